@@ -4,6 +4,7 @@ import tempfile
 import time
 from pathlib import Path
 
+from codebase_rag.graph_columnar import ColumnarGraphLoader, write_columnar_graph
 from codebase_rag.graph_loader import GraphLoader
 
 WARMUP_RUNS = 2
@@ -57,6 +58,15 @@ def bench_graph_load(file_path: str) -> float:
     return time.perf_counter() - start
 
 
+def bench_columnar_load(file_path: str) -> float:
+    start = time.perf_counter()
+    loader = ColumnarGraphLoader(file_path)
+    loader.load()
+    elapsed = time.perf_counter() - start
+    loader.close()
+    return elapsed
+
+
 def bench_find_nodes_by_label(loader: GraphLoader) -> float:
     labels = ["Function", "Class", "Module"]
     start = time.perf_counter()
@@ -160,8 +170,32 @@ def main() -> None:
         r = run_benchmark(f"summary ({num_nodes}n)", bench_summary, loader)
         results.append(r)
 
+        columnar_path = tmp_path + ".cgrg"
+        write_columnar_graph(json.loads(json_str), Path(columnar_path))
+        print(f"Columnar size: {Path(columnar_path).stat().st_size / 1024:.1f} KB")
+
+        r = run_benchmark(f"Columnar.load ({num_nodes}n)", bench_columnar_load, columnar_path)
+        results.append(r)
+
+        columnar = ColumnarGraphLoader(columnar_path)
+        columnar.load()
+
+        r = run_benchmark(f"columnar find_nodes_by_label ({num_nodes}n)", bench_find_nodes_by_label, columnar)
+        results.append(r)
+
+        r = run_benchmark(f"columnar find_node_by_property ({num_nodes}n)", bench_find_node_by_property, columnar)
+        results.append(r)
+
+        r = run_benchmark(f"columnar get_relationships ({num_nodes}n)", bench_get_relationships, columnar, num_nodes)
+        results.append(r)
+
+        r = run_benchmark(f"columnar summary ({num_nodes}n)", bench_summary, columnar)
+        results.append(r)
+
         print_results(results)
 
+        columnar.close()
+        Path(columnar_path).unlink(missing_ok=True)
         Path(tmp_path).unlink(missing_ok=True)
 
 
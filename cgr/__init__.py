@@ -1,13 +1,16 @@
 from codebase_rag.config import settings
 from codebase_rag.embedder import embed_code
+from codebase_rag.graph_columnar import ColumnarGraphLoader, convert_graph_file
 from codebase_rag.graph_loader import GraphLoader, load_graph
 from codebase_rag.services.graph_service import MemgraphIngestor
 from codebase_rag.services.llm import CypherGenerator
 
 __all__ = [
+    "ColumnarGraphLoader",
     "CypherGenerator",
     "GraphLoader",
     "MemgraphIngestor",
+    "convert_graph_file",
     "embed_code",
     "load_graph",
     "settings",
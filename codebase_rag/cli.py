@@ -1,6 +1,7 @@
 """Command-line entry point wiring cgr subcommands to their handlers."""
 
 import asyncio
+import contextlib
 import json
 import sys
 import time
@@ -37,7 +38,7 @@ from .main import (
     update_model_settings,
 )
 from .parser_loader import load_parsers
-from .services.graph_diff import DiffError, diff_indexes, diff_is_empty
+from .services.graph_diff import DiffError, diff_indexes, diff_is_empty, iter_diff
 from .services.graph_service import MemgraphIngestor
 from .services.protobuf_service import ProtobufFileIngestor
 from .services.provenance import (
@@ -365,6 +366,9 @@ def _delete_hash_cache(repo_path: Path) -> None:
         cache_path.unlink(missing_ok=True)
     (repo_path / cs.DIR_MTIMES_FILENAME).unlink(missing_ok=True)
     (repo_path / cs.PARSER_FINGERPRINT_FILENAME).unlink(missing_ok=True)
+    (repo_path / cs.IMPORT_RESOLUTION_FILENAME).unlink(missing_ok=True)
+    (repo_path / cs.GIT_INDEX_STATE_FILENAME).unlink(missing_ok=True)
+    (repo_path / cs.WARM_STATE_FILENAME).unlink(missing_ok=True)
 
 
 def _resolve_and_validate_repo(repo_path: str | None) -> Path:
@@ -663,6 +667,11 @@ def index(
         "--split-index",
         help=ch.HELP_SPLIT_INDEX,
     ),
+    stream_index: bool = typer.Option(
+        False,
+        "--stream-index",
+        help=ch.HELP_STREAM_INDEX,
+    ),
     exclude: list[str] | None = typer.Option(
         None,
         "--exclude",
@@ -679,6 +688,9 @@ def index(
         help=ch.HELP_INTERACTIVE_SETUP,
     ),
 ) -> None:
+    if split_index and stream_index:
+        app_context.console.print(style(cs.CLI_ERR_INDEX_LAYOUT_CONFLICT, cs.Color.RED))
+        raise typer.Exit(1)
     repo_to_index = _resolve_and_validate_repo(repo_path)
     _info(style(cs.CLI_MSG_INDEXING_AT.format(path=repo_to_index), cs.Color.GREEN))
 
@@ -701,6 +713,7 @@ def index(
             output_path=output_proto_dir,
             split_index=split_index,
             repo_path=str(repo_to_index),
+            stream_index=stream_index,
         )
         parsers, queries = load_parsers()
         updater = GraphUpdater(
@@ -768,7 +781,11 @@ def diff_index_command(
     old_dir: str = typer.Option(..., "--old", help=ch.HELP_DIFF_OLD),
     new_dir: str = typer.Option(..., "--new", help=ch.HELP_DIFF_NEW),
     json_out: str | None = typer.Option(None, "--json-out", help=ch.HELP_DIFF_JSON_OUT),
+    stream: bool = typer.Option(False, "--stream", help=ch.HELP_DIFF_STREAM),
 ) -> None:
+    if stream:
+        _stream_diff(Path(old_dir), Path(new_dir), json_out)
+        return
     try:
         diff = diff_indexes(Path(old_dir), Path(new_dir))
     except DiffError as error:
@@ -784,6 +801,28 @@ def diff_index_command(
         _info(style(cs.CLI_MSG_DIFF_EMPTY, cs.Color.GREEN))
 
 
+def _stream_diff(old_dir: Path, new_dir: Path, json_out: str | None) -> None:
+    # One NDJSON line per delta as the merge finds it: nothing is buffered,
+    # so arbitrarily large snapshots diff in constant memory.
+    empty = True
+    with (
+        open(json_out, "w", encoding="utf-8")
+        if json_out is not None
+        else contextlib.nullcontext(sys.stdout)
+    ) as sink:
+        try:
+            for event in iter_diff(old_dir, new_dir):
+                empty = False
+                sink.write(json.dumps(event, sort_keys=True) + "\n")
+        except DiffError as error:
+            app_context.console.print(style(str(error), cs.Color.RED))
+            raise typer.Exit(2) from error
+    if json_out is not None:
+        _info(style(cs.CLI_MSG_DIFF_WRITTEN.format(path=json_out), cs.Color.CYAN))
+    if empty:
+        _info(style(cs.CLI_MSG_DIFF_EMPTY, cs.Color.GREEN))
+
+
 @app.command(
     help=ch.CMD_EXPORT,
     short_help=ch.CMD_EXPORT,
@@ -910,7 +949,12 @@ def mcp_server(
     ),
     host: str = typer.Option(None, help=ch.HELP_MCP_HTTP_HOST),
     port: int = typer.Option(None, help=ch.HELP_MCP_HTTP_PORT),
+    offline_graph: Path | None = typer.Option(
+        None, "--offline-graph", help=ch.HELP_MCP_OFFLINE_GRAPH
+    ),
 ) -> None:
+    if offline_graph is not None:
+        settings.MCP_OFFLINE_GRAPH = str(offline_graph)
     try:
         if transport == cs.MCPTransport.HTTP:
             from codebase_rag.mcp import serve_http
@@ -944,10 +988,24 @@ def mcp_server(
 )
 def graph_loader_command(
     graph_file: str = typer.Argument(..., help=ch.HELP_GRAPH_FILE),
+    columnar_out: str | None = typer.Option(
+        None, "--columnar-out", help=ch.HELP_COLUMNAR_OUT
+    ),
 ) -> None:
     from .graph_loader import load_graph
 
     try:
+        if columnar_out is not None:
+            from .graph_columnar import convert_graph_file
+
+            convert_graph_file(Path(graph_file), Path(columnar_out))
+            _info(
+                style(
+                    cs.CLI_MSG_COLUMNAR_WRITTEN.format(path=columnar_out),
+                    cs.Color.CYAN,
+                )
+            )
+            graph_file = columnar_out
         graph = load_graph(graph_file)
         summary = graph.summary()
 
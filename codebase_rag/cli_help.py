@@ -87,8 +87,12 @@ EXAMPLES_EXPORT = "EXAMPLE\n\n  cgr export -o graph.json"
 EXAMPLES_OPTIMIZE = "EXAMPLE\n\n  cgr optimize python --repo-path ./my-repo"
 EXAMPLES_MCP_SERVER = (
     "EXAMPLES\n\n  cgr mcp-server\n\n  cgr mcp-server --transport http --port 8080"
+    "\n\n  cgr mcp-server --offline-graph ./index"
+)
+EXAMPLES_GRAPH_LOADER = (
+    "EXAMPLES\n\n  cgr graph-loader graph.json\n\n"
+    "  cgr graph-loader graph.json --columnar-out graph.cgrg"
 )
-EXAMPLES_GRAPH_LOADER = "EXAMPLE\n\n  cgr graph-loader graph.json"
 EXAMPLES_LANGUAGE_ADD = "EXAMPLE\n\n  cgr language add-grammar ruby"
 EXAMPLES_LANGUAGE_REMOVE = "EXAMPLE\n\n  cgr language remove-language ruby"
 EXAMPLES_DEAD_CODE = (
@@ -267,10 +271,18 @@ HELP_OUTPUT_GRAPH = "Write the updated graph to PATH as JSON. Requires --update-
 HELP_OUTPUT_PATH = "Write the exported graph to PATH."
 HELP_OUTPUT_PROTO_DIR = "Write protobuf index files under DIRECTORY."
 HELP_SPLIT_INDEX = "Write separate nodes.bin and relationships.bin files."
+HELP_STREAM_INDEX = (
+    "Write one streamed index.pbs file of length-delimited records, "
+    "for graphs beyond the 2 GB protobuf message limit."
+)
 HELP_FORMAT_JSON = "Use JSON output. Other export formats are not supported."
 HELP_LANGUAGE_ARG = "Language to optimise, such as python, java, javascript, or cpp."
 HELP_REFERENCE_DOC = "Reference document to use during optimisation."
-HELP_GRAPH_FILE = "Exported graph JSON file to load."
+HELP_GRAPH_FILE = "Exported graph JSON file, or a columnar graph file, to load."
+HELP_COLUMNAR_OUT = (
+    "Convert the JSON graph to the memory-mapped columnar format at PATH "
+    "and load that instead."
+)
 HELP_EXPORTED_GRAPH_FILE = "Path to the exported_graph.json file."
 
 HELP_GRAMMAR_URL = (
@@ -300,6 +312,10 @@ HELP_QUERY_OUTPUT_FORMAT = "Format --ask-agent output as table or json."
 HELP_MCP_TRANSPORT = "Transport to serve: stdio or http."
 HELP_MCP_HTTP_HOST = "HTTP bind host. Used only with --transport http."
 HELP_MCP_HTTP_PORT = "HTTP bind port. Used only with --transport http."
+HELP_MCP_OFFLINE_GRAPH = (
+    "Answer read-only tools from this graph export (JSON, columnar file or "
+    "protobuf index directory) instead of Memgraph. Write tools are refused."
+)
 
 HELP_DEADCODE_PROJECT_NAME = (
     "Project to scan. If omitted, cgr uses the only indexed project."
@@ -361,3 +377,6 @@ CMD_DIFF_INDEX = "Structural diff between two protobuf index snapshots"
 HELP_DIFF_OLD = "Directory holding the OLD snapshot artifacts."
 HELP_DIFF_NEW = "Directory holding the NEW snapshot artifacts."
 HELP_DIFF_JSON_OUT = "Write the JSON delta to FILE instead of stdout."
+HELP_DIFF_STREAM = (
+    "Emit one NDJSON delta per line as the sorted merge finds it, in constant memory."
+)
@@ -200,6 +200,21 @@ class AppConfig(BaseSettings):
     # is missing, so it is a safe default and strictly better (macros, includes,
     # expansion calls) with one.
     CPP_FRONTEND: cs.CppFrontend = cs.CppFrontend.HYBRID
+    # libclang parse processes; 0 picks one per CPU (capped), 1 keeps every
+    # translation unit in process. Small compile databases stay in process.
+    CPP_FRONTEND_WORKERS: int = Field(
+        0, ge=0, validation_alias="CGR_CPP_FRONTEND_WORKERS"
+    )
+    # Walk an include-guarded header once per worker and preprocessor-flag set
+    # instead of once per translation unit that includes it.
+    CPP_FRONTEND_SHARE_HEADERS: bool = Field(
+        True, validation_alias="CGR_CPP_FRONTEND_SHARE_HEADERS"
+    )
+    # Persist per-translation-unit facts under CGR_HOME so units whose
+    # sources and headers are unchanged are not reparsed on the next run.
+    CPP_FRONTEND_TU_CACHE: bool = Field(
+        True, validation_alias="CGR_CPP_FRONTEND_TU_CACHE"
+    )
     # Opt-in Roslyn semantic layer for C#. Defaults to pure tree-sitter because
     # HYBRID needs a dotnet SDK + a restorable .csproj/.sln and degrades without
     # them. HYBRID augments (base-vs-interface, overload and extension binding,
@@ -213,11 +228,55 @@ class AppConfig(BaseSettings):
     # tree-sitter stays the standalone-correct backbone.
     GO_FRONTEND: cs.GoFrontend = cs.GoFrontend.AUTO
     PYTHON_FRONTEND: cs.PythonFrontend = cs.PythonFrontend.HEURISTIC
+    # Jedi inference processes for a full run; 0 picks one per CPU (capped),
+    # 1 keeps everything in process. Small runs always stay in process.
+    PYTHON_FRONTEND_WORKERS: int = Field(
+        0, ge=0, validation_alias="CGR_PYTHON_FRONTEND_WORKERS"
+    )
+    # Persist per-file Jedi facts under CGR_HOME so unchanged files skip
+    # inference on the next run.
+    PYTHON_FRONTEND_FACT_CACHE: bool = Field(
+        True, validation_alias="CGR_PYTHON_FRONTEND_FACT_CACHE"
+    )
+    # Keep Jedi warm in a long-lived worker process across runs (watch mode,
+    # repeated MCP updates) instead of inferring in the indexer's process.
+    PYTHON_FRONTEND_WORKER: bool = Field(
+        False, validation_alias="CGR_PYTHON_FRONTEND_WORKER"
+    )
+    # A worker silent this long on one request is killed and the request
+    # runs in process instead.
+    PYTHON_FRONTEND_WORKER_TIMEOUT: float = Field(
+        600.0, gt=0, validation_alias="CGR_PYTHON_FRONTEND_WORKER_TIMEOUT"
+    )
     JAVA_FRONTEND: cs.JavaFrontend = cs.JavaFrontend.HEURISTIC
     LOMBOK_JAR: str | None = None
     CAPTURE_FUNCTION_LOCAL_DEFINITIONS: bool = Field(
         True, validation_alias="CGR_CAPTURE_LOCAL_DEFINITIONS"
     )
+    # Persist import-resolution answers in the repo's state files so an
+    # incremental run whose directories and manifests are unchanged skips
+    # the discovery walks and per-import filesystem probes.
+    IMPORT_RESOLUTION_CACHE: bool = Field(
+        True, validation_alias="CGR_IMPORT_RESOLUTION_CACHE"
+    )
+    # Find an incremental run's changed files from the git index and the
+    # commits since the last indexed one instead of walking the tree; falls
+    # back to the walk whenever git cannot vouch for every eligible file.
+    GIT_CHANGE_DETECTION: bool = Field(
+        False, validation_alias="CGR_GIT_CHANGE_DETECTION"
+    )
+    # Persist the registries a finished run leaves in memory so a watcher
+    # started on an in-sync repo answers events without graph reads.
+    WARM_STATE_SNAPSHOT: bool = Field(True, validation_alias="CGR_WARM_STATE_SNAPSHOT")
+    # watchdog runs one emitter (an inotify instance on Linux) per scheduled
+    # watch; past this many the watcher keeps a subtree under one recursive
+    # watch instead of carving ignored directories out of it.
+    WATCHER_MAX_WATCHES: int = Field(64, validation_alias="CGR_WATCHER_MAX_WATCHES")
+    # How often a running watcher logs its processed and dropped event
+    # totals, when they moved since the last report; 0 logs them only on exit.
+    WATCHER_EVENT_COUNTS_INTERVAL: float = Field(
+        300.0, ge=0, validation_alias="CGR_WATCHER_EVENT_COUNTS_INTERVAL"
+    )
     CGR_HOME: Path = Field(default_factory=lambda: Path.home() / ".cgr")
     SHELL_COMMAND_TIMEOUT: int = 30
     SHELL_COMMAND_ALLOWLIST: frozenset[str] = frozenset(
@@ -283,6 +342,21 @@ class AppConfig(BaseSettings):
     MILVUS_VECTOR_DIM: int = 768
     MILVUS_TOP_K: int = 5
     MILVUS_CONSISTENCY_LEVEL: str = "Strong"
+    # The embedded "local" backend: memory-mapped per-project matrices
+    # under LOCAL_VECTOR_PATH, searched exactly unless the IVF index is on.
+    LOCAL_VECTOR_PATH: str = "./.cgr_vectors"
+    LOCAL_VECTOR_DIM: int = Field(default=768, gt=0)
+    LOCAL_VECTOR_TOP_K: int = 5
+    LOCAL_VECTOR_INDEX: cs.LocalVectorIndex = cs.LocalVectorIndex.FLAT
+    LOCAL_VECTOR_IVF_MIN_ROWS: int = Field(default=50_000, gt=0)
+    LOCAL_VECTOR_IVF_PROBES: int = Field(default=8, gt=0)
+    # Opt-in quantized search: candidates are ranked on int8, binary or
+    # product-quantized codes and the best VECTOR_RESCORE_OVERSAMPLING x k
+    # are rescored against the full-precision vectors.
+    VECTOR_QUANTIZATION: cs.VectorQuantization = Field(
+        cs.VectorQuantization.NONE, validation_alias="CGR_VECTOR_QUANTIZATION"
+    )
+    VECTOR_RESCORE_OVERSAMPLING: float = Field(default=3.0, ge=1.0)
     EMBEDDING_PROVIDER: cs.EmbeddingProvider = Field(
         cs.EmbeddingProvider.UNIXCODER, validation_alias="CGR_EMBEDDING_PROVIDER"
     )
@@ -292,12 +366,56 @@ class AppConfig(BaseSettings):
     OPENAI_EMBEDDING_DIMENSIONS: int | None = Field(default=None, gt=0)
     OPENAI_EMBEDDING_BATCH_SIZE: int = Field(default=128, gt=0)
     OPENAI_EMBEDDING_TIMEOUT: float = Field(default=60.0, gt=0)
+    # Requests in flight at once; halved on every 429 and grown back by one
+    # per success. Batches are packed to an estimated token budget as well
+    # as OPENAI_EMBEDDING_BATCH_SIZE inputs.
+    OPENAI_EMBEDDING_CONCURRENCY: int = Field(default=4, gt=0)
+    OPENAI_EMBEDDING_TOKEN_BUDGET: int = Field(default=100_000, gt=0)
+    OPENAI_EMBEDDING_MAX_RETRIES: int = Field(default=5, ge=0)
     EMBEDDING_MAX_LENGTH: int = 512
+    # Padded tokens (rows x longest row) per UniXcoder forward pass; batches
+    # are formed from length-sorted snippets so short code shares a batch.
+    EMBEDDING_TOKEN_BUDGET: int = Field(
+        default=cs.EMBEDDING_DEFAULT_TOKEN_BUDGET,
+        gt=0,
+        validation_alias="CGR_EMBEDDING_TOKEN_BUDGET",
+    )
+    # Storage precision of the on-disk embedding cache; float16 halves the
+    # file at ~3 significant digits, which ranking by cosine tolerates, and
+    # int8 (a per-row scale and one byte per value) quarters it.
+    EMBEDDING_CACHE_DTYPE: cs.EmbeddingCacheDtype = Field(
+        cs.EmbeddingCacheDtype.FLOAT32, validation_alias="CGR_EMBEDDING_CACHE_DTYPE"
+    )
     EMBEDDING_PROGRESS_INTERVAL: int = 10
+    # Batches queued between the extract, embed and store stages of Pass 4;
+    # a full queue blocks the stage feeding it.
+    EMBEDDING_PIPELINE_DEPTH: int = Field(default=2, gt=0)
     SKIP_EMBEDDINGS: bool = Field(False, validation_alias="CGR_SKIP_EMBEDDINGS")
     EMBEDDING_DEVICE: cs.EmbeddingDevice | None = Field(
         None, validation_alias="CGR_EMBEDDING_DEVICE"
     )
+    # Opt-in CPU inference for UniXcoder: int8 dynamic quantization of the
+    # encoder's linear layers (forces the CPU device), the intra-op thread
+    # count, and PyTorch's fused scaled-dot-product attention kernel.
+    EMBEDDING_CPU_INT8: bool = Field(False, validation_alias="CGR_EMBEDDING_CPU_INT8")
+    EMBEDDING_CPU_THREADS: int | None = Field(
+        None, gt=0, validation_alias="CGR_EMBEDDING_CPU_THREADS"
+    )
+    EMBEDDING_FUSED_ATTENTION: bool = Field(
+        False, validation_alias="CGR_EMBEDDING_FUSED_ATTENTION"
+    )
+    # Pass 4 also builds a BM25 index over names and bodies. Identifier-like
+    # queries are answered from it without the model; other queries blend
+    # its scores into the vector scores with this weight.
+    LEXICAL_INDEX_ENABLED: bool = Field(True, validation_alias="CGR_LEXICAL_INDEX")
+    LEXICAL_FUSION_WEIGHT: float = Field(default=0.3, ge=0.0, le=1.0)
+    # Semantic-search queries arriving within this window share one forward
+    # pass; the LRU serves repeated queries without the model. The timeout
+    # bounds a caller's wait, including the first query's model load.
+    QUERY_EMBEDDING_BATCH_WINDOW_MS: float = Field(default=5.0, ge=0)
+    QUERY_EMBEDDING_MAX_BATCH: int = Field(default=32, gt=0)
+    QUERY_EMBEDDING_CACHE_SIZE: int = Field(default=256, ge=0)
+    QUERY_EMBEDDING_TIMEOUT_S: float = Field(default=300.0, gt=0)
 
     FLUSH_THREAD_POOL_SIZE: int = Field(default=4, gt=0)
     FILE_FLUSH_INTERVAL: int = Field(default=500, gt=0)
@@ -331,6 +449,10 @@ class AppConfig(BaseSettings):
     # Bearer token for the HTTP MCP endpoint; unset means loopback-only
     # (serve_http refuses a non-loopback bind without it).
     MCP_HTTP_AUTH_TOKEN: str | None = None
+    # Graph export (JSON, columnar file or protobuf index directory) the MCP
+    # server queries in-process instead of connecting to Memgraph; unset
+    # keeps the live-database behaviour.
+    MCP_OFFLINE_GRAPH: str | None = None
 
     def _get_default_config(self, role: str) -> ModelConfig:
         role_upper = role.upper()
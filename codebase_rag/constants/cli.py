@@ -41,6 +41,9 @@ HELP_ARG = "help"
 CLI_ERR_OUTPUT_REQUIRES_UPDATE = (
     "Error: --output/-o option requires --update-graph to be specified."
 )
+CLI_ERR_INDEX_LAYOUT_CONFLICT = (
+    "Error: --split-index and --stream-index select different layouts; pass one."
+)
 CLI_ERR_ONLY_JSON = "Error: Currently only JSON format is supported."
 CLI_ERR_JSON_REQUIRES_ASK_AGENT = (
     "Error: --output-format json requires --ask-agent/-a; "
@@ -110,6 +113,7 @@ CLI_MSG_INDEXING_DONE = "Indexing process completed successfully!"
 CLI_MSG_MANIFEST_WRITTEN = "Provenance manifest written to {path}"
 CLI_MSG_VERIFY_PROBLEM = "VERIFY FAILED: {problem}"
 CLI_MSG_VERIFY_OK = "Index verified against its manifest: {path}"
+CLI_MSG_COLUMNAR_WRITTEN = "Columnar graph written to {path}"
 CLI_MSG_DIFF_WRITTEN = "Graph delta written to {path}"
 CLI_MSG_DIFF_EMPTY = "No structural delta: the snapshots are equivalent"
 CLI_MSG_CONNECTING_MEMGRAPH = "Connecting to Memgraph to export graph..."
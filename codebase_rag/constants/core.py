@@ -52,6 +52,7 @@ class EventType(StrEnum):
     MODIFIED = "modified"
     CREATED = "created"
     DELETED = "deleted"
+    MOVED = "moved"
 
 
 REALTIME_LOGGER_FORMAT = (
@@ -68,6 +69,10 @@ LOG_LEVEL_ERROR = "ERROR"
 # Debounce settings for realtime watcher
 DEFAULT_DEBOUNCE_SECONDS = 5
 DEFAULT_MAX_WAIT_SECONDS = 30
+# An ignored directory with at least this many subdirectories is carved out
+# of the watch registration; smaller ones (__pycache__) stay inside their
+# parent's recursive watch and their events are dropped one by one.
+WATCH_PRUNED_SUBTREE_MIN_DIRS = 16
 
 CHAR_HYPHEN = "-"
 CHAR_UNDERSCORE = "_"
@@ -119,15 +124,54 @@ HASH_CACHE_FILENAME = ".cgr-hash-cache.json"
 DIR_MTIMES_FILENAME = ".cgr-dir-mtimes.json"
 PARSER_FINGERPRINT_FILENAME = ".cgr-parser-fingerprint"
 DELOMBOK_STATE_FILENAME = ".cgr-delombok-state.json"
+IMPORT_RESOLUTION_FILENAME = ".cgr-import-resolution.json"
+GIT_INDEX_STATE_FILENAME = ".cgr-git-state.json"
+WARM_STATE_FILENAME = ".cgr-warm-state.json"
 CGR_STATE_FILENAMES: frozenset[str] = frozenset(
     {
         HASH_CACHE_FILENAME,
         DIR_MTIMES_FILENAME,
         PARSER_FINGERPRINT_FILENAME,
         DELOMBOK_STATE_FILENAME,
+        IMPORT_RESOLUTION_FILENAME,
+        GIT_INDEX_STATE_FILENAME,
+        WARM_STATE_FILENAME,
     }
 )
 
+# Warm-state snapshot: the registries a finished run leaves in memory, keyed
+# to the hash cache it was written with so a watcher can start from them.
+WARM_STATE_VERSION = 1
+WARM_STATE_KEY_VERSION = "version"
+WARM_STATE_KEY_PROJECT = "project"
+WARM_STATE_KEY_HASH_CACHE = "hash_cache"
+WARM_STATE_KEY_REGISTRY = "registry"
+WARM_STATE_KEY_PROPERTIES = "properties"
+WARM_STATE_KEY_MACROS = "macros"
+WARM_STATE_KEY_MODULE_PATHS = "module_paths"
+WARM_STATE_KEY_FUNCTION_LOCATIONS = "function_locations"
+WARM_STATE_KEY_GO_TYPE_LOCATIONS = "go_type_locations"
+WARM_STATE_KEY_CSHARP_TYPE_LOCATIONS = "csharp_type_locations"
+WARM_STATE_KEY_IMPORT_MAPPING = "import_mapping"
+
+# Git-driven change detection (CGR_GIT_CHANGE_DETECTION): the state of the
+# last indexed run, and how long one git query may take.
+GIT_STATE_KEY_COMMIT = "commit"
+GIT_STATE_KEY_DIRTY = "dirty"
+GIT_STATE_KEY_COMPLETE = "complete"
+GIT_STATE_KEY_CONFIG = "config"
+GIT_CHANGE_TIMEOUT = 60
+
+
+class GitChangeFallback(StrEnum):
+    NOT_GIT = "not a git work tree with commits"
+    NO_STATE = "no recorded git state"
+    INCOMPLETE = "eligible files git does not track"
+    CONFIG = "ignore configuration changed"
+    HISTORY = "last indexed commit unavailable"
+    GITIGNORE = ".gitignore changed"
+
+
 # Inputs to the parser fingerprint: everything that changes how source files
 # become graph nodes and edges, plus the installed grammar wheels. Paths are
 # relative to the codebase_rag package root.
@@ -1,5 +1,9 @@
 # Dependency-file names and manifest parsing keys.
 
+from enum import StrEnum
+
+from .languages import TSCONFIG_FILENAMES
+
 EXCLUDED_DEPENDENCY_NAMES = frozenset({"python", "php"})
 
 DEPENDENCY_FILES = frozenset(
@@ -66,8 +70,60 @@ GOMOD_COMMENT_PREFIX = "//"
 
 GEMFILE_GEM_PREFIX = "gem "
 
-IMPORT_CACHE_TTL = 3600
 IMPORT_CACHE_DIR = ".cache/codebase_rag"
 IMPORT_CACHE_FILE = "stdlib_cache.json"
 IMPORT_CACHE_KEY = "cache"
-IMPORT_TIMESTAMPS_KEY = "timestamps"
+IMPORT_TOOLCHAINS_KEY = "toolchains"
+
+# Long-lived stdlib introspection helpers: queries per pipe round trip (small
+# enough that neither pipe buffer fills mid-batch), seconds a round trip may
+# take, and seconds to build the Go helper.
+STDLIB_HELPER_BATCH_SIZE = 256
+STDLIB_HELPER_TIMEOUT = 30
+STDLIB_HELPER_BUILD_TIMEOUT = 120
+
+# Per-project import-resolution cache (IMPORT_RESOLUTION_FILENAME): resolver
+# answers reused across runs while the directory mtimes and manifest digests
+# they were computed under still hold.
+IMPORT_RESOLUTION_VERSION = 1
+IMPORT_RESOLUTION_KEY_VERSION = "version"
+IMPORT_RESOLUTION_KEY_DIRS = "dirs"
+IMPORT_RESOLUTION_KEY_MANIFESTS = "manifests"
+IMPORT_RESOLUTION_KEY_DISCOVERY = "discovery"
+IMPORT_RESOLUTION_KEY_ENTRIES = "entries"
+IMPORT_RESOLUTION_KEY_LISTINGS = "listings"
+IMPORT_RESOLUTION_KEY_SEP = "\x00"
+
+
+class ImportResolutionFamily(StrEnum):
+    PY_SOURCE_ROOTS = "py_source_roots"
+    PY_SOURCE_ROOT = "py_source_root"
+    PY_LOCAL_MODULE = "py_local_module"
+    GO_MODULE_PATHS = "go_module_paths"
+    GO_IMPORT_PATH = "go_import_path"
+    JS_WORKSPACE_PACKAGES = "js_workspace_packages"
+    JS_WORKSPACE_IMPORT = "js_workspace_import"
+    TS_PATH_ALIASES = "ts_path_aliases"
+    JAVA_SOURCE_ROOT = "java_source_root"
+
+
+# Which families a manifest's CONTENT feeds (a manifest added or removed
+# already shows as a directory mtime change).
+IMPORT_RESOLUTION_MANIFEST_FAMILIES: dict[str, frozenset[ImportResolutionFamily]] = {
+    DEP_FILE_PYPROJECT: frozenset(
+        {ImportResolutionFamily.PY_SOURCE_ROOTS, ImportResolutionFamily.PY_SOURCE_ROOT}
+    ),
+    DEP_FILE_GOMOD: frozenset(
+        {ImportResolutionFamily.GO_MODULE_PATHS, ImportResolutionFamily.GO_IMPORT_PATH}
+    ),
+    DEP_FILE_PACKAGE_JSON: frozenset(
+        {
+            ImportResolutionFamily.JS_WORKSPACE_PACKAGES,
+            ImportResolutionFamily.JS_WORKSPACE_IMPORT,
+        }
+    ),
+    **{
+        name: frozenset({ImportResolutionFamily.TS_PATH_ALIASES})
+        for name in TSCONFIG_FILENAMES
+    },
+}
@@ -56,6 +56,7 @@ KEY_REL_TYPE = "rel_type"
 KEY_TO_LABEL = "to_label"
 KEY_TO_QN = "to_qn"
 KEY_PROJECT_PREFIX = "project_prefix"
+KEY_PATHS = "paths"
 KEY_VERSION_SPEC = "version_spec"
 KEY_PREFIX = "prefix"
 KEY_PROJECT_NAME = "project_name"
@@ -70,6 +71,14 @@ PROTOBUF_INDEX_FILE = "index.bin"
 PROTOBUF_PAYLOAD_ONEOF = "payload"
 PROTOBUF_NODES_FILE = "nodes.bin"
 PROTOBUF_RELS_FILE = "relationships.bin"
+# Streamed layout (header + length-delimited records): no single message has
+# to hold the whole graph, so it is free of protobuf's 2 GB message limit.
+PROTOBUF_STREAM_FILE = "index.pbs"
+PROTOBUF_STREAM_MAGIC = b"CGRPBS\x00"
+PROTOBUF_STREAM_VERSION = 1
+
+COLUMNAR_GRAPH_MAGIC = b"CGRGRAPH"
+COLUMNAR_GRAPH_VERSION = 1
 
 ONEOF_PROJECT = "project"
 ONEOF_PACKAGE = "package"
@@ -349,18 +358,31 @@ WHERE (n:Function OR n:Method)
   AND m.qualified_name STARTS WITH ($project_name + '.')
 """
 
-CYPHER_QUERY_EMBEDDINGS = (
-    _CYPHER_EMBEDDING_BASE
-    + """RETURN id(n) AS node_id, n.qualified_name AS qualified_name,
+_CYPHER_EMBEDDING_RETURN = """RETURN id(n) AS node_id, n.qualified_name AS qualified_name,
        n.start_line AS start_line, n.end_line AS end_line,
        m.path AS path
 """
+
+CYPHER_QUERY_EMBEDDINGS = _CYPHER_EMBEDDING_BASE + _CYPHER_EMBEDDING_RETURN
+
+# Incremental runs embed only the definitions of the files they re-parsed.
+CYPHER_QUERY_EMBEDDINGS_FOR_PATHS = (
+    _CYPHER_EMBEDDING_BASE + "  AND m.path IN $paths\n" + _CYPHER_EMBEDDING_RETURN
 )
 
 CYPHER_QUERY_PROJECT_NODE_IDS = _CYPHER_EMBEDDING_BASE + "RETURN id(n) AS node_id\n"
 
+# The embedded definitions of one module, read just before its subtree is
+# deleted so their vectors can be dropped with it.
+CYPHER_QUERY_MODULE_EMBEDDING_IDS = (
+    _CYPHER_EMBEDDING_BASE + "  AND m.path = $path\nRETURN id(n) AS node_id\n"
+)
+
 PAYLOAD_NODE_ID = "node_id"
 PAYLOAD_QUALIFIED_NAME = "qualified_name"
+# Leading qualified-name segment, stored so scoped searches filter in the
+# vector store instead of over-fetching and prefix-matching client-side.
+PAYLOAD_PROJECT = "project"
 
 CYPHER_DELETE_MODULE = (
     # Scoped to the project: two projects in the shared graph can hold the
@@ -387,6 +387,7 @@ DIR_SRC = "src"
 IGNORE_PATTERNS = frozenset(
     {
         ".cache",
+        ".cgr_vectors",
         ".claude",
         # Android NDK per-ABI CMake build cache; ships compiler-probe
         # sources (CMakeCCompilerId.c) that index as project code.
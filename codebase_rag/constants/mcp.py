@@ -24,6 +24,17 @@ class MCPToolName(StrEnum):
     RANK_ROOT_CAUSES = "rank_root_causes"
 
 
+# Tools that change graph data; an offline graph does not offer them.
+MCP_GRAPH_WRITE_TOOLS = frozenset(
+    {
+        MCPToolName.DELETE_PROJECT,
+        MCPToolName.WIPE_DATABASE,
+        MCPToolName.INDEX_REPOSITORY,
+        MCPToolName.UPDATE_REPOSITORY,
+    }
+)
+
+
 class MCPTransport(StrEnum):
     STDIO = "stdio"
     HTTP = "http"
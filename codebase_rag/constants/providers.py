@@ -50,10 +50,34 @@ HTTP_OK = 200
 
 UNIXCODER_MODEL = "microsoft/unixcoder-base"
 EMBEDDING_DEFAULT_BATCH_SIZE = 64
-EMBEDDING_CACHE_FILENAME = ".embedding_cache.json"
+# Padded tokens per UniXcoder forward pass: the old worst case of a full
+# batch padded to the 512-token window.
+EMBEDDING_DEFAULT_TOKEN_BUDGET = 32768
+EMBEDDING_CACHE_FILENAME = ".embedding_cache.bin"
+LEGACY_EMBEDDING_CACHE_FILENAME = ".embedding_cache.json"
+UNIXCODER_INT8_CACHE_FILENAME = ".unixcoder_int8.pt"
+UNIXCODER_INT8_VARIANT = "int8"
+UNIXCODER_FUSED_ATTENTION = "sdpa"
+LEXICAL_INDEX_DIRNAME = ".lexical_index"
+LEXICAL_INDEX_SUFFIX = ".json"
+EMBEDDING_CACHE_MAGIC = b"CGREMBC\x00"
+EMBEDDING_CACHE_VERSION = 1
+EMBEDDING_CACHE_INDEX_SUFFIX = ".idx"
+EMBEDDING_CACHE_INDEX_MAGIC = b"CGREMBI\x00"
 
 OPENAI_EMBEDDING_DEFAULT_MODEL = "text-embedding-3-small"
 OPENAI_EMBEDDINGS_PATH = "/embeddings"
+HTTP_TOO_MANY_REQUESTS = 429
+# No tokenizer for remote models; a conservative average for source code.
+OPENAI_EMBEDDING_CHARS_PER_TOKEN = 4
+OPENAI_EMBEDDING_BACKOFF_BASE = 1.0
+OPENAI_EMBEDDING_BACKOFF_MAX = 60.0
+OPENAI_HEADER_RETRY_AFTER = "retry-after"
+OPENAI_HEADER_RETRY_AFTER_MS = "retry-after-ms"
+OPENAI_HEADER_RATE_LIMIT_WINDOWS = (
+    ("x-ratelimit-remaining-requests", "x-ratelimit-reset-requests"),
+    ("x-ratelimit-remaining-tokens", "x-ratelimit-reset-tokens"),
+)
 
 
 class EmbeddingProvider(StrEnum):
@@ -61,6 +85,22 @@ class EmbeddingProvider(StrEnum):
     OPENAI = "openai"
 
 
+class EmbeddingCacheDtype(StrEnum):
+    FLOAT32 = "float32"
+    FLOAT16 = "float16"
+    INT8 = "int8"
+
+
+class EmbeddingStage(StrEnum):
+    EXTRACT = "extract"
+    EMBED = "embed"
+    STORE = "store"
+
+
+EMBEDDING_EXTRACT_THREAD = "cgr-embed-extract"
+EMBEDDING_STORE_THREAD = "cgr-embed-store"
+
+
 class EmbeddingDevice(StrEnum):
     CUDA = "cuda"
     MPS = "mps"
@@ -70,6 +110,19 @@ class EmbeddingDevice(StrEnum):
 class VectorStoreBackend(StrEnum):
     QDRANT = "qdrant"
     MILVUS = "milvus"
+    LOCAL = "local"
+
+
+class LocalVectorIndex(StrEnum):
+    FLAT = "flat"
+    IVF = "ivf"
+
+
+class VectorQuantization(StrEnum):
+    NONE = "none"
+    INT8 = "int8"
+    BINARY = "binary"
+    PRODUCT = "product"
 
 
 # Batches between torch.mps.empty_cache() calls: dropping the Metal
@@ -115,6 +168,7 @@ MODULE_TORCH = "torch"
 MODULE_TRANSFORMERS = "transformers"
 MODULE_QDRANT_CLIENT = "qdrant_client"
 MODULE_PYMILVUS = "pymilvus"
+MODULE_NUMPY = "numpy"
 
 SEMANTIC_DEPENDENCIES = (
     MODULE_PYMILVUS,
@@ -2,9 +2,16 @@ from __future__ import annotations
 
 import hashlib
 import json
+import mmap
 import os
+import re
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO
 
 import httpx
 from loguru import logger
@@ -25,25 +32,105 @@ def _cache_namespace() -> str:
         if settings.OPENAI_EMBEDDING_DIMENSIONS is not None:
             namespace = f"{namespace}:{settings.OPENAI_EMBEDDING_DIMENSIONS}"
         return namespace
-    return f"{cs.EmbeddingProvider.UNIXCODER}:{cs.UNIXCODER_MODEL}"
+    namespace = f"{cs.EmbeddingProvider.UNIXCODER}:{cs.UNIXCODER_MODEL}"
+    if settings.EMBEDDING_CPU_INT8:
+        namespace = f"{namespace}:{cs.UNIXCODER_INT8_VARIANT}"
+    return namespace
+
+
+# On-disk layout: a header (magic, version, dtype code), then append-only
+# records of a 40-byte head (sha256 key, dimension, reserved) and the vector
+# as little-endian float32/float16, or as a float32 scale followed by int8
+# codes (value = code * scale), padded to 8 bytes. A re-put key appends a
+# new record and the older one goes stale until compaction drops it.
+_CACHE_HEADER = struct.Struct("<8sII")
+_CACHE_RECORD = struct.Struct("<32sII")
+_CACHE_ALIGN = 8
+_DTYPE_CODES = {
+    cs.EmbeddingCacheDtype.FLOAT32: 0,
+    cs.EmbeddingCacheDtype.FLOAT16: 1,
+    cs.EmbeddingCacheDtype.INT8: 2,
+}
+_DTYPE_FORMATS = {0: ("f", 4), 1: ("e", 2), 2: ("b", 1)}
+_INT8_CODE = 2
+_INT8_SCALE = struct.Struct("<f")
+_INT8_MAX = 127
+# Sidecar index next to the data file: a header (magic, cache version, dtype
+# code, the data length it covers, stale rows within that length) and a
+# (key, offset) entry per live row. Loading it replaces the record scan up
+# to the covered length; only rows appended after it are scanned.
+_INDEX_HEADER = struct.Struct("<8sIIQQ")
+_INDEX_ENTRY = struct.Struct("<32sQ")
+
+
+def _padded(size: int) -> int:
+    return -(-size // _CACHE_ALIGN) * _CACHE_ALIGN
+
+
+def _payload_size(dtype_code: int, dim: int) -> int:
+    _fmt, item_size = _DTYPE_FORMATS[dtype_code]
+    scale = _INT8_SCALE.size if dtype_code == _INT8_CODE else 0
+    return _padded(scale + dim * item_size)
 
 
 class EmbeddingCache:
-    __slots__ = ("_cache", "_path")
+    """Content-hash keyed embeddings in a memory-mapped append-only file.
+
+    `load` maps the file and restores the key -> offset index from its
+    sidecar, scanning only records appended after the sidecar was written;
+    `get` decodes one row on demand. `save` appends only the rows put since
+    the last save, and compacts once stale rows outnumber live ones.
+    """
+
+    __slots__ = (
+        "_path",
+        "_index",
+        "_pending",
+        "_handle",
+        "_view",
+        "_dtype_code",
+        "_end",
+        "_stale",
+        "_rewrite",
+        "_legacy",
+    )
 
     def __init__(self, path: Path | None = None) -> None:
-        self._cache: dict[str, list[float]] = {}
         self._path = path
+        self._index: dict[bytes, int] = {}
+        self._pending: dict[bytes, list[float]] = {}
+        self._handle: BinaryIO | None = None
+        self._view: mmap.mmap | None = None
+        self._dtype_code = _DTYPE_CODES[settings.EMBEDDING_CACHE_DTYPE]
+        self._end = _CACHE_HEADER.size
+        self._stale = 0
+        self._rewrite = True
+        self._legacy: Path | None = None
 
     @staticmethod
-    def _content_hash(content: str) -> str:
-        return hashlib.sha256(f"{_cache_namespace()}\x00{content}".encode()).hexdigest()
+    def _content_hash(content: str) -> bytes:
+        return hashlib.sha256(f"{_cache_namespace()}\x00{content}".encode()).digest()
+
+    def _read_row(self, offset: int) -> list[float]:
+        assert self._view is not None
+        _key, dim, _reserved = _CACHE_RECORD.unpack_from(self._view, offset)
+        fmt, _size = _DTYPE_FORMATS[self._dtype_code]
+        start = offset + _CACHE_RECORD.size
+        if self._dtype_code == _INT8_CODE:
+            (scale,) = _INT8_SCALE.unpack_from(self._view, start)
+            codes = struct.unpack_from(f"<{dim}b", self._view, start + _INT8_SCALE.size)
+            return [code * scale for code in codes]
+        return list(struct.unpack_from(f"<{dim}{fmt}", self._view, start))
 
     def get(self, content: str) -> list[float] | None:
-        return self._cache.get(self._content_hash(content))
+        key = self._content_hash(content)
+        if (pending := self._pending.get(key)) is not None:
+            return pending
+        offset = self._index.get(key)
+        return None if offset is None else self._read_row(offset)
 
     def put(self, content: str, embedding: list[float]) -> None:
-        self._cache[self._content_hash(content)] = embedding
+        self._pending[self._content_hash(content)] = embedding
 
     def get_many(self, snippets: list[str]) -> dict[int, list[float]]:
         results: dict[int, list[float]] = {}
@@ -56,34 +143,243 @@ class EmbeddingCache:
         for snippet, embedding in zip(snippets, embeddings):
             self.put(snippet, embedding)
 
+    def _encode(self, key: bytes, embedding: list[float]) -> bytes:
+        fmt, _size = _DTYPE_FORMATS[self._dtype_code]
+        if self._dtype_code == _INT8_CODE:
+            scale = max(map(abs, embedding), default=0.0) / _INT8_MAX or 1.0
+            payload = _INT8_SCALE.pack(scale) + struct.pack(
+                f"<{len(embedding)}b",
+                *(
+                    max(-_INT8_MAX, min(_INT8_MAX, round(value / scale)))
+                    for value in embedding
+                ),
+            )
+        else:
+            payload = struct.pack(f"<{len(embedding)}{fmt}", *embedding)
+        padding = b"\x00" * (
+            _payload_size(self._dtype_code, len(embedding)) - len(payload)
+        )
+        return _CACHE_RECORD.pack(key, len(embedding), 0) + payload + padding
+
+    def _unmap(self) -> None:
+        if self._view is not None:
+            self._view.close()
+            self._view = None
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _map(self) -> None:
+        assert self._path is not None
+        self._unmap()
+        self._handle = self._path.open("rb")
+        if self._end > _CACHE_HEADER.size:
+            self._view = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+
     def save(self) -> None:
-        if self._path is None:
+        if self._path is None or not (self._pending or self._rewrite):
             return
         try:
             self._path.parent.mkdir(parents=True, exist_ok=True)
-            with self._path.open("w", encoding="utf-8") as f:
-                json.dump(self._cache, f)
+            # Windows cannot resize a mapped file; unmap for the append.
+            self._unmap()
+            if self._rewrite or not self._path.exists():
+                # The sidecar goes first: offsets into the old file must
+                # never be read against the new one.
+                self._index_path().unlink(missing_ok=True)
+                self._write_fresh(self._path, [])
+            with self._path.open("r+b") as f:
+                # Drops a torn record left by an interrupted earlier save.
+                f.truncate(self._end)
+                f.seek(self._end)
+                for key, embedding in self._pending.items():
+                    if key in self._index:
+                        self._stale += 1
+                    self._index[key] = self._end
+                    record = self._encode(key, embedding)
+                    f.write(record)
+                    self._end += len(record)
+            self._pending.clear()
+            self._map()
+            if self._legacy is not None:
+                self._legacy.unlink(missing_ok=True)
+                self._legacy = None
+            if self._stale > len(self._index):
+                self.compact()
+            else:
+                self._write_index()
         except Exception as e:
             logger.warning(ls.EMBEDDING_CACHE_SAVE_FAILED, path=self._path, error=e)
 
+    def _index_path(self) -> Path:
+        assert self._path is not None
+        return self._path.with_name(self._path.name + cs.EMBEDDING_CACHE_INDEX_SUFFIX)
+
+    def _write_index(self) -> None:
+        path = self._index_path()
+        scratch = path.with_name(f"{path.name}.tmp")
+        with scratch.open("wb") as f:
+            f.write(
+                _INDEX_HEADER.pack(
+                    cs.EMBEDDING_CACHE_INDEX_MAGIC,
+                    cs.EMBEDDING_CACHE_VERSION,
+                    self._dtype_code,
+                    self._end,
+                    self._stale,
+                )
+            )
+            f.write(b"".join(_INDEX_ENTRY.pack(*item) for item in self._index.items()))
+        os.replace(scratch, path)
+
+    def _index_matches(self, index: dict[bytes, int], covered: int) -> bool:
+        # The record at the highest offset is always live (a later put of
+        # its key would sit after it), so it must carry its key and end
+        # exactly where the sidecar's coverage does. One record is read.
+        if not index:
+            return covered == _CACHE_HEADER.size
+        last = max(index.values())
+        if self._view is None or last + _CACHE_RECORD.size > covered:
+            return False
+        key, dim, _reserved = _CACHE_RECORD.unpack_from(self._view, last)
+        end = last + _CACHE_RECORD.size + _payload_size(self._dtype_code, dim)
+        return index.get(key) == last and end == covered
+
+    def _read_index(self) -> int:
+        """Restore `_index` from the sidecar; returns where the scan resumes."""
+        try:
+            raw = self._index_path().read_bytes()
+        except OSError:
+            return _CACHE_HEADER.size
+        if len(raw) >= _INDEX_HEADER.size:
+            magic, version, dtype_code, covered, stale = _INDEX_HEADER.unpack_from(raw)
+            entries = memoryview(raw)[_INDEX_HEADER.size :]
+            if (
+                magic == cs.EMBEDDING_CACHE_INDEX_MAGIC
+                and version == cs.EMBEDDING_CACHE_VERSION
+                and dtype_code == self._dtype_code
+                and _CACHE_HEADER.size <= covered <= self._end
+                and len(entries) % _INDEX_ENTRY.size == 0
+            ):
+                index = dict(_INDEX_ENTRY.iter_unpack(entries))
+                if self._index_matches(index, covered):
+                    self._index = index
+                    self._stale = stale
+                    return covered
+        logger.debug(ls.EMBEDDING_CACHE_INDEX_REJECTED, path=self._index_path())
+        return _CACHE_HEADER.size
+
+    def _write_fresh(self, path: Path, rows: list[tuple[bytes, list[float]]]) -> None:
+        self._dtype_code = _DTYPE_CODES[settings.EMBEDDING_CACHE_DTYPE]
+        self._index = {}
+        self._stale = 0
+        self._rewrite = False
+        self._end = _CACHE_HEADER.size
+        with path.open("wb") as f:
+            f.write(
+                _CACHE_HEADER.pack(
+                    cs.EMBEDDING_CACHE_MAGIC,
+                    cs.EMBEDDING_CACHE_VERSION,
+                    self._dtype_code,
+                )
+            )
+            for key, embedding in rows:
+                self._index[key] = self._end
+                record = self._encode(key, embedding)
+                f.write(record)
+                self._end += len(record)
+
+    def compact(self) -> None:
+        """Rewrite the file with live rows only, in the configured dtype."""
+        if self._path is None:
+            return
+        rows = [(key, self._read_row(offset)) for key, offset in self._index.items()]
+        dropped = self._stale
+        self._unmap()
+        scratch = self._path.with_name(f"{self._path.name}.tmp")
+        self._write_fresh(scratch, rows)
+        self._index_path().unlink(missing_ok=True)
+        os.replace(scratch, self._path)
+        self._map()
+        self._write_index()
+        logger.debug(ls.EMBEDDING_CACHE_COMPACTED, path=self._path, dropped=dropped)
+
     def load(self) -> None:
-        if self._path is None or not self._path.exists():
+        if self._path is None:
+            return
+        if not self._path.exists():
+            self._load_legacy()
             return
         try:
-            with self._path.open("r", encoding="utf-8") as f:
-                self._cache = json.load(f)
+            self._scan()
             logger.debug(
-                ls.EMBEDDING_CACHE_LOADED, count=len(self._cache), path=self._path
+                ls.EMBEDDING_CACHE_LOADED, count=len(self._index), path=self._path
             )
         except Exception as e:
             logger.warning(ls.EMBEDDING_CACHE_LOAD_FAILED, path=self._path, error=e)
-            self._cache = {}
+            self._unmap()
+            self._index = {}
+            self._rewrite = True
+
+    def _scan(self) -> None:
+        assert self._path is not None
+        self._unmap()
+        self._index = {}
+        self._stale = 0
+        with self._path.open("rb") as f:
+            head = f.read(_CACHE_HEADER.size)
+        if len(head) < _CACHE_HEADER.size:
+            raise ValueError(ex.EMBEDDING_CACHE_BAD_HEADER)
+        magic, version, dtype_code = _CACHE_HEADER.unpack(head)
+        if magic != cs.EMBEDDING_CACHE_MAGIC or dtype_code not in _DTYPE_FORMATS:
+            raise ValueError(ex.EMBEDDING_CACHE_BAD_HEADER)
+        if version != cs.EMBEDDING_CACHE_VERSION:
+            raise ValueError(ex.EMBEDDING_CACHE_BAD_VERSION.format(version=version))
+        self._dtype_code = dtype_code
+        self._end = self._path.stat().st_size
+        self._map()
+        pos = self._read_index()
+        view = self._view
+        while view is not None and pos + _CACHE_RECORD.size <= self._end:
+            key, dim, _reserved = _CACHE_RECORD.unpack_from(view, pos)
+            end = pos + _CACHE_RECORD.size + _payload_size(dtype_code, dim)
+            if end > self._end:
+                break
+            if key in self._index:
+                self._stale += 1
+            self._index[key] = pos
+            pos = end
+        self._end = pos
+        self._rewrite = False
+
+    def _load_legacy(self) -> None:
+        # One-time import of the JSON cache this format replaced; the JSON
+        # file is removed once its rows are saved in the binary file.
+        assert self._path is not None
+        legacy = self._path.with_name(cs.LEGACY_EMBEDDING_CACHE_FILENAME)
+        if not legacy.is_file():
+            return
+        try:
+            with legacy.open("r", encoding="utf-8") as f:
+                rows: dict[str, list[float]] = json.load(f)
+            self._pending.update((bytes.fromhex(k), v) for k, v in rows.items())
+            self._legacy = legacy
+            logger.info(ls.EMBEDDING_CACHE_MIGRATED, count=len(rows), path=legacy)
+        except Exception as e:
+            logger.warning(ls.EMBEDDING_CACHE_LOAD_FAILED, path=legacy, error=e)
 
     def clear(self) -> None:
-        self._cache.clear()
+        self._unmap()
+        self._index = {}
+        self._pending.clear()
+        self._stale = 0
+        self._end = _CACHE_HEADER.size
+        self._rewrite = True
+
+    def close(self) -> None:
+        self._unmap()
 
     def __len__(self) -> int:
-        return len(self._cache)
+        return len(self._index) + sum(1 for k in self._pending if k not in self._index)
 
 
 _embedding_cache: EmbeddingCache | None = None
@@ -119,27 +415,186 @@ def _openai_client() -> httpx.Client:
     )
 
 
+_RESET_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _parse_reset_duration(value: str) -> float | None:
+    # OpenAI reports reset windows as Go durations ("1s", "6m0s", "20ms").
+    parts = _RESET_DURATION.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _rate_limit_delay(response: httpx.Response) -> float | None:
+    """Seconds the endpoint asked us to wait, if its headers say so."""
+    headers = response.headers
+    try:
+        if (millis := headers.get(cs.OPENAI_HEADER_RETRY_AFTER_MS)) is not None:
+            return float(millis) / 1000
+        if (seconds := headers.get(cs.OPENAI_HEADER_RETRY_AFTER)) is not None:
+            return float(seconds)
+    except ValueError:
+        pass
+    resets = [
+        _parse_reset_duration(headers.get(reset, ""))
+        for remaining, reset in cs.OPENAI_HEADER_RATE_LIMIT_WINDOWS
+        if headers.get(remaining) == "0"
+    ]
+    return max((delay for delay in resets if delay is not None), default=None)
+
+
+class _OpenAIRateLimiter:
+    """Concurrency window shared by the request threads of one embedding call.
+
+    The window halves on every 429 and grows back by one per successful
+    request, up to `max_concurrency`. A pause (from a 429 or from headers
+    reporting an exhausted quota) holds every thread until it elapses.
+    """
+
+    __slots__ = ("_cond", "_limit", "_max", "_in_flight", "_resume_at")
+
+    def __init__(self, max_concurrency: int) -> None:
+        self._cond = threading.Condition()
+        self._limit = max_concurrency
+        self._max = max_concurrency
+        self._in_flight = 0
+        self._resume_at = 0.0
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def acquire(self) -> None:
+        with self._cond:
+            while True:
+                wait = self._resume_at - time.monotonic()
+                if wait <= 0 and self._in_flight < self._limit:
+                    break
+                self._cond.wait(wait if wait > 0 else None)
+            self._in_flight += 1
+
+    def release(self, response: httpx.Response | None) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            if response is not None:
+                if response.status_code == cs.HTTP_TOO_MANY_REQUESTS:
+                    self._limit = max(1, self._limit // 2)
+                elif response.status_code == cs.HTTP_OK:
+                    self._limit = min(self._max, self._limit + 1)
+                    if (delay := _rate_limit_delay(response)) is not None:
+                        self._pause_locked(delay)
+            self._cond.notify_all()
+
+    def pause(self, delay: float) -> None:
+        with self._cond:
+            self._pause_locked(delay)
+            self._cond.notify_all()
+
+    def _pause_locked(self, delay: float) -> None:
+        self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+
+def _pack_openai_batches(
+    snippets: list[str], token_budget: int, max_items: int
+) -> list[tuple[int, int]]:
+    """Split `snippets` into contiguous [start, end) request ranges.
+
+    A range closes when the next snippet would push its estimated tokens
+    past `token_budget` or its size to `max_items`; a snippet over the
+    budget on its own still gets a request.
+    """
+    ranges: list[tuple[int, int]] = []
+    start, tokens = 0, 0
+    for index, snippet in enumerate(snippets):
+        estimate = len(snippet) // cs.OPENAI_EMBEDDING_CHARS_PER_TOKEN + 1
+        if index > start and (
+            tokens + estimate > token_budget or index - start >= max_items
+        ):
+            ranges.append((start, index))
+            start, tokens = index, 0
+        tokens += estimate
+    if start < len(snippets):
+        ranges.append((start, len(snippets)))
+    return ranges
+
+
+def _post_openai_batch(
+    client: httpx.Client, limiter: _OpenAIRateLimiter, batch: list[str]
+) -> list[list[float]]:
+    payload: dict[str, object] = {
+        "model": settings.OPENAI_EMBEDDING_MODEL,
+        "input": batch,
+    }
+    if settings.OPENAI_EMBEDDING_DIMENSIONS is not None:
+        payload["dimensions"] = settings.OPENAI_EMBEDDING_DIMENSIONS
+    max_attempts = settings.OPENAI_EMBEDDING_MAX_RETRIES + 1
+    for attempt in range(1, max_attempts + 1):
+        limiter.acquire()
+        response: httpx.Response | None = None
+        try:
+            response = client.post(cs.OPENAI_EMBEDDINGS_PATH, json=payload)
+        finally:
+            limiter.release(response)
+        if response.status_code == cs.HTTP_OK:
+            return _parse_embedding_rows(response, len(batch))
+        if response.status_code != cs.HTTP_TOO_MANY_REQUESTS or attempt == max_attempts:
+            break
+        delay = _rate_limit_delay(response)
+        if delay is None:
+            delay = min(
+                cs.OPENAI_EMBEDDING_BACKOFF_BASE * 2 ** (attempt - 1),
+                cs.OPENAI_EMBEDDING_BACKOFF_MAX,
+            )
+        logger.warning(
+            ls.OPENAI_EMBEDDING_RATE_LIMITED.format(
+                count=len(batch),
+                attempt=attempt,
+                max_attempts=max_attempts,
+                delay=delay,
+                concurrency=limiter.limit,
+            )
+        )
+        limiter.pause(delay)
+    raise RuntimeError(
+        ex.OPENAI_EMBEDDING_HTTP_ERROR.format(
+            status=response.status_code, body=response.text[:500]
+        )
+    )
+
+
 def _openai_embed_batch(snippets: list[str]) -> list[list[float]]:
-    embeddings: list[list[float]] = []
-    batch_size = settings.OPENAI_EMBEDDING_BATCH_SIZE
+    ranges = _pack_openai_batches(
+        snippets,
+        settings.OPENAI_EMBEDDING_TOKEN_BUDGET,
+        settings.OPENAI_EMBEDDING_BATCH_SIZE,
+    )
+    limiter = _OpenAIRateLimiter(settings.OPENAI_EMBEDDING_CONCURRENCY)
+    workers = min(settings.OPENAI_EMBEDDING_CONCURRENCY, len(ranges))
     with _openai_client() as client:
-        for start in range(0, len(snippets), batch_size):
-            batch = snippets[start : start + batch_size]
-            payload: dict[str, object] = {
-                "model": settings.OPENAI_EMBEDDING_MODEL,
-                "input": batch,
-            }
-            if settings.OPENAI_EMBEDDING_DIMENSIONS is not None:
-                payload["dimensions"] = settings.OPENAI_EMBEDDING_DIMENSIONS
-            response = client.post(cs.OPENAI_EMBEDDINGS_PATH, json=payload)
-            if response.status_code != cs.HTTP_OK:
-                raise RuntimeError(
-                    ex.OPENAI_EMBEDDING_HTTP_ERROR.format(
-                        status=response.status_code, body=response.text[:500]
+        if workers <= 1:
+            results = [
+                _post_openai_batch(client, limiter, snippets[start:end])
+                for start, end in ranges
+            ]
+        else:
+            # httpx.Client is thread-safe and pools connections, so the
+            # request threads share it; the limiter bounds how many run.
+            executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="cgr-openai-embed"
+            )
+            try:
+                futures = [
+                    executor.submit(
+                        _post_openai_batch, client, limiter, snippets[start:end]
                     )
-                )
-            embeddings.extend(_parse_embedding_rows(response, len(batch)))
-    return embeddings
+                    for start, end in ranges
+                ]
+                results = [future.result() for future in futures]
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+    return [row for rows in results for row in rows]
 
 
 def _parse_embedding_rows(response: httpx.Response, expected: int) -> list[list[float]]:
@@ -178,6 +633,35 @@ def _parse_embedding_rows(response: httpx.Response, expected: int) -> list[list[
     return [row for row in placed if row is not None]
 
 
+def _plan_token_batches(
+    lengths: list[int], token_budget: int, max_rows: int
+) -> list[list[int]]:
+    """Group snippet indices into batches that each pad to their own longest row.
+
+    Indices are taken longest first so neighbours have similar lengths; a
+    batch closes when another row would push rows x longest past
+    `token_budget` or reach `max_rows`. A row longer than the budget still
+    gets a batch of its own. Starting with the longest batch surfaces an
+    out-of-memory device on the first forward pass rather than the last.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+    batches: list[list[int]] = []
+    current: list[int] = []
+    longest = 0
+    for index in order:
+        longest = longest or lengths[index]
+        if current and (
+            len(current) >= max_rows or (len(current) + 1) * longest > token_budget
+        ):
+            batches.append(current)
+            current = []
+            longest = lengths[index]
+        current.append(index)
+    if current:
+        batches.append(current)
+    return batches
+
+
 if has_torch() and has_transformers():
     import numpy as np
     import torch
@@ -195,6 +679,14 @@ if has_torch() and has_transformers():
                 return True
 
     def _select_device() -> cs.EmbeddingDevice:
+        if settings.EMBEDDING_CPU_INT8:
+            # Dynamically quantized linear layers only have CPU kernels.
+            if (override := settings.EMBEDDING_DEVICE) not in (
+                None,
+                cs.EmbeddingDevice.CPU,
+            ):
+                logger.warning(ls.EMBEDDING_INT8_FORCES_CPU.format(device=override))
+            return cs.EmbeddingDevice.CPU
         if (override := settings.EMBEDDING_DEVICE) is not None:
             if _device_available(override):
                 return override
@@ -222,11 +714,84 @@ if has_torch() and has_transformers():
             torch.mps.empty_cache()
             _batches_since_cache_drop = 0
 
+    def _build_unixcoder(*, pretrained: bool = True) -> UniXcoder:
+        if not settings.EMBEDDING_FUSED_ATTENTION:
+            return UniXcoder(cs.UNIXCODER_MODEL, pretrained=pretrained)
+        try:
+            return UniXcoder(
+                cs.UNIXCODER_MODEL,
+                pretrained=pretrained,
+                attn_implementation=cs.UNIXCODER_FUSED_ATTENTION,
+            )
+        except (ImportError, ValueError) as e:
+            logger.warning(ls.EMBEDDING_FUSED_ATTENTION_UNAVAILABLE.format(error=e))
+            return UniXcoder(cs.UNIXCODER_MODEL, pretrained=pretrained)
+
+    def _quantize_int8(model: UniXcoder) -> UniXcoder:
+        model.eval()
+        # Only the encoder runs at embedding time; quantizing lm_head would
+        # add an unused int8 copy of the tied word embeddings.
+        model.model = torch.ao.quantization.quantize_dynamic(
+            model.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        return model
+
+    def _int8_cache_path() -> Path:
+        return Path(settings.QDRANT_DB_PATH) / cs.UNIXCODER_INT8_CACHE_FILENAME
+
+    def _load_int8_model() -> UniXcoder:
+        # A warm start quantizes an untrained skeleton and loads the cached
+        # int8 weights, skipping the float checkpoint load and quantization.
+        path = _int8_cache_path()
+        if path.is_file():
+            try:
+                cached = torch.load(path, map_location="cpu", weights_only=True)
+                if (
+                    cached.get("model") == cs.UNIXCODER_MODEL
+                    and cached.get("torch") == torch.__version__
+                ):
+                    model = _quantize_int8(_build_unixcoder(pretrained=False))
+                    model.load_state_dict(cached["state"])
+                    logger.info(ls.EMBEDDING_INT8_MODEL_LOADED.format(path=path))
+                    return model
+                logger.info(ls.EMBEDDING_INT8_MODEL_STALE.format(path=path))
+            except Exception as e:
+                logger.warning(
+                    ls.EMBEDDING_INT8_MODEL_CACHE_FAILED.format(path=path, error=e)
+                )
+
+        model = _quantize_int8(_build_unixcoder())
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.tmp")
+            torch.save(
+                {
+                    "model": cs.UNIXCODER_MODEL,
+                    "torch": torch.__version__,
+                    "state": model.state_dict(),
+                },
+                tmp_path,
+            )
+            os.replace(tmp_path, path)
+            logger.info(ls.EMBEDDING_INT8_MODEL_SAVED.format(path=path))
+        except Exception as e:
+            logger.warning(
+                ls.EMBEDDING_INT8_MODEL_CACHE_FAILED.format(path=path, error=e)
+            )
+        return model
+
     @lru_cache(maxsize=1)
     def get_model() -> UniXcoder:
-        model = UniXcoder(cs.UNIXCODER_MODEL)
-        model.eval()
         device = _select_device()
+        if device == cs.EmbeddingDevice.CPU and (
+            threads := settings.EMBEDDING_CPU_THREADS
+        ):
+            torch.set_num_threads(threads)
+            logger.info(ls.EMBEDDING_CPU_THREADS_SET.format(threads=threads))
+        if settings.EMBEDDING_CPU_INT8:
+            return _load_int8_model()
+        model = _build_unixcoder()
+        model.eval()
         if device != cs.EmbeddingDevice.CPU:
             model = model.to(device)
         return model
@@ -252,18 +817,41 @@ if has_torch() and has_transformers():
             max_length = settings.EMBEDDING_MAX_LENGTH
         model = get_model()
         device = next(model.parameters()).device
+        pad_id = model.config.pad_token_id
+
+        started = time.perf_counter()
+        token_rows = model.tokenize(snippets, max_length=max_length)
+        lengths = [len(row) for row in token_rows]
+        batches = _plan_token_batches(
+            lengths, settings.EMBEDDING_TOKEN_BUDGET, batch_size
+        )
 
-        all_new_embeddings: list[list[float]] = []
-        for start in range(0, len(snippets), batch_size):
-            batch = snippets[start : start + batch_size]
-            tokens_list = model.tokenize(batch, max_length=max_length, padding=True)
+        all_new_embeddings: list[list[float]] = [[] for _ in snippets]
+        padded_tokens = 0
+        for batch in batches:
+            width = lengths[batch[0]]
+            tokens_list = [
+                token_rows[i] + [pad_id] * (width - lengths[i]) for i in batch
+            ]
+            padded_tokens += width * len(batch)
             tokens_tensor = torch.tensor(tokens_list).to(device)
             with torch.no_grad():
                 _, sentence_embeddings = model(tokens_tensor)
                 batch_np: NDArray[np.float32] = sentence_embeddings.cpu().numpy()
             _sync_after_batch(device)
-            for row in batch_np:
-                all_new_embeddings.append(row.tolist())
+            for index, row in zip(batch, batch_np.tolist()):
+                all_new_embeddings[index] = row
+
+        real_tokens = sum(lengths)
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        logger.debug(
+            ls.EMBEDDING_BATCH_THROUGHPUT,
+            count=len(snippets),
+            batches=len(batches),
+            tokens=real_tokens,
+            rate=real_tokens / elapsed,
+            padding=1 - real_tokens / padded_tokens if padded_tokens else 0.0,
+        )
         return all_new_embeddings
 
 else:
@@ -0,0 +1,185 @@
+# Pass 4 as three overlapped stages: a thread extracts source for the next
+# batches while the calling thread runs the model, and a writer thread
+# upserts finished vectors. Bounded queues between the stages apply
+# backpressure, so a slow vector store stalls inference instead of growing
+# memory, and a slow model stalls extraction the same way.
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+from loguru import logger
+
+from . import constants as cs
+from . import logs as ls
+
+type SourceItem = tuple[int, str, str]
+type EmbeddingPoint = tuple[int, list[float], str]
+
+_POLL_SECONDS = 0.1
+_DONE = object()
+
+
+@dataclass(slots=True)
+class StageStats:
+    stage: cs.EmbeddingStage
+    items: int = 0
+    busy_seconds: float = 0.0
+    # Time spent blocked on the neighbouring queues: waiting for input when
+    # the stage upstream is slower, or for room when the one downstream is.
+    wait_seconds: float = 0.0
+
+    def log(self) -> None:
+        logger.info(
+            ls.EMBEDDING_STAGE_STATS,
+            stage=self.stage,
+            items=self.items,
+            busy=self.busy_seconds,
+            rate=self.items / self.busy_seconds if self.busy_seconds else 0.0,
+            waited=self.wait_seconds,
+        )
+
+
+@dataclass(slots=True)
+class PipelineResult:
+    stored: int = 0
+    expected_ids: set[int] = field(default_factory=set)
+    stages: list[StageStats] = field(default_factory=list)
+
+
+def run_embedding_pipeline[R](
+    rows: Iterable[R],
+    extract: Callable[[R], SourceItem | None],
+    embed: Callable[[list[str]], list[list[float]]],
+    store: Callable[[list[EmbeddingPoint]], int],
+    *,
+    batch_size: int,
+    depth: int,
+    on_stored: Callable[[int], None] | None = None,
+) -> PipelineResult:
+    """Extract, embed and store `rows`, each stage on its own thread.
+
+    `embed` runs on the calling thread (the model is not shared across
+    threads); a batch it fails on is logged and dropped, as before the
+    pipeline. Any other stage error stops all three stages and is re-raised
+    here. Every node id handed to `store` lands in `expected_ids`, stored or
+    not, so reconciliation still sees what a failed upsert lost; ids of a
+    batch `embed` failed on never reach it and are not recorded.
+    """
+    extracted: queue.Queue[object] = queue.Queue(maxsize=depth)
+    embedded: queue.Queue[object] = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    errors: list[BaseException] = []
+    result = PipelineResult(
+        stages=[StageStats(stage) for stage in cs.EmbeddingStage],
+    )
+    extract_stats, embed_stats, store_stats = result.stages
+
+    def put(target: queue.Queue[object], item: object, stats: StageStats) -> bool:
+        started = time.perf_counter()
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=_POLL_SECONDS)
+            except queue.Full:
+                continue
+            stats.wait_seconds += time.perf_counter() - started
+            return True
+        return False
+
+    def take(source: queue.Queue[object], stats: StageStats) -> object:
+        started = time.perf_counter()
+        while not stop.is_set():
+            try:
+                item = source.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            stats.wait_seconds += time.perf_counter() - started
+            return item
+        return _DONE
+
+    def produce() -> None:
+        try:
+            batch: list[SourceItem] = []
+            for row in rows:
+                if stop.is_set():
+                    return
+                started = time.perf_counter()
+                item = extract(row)
+                extract_stats.busy_seconds += time.perf_counter() - started
+                if item is None:
+                    continue
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    extract_stats.items += len(batch)
+                    if not put(extracted, batch, extract_stats):
+                        return
+                    batch = []
+            if batch:
+                extract_stats.items += len(batch)
+                put(extracted, batch, extract_stats)
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            put(extracted, _DONE, extract_stats)
+
+    def consume() -> None:
+        try:
+            while (item := take(embedded, store_stats)) is not _DONE:
+                assert isinstance(item, list)
+                result.expected_ids.update(point[0] for point in item)
+                started = time.perf_counter()
+                result.stored += store(item)
+                store_stats.busy_seconds += time.perf_counter() - started
+                store_stats.items += len(item)
+                if on_stored is not None:
+                    on_stored(result.stored)
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+
+    producer = threading.Thread(
+        target=produce, name=cs.EMBEDDING_EXTRACT_THREAD, daemon=True
+    )
+    writer = threading.Thread(
+        target=consume, name=cs.EMBEDDING_STORE_THREAD, daemon=True
+    )
+    producer.start()
+    writer.start()
+    try:
+        while (item := take(extracted, embed_stats)) is not _DONE:
+            assert isinstance(item, list)
+            started = time.perf_counter()
+            try:
+                vectors = embed([source for _id, _qn, source in item])
+            except Exception as e:
+                logger.warning(
+                    ls.EMBEDDING_BATCH_COMPUTE_FAILED, count=len(item), error=e
+                )
+                continue
+            finally:
+                embed_stats.busy_seconds += time.perf_counter() - started
+            embed_stats.items += len(item)
+            points = [
+                (node_id, vector, qualified_name)
+                for (node_id, qualified_name, _source), vector in zip(item, vectors)
+            ]
+            if not put(embedded, points, embed_stats):
+                break
+        put(embedded, _DONE, embed_stats)
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        producer.join()
+        writer.join()
+
+    if errors:
+        raise errors[0]
+    for stats in result.stages:
+        stats.log()
+    return result
@@ -67,10 +67,33 @@ CONFIG = "{role} configuration error: {error}"
 # Graph loading errors
 GRAPH_FILE_NOT_FOUND = "Graph file not found: {path}"
 FAILED_TO_LOAD_DATA = "Failed to load data from file"
+COLUMNAR_GRAPH_BAD_MAGIC = "Not a columnar graph file: {path}"
+COLUMNAR_GRAPH_BAD_VERSION = "Unsupported columnar graph version: {version}"
+EMBEDDING_CACHE_BAD_HEADER = "Not an embedding cache file"
+LOCAL_VECTOR_DIM_MISMATCH = (
+    "Local vector store {path} holds {dim}-dimensional vectors, expected {expected}"
+)
+LOCAL_VECTOR_BAD_ROW = "Vector has {dim} dimensions, expected {expected}"
+VECTOR_QUANTIZATION_UNSUPPORTED = "No local codes for '{mode}' vector quantization"
+EMBEDDING_CACHE_BAD_VERSION = "Unsupported embedding cache version: {version}"
 NODES_NOT_LOADED = "Nodes should be loaded"
 RELATIONSHIPS_NOT_LOADED = "Relationships should be loaded"
 DATA_NOT_LOADED = "Data should be loaded"
 
+# Offline query engine errors
+OFFLINE_GRAPH_NOT_FOUND = "Offline graph not found: {path}"
+OFFLINE_QUERY_READ_ONLY = (
+    "The offline graph is read-only; this operation needs Memgraph: {operation}"
+)
+OFFLINE_QUERY_SYNTAX = "Offline query: expected {expected} at position {pos}"
+OFFLINE_QUERY_UNSUPPORTED = (
+    "Offline query: '{feature}' is outside the supported Cypher subset "
+    "(MATCH / OPTIONAL MATCH / WHERE / RETURN / ORDER BY / SKIP / LIMIT)"
+)
+OFFLINE_QUERY_UNKNOWN_FUNCTION = "Offline query: unsupported function {name}()"
+OFFLINE_QUERY_MISSING_PARAM = "Offline query: missing parameter ${name}"
+OFFLINE_QUERY_UNBOUND = "Offline query: variable {name} is not defined"
+
 # Parser errors
 NO_LANGUAGES = "No Tree-sitter languages available."
 
@@ -101,6 +124,16 @@ AUTH_INCOMPLETE = (
 # Access control errors (used with raise)
 ACCESS_DENIED = "Access denied: Cannot access files outside the project root."
 
+# Semantic frontend worker errors
+FRONTEND_WORKER_EXITED = "Frontend worker exited unexpectedly"
+FRONTEND_WORKER_TIMEOUT = "Frontend worker did not answer within {seconds}s"
+FRONTEND_WORKER_PROTOCOL = (
+    "Frontend worker protocol mismatch: expected version {expected}, got {got}"
+)
+FRONTEND_WORKER_BAD_MESSAGE = "Malformed frontend worker message: {message}"
+FRONTEND_WORKER_BAD_FACTS = "Malformed facts in frontend worker response: {error}"
+FRONTEND_WORKER_UNKNOWN_METHOD = "Unknown frontend worker method: {method}"
+
 
 # Exception classes
 class LLMGenerationError(Exception):
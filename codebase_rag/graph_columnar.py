@@ -0,0 +1,507 @@
+"""Memory-mapped columnar graph format with CSR adjacency.
+
+`GraphLoader` parses an entire JSON export into Python objects plus several
+dict indexes before answering anything. This format stores the same graph as
+fixed-width columns: node ids, interned labels, interned property values and
+relationship endpoints, with outgoing and incoming adjacency in CSR form
+(per-node offsets into an edge array) and the label and property indexes
+precomputed. Opening a file maps it and reads only a small JSON directory;
+lookups then touch just the pages they need, and `GraphNode` /
+`GraphRelationship` objects are built for results only.
+
+Layout: the magic bytes, a little-endian u64 directory length, the JSON
+directory, then 8-byte-aligned sections. Every section is a plain
+little-endian array (`q` = int64, `i` = int32, `B` = bytes) whose offset and
+count the directory records, so `numpy.frombuffer` or `numpy.memmap` can map
+any column without copying; the loader itself needs only the standard
+library.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any, cast
+
+from loguru import logger
+
+from . import constants as cs
+from . import exceptions as ex
+from . import logs as ls
+from .models import GraphNode, GraphRelationship
+from .types_defs import (
+    GraphData,
+    GraphMetadata,
+    GraphSummary,
+    NodeData,
+    PropertyDict,
+    PropertyValue,
+    RelationshipData,
+)
+
+_HEADER = struct.Struct("<8sQ")
+_ALIGN = 8
+
+_NODE_IDS = "node_ids"
+_NODE_LABEL_OFFSETS = "node_label_offsets"
+_NODE_LABELS = "node_labels"
+_LABEL_OFFSETS = "label_offsets"
+_LABEL_ROWS = "label_rows"
+_NODE_PROP_OFFSETS = "node_prop_offsets"
+_NODE_PROP_KEYS = "node_prop_keys"
+_NODE_PROP_VALUES = "node_prop_values"
+_VALUE_OFFSETS = "value_offsets"
+_VALUE_HEAP = "value_heap"
+_PROP_INDEX_KEYS = "prop_index_keys"
+_PROP_INDEX_VALUES = "prop_index_values"
+_PROP_INDEX_ROWS = "prop_index_rows"
+_REL_FROM = "rel_from"
+_REL_TO = "rel_to"
+_REL_TYPES = "rel_types"
+_REL_PROP_OFFSETS = "rel_prop_offsets"
+_REL_PROP_HEAP = "rel_prop_heap"
+_OUT_OFFSETS = "out_offsets"
+_OUT_RELS = "out_rels"
+_IN_OFFSETS = "in_offsets"
+_IN_RELS = "in_rels"
+
+
+def _encode_value(value: PropertyValue | PropertyDict) -> bytes:
+    # One canonical text per value: interning and the property index both
+    # compare these bytes, so the encoding must be deterministic.
+    return json.dumps(
+        value, separators=(",", ":"), ensure_ascii=False, sort_keys=True
+    ).encode(cs.ENCODING_UTF8)
+
+
+def is_columnar_graph(path: Path) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(cs.COLUMNAR_GRAPH_MAGIC)) == cs.COLUMNAR_GRAPH_MAGIC
+    except OSError:
+        return False
+
+
+def _csr(buckets: Sequence[Sequence[int]]) -> tuple[array, array]:
+    offsets = array("q", [0])
+    items = array("q")
+    for bucket in buckets:
+        items.extend(bucket)
+        offsets.append(len(items))
+    return offsets, items
+
+
+def _heap(blobs: Iterable[bytes]) -> tuple[array, bytes]:
+    offsets = array("q", [0])
+    parts: list[bytes] = []
+    total = 0
+    for blob in blobs:
+        parts.append(blob)
+        total += len(blob)
+        offsets.append(total)
+    return offsets, b"".join(parts)
+
+
+def write_columnar_graph(data: GraphData, out_path: Path) -> None:
+    """Write an exported graph (the `cgr export` JSON shape) as columns."""
+    # An export is always in the NodeData / RelationshipData shape; GraphData
+    # also admits raw query rows, which this writer never receives.
+    nodes = sorted(
+        cast(list[NodeData], data[cs.KEY_NODES]), key=lambda n: n[cs.KEY_NODE_ID]
+    )
+    rels = cast(list[RelationshipData], data[cs.KEY_RELATIONSHIPS])
+    node_ids = array("q", (n[cs.KEY_NODE_ID] for n in nodes))
+    row_of = {node_id: row for row, node_id in enumerate(node_ids)}
+
+    labels = sorted({label for n in nodes for label in n[cs.KEY_LABELS]})
+    label_id = {label: i for i, label in enumerate(labels)}
+    label_rows: list[list[int]] = [[] for _ in labels]
+    node_label_offsets = array("q", [0])
+    node_labels = array("i")
+    for row, node in enumerate(nodes):
+        for label in node[cs.KEY_LABELS]:
+            node_labels.append(label_id[label])
+            label_rows[label_id[label]].append(row)
+        node_label_offsets.append(len(node_labels))
+    label_offsets, label_row_items = _csr(label_rows)
+
+    prop_keys = sorted({key for n in nodes for key in n[cs.KEY_PROPERTIES]})
+    key_id = {key: i for i, key in enumerate(prop_keys)}
+    encoded_nodes = [
+        sorted(
+            (key_id[key], _encode_value(value))
+            for key, value in n[cs.KEY_PROPERTIES].items()
+        )
+        for n in nodes
+    ]
+    values = sorted({blob for props in encoded_nodes for _k, blob in props})
+    value_id = {blob: i for i, blob in enumerate(values)}
+    value_offsets, value_heap = _heap(values)
+
+    node_prop_offsets = array("q", [0])
+    node_prop_keys = array("i")
+    node_prop_values = array("i")
+    index_entries: list[tuple[int, int, int]] = []
+    null_blob = _encode_value(None)
+    for row, props in enumerate(encoded_nodes):
+        for kid, blob in props:
+            vid = value_id[blob]
+            node_prop_keys.append(kid)
+            node_prop_values.append(vid)
+            # Like GraphLoader's property index, null values are kept on
+            # the node but never indexed.
+            if blob != null_blob:
+                index_entries.append((kid, vid, row))
+        node_prop_offsets.append(len(node_prop_keys))
+    index_entries.sort()
+
+    rel_types = sorted({r[cs.KEY_TYPE] for r in rels})
+    rel_type_id = {t: i for i, t in enumerate(rel_types)}
+    rel_type_counts = dict.fromkeys(rel_types, 0)
+    out_buckets: list[list[int]] = [[] for _ in nodes]
+    in_buckets: list[list[int]] = [[] for _ in nodes]
+    for i, rel in enumerate(rels):
+        rel_type_counts[rel[cs.KEY_TYPE]] += 1
+        if (src := row_of.get(rel[cs.KEY_FROM_ID])) is not None:
+            out_buckets[src].append(i)
+        if (dst := row_of.get(rel[cs.KEY_TO_ID])) is not None:
+            in_buckets[dst].append(i)
+    out_offsets, out_rels = _csr(out_buckets)
+    in_offsets, in_rels = _csr(in_buckets)
+    rel_prop_offsets, rel_prop_heap = _heap(
+        _encode_value(r[cs.KEY_PROPERTIES]) if r[cs.KEY_PROPERTIES] else b""
+        for r in rels
+    )
+
+    sections: dict[str, array | bytes] = {
+        _NODE_IDS: node_ids,
+        _NODE_LABEL_OFFSETS: node_label_offsets,
+        _NODE_LABELS: node_labels,
+        _LABEL_OFFSETS: label_offsets,
+        _LABEL_ROWS: label_row_items,
+        _NODE_PROP_OFFSETS: node_prop_offsets,
+        _NODE_PROP_KEYS: node_prop_keys,
+        _NODE_PROP_VALUES: node_prop_values,
+        _VALUE_OFFSETS: value_offsets,
+        _VALUE_HEAP: value_heap,
+        _PROP_INDEX_KEYS: array("i", (e[0] for e in index_entries)),
+        _PROP_INDEX_VALUES: array("i", (e[1] for e in index_entries)),
+        _PROP_INDEX_ROWS: array("q", (e[2] for e in index_entries)),
+        _REL_FROM: array("q", (r[cs.KEY_FROM_ID] for r in rels)),
+        _REL_TO: array("q", (r[cs.KEY_TO_ID] for r in rels)),
+        _REL_TYPES: array("i", (rel_type_id[r[cs.KEY_TYPE]] for r in rels)),
+        _REL_PROP_OFFSETS: rel_prop_offsets,
+        _REL_PROP_HEAP: rel_prop_heap,
+        _OUT_OFFSETS: out_offsets,
+        _OUT_RELS: out_rels,
+        _IN_OFFSETS: in_offsets,
+        _IN_RELS: in_rels,
+    }
+    _write_sections(
+        out_path,
+        sections,
+        {
+            "version": cs.COLUMNAR_GRAPH_VERSION,
+            "labels": labels,
+            "property_keys": prop_keys,
+            "relationship_types": rel_types,
+            "relationship_type_counts": rel_type_counts,
+            "metadata": data.get(cs.KEY_METADATA, {}),
+        },
+    )
+
+
+def _write_sections(
+    out_path: Path, sections: dict[str, array | bytes], directory: dict[str, Any]
+) -> None:
+    layout: dict[str, dict[str, Any]] = {}
+    blobs: list[bytes] = []
+    offset = 0
+    for name, section in sections.items():
+        if isinstance(section, array):
+            if sys.byteorder != "little":
+                section = array(section.typecode, section)
+                section.byteswap()
+            blob, typecode, count = section.tobytes(), section.typecode, len(section)
+        else:
+            blob, typecode, count = section, "B", len(section)
+        layout[name] = {"offset": offset, "typecode": typecode, "count": count}
+        padding = -len(blob) % _ALIGN
+        blobs.append(blob + b"\0" * padding)
+        offset += len(blob) + padding
+    directory_bytes = json.dumps(
+        {**directory, "sections": layout}, sort_keys=True
+    ).encode(cs.ENCODING_UTF8)
+    directory_bytes += b" " * (-(_HEADER.size + len(directory_bytes)) % _ALIGN)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "wb") as f:
+        f.write(_HEADER.pack(cs.COLUMNAR_GRAPH_MAGIC, len(directory_bytes)))
+        f.write(directory_bytes)
+        for blob in blobs:
+            f.write(blob)
+
+
+def convert_graph_file(json_path: Path, out_path: Path) -> None:
+    with open(json_path, encoding=cs.ENCODING_UTF8) as f:
+        data: GraphData = json.load(f)
+    write_columnar_graph(data, out_path)
+    logger.info(ls.COLUMNAR_GRAPH_WRITTEN.format(path=out_path))
+
+
+class ColumnarGraphLoader:
+    """Read-only `GraphLoader` counterpart over a mapped columnar file.
+
+    Node-returning queries yield nodes in ascending node-id order.
+    """
+
+    __slots__ = (
+        "file_path",
+        "_mmap",
+        "_directory",
+        "_columns",
+        "_key_ids",
+        "_label_ids",
+        "_nodes",
+        "_relationships",
+        "_node_cache",
+        "_rel_cache",
+        "_value_cache",
+    )
+
+    def __init__(self, file_path: str | Path):
+        self.file_path = Path(file_path)
+        self._mmap: mmap.mmap | None = None
+        self._directory: dict[str, Any] = {}
+        self._columns: dict[str, memoryview] = {}
+        self._key_ids: dict[str, int] = {}
+        self._label_ids: dict[str, int] = {}
+        self._nodes: list[GraphNode] | None = None
+        self._relationships: list[GraphRelationship] | None = None
+        # Objects are decoded on first access and then kept, so a repeated
+        # lookup costs what the JSON loader's resident dicts do.
+        self._node_cache: dict[int, GraphNode] = {}
+        self._rel_cache: dict[int, GraphRelationship] = {}
+        self._value_cache: dict[int, PropertyValue] = {}
+
+    def load(self) -> None:
+        if not self.file_path.exists():
+            raise FileNotFoundError(ex.GRAPH_FILE_NOT_FOUND.format(path=self.file_path))
+        logger.info(ls.LOADING_GRAPH.format(path=self.file_path))
+        with open(self.file_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, directory_len = _HEADER.unpack_from(self._mmap, 0)
+        if magic != cs.COLUMNAR_GRAPH_MAGIC:
+            raise ValueError(ex.COLUMNAR_GRAPH_BAD_MAGIC.format(path=self.file_path))
+        raw = self._mmap[_HEADER.size : _HEADER.size + directory_len]
+        self._directory = json.loads(raw)
+        if self._directory.get("version") != cs.COLUMNAR_GRAPH_VERSION:
+            raise ValueError(
+                ex.COLUMNAR_GRAPH_BAD_VERSION.format(
+                    version=self._directory.get("version")
+                )
+            )
+        base = _HEADER.size + directory_len
+        with memoryview(self._mmap) as view:
+            for name, section in self._directory["sections"].items():
+                start = base + section["offset"]
+                itemsize = struct.calcsize(section["typecode"])
+                column = view[start : start + section["count"] * itemsize]
+                self._columns[name] = (
+                    column
+                    if section["typecode"] == "B"
+                    else column.cast(section["typecode"])
+                )
+        self._key_ids = {k: i for i, k in enumerate(self._directory["property_keys"])}
+        self._label_ids = {k: i for i, k in enumerate(self._directory["labels"])}
+        logger.info(
+            ls.LOADED_GRAPH.format(
+                nodes=len(self._columns[_NODE_IDS]),
+                relationships=len(self._columns[_REL_FROM]),
+            )
+        )
+
+    def close(self) -> None:
+        self._node_cache.clear()
+        self._rel_cache.clear()
+        self._value_cache.clear()
+        self._nodes = None
+        self._relationships = None
+        for column in self._columns.values():
+            column.release()
+        self._columns.clear()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _ensure_loaded(self) -> None:
+        if self._mmap is None:
+            self.load()
+
+    def _value(self, vid: int) -> PropertyValue:
+        if vid in self._value_cache:
+            return self._value_cache[vid]
+        offsets = self._columns[_VALUE_OFFSETS]
+        value = json.loads(
+            bytes(self._columns[_VALUE_HEAP][offsets[vid] : offsets[vid + 1]])
+        )
+        self._value_cache[vid] = value
+        return value
+
+    def _value_id(self, value: PropertyValue) -> int | None:
+        offsets = self._columns[_VALUE_OFFSETS]
+        heap = self._columns[_VALUE_HEAP]
+        target = _encode_value(value)
+        count = len(offsets) - 1
+        pos = bisect_left(
+            range(count), target, key=lambda i: bytes(heap[offsets[i] : offsets[i + 1]])
+        )
+        if pos < count and bytes(heap[offsets[pos] : offsets[pos + 1]]) == target:
+            return pos
+        return None
+
+    def _node_at(self, row: int) -> GraphNode:
+        if (node := self._node_cache.get(row)) is not None:
+            return node
+        c = self._columns
+        labels = self._directory["labels"]
+        keys = self._directory["property_keys"]
+        label_offsets = c[_NODE_LABEL_OFFSETS]
+        prop_offsets = c[_NODE_PROP_OFFSETS]
+        prop_keys = c[_NODE_PROP_KEYS]
+        prop_values = c[_NODE_PROP_VALUES]
+        node = GraphNode(
+            node_id=c[_NODE_IDS][row],
+            labels=[
+                labels[lid]
+                for lid in c[_NODE_LABELS][label_offsets[row] : label_offsets[row + 1]]
+            ],
+            properties={
+                keys[prop_keys[i]]: self._value(prop_values[i])
+                for i in range(prop_offsets[row], prop_offsets[row + 1])
+            },
+        )
+        self._node_cache[row] = node
+        return node
+
+    def _relationship_at(self, index: int) -> GraphRelationship:
+        if (rel := self._rel_cache.get(index)) is not None:
+            return rel
+        c = self._columns
+        start, end = c[_REL_PROP_OFFSETS][index], c[_REL_PROP_OFFSETS][index + 1]
+        rel = GraphRelationship(
+            from_id=c[_REL_FROM][index],
+            to_id=c[_REL_TO][index],
+            type=self._directory["relationship_types"][c[_REL_TYPES][index]],
+            properties=(
+                json.loads(bytes(c[_REL_PROP_HEAP][start:end])) if end > start else {}
+            ),
+        )
+        self._rel_cache[index] = rel
+        return rel
+
+    def _row_of(self, node_id: int) -> int | None:
+        ids = self._columns[_NODE_IDS]
+        row = bisect_left(ids, node_id)
+        return row if row < len(ids) and ids[row] == node_id else None
+
+    @property
+    def nodes(self) -> list[GraphNode]:
+        self._ensure_loaded()
+        if self._nodes is None:
+            self._nodes = [
+                self._node_at(row) for row in range(len(self._columns[_NODE_IDS]))
+            ]
+        return self._nodes
+
+    @property
+    def relationships(self) -> list[GraphRelationship]:
+        self._ensure_loaded()
+        if self._relationships is None:
+            self._relationships = [
+                self._relationship_at(i) for i in range(len(self._columns[_REL_FROM]))
+            ]
+        return self._relationships
+
+    @property
+    def metadata(self) -> GraphMetadata:
+        self._ensure_loaded()
+        return self._directory["metadata"]
+
+    def find_nodes_by_label(self, label: str) -> list[GraphNode]:
+        self._ensure_loaded()
+        lid = self._label_ids.get(label)
+        if lid is None:
+            return []
+        offsets = self._columns[_LABEL_OFFSETS]
+        rows = self._columns[_LABEL_ROWS][offsets[lid] : offsets[lid + 1]]
+        return [self._node_at(row) for row in rows]
+
+    def find_node_by_property(
+        self, property_name: str, value: PropertyValue
+    ) -> list[GraphNode]:
+        self._ensure_loaded()
+        kid = self._key_ids.get(property_name)
+        vid = self._value_id(value) if kid is not None else None
+        if kid is None or vid is None:
+            return []
+        keys = self._columns[_PROP_INDEX_KEYS]
+        values = self._columns[_PROP_INDEX_VALUES]
+        span = range(len(keys))
+
+        def composite(i: int) -> tuple[int, int]:
+            return keys[i], values[i]
+
+        lo = bisect_left(span, (kid, vid), key=composite)
+        hi = bisect_right(span, (kid, vid), key=composite)
+        rows = self._columns[_PROP_INDEX_ROWS][lo:hi]
+        return [self._node_at(row) for row in rows]
+
+    def get_node_by_id(self, node_id: int) -> GraphNode | None:
+        self._ensure_loaded()
+        row = self._row_of(node_id)
+        return self._node_at(row) if row is not None else None
+
+    def _adjacent(
+        self, node_id: int, offsets: str, rels: str
+    ) -> list[GraphRelationship]:
+        self._ensure_loaded()
+        row = self._row_of(node_id)
+        if row is None:
+            return []
+        bounds = self._columns[offsets]
+        return [
+            self._relationship_at(i)
+            for i in self._columns[rels][bounds[row] : bounds[row + 1]]
+        ]
+
+    def get_outgoing_relationships(self, node_id: int) -> list[GraphRelationship]:
+        return self._adjacent(node_id, _OUT_OFFSETS, _OUT_RELS)
+
+    def get_incoming_relationships(self, node_id: int) -> list[GraphRelationship]:
+        return self._adjacent(node_id, _IN_OFFSETS, _IN_RELS)
+
+    def get_relationships_for_node(self, node_id: int) -> list[GraphRelationship]:
+        return self.get_outgoing_relationships(
+            node_id
+        ) + self.get_incoming_relationships(node_id)
+
+    def summary(self) -> GraphSummary:
+        self._ensure_loaded()
+        offsets = self._columns[_LABEL_OFFSETS]
+        node_labels = {
+            label: offsets[i + 1] - offsets[i]
+            for i, label in enumerate(self._directory["labels"])
+        }
+        return GraphSummary(
+            total_nodes=len(self._columns[_NODE_IDS]),
+            total_relationships=len(self._columns[_REL_FROM]),
+            node_labels=node_labels,
+            relationship_types=dict(self._directory["relationship_type_counts"]),
+            metadata=self.metadata,
+        )
@@ -1,6 +1,7 @@
 import json
 from collections import Counter, defaultdict
 from pathlib import Path
+from typing import cast
 
 from loguru import logger
 
@@ -9,7 +10,15 @@ from . import exceptions as ex
 from . import logs as ls
 from .decorators import ensure_loaded
 from .models import GraphNode, GraphRelationship
-from .types_defs import GraphData, GraphMetadata, GraphSummary, PropertyValue
+from .types_defs import (
+    GraphData,
+    GraphMetadata,
+    GraphReaderProtocol,
+    GraphSummary,
+    NodeData,
+    PropertyValue,
+    RelationshipData,
+)
 
 
 class GraphLoader:
@@ -56,8 +65,21 @@ class GraphLoader:
         if self._data is None:
             raise RuntimeError(ex.FAILED_TO_LOAD_DATA)
 
+        self._index_data()
+
+    @classmethod
+    def from_data(cls, data: GraphData, file_path: str = "") -> "GraphLoader":
+        # Graphs built in memory (the protobuf index read by the offline
+        # query engine) get the same indexes without a JSON round trip.
+        loader = cls(file_path)
+        loader._data = data
+        loader._index_data()
+        return loader
+
+    def _index_data(self) -> None:
+        assert self._data is not None, ex.DATA_NOT_LOADED
         self._nodes = []
-        for node_data in self._data[cs.KEY_NODES]:
+        for node_data in cast(list[NodeData], self._data[cs.KEY_NODES]):
             node = GraphNode(
                 node_id=node_data[cs.KEY_NODE_ID],
                 labels=node_data[cs.KEY_LABELS],
@@ -70,7 +92,7 @@ class GraphLoader:
                 self._nodes_by_label[label].append(node)
 
         self._relationships = []
-        for rel_data in self._data[cs.KEY_RELATIONSHIPS]:
+        for rel_data in cast(list[RelationshipData], self._data[cs.KEY_RELATIONSHIPS]):
             rel = GraphRelationship(
                 from_id=rel_data[cs.KEY_FROM_ID],
                 to_id=rel_data[cs.KEY_TO_ID],
@@ -160,7 +182,15 @@ class GraphLoader:
         )
 
 
-def load_graph(file_path: str) -> GraphLoader:
-    loader = GraphLoader(file_path)
+def load_graph(file_path: str) -> GraphReaderProtocol:
+    # The columnar format is detected by its magic bytes, so every caller
+    # takes the memory-mapped path transparently once a graph is converted.
+    from .graph_columnar import ColumnarGraphLoader, is_columnar_graph
+
+    loader: GraphReaderProtocol
+    if is_columnar_graph(Path(file_path)):
+        loader = ColumnarGraphLoader(file_path)
+    else:
+        loader = GraphLoader(file_path)
     loader.load()
     return loader
@@ -3,9 +3,10 @@
 import hashlib
 import json
 import os
+import posixpath
 import sys
 from collections import defaultdict
-from collections.abc import Callable, Mapping
+from collections.abc import Callable, Mapping, Sequence
 from pathlib import Path
 
 from loguru import logger
@@ -17,7 +18,7 @@ from . import logs as ls
 from .analyzers import FindingAnalyzer
 from .ast_cache import BoundedASTCache
 from .capture import CaptureSelection, default_capture
-from .config import settings
+from .config import GITIGNORE_FILENAME, settings
 from .function_registry import FunctionRegistryTrie
 from .language_spec import (
     LANGUAGE_FQN_SPECS,
@@ -57,7 +58,12 @@ from .parsers.endpoints import (
     parse_route_decorator,
 )
 from .parsers.factory import ProcessorFactory
-from .parsers.frontends import FRONTENDS, SemanticFacts
+from .parsers.frontends import (
+    FRONTENDS,
+    IncrementalFrontend,
+    SemanticFacts,
+    drop_file_facts,
+)
 from .parsers.frontends.protocol import QueryCall
 from .parsers.go_frontend import find_go_module
 from .parsers.java_generated import (
@@ -88,6 +94,15 @@ from .types_defs import (
 )
 from .utils.dependencies import has_semantic_dependencies
 from .utils.fqn_resolver import find_function_source_by_fqn
+from .utils.git_changes import (
+    GitIndexState,
+    GitSnapshot,
+    committed_changes,
+    load_git_index_state,
+    read_git_snapshot,
+    save_git_index_state,
+    tracked_files,
+)
 from .utils.path_utils import (
     cached_file_identity_posix,
     cached_relative_path,
@@ -95,7 +110,13 @@ from .utils.path_utils import (
     should_skip_path,
     should_skip_rel_file,
 )
-from .utils.source_extraction import extract_source_with_fallback
+from .utils.source_extraction import LastSourceFile, extract_source_with_fallback
+from .warm_state import (
+    WarmState,
+    hash_cache_digest,
+    load_warm_state,
+    save_warm_state,
+)
 
 
 def _persisted_int(value: object) -> int | None:
@@ -252,6 +273,13 @@ def _save_dir_mtimes(cache_path: Path, mtimes: DirMtimesCache) -> None:
         pass
 
 
+def _walk_order(file_key: str) -> tuple[tuple[int, str], ...]:
+    # os.walk's top-down order with sorted names: a directory's own files
+    # come before its subdirectories.
+    *dirs, name = file_key.split("/")
+    return (*((1, part) for part in dirs), (0, name))
+
+
 def _touch_empty_json(cache_path: Path) -> None:
     if cache_path.exists():
         return
@@ -319,6 +347,9 @@ class GraphUpdater:
         # no tree-sitter span records; the watch prefix sweep reads this to
         # spare foreign files' entries (issue #1025).
         self._frontend_owned_qns: dict[str, set[str]] = {}
+        # Whether the Python fact maps hold a full frontend run, so a watch
+        # event may refresh them incrementally instead of rebuilding.
+        self._python_facts_seeded = False
         self.unignore_paths = unignore_paths
         self._configured_unignore_paths = unignore_paths
         self._delombok_overlay: dict[str, bytes] = {}
@@ -352,9 +383,21 @@ class GraphUpdater:
         # Files (re)parsed by Pass 2 this run: the only files whose
         # definition spans exist for hybrid macro-call attribution.
         self._reparsed_file_keys: set[str] = set()
+        # Files whose definitions Pass 4 re-embeds; None embeds the whole
+        # project (full builds, or Pass 4 run on its own).
+        self._embedding_paths: set[str] | None = None
+        # Vector ids of embedded definitions deleted with their module this
+        # run; Pass 4 drops them from the vector store.
+        self._stale_embedding_ids: set[int] = set()
         # Module qns read back from the graph on incremental runs; deferred
         # import verification counts them as real internal targets.
         self._rehydrated_module_qns: set[str] = set()
+        # Whether the location indexes cover every indexed file (a finished
+        # run, a loaded warm-state snapshot, or one rehydration), so watch
+        # events need no graph reads; and the digest of the hash cache this
+        # run started from, against which the previous snapshot is merged.
+        self._warm_state_ready = False
+        self._warm_state_base: str | None = None
 
         self.factory = ProcessorFactory(
             ingestor=self._sink,
@@ -579,30 +622,51 @@ class GraphUpdater:
             )
         )
 
-    def _run_python_frontend(self) -> None:
+    def _run_python_frontend(self, changed: Sequence[Path] | None = None) -> None:
         # In-process Jedi facts (issue #1183): exact first-party callees
         # through re-exports/decorators and external proofs for calls leaving
         # the repo. Off (HEURISTIC) or unavailable degrades to the tree-sitter
         # heuristics; reset first so a reused updater does not keep stale
-        # facts when the setting flips between runs.
+        # facts when the setting flips between runs. A watch event passes the
+        # `changed` paths: once a full run has seeded the maps, only the facts
+        # of the files the frontend refreshed are replaced, in place.
         dp = self.factory.definition_processor
-        dp.python_call_sites.clear()
-        dp.python_external_sites.clear()
+        seeded, self._python_facts_seeded = self._python_facts_seeded, False
         if settings.PYTHON_FRONTEND == cs.PythonFrontend.HEURISTIC:
+            dp.python_call_sites.clear()
+            dp.python_external_sites.clear()
             return
         frontend = FRONTENDS.get(cs.SupportedLanguage.PYTHON)
         if frontend is None or not frontend.available():
+            dp.python_call_sites.clear()
+            dp.python_external_sites.clear()
             logger.warning(ls.PY_FRONTEND_UNAVAILABLE)
             return
         files = [
             fp for fp, lang in self._parsed_files if lang == cs.SupportedLanguage.PYTHON
         ]
-        if not files:
-            return
-        logger.info(ls.PY_FRONTEND_RUNNING)
-        facts = frontend.run(self.repo_path, files)
+        if changed is not None and seeded and isinstance(frontend, IncrementalFrontend):
+            result = frontend.run_incremental(self.repo_path, files, changed)
+            facts = result.facts
+            if result.refreshed_files is not None:
+                drop_file_facts(dp.python_call_sites, result.refreshed_files)
+                drop_file_facts(dp.python_external_sites, result.refreshed_files)
+                dp.python_call_sites.update(facts.resolved_call_sites)
+                dp.python_external_sites.update(facts.external_sites)
+                self._python_facts_seeded = True
+                return
+        else:
+            if not files:
+                dp.python_call_sites.clear()
+                dp.python_external_sites.clear()
+                return
+            logger.info(ls.PY_FRONTEND_RUNNING)
+            facts = frontend.run(self.repo_path, files)
+        dp.python_call_sites.clear()
+        dp.python_external_sites.clear()
         dp.python_call_sites.update(facts.resolved_call_sites)
         dp.python_external_sites.update(facts.external_sites)
+        self._python_facts_seeded = True
         logger.info(
             ls.PY_FRONTEND_FACTS.format(
                 calls=len(facts.resolved_call_sites),
@@ -841,6 +905,8 @@ class GraphUpdater:
         # Reset per-run parse tracking so a reused updater does not reprocess
         # a previous run's files in Pass 3.
         self._parsed_files.clear()
+        self._embedding_paths = None
+        self._stale_embedding_ids.clear()
         self._sink.ensure_node_batch(
             cs.NODE_PROJECT,
             {
@@ -1073,6 +1139,15 @@ class GraphUpdater:
                 self._delombok_state_candidate,
             )
 
+        # Same posture for the warm-state snapshot: written only once the
+        # graph it describes is flushed. Full builds parsed everything and
+        # incremental runs rehydrated the rest above, so the in-memory
+        # registries now cover every indexed file.
+        if self._single_file is None:
+            self._warm_state_ready = True
+            if settings.WARM_STATE_SNAPSHOT:
+                self._save_warm_state()
+
     def _emit_pending_endpoints(self) -> None:
         if not self.capture.rel_enabled(cs.RelationshipType.EXPOSES):
             return
@@ -1616,6 +1691,148 @@ class GraphUpdater:
         if restored:
             logger.info(ls.FUNCTION_LOCATIONS_REHYDRATED.format(count=restored))
 
+    def ensure_warm_state(self) -> None:
+        """Make the location indexes cover every indexed file, once.
+
+        A watcher whose initial run found the repo in sync holds nothing in
+        memory; without a warm-state snapshot the indexes are read back from
+        the graph on the first event, and watch events keep them current
+        from then on.
+        """
+        if self._warm_state_ready:
+            return
+        self._rehydrate_csharp_type_locations()
+        self._rehydrate_go_type_locations()
+        self._rehydrate_function_locations()
+        self._warm_state_ready = True
+
+    def load_warm_state(self) -> bool:
+        """Restore the registries the last finished run persisted.
+
+        Only a snapshot written with the current hash cache is used: it then
+        describes exactly the graph an in-sync run left untouched.
+        """
+        cache_path = self.repo_path / cs.HASH_CACHE_FILENAME
+        state = load_warm_state(
+            self.repo_path / cs.WARM_STATE_FILENAME,
+            self.project_name,
+            hash_cache_digest(cache_path),
+        )
+        if state is None:
+            logger.info(ls.WARM_STATE_UNAVAILABLE)
+            return False
+        self._apply_warm_state(state)
+        self._warm_state_ready = True
+        logger.info(
+            ls.WARM_STATE_LOADED,
+            count=len(state.registry),
+            locations=len(self.factory.definition_processor.function_locations),
+        )
+        return True
+
+    def _save_warm_state(self) -> None:
+        state_path = self.repo_path / cs.WARM_STATE_FILENAME
+        cache_path = self.repo_path / cs.HASH_CACHE_FILENAME
+        digest = hash_cache_digest(cache_path)
+        if digest is None:
+            state_path.unlink(missing_ok=True)
+            return
+        state = self._capture_warm_state()
+        previous = (
+            None
+            if self._is_full_build
+            else load_warm_state(state_path, self.project_name, self._warm_state_base)
+        )
+        if previous is not None:
+            # Import maps are the one registry an incremental run neither
+            # re-parses nor rehydrates for unchanged files: carry them over
+            # from the snapshot of the run this one started from, for every
+            # module whose file is still indexed and was not re-parsed.
+            indexed = _load_hash_cache(cache_path).keys()
+            reparsed = {
+                cached_relative_path(path, self.repo_path).as_posix()
+                for path, _language in self._parsed_files
+            }
+            for qn, rel_path in previous.module_paths.items():
+                if rel_path not in indexed or rel_path in reparsed:
+                    continue
+                state.module_paths.setdefault(qn, rel_path)
+                if (mapping := previous.import_mapping.get(qn)) is not None:
+                    state.import_mapping.setdefault(qn, mapping)
+        save_warm_state(state_path, self.project_name, digest, state)
+
+    def _capture_warm_state(self) -> WarmState:
+        dp = self.factory.definition_processor
+        registry = self.function_registry
+        module_paths: dict[str, str] = {}
+        for qn, path in dp.module_qn_to_file_path.items():
+            try:
+                module_paths[qn] = path.relative_to(self.repo_path).as_posix()
+            except ValueError:
+                continue
+        return WarmState(
+            registry={qn: node_type.value for qn, node_type in registry.items()},
+            properties=[qn for qn in registry.keys() if registry.is_property(qn)],
+            macros=sorted(dp.macro_qns),
+            module_paths=module_paths,
+            function_locations=[
+                (module_qn, line, col, *location)
+                for (module_qn, line, col), location in dp.function_locations.items()
+            ],
+            go_type_locations=[
+                (path, line, col, qn, label)
+                for (path, line, col), (qn, label) in dp.go_type_locations.items()
+            ],
+            csharp_type_locations=[
+                (path, line, qn)
+                for (path, line), qn in dp.csharp_type_locations.items()
+            ],
+            import_mapping={
+                qn: dict(mapping)
+                for qn, mapping in self.factory.import_processor.import_mapping.items()
+            },
+        )
+
+    def _apply_warm_state(self, state: WarmState) -> None:
+        # Live entries win, as with graph rehydration; load_warm_state has
+        # already dropped malformed rows.
+        dp = self.factory.definition_processor
+        for qn, label in state.registry.items():
+            if qn in self.function_registry:
+                continue
+            try:
+                self.function_registry[qn] = NodeType(label)
+            except ValueError:
+                continue
+        for qn in state.properties:
+            if qn in self.function_registry:
+                self.function_registry.mark_property(qn)
+        dp.macro_qns.update(state.macros)
+        for qn, rel_path in state.module_paths.items():
+            dp.module_qn_to_file_path.setdefault(qn, self.repo_path / rel_path)
+        for (
+            module_qn,
+            line,
+            col,
+            label,
+            qn,
+            container,
+            is_named,
+        ) in state.function_locations:
+            # Item assignment, not setdefault: FunctionLocations keeps its
+            # per-module index in __setitem__.
+            if (key := (module_qn, line, col)) not in dp.function_locations:
+                dp.function_locations[key] = FunctionLocation(
+                    label, qn, container, is_named
+                )
+        for path, line, col, qn, label in state.go_type_locations:
+            dp.go_type_locations.setdefault((path, line, col), (qn, label))
+        for path, line, qn in state.csharp_type_locations:
+            dp.csharp_type_locations.setdefault((path, line), qn)
+        import_mapping = self.factory.import_processor.import_mapping
+        for qn, mapping in state.import_mapping.items():
+            import_mapping.setdefault(qn, dict(mapping))
+
     @staticmethod
     def _restore_function_rows(
         rows: list[ResultRow], locations: FunctionLocations
@@ -1900,6 +2117,8 @@ class GraphUpdater:
         Method nodes and their edges linger alongside the new ones.
         """
         if isinstance(self.ingestor, QueryProtocol):
+            if not self.skip_embeddings and has_semantic_dependencies():
+                self._collect_stale_embedding_ids(file_key)
             self.ingestor.execute_write(
                 cs.CYPHER_DELETE_MODULE,
                 {
@@ -1909,6 +2128,22 @@ class GraphUpdater:
                 },
             )
 
+    def _collect_stale_embedding_ids(self, file_key: str) -> None:
+        assert isinstance(self.ingestor, QueryProtocol)
+        try:
+            rows = self.ingestor.fetch_all(
+                cs.CYPHER_QUERY_MODULE_EMBEDDING_IDS,
+                {cs.KEY_PATH: file_key, cs.KEY_PROJECT_NAME: self.project_name},
+            )
+        except Exception as e:
+            logger.warning(ls.EMBEDDING_STALE_LOOKUP_FAILED, path=file_key, error=e)
+            return
+        self._stale_embedding_ids.update(
+            node_id
+            for row in rows
+            if isinstance(node_id := row.get(cs.KEY_NODE_ID), int)
+        )
+
     def _diff_dir_against_cache(
         self,
         dir_path_str: str,
@@ -2061,6 +2296,11 @@ class GraphUpdater:
         if not old_hashes or not old_dir_mtimes:
             return False
 
+        if (snapshot := self._read_git_snapshot()) is not None and (
+            candidates := self._git_candidates(snapshot)
+        ) is not None:
+            return self._git_candidates_in_sync(snapshot, candidates, old_hashes)
+
         repo_str = str(self.repo_path)
         for dir_key, cached_mtime in old_dir_mtimes.items():
             dir_path_str = (
@@ -2089,6 +2329,149 @@ class GraphUpdater:
                 return False
         return True
 
+    def _git_config_fingerprint(self) -> str:
+        # The eligible set also depends on these; git cannot see them change.
+        return json.dumps(
+            [sorted(self.exclude_paths or ()), sorted(self.unignore_paths or ())]
+        )
+
+    def _read_git_snapshot(self) -> GitSnapshot | None:
+        if not settings.GIT_CHANGE_DETECTION or self._single_file is not None:
+            return None
+        snapshot = read_git_snapshot(self.repo_path)
+        if snapshot is None:
+            logger.debug(
+                ls.INCREMENTAL_GIT_FALLBACK, reason=cs.GitChangeFallback.NOT_GIT
+            )
+        return snapshot
+
+    def _git_candidates(self, snapshot: GitSnapshot) -> frozenset[str] | None:
+        """Paths that may differ from what the last run indexed.
+
+        Everything else is byte-identical to its indexed state: committed at
+        the last indexed commit, clean then, unchanged since and clean now.
+        None means git cannot vouch for the rest of the tree and the walk
+        must decide.
+        """
+        state = load_git_index_state(self.repo_path / cs.GIT_INDEX_STATE_FILENAME)
+        committed: frozenset[str] | None = None
+        if state is None:
+            reason = cs.GitChangeFallback.NO_STATE
+        elif not state.complete:
+            reason = cs.GitChangeFallback.INCOMPLETE
+        elif state.config != self._git_config_fingerprint():
+            reason = cs.GitChangeFallback.CONFIG
+        else:
+            committed = committed_changes(self.repo_path, state.commit, snapshot.head)
+            reason = cs.GitChangeFallback.HISTORY
+        if state is None or committed is None:
+            logger.debug(ls.INCREMENTAL_GIT_FALLBACK, reason=reason)
+            return None
+        candidates = committed | snapshot.dirty | state.dirty
+        if any(posixpath.basename(p) == GITIGNORE_FILENAME for p in candidates):
+            logger.debug(
+                ls.INCREMENTAL_GIT_FALLBACK, reason=cs.GitChangeFallback.GITIGNORE
+            )
+            return None
+        logger.info(
+            ls.INCREMENTAL_GIT_CHANGES, count=len(candidates), commit=state.commit
+        )
+        return frozenset(
+            p
+            for p in candidates | self._delombok_stale_keys
+            if posixpath.basename(p) not in cs.CGR_STATE_FILENAMES
+        )
+
+    def _is_eligible_key(self, file_key: str) -> bool:
+        # The walk's own predicate, applied to one path: every directory on
+        # the way must survive pruning and the file must survive the filter.
+        *dirs, name = file_key.split("/")
+        prefix = ""
+        for dirname in dirs:
+            if not self._should_keep_dir(dirname, prefix):
+                return False
+            prefix = f"{prefix}{dirname}/"
+        path = f"{self.repo_path}/{file_key}"
+        if not os.path.lexists(path) or os.path.isdir(path):
+            return False
+        dot = name.rfind(".")
+        return not should_skip_rel_file(
+            file_key,
+            tuple(dirs),
+            name[dot:] if dot != -1 else "",
+            exclude_paths=self.exclude_paths,
+            unignore_paths=self.unignore_paths,
+        )
+
+    def _git_candidates_in_sync(
+        self,
+        snapshot: GitSnapshot,
+        candidates: frozenset[str],
+        old_hashes: FileHashCache,
+    ) -> bool:
+        for file_key in candidates:
+            if not self._is_eligible_key(file_key):
+                if file_key in old_hashes:
+                    return False
+                continue
+            old_hash = old_hashes.get(file_key)
+            try:
+                if old_hash is None or (
+                    _hash_file(self.repo_path / file_key) != old_hash
+                ):
+                    return False
+            except OSError:
+                return False
+        # Every candidate matches its indexed bytes, so this snapshot is an
+        # equally valid baseline, and a shorter diff next time.
+        self._save_git_state(snapshot, complete=True)
+        return True
+
+    def _eligible_files_from_git(
+        self, candidates: frozenset[str], old_hashes: FileHashCache
+    ) -> list[tuple[Path, str]]:
+        # The last run's files, minus candidates that left the eligible set,
+        # plus the ones that joined it; the directory mtimes are refreshed
+        # along the candidates' ancestors only.
+        keys = set(old_hashes) - candidates
+        mtimes = _load_dir_mtimes(self.repo_path / cs.DIR_MTIMES_FILENAME)
+        refreshed: set[str] = set()
+        repo_str = str(self.repo_path)
+        for file_key in candidates:
+            eligible = self._is_eligible_key(file_key)
+            if eligible:
+                keys.add(file_key)
+            parts = file_key.split("/")[:-1]
+            for depth in range(len(parts), -1, -1):
+                dir_key = "/".join(parts[:depth]) or cs.ROOT_DIR_KEY
+                if dir_key in refreshed or (not eligible and dir_key not in mtimes):
+                    continue
+                refreshed.add(dir_key)
+                try:
+                    mtimes[dir_key] = os.stat(
+                        repo_str
+                        if dir_key == cs.ROOT_DIR_KEY
+                        else f"{repo_str}/{dir_key}"
+                    ).st_mtime
+                except OSError:
+                    mtimes.pop(dir_key, None)
+        self._collected_dir_mtimes = mtimes
+        return [
+            (Path(f"{repo_str}/{file_key}"), file_key)
+            for file_key in sorted(keys, key=_walk_order)
+        ]
+
+    def _save_git_state(self, snapshot: GitSnapshot, complete: bool) -> None:
+        save_git_index_state(
+            self.repo_path / cs.GIT_INDEX_STATE_FILENAME,
+            GitIndexState(
+                snapshot.head,
+                snapshot.dirty,
+                complete,
+                self._git_config_fingerprint(),
+            ),
+        )
+
     def _register_generated_sources(self) -> None:
         # Annotation-processor output next to a build file (issue #1140):
         # carve those exact subtrees out of the target/build prune, register
@@ -2199,14 +2582,27 @@ class GraphUpdater:
         return eligible
 
     def _process_files(self, force: bool = False) -> None:
+        self.factory.import_processor.revalidate_resolution_cache()
         self.factory.import_processor.reset_rust_path_caches()
         self.factory.import_processor.reset_java_path_caches()
         cache_path = self.repo_path / cs.HASH_CACHE_FILENAME
         dir_mtimes_path = self.repo_path / cs.DIR_MTIMES_FILENAME
         old_hashes = _load_hash_cache(cache_path) if not force else {}
+        if old_hashes and self._single_file is None:
+            self._warm_state_base = hash_cache_digest(cache_path)
         for stale_key in self._delombok_stale_keys:
             old_hashes.pop(stale_key, None)
         is_full_build = (force or not old_hashes) and self._single_file is None
+        # Taken before any file is read: an edit landing mid-run is then
+        # either indexed already or dirty in the next run's snapshot.
+        git_snapshot = self._read_git_snapshot()
+        git_candidates = (
+            self._git_candidates(git_snapshot)
+            if git_snapshot is not None
+            and not is_full_build
+            and (self.repo_path / cs.DIR_MTIMES_FILENAME).is_file()
+            else None
+        )
         self._is_full_build = is_full_build
         cache_mtime = cache_path.stat().st_mtime if cache_path.is_file() else 0.0
         if force:
@@ -2214,8 +2610,17 @@ class GraphUpdater:
 
         _touch_empty_json(cache_path)
         _touch_empty_json(dir_mtimes_path)
-
-        eligible_files = self._collect_eligible_files()
+        _touch_empty_json(self.repo_path / cs.IMPORT_RESOLUTION_FILENAME)
+        if git_snapshot is not None:
+            _touch_empty_json(self.repo_path / cs.GIT_INDEX_STATE_FILENAME)
+        if settings.WARM_STATE_SNAPSHOT and self._single_file is None:
+            _touch_empty_json(self.repo_path / cs.WARM_STATE_FILENAME)
+
+        eligible_files = (
+            self._collect_eligible_files()
+            if git_candidates is None
+            else self._eligible_files_from_git(git_candidates, old_hashes)
+        )
 
         if not is_full_build:
             self._seed_module_qns_from_graph({key for _fp, key in eligible_files})
@@ -2242,6 +2647,11 @@ class GraphUpdater:
         changed_entries: list[tuple[Path, str, bool, bytes]] = []
         for filepath, file_key in eligible_files:
             if not force and file_key in old_hashes:
+                if git_candidates is not None and file_key not in git_candidates:
+                    new_hashes[file_key] = old_hashes[file_key]
+                    current_file_keys.add(file_key)
+                    skipped_count += 1
+                    continue
                 try:
                     file_mtime = filepath.stat().st_mtime
                 except OSError:
@@ -2329,6 +2739,8 @@ class GraphUpdater:
         self._reparsed_file_keys = {
             file_key for _fp, file_key, _new, _b in changed_entries
         }
+        if not is_full_build:
+            self._embedding_paths = self._reparsed_file_keys
 
         pre_parsed = self._pre_parse_changed_files(changed_entries)
 
@@ -2411,6 +2823,25 @@ class GraphUpdater:
 
         _save_hash_cache(cache_path, new_hashes)
         _save_dir_mtimes(dir_mtimes_path, self._collected_dir_mtimes)
+        if git_snapshot is not None:
+            # A walked run decides whether git can vouch for the tree: any
+            # eligible file git neither tracks nor lists as untracked is
+            # ignored, and a symlinked one is hashed through its target;
+            # edits to either would go unseen.
+            if git_candidates is None:
+                tracked = tracked_files(self.repo_path)
+                complete = tracked is not None and all(
+                    (key in tracked or key in git_snapshot.dirty)
+                    and not filepath.is_symlink()
+                    for filepath, key in eligible_files
+                )
+            else:
+                complete = True
+            self._save_git_state(git_snapshot, complete)
+        if self._single_file is None:
+            self.factory.import_processor.save_resolution_cache(
+                self._collected_dir_mtimes
+            )
         # Stamp only full builds: re-stamping an incremental run would
         # silence the staleness warning while unchanged files still carry
         # the old parser's edges.
@@ -2755,60 +3186,81 @@ class GraphUpdater:
 
         try:
             from .embedder import embed_code_batch, get_embedding_cache
+            from .embedding_pipeline import run_embedding_pipeline
+            from .lexical_index import get_lexical_index
             from .vector_store import (
                 close_qdrant_client,
+                delete_project_embeddings,
                 store_embedding_batch,
                 verify_stored_ids,
             )
 
             logger.info(ls.PASS_4_EMBEDDINGS)
 
-            results = self.ingestor.fetch_all(
-                cs.CYPHER_QUERY_EMBEDDINGS, {"project_name": self.project_name}
+            paths = self._embedding_paths
+            if paths is None:
+                results = self.ingestor.fetch_all(
+                    cs.CYPHER_QUERY_EMBEDDINGS, {"project_name": self.project_name}
+                )
+            elif paths:
+                results = self.ingestor.fetch_all(
+                    cs.CYPHER_QUERY_EMBEDDINGS_FOR_PATHS,
+                    {
+                        cs.KEY_PROJECT_NAME: self.project_name,
+                        cs.KEY_PATHS: sorted(paths),
+                    },
+                )
+            else:
+                results = []
+
+            # Re-parsing recreates a definition under a new node id, so the
+            # vectors of every deleted definition go, whether or not it came
+            # back; ids present in the fresh rows are kept defensively.
+            live_ids = {row.get(cs.KEY_NODE_ID) for row in results}
+            if stale := sorted(self._stale_embedding_ids - live_ids):
+                logger.info(ls.EMBEDDING_STALE_DELETED, count=len(stale))
+                delete_project_embeddings(self.project_name, stale)
+            self._stale_embedding_ids.clear()
+
+            # The lexical index follows the vectors: rebuilt on a full build,
+            # and on an update every definition of a re-parsed file is
+            # dropped and re-added from the fresh rows below.
+            lexical = (
+                get_lexical_index(self.project_name)
+                if settings.LEXICAL_INDEX_ENABLED
+                else None
             )
+            if lexical is not None:
+                if paths is None:
+                    lexical.reset()
+                else:
+                    lexical.remove_paths(paths)
 
             if not results:
                 logger.info(ls.NO_FUNCTIONS_FOR_EMBEDDING)
+                if lexical is not None:
+                    lexical.save()
                 return
 
-            logger.info(ls.GENERATING_EMBEDDINGS, count=len(results))
+            if paths is None:
+                logger.info(ls.GENERATING_EMBEDDINGS, count=len(results))
+            else:
+                logger.info(
+                    ls.GENERATING_INCREMENTAL_EMBEDDINGS,
+                    count=len(results),
+                    files=len(paths),
+                )
 
-            embedded_count = 0
-            expected_ids: set[int] = set()
-            pending: list[tuple[int, str, str]] = []
-            flush_at = settings.QDRANT_BATCH_SIZE
+            # Grouped by file: each module is read and line-indexed once,
+            # not once per definition it holds. Runs on the pipeline's
+            # extraction thread, the only Pass 4 user of the AST cache.
+            source_cache = LastSourceFile()
 
-            def flush() -> int:
-                nonlocal pending
-                if not pending:
-                    return 0
-                snippets = [item[2] for item in pending]
-                try:
-                    embeddings = embed_code_batch(snippets)
-                except Exception as e:
-                    logger.warning(
-                        ls.EMBEDDING_BATCH_COMPUTE_FAILED,
-                        count=len(pending),
-                        error=e,
-                    )
-                    pending = []
-                    return 0
-                points: list[tuple[int, list[float], str]] = [
-                    (node_id, emb, qname)
-                    for (node_id, qname, _), emb in zip(pending, embeddings)
-                ]
-                for node_id, _qname, _src in pending:
-                    expected_ids.add(node_id)
-                stored = store_embedding_batch(points)
-                pending = []
-                return stored
-
-            for row in results:
+            def extract(row: ResultRow) -> tuple[int, str, str] | None:
                 parsed = self._parse_embedding_result(row)
                 if parsed is None:
-                    continue
+                    return None
 
-                node_id = parsed[cs.KEY_NODE_ID]
                 qualified_name = parsed[cs.KEY_QUALIFIED_NAME]
                 start_line = parsed.get(cs.KEY_START_LINE)
                 end_line = parsed.get(cs.KEY_END_LINE)
@@ -2816,31 +3268,41 @@ class GraphUpdater:
 
                 if start_line is None or end_line is None or file_path is None:
                     logger.debug(ls.NO_SOURCE_FOR, name=qualified_name)
-                    continue
+                    return None
 
                 if source_code := self._extract_source_code(
-                    qualified_name, file_path, start_line, end_line
+                    qualified_name, file_path, start_line, end_line, source_cache
                 ):
-                    pending.append((node_id, qualified_name, source_code))
-                    if len(pending) >= flush_at:
-                        embedded_count += flush()
-                        if (
-                            embedded_count % settings.EMBEDDING_PROGRESS_INTERVAL == 0
-                            and embedded_count > 0
-                        ):
-                            logger.debug(
-                                ls.EMBEDDING_PROGRESS,
-                                done=embedded_count,
-                                total=len(results),
-                            )
-                else:
-                    logger.debug(ls.NO_SOURCE_FOR, name=qualified_name)
+                    if lexical is not None:
+                        lexical.add(
+                            parsed[cs.KEY_NODE_ID],
+                            qualified_name,
+                            file_path,
+                            source_code,
+                        )
+                    return parsed[cs.KEY_NODE_ID], qualified_name, source_code
+                logger.debug(ls.NO_SOURCE_FOR, name=qualified_name)
+                return None
 
-            embedded_count += flush()
+            def report_progress(stored: int) -> None:
+                if stored % settings.EMBEDDING_PROGRESS_INTERVAL == 0 and stored > 0:
+                    logger.debug(ls.EMBEDDING_PROGRESS, done=stored, total=len(results))
 
-            logger.info(ls.EMBEDDINGS_COMPLETE, count=embedded_count)
+            outcome = run_embedding_pipeline(
+                sorted(results, key=lambda r: str(r.get(cs.KEY_PATH) or "")),
+                extract,
+                embed_code_batch,
+                store_embedding_batch,
+                batch_size=settings.QDRANT_BATCH_SIZE,
+                depth=settings.EMBEDDING_PIPELINE_DEPTH,
+                on_stored=report_progress,
+            )
 
-            self._reconcile_embeddings(expected_ids, verify_stored_ids)
+            logger.info(ls.EMBEDDINGS_COMPLETE, count=outcome.stored)
+            if lexical is not None:
+                lexical.save()
+
+            self._reconcile_embeddings(outcome.expected_ids, verify_stored_ids)
 
             get_embedding_cache().save()
             close_qdrant_client()
@@ -2873,7 +3335,12 @@ class GraphUpdater:
             logger.warning(ls.EMBEDDING_RECONCILE_FAILED.format(error=e))
 
     def _extract_source_code(
-        self, qualified_name: str, file_path: str, start_line: int, end_line: int
+        self,
+        qualified_name: str,
+        file_path: str,
+        start_line: int,
+        end_line: int,
+        source_cache: LastSourceFile | None = None,
     ) -> str | None:
         if not file_path or not start_line or not end_line:
             return None
@@ -2900,7 +3367,12 @@ class GraphUpdater:
                 ast_extractor = ast_extractor_func
 
         return extract_source_with_fallback(
-            file_path_obj, start_line, end_line, qualified_name, ast_extractor
+            file_path_obj,
+            start_line,
+            end_line,
+            qualified_name,
+            ast_extractor,
+            source_cache=source_cache,
         )
 
     def _parse_embedding_result(self, row: ResultRow) -> EmbeddingQueryResult | None:
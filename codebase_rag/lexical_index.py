@@ -0,0 +1,439 @@
+# A persistent inverted index over the definitions Pass 4 embeds, so a
+# search for an identifier such as `parse_with_preproc_recovery` or
+# `OrderService.refund` is answered without a model forward pass.
+#
+# Each definition is one document with two fields: its name (the qualified
+# name's segments) and its body (every identifier and word in its source,
+# docstrings included). Identifiers are indexed whole and split into their
+# snake_case / camelCase parts. Scoring is BM25 per field with the name
+# field weighted up; a name term the index has never seen is widened to
+# the indexed names containing it, found through a trigram index over the
+# name vocabulary. One JSON file per project lives next to the embedding
+# cache and is reloaded when another process rewrites it.
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import quote, unquote
+
+from loguru import logger
+
+from . import constants as cs
+from . import logs as ls
+from .config import settings
+
+_INDEX_VERSION = 1
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+_NAME_WEIGHT = 3.0
+# A partial name match counts for less than the exact term it stands in for.
+_PARTIAL_WEIGHT = 0.5
+_PARTIAL_LIMIT = 64
+# Added once per document whose qualified name ends with the whole query,
+# so an exact identifier outranks bodies that merely mention it.
+_EXACT_BONUS = 10.0
+_MIN_TERM = 2
+_GRAM = 3
+
+_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*")
+_CAMEL_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+\d*|[A-Z]+\d*|\d+")
+_QUERY_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*(?:(?:\.|::|#)[A-Za-z_$][\w$]*)*")
+_IDENTIFIER_SHAPE = re.compile(r"[_.#$]|::|[a-z][A-Z]|\d")
+_NAME_SEPARATORS = re.compile(r"::|#")
+
+
+def _identifier_terms(identifier: str) -> list[str]:
+    """`parseHTTPRequest_v2` -> the whole identifier and each of its parts."""
+    whole = identifier.lower()
+    terms = [whole] if len(whole) >= _MIN_TERM else []
+    for chunk in identifier.split("_"):
+        parts = [part.lower() for part in _CAMEL_PART.findall(chunk)]
+        if len(parts) > 1 or (parts and parts[0] != whole):
+            terms.extend(part for part in parts if len(part) >= _MIN_TERM)
+    return terms
+
+
+def tokenize(text: str) -> list[str]:
+    return [
+        term
+        for identifier in _IDENTIFIER.findall(text)
+        for term in _identifier_terms(identifier)
+    ]
+
+
+def _trigrams(term: str) -> set[str]:
+    return {term[i : i + _GRAM] for i in range(len(term) - _GRAM + 1)}
+
+
+def is_identifier_query(query: str) -> bool:
+    """Whether `query` reads as a code identifier rather than prose.
+
+    One token shaped like code: dotted or `::` qualified, snake_case,
+    camelCase or carrying digits. A plain word such as `refund` is left to
+    hybrid search since it is as likely to describe intent as to name.
+    """
+    query = query.strip()
+    return bool(_QUERY_IDENTIFIER.fullmatch(query) and _IDENTIFIER_SHAPE.search(query))
+
+
+class LexicalHit(NamedTuple):
+    node_id: int
+    score: float
+    # The qualified name is the query itself or ends with it; a match on
+    # its snake_case / camelCase parts alone does not count.
+    exact: bool
+
+
+@dataclass(slots=True)
+class _Document:
+    qualified_name: str
+    path: str
+    name_terms: dict[str, int]
+    body_terms: dict[str, int]
+    name_length: int
+    body_length: int
+
+
+class _Field:
+    """Postings and length statistics of one document field."""
+
+    __slots__ = ("postings", "total_length", "name_vocabulary")
+
+    def __init__(self, *, name_vocabulary: bool) -> None:
+        self.postings: dict[str, dict[int, int]] = {}
+        self.total_length = 0
+        # Trigram -> terms holding it; only the name field needs partials.
+        self.name_vocabulary: dict[str, set[str]] | None = (
+            {} if name_vocabulary else None
+        )
+
+    def add(self, doc_id: int, terms: dict[str, int], length: int) -> None:
+        self.total_length += length
+        for term, count in terms.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                if self.name_vocabulary is not None:
+                    for gram in _trigrams(term):
+                        self.name_vocabulary.setdefault(gram, set()).add(term)
+            postings[doc_id] = count
+
+    def remove(self, doc_id: int, terms: dict[str, int], length: int) -> None:
+        self.total_length -= length
+        for term in terms:
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if postings:
+                continue
+            del self.postings[term]
+            if self.name_vocabulary is not None:
+                for gram in _trigrams(term):
+                    holders = self.name_vocabulary.get(gram)
+                    if holders is not None:
+                        holders.discard(term)
+                        if not holders:
+                            del self.name_vocabulary[gram]
+
+    def containing(self, fragment: str) -> list[str]:
+        """Indexed terms that contain `fragment`, via the trigram index."""
+        if self.name_vocabulary is None or len(fragment) < _GRAM:
+            return []
+        holders = sorted(
+            (self.name_vocabulary.get(gram, set()) for gram in _trigrams(fragment)),
+            key=len,
+        )
+        if not holders or not holders[0]:
+            return []
+        candidates = set(holders[0]).intersection(*holders[1:])
+        return sorted(term for term in candidates if fragment in term)[:_PARTIAL_LIMIT]
+
+
+class LexicalIndex:
+    """The BM25 index of one project's definitions, keyed by graph node id."""
+
+    __slots__ = ("path", "_docs", "_name", "_body", "_lock", "_mtime")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._docs: dict[int, _Document] = {}
+        self._name = _Field(name_vocabulary=True)
+        self._body = _Field(name_vocabulary=False)
+        self._lock = threading.RLock()
+        self._mtime: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, node_id: int, qualified_name: str, path: str, source: str) -> None:
+        name_tokens = tokenize(_NAME_SEPARATORS.sub(".", qualified_name))
+        body_tokens = tokenize(source)
+        self._insert(
+            node_id,
+            _Document(
+                qualified_name=qualified_name,
+                path=path,
+                name_terms=dict(Counter(name_tokens)),
+                body_terms=dict(Counter(body_tokens)),
+                name_length=len(name_tokens),
+                body_length=len(body_tokens),
+            ),
+        )
+
+    def _insert(self, node_id: int, doc: _Document) -> None:
+        with self._lock:
+            self._discard(node_id)
+            self._docs[node_id] = doc
+            self._name.add(node_id, doc.name_terms, doc.name_length)
+            self._body.add(node_id, doc.body_terms, doc.body_length)
+
+    def _discard(self, node_id: int) -> None:
+        if (doc := self._docs.pop(node_id, None)) is None:
+            return
+        self._name.remove(node_id, doc.name_terms, doc.name_length)
+        self._body.remove(node_id, doc.body_terms, doc.body_length)
+
+    def remove_ids(self, node_ids: set[int]) -> None:
+        with self._lock:
+            for node_id in node_ids:
+                self._discard(node_id)
+
+    def remove_paths(self, paths: set[str]) -> None:
+        with self._lock:
+            self.remove_ids(
+                {node_id for node_id, doc in self._docs.items() if doc.path in paths}
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._docs.clear()
+            self._name = _Field(name_vocabulary=True)
+            self._body = _Field(name_vocabulary=False)
+
+    def _bm25(
+        self,
+        field: _Field,
+        term: str,
+        weight: float,
+        length_of: str,
+        scores: dict[int, float],
+    ) -> None:
+        postings = field.postings.get(term)
+        if not postings:
+            return
+        count = len(self._docs)
+        idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+        average = field.total_length / count if count else 0.0
+        for node_id, frequency in postings.items():
+            length = getattr(self._docs[node_id], length_of)
+            norm = 1 - _BM25_B + _BM25_B * (length / average if average else 0.0)
+            scores[node_id] = scores.get(node_id, 0.0) + weight * idf * (
+                frequency * (_BM25_K1 + 1) / (frequency + _BM25_K1 * norm)
+            )
+
+    def search(
+        self, query: str, top_k: int, scope: str | None = None
+    ) -> list[LexicalHit]:
+        """The `top_k` best BM25 matches for `query`, best first.
+
+        `scope` keeps only qualified names equal to it or beneath it.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        scores: dict[int, float] = {}
+        with self._lock:
+            for term in terms:
+                if term in self._name.postings:
+                    self._bm25(self._name, term, _NAME_WEIGHT, "name_length", scores)
+                else:
+                    for partial in self._name.containing(term):
+                        self._bm25(
+                            self._name,
+                            partial,
+                            _NAME_WEIGHT * _PARTIAL_WEIGHT,
+                            "name_length",
+                            scores,
+                        )
+                self._bm25(self._body, term, 1.0, "body_length", scores)
+
+            exact = _NAME_SEPARATORS.sub(".", query.strip()).lower()
+            hits: list[LexicalHit] = []
+            for node_id, score in scores.items():
+                qualified_name = self._docs[node_id].qualified_name
+                if scope is not None and not (
+                    qualified_name == scope or qualified_name.startswith(f"{scope}.")
+                ):
+                    continue
+                lowered = qualified_name.lower()
+                is_exact = lowered == exact or lowered.endswith(f".{exact}")
+                if is_exact:
+                    score += _EXACT_BONUS
+                hits.append(LexicalHit(node_id, score, is_exact))
+        hits.sort(key=lambda hit: (-hit.score, hit.node_id))
+        return hits[:top_k]
+
+    def load(self) -> None:
+        with self._lock:
+            self.reset()
+            try:
+                stat = self.path.stat()
+            except FileNotFoundError:
+                self._mtime = None
+                return
+            try:
+                data = json.loads(self.path.read_text(encoding=cs.ENCODING_UTF8))
+                if data.get("version") != _INDEX_VERSION:
+                    raise ValueError(data.get("version"))
+                for node_id, qualified_name, path, name, body in data["docs"]:
+                    self._insert(
+                        node_id,
+                        _Document(
+                            qualified_name=qualified_name,
+                            path=path,
+                            name_terms=name,
+                            body_terms=body,
+                            name_length=sum(name.values()),
+                            body_length=sum(body.values()),
+                        ),
+                    )
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(ls.LEXICAL_INDEX_LOAD_FAILED, path=self.path, error=e)
+                self.reset()
+            self._mtime = stat.st_mtime
+
+    def reload_if_changed(self) -> None:
+        try:
+            mtime: float | None = self.path.stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self._mtime:
+            self.load()
+
+    def save(self) -> None:
+        with self._lock:
+            docs = [
+                [node_id, doc.qualified_name, doc.path, doc.name_terms, doc.body_terms]
+                for node_id, doc in self._docs.items()
+            ]
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+                tmp_path.write_text(
+                    json.dumps({"version": _INDEX_VERSION, "docs": docs}),
+                    encoding=cs.ENCODING_UTF8,
+                )
+                os.replace(tmp_path, self.path)
+                self._mtime = self.path.stat().st_mtime
+                logger.info(ls.LEXICAL_INDEX_SAVED, count=len(docs), path=self.path)
+            except OSError as e:
+                logger.warning(ls.LEXICAL_INDEX_SAVE_FAILED, path=self.path, error=e)
+
+
+_indexes: dict[Path, LexicalIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def _index_root() -> Path:
+    return Path(settings.QDRANT_DB_PATH) / cs.LEXICAL_INDEX_DIRNAME
+
+
+def _open(path: Path) -> LexicalIndex:
+    with _indexes_lock:
+        if (index := _indexes.get(path)) is None:
+            index = _indexes[path] = LexicalIndex(path)
+            index.load()
+    return index
+
+
+def get_lexical_index(project: str) -> LexicalIndex:
+    filename = f"{quote(project, safe='') or '_'}{cs.LEXICAL_INDEX_SUFFIX}"
+    return _open(_index_root() / filename)
+
+
+def _project_indexes(project: str | None) -> list[LexicalIndex]:
+    if project is not None:
+        # Stored projects are the first qualified-name segment, as for vectors.
+        indexes = [get_lexical_index(project.split(cs.SEPARATOR_DOT, 1)[0])]
+    else:
+        root = _index_root()
+        if not root.is_dir():
+            return []
+        indexes = [
+            get_lexical_index(unquote(entry.name.removesuffix(cs.LEXICAL_INDEX_SUFFIX)))
+            for entry in sorted(root.glob(f"*{cs.LEXICAL_INDEX_SUFFIX}"))
+        ]
+    for index in indexes:
+        index.reload_if_changed()
+    return indexes
+
+
+def search_lexical(
+    query: str, top_k: int, project: str | None = None
+) -> list[LexicalHit]:
+    """The `top_k` best matches across the project indexes, best first.
+
+    Each hit reports whether its qualified name matched `query` exactly.
+    """
+    hits = [
+        hit
+        for index in _project_indexes(project)
+        for hit in index.search(query, top_k, scope=project)
+    ]
+    hits.sort(key=lambda hit: (-hit.score, hit.node_id))
+    return hits[:top_k]
+
+
+def fuse_scores(
+    vector_hits: list[tuple[int, float]],
+    lexical_hits: list[LexicalHit],
+    top_k: int,
+    lexical_weight: float,
+) -> list[tuple[int, float]]:
+    """Blend cosine scores with BM25 scores scaled to the best lexical hit.
+
+    A definition only one side found gets nothing from the other, so a
+    lexical-only hit needs a strong name match to outrank vector hits.
+    """
+    if not lexical_hits:
+        return vector_hits[:top_k]
+    best = lexical_hits[0].score or 1.0
+    lexical = {hit.node_id: hit.score / best for hit in lexical_hits}
+    vector = dict(vector_hits)
+    fused = [
+        (
+            node_id,
+            (1 - lexical_weight) * vector.get(node_id, 0.0)
+            + lexical_weight * lexical.get(node_id, 0.0),
+        )
+        for node_id in dict.fromkeys([*vector, *lexical])
+    ]
+    fused.sort(key=lambda hit: (-hit[1], hit[0]))
+    return fused[:top_k]
+
+
+def delete_lexical_ids(project: str, node_ids: set[int]) -> None:
+    index = get_lexical_index(project)
+    if not index.path.exists() and not len(index):
+        return
+    index.reload_if_changed()
+    index.remove_ids(node_ids)
+    index.save()
+
+
+def clear_lexical_index() -> None:
+    with _indexes_lock:
+        _indexes.clear()
+    root = _index_root()
+    if root.is_dir():
+        for entry in root.glob(f"*{cs.LEXICAL_INDEX_SUFFIX}"):
+            entry.unlink(missing_ok=True)
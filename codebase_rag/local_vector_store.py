@@ -0,0 +1,546 @@
+"""Embedded vector store: per-project memory-mapped matrices, no service.
+
+Each project (the first segment of a qualified name) owns a directory under
+`LOCAL_VECTOR_PATH` holding four append-only files:
+
+- `vectors.f32`: unit-normalised little-endian float32 rows
+- `ids.i64`: the node id of each row
+- `names.txt`: the qualified name of each row, one per line
+- `dead.i64`: row numbers tombstoned by a delete or an overwrite
+
+Appends never rewrite earlier rows, so a sync that stores fifty vectors
+writes fifty rows. A torn tail (a crash mid-append) is cut back to the last
+row present in all three row files when the partition opens, and a
+partition whose tombstones outnumber its live rows is compacted.
+
+Search is exact by default: one matrix-vector product over the memory-mapped
+rows gives cosine similarity (rows and query are unit vectors), and
+`argpartition` selects the top k. With `LOCAL_VECTOR_INDEX=ivf`, partitions
+of at least `LOCAL_VECTOR_IVF_MIN_ROWS` rows also keep an inverted-file
+index (spherical k-means centroids plus each row's list, `ivf.npz`), and a
+query scores only the rows of its `LOCAL_VECTOR_IVF_PROBES` nearest lists.
+
+With `VECTOR_QUANTIZATION=int8` or `binary`, a partition also keeps
+`codes.i8` or `codes.b1`, derived from `vectors.f32` and extended on demand.
+Candidates are ranked on the codes and only the shortlist is rescored against
+the float32 rows, so a search reads a quarter (or a thirty-second) of the
+matrix plus the few float rows it rescores.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+from numpy.typing import NDArray
+
+from . import constants as cs
+from . import exceptions as ex
+from . import vector_quantization as vq
+from .config import settings
+
+_VECTORS_FILE = "vectors.f32"
+_IDS_FILE = "ids.i64"
+_NAMES_FILE = "names.txt"
+_DEAD_FILE = "dead.i64"
+_IVF_FILE = "ivf.npz"
+_IVF_TMP_FILE = "ivf.tmp.npz"
+_CODES_FILES = {
+    cs.VectorQuantization.INT8: "codes.i8",
+    cs.VectorQuantization.BINARY: "codes.b1",
+}
+_META_FILE = "meta.json"
+_META_VERSION = 1
+_FLOAT = np.dtype("<f4")
+_INT = np.dtype("<i8")
+_COMPACT_MIN_DEAD = 1024
+_IVF_MAX_LISTS = 4096
+_IVF_TRAIN_PER_LIST = 64
+_IVF_ITERATIONS = 10
+# An index trained on far fewer rows than the partition now holds has
+# lists too coarse to prune well; past this growth it is retrained.
+_IVF_RETRAIN_GROWTH = 4
+_ASSIGN_CHUNK = 65536
+
+type ScoredRow = tuple[int, float, str]
+
+
+def partition_name(qualified_name: str) -> str:
+    return qualified_name.split(".", 1)[0]
+
+
+def _unit_rows(vectors: NDArray[np.float32]) -> NDArray[np.float32]:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(
+    scores: NDArray[np.float32], rows: NDArray[np.int64], k: int
+) -> list[tuple[int, float]]:
+    if k <= 0 or not len(rows):
+        return []
+    if k < len(rows):
+        picked = np.argpartition(-scores, k - 1)[:k]
+        scores, rows = scores[picked], rows[picked]
+    order = np.argsort(-scores, kind="stable")
+    return [(int(rows[i]), float(scores[i])) for i in order]
+
+
+class _Partition:
+    __slots__ = (
+        "path",
+        "dim",
+        "ids",
+        "names",
+        "dead",
+        "_row_of",
+        "_view",
+        "_codes",
+        "_codes_mode",
+        "_ivf_centroids",
+        "_ivf_lists",
+        "_ivf_trained_rows",
+    )
+
+    def __init__(self, path: Path, dim: int) -> None:
+        self.path = path
+        self.dim = dim
+        self.ids: NDArray[np.int64] = np.empty(0, dtype=_INT)
+        self.names: list[str] = []
+        self.dead: set[int] = set()
+        self._row_of: dict[int, int] = {}
+        self._view: NDArray[np.float32] | None = None
+        self._codes: NDArray | None = None
+        self._codes_mode: cs.VectorQuantization | None = None
+        self._ivf_centroids: NDArray[np.float32] | None = None
+        self._ivf_lists: NDArray[np.int32] | None = None
+        self._ivf_trained_rows = 0
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def live_count(self) -> int:
+        return len(self._row_of)
+
+    def _file(self, name: str) -> Path:
+        return self.path / name
+
+    def _load(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        row_bytes = self.dim * _FLOAT.itemsize
+        vectors = self._file(_VECTORS_FILE)
+        ids_path = self._file(_IDS_FILE)
+        names_path = self._file(_NAMES_FILE)
+        vector_rows = vectors.stat().st_size // row_bytes if vectors.exists() else 0
+        ids = (
+            np.fromfile(ids_path, dtype=_INT)
+            if ids_path.exists()
+            else np.empty(0, dtype=_INT)
+        )
+        names = (
+            names_path.read_text(encoding=cs.ENCODING_UTF8).split("\n")[:-1]
+            if names_path.exists()
+            else []
+        )
+        rows = min(vector_rows, len(ids), len(names))
+        # Cut every row file back to the rows all three hold: an append
+        # that died part-way must not shift later rows out of alignment.
+        with open(vectors, "ab") as handle:
+            handle.truncate(rows * row_bytes)
+        with open(ids_path, "ab") as handle:
+            handle.truncate(rows * _INT.itemsize)
+        self.names = names[:rows]
+        if len(names) != rows:
+            names_path.write_text(
+                "".join(f"{name}\n" for name in self.names), encoding=cs.ENCODING_UTF8
+            )
+        self.ids = ids[:rows].copy()
+        dead_path = self._file(_DEAD_FILE)
+        if dead_path.exists():
+            dead = np.fromfile(dead_path, dtype=_INT)
+            self.dead = {int(row) for row in dead if row < rows}
+        self._row_of = {
+            int(node_id): row
+            for row, node_id in enumerate(self.ids)
+            if row not in self.dead
+        }
+        self._load_ivf()
+
+    def _vectors(self) -> NDArray[np.float32]:
+        if self._view is None or len(self._view) != len(self.ids):
+            if not len(self.ids):
+                return np.empty((0, self.dim), dtype=_FLOAT)
+            self._view = np.memmap(
+                self._file(_VECTORS_FILE),
+                dtype=_FLOAT,
+                mode="r",
+                shape=(len(self.ids), self.dim),
+            )
+        return self._view
+
+    def _quantized(self, mode: cs.VectorQuantization) -> NDArray | None:
+        # Codes are derived from vectors.f32: rows missing from the codes
+        # file are encoded here, and rows past the matrix (a torn append)
+        # are cut, so neither a crash nor a mode switch needs a repair step.
+        if mode not in vq.LOCAL_MODES:
+            return None
+        rows = len(self.ids)
+        if self._codes_mode == mode and self._codes is not None:
+            if len(self._codes) == rows:
+                return self._codes
+        self._codes = None
+        width = vq.code_width(self.dim, mode)
+        path = self._file(_CODES_FILES[mode])
+        encoded = min(rows, path.stat().st_size // width if path.exists() else 0)
+        vectors = self._vectors()
+        with open(path, "ab") as handle:
+            handle.truncate(encoded * width)
+            for start in range(encoded, rows, _ASSIGN_CHUNK):
+                chunk = np.asarray(vectors[start : min(start + _ASSIGN_CHUNK, rows)])
+                handle.write(vq.encode(chunk, mode).tobytes())
+        self._codes = (
+            np.memmap(path, dtype=vq.code_dtype(mode), mode="r", shape=(rows, width))
+            if rows
+            else np.empty((0, width), dtype=vq.code_dtype(mode))
+        )
+        self._codes_mode = mode
+        return self._codes
+
+    def contains(self, node_id: int) -> bool:
+        return node_id in self._row_of
+
+    def append(
+        self, ids: list[int], vectors: NDArray[np.float32], names: list[str]
+    ) -> None:
+        self._tombstone([self._row_of[i] for i in ids if i in self._row_of])
+        start = len(self.ids)
+        with open(self._file(_VECTORS_FILE), "ab") as handle:
+            handle.write(_unit_rows(vectors).astype(_FLOAT).tobytes())
+        with open(self._file(_IDS_FILE), "ab") as handle:
+            handle.write(np.asarray(ids, dtype=_INT).tobytes())
+        with open(self._file(_NAMES_FILE), "a", encoding=cs.ENCODING_UTF8) as handle:
+            handle.write("".join(f"{name}\n" for name in names))
+        self.ids = np.concatenate([self.ids, np.asarray(ids, dtype=_INT)])
+        self.names.extend(names)
+        for offset, node_id in enumerate(ids):
+            self._row_of[node_id] = start + offset
+
+    def delete(self, ids: Iterable[int]) -> int:
+        rows = [self._row_of.pop(i) for i in ids if i in self._row_of]
+        self._tombstone(rows, already_unmapped=True)
+        return len(rows)
+
+    def _tombstone(self, rows: list[int], already_unmapped: bool = False) -> None:
+        if not rows:
+            return
+        if not already_unmapped:
+            for row in rows:
+                self._row_of.pop(int(self.ids[row]), None)
+        self.dead.update(rows)
+        with open(self._file(_DEAD_FILE), "ab") as handle:
+            handle.write(np.asarray(rows, dtype=_INT).tobytes())
+
+    def maybe_compact(self) -> None:
+        if len(self.dead) < _COMPACT_MIN_DEAD or len(self.dead) <= self.live_count:
+            return
+        live = np.asarray(sorted(self._row_of.values()), dtype=np.int64)
+        vectors = np.asarray(self._vectors()[live]) if len(live) else None
+        ids = [int(self.ids[row]) for row in live]
+        names = [self.names[row] for row in live]
+        self._view = None
+        self._codes = None
+        for name in (
+            _VECTORS_FILE,
+            _IDS_FILE,
+            _NAMES_FILE,
+            _DEAD_FILE,
+            _IVF_FILE,
+            *_CODES_FILES.values(),
+        ):
+            self._file(name).unlink(missing_ok=True)
+        self.ids = np.empty(0, dtype=_INT)
+        self.names = []
+        self.dead = set()
+        self._row_of = {}
+        self._drop_ivf()
+        if vectors is not None:
+            self.append(ids, vectors, names)
+
+    def search(
+        self, query: NDArray[np.float32], k: int, prefix: str | None
+    ) -> list[ScoredRow]:
+        if not self._row_of:
+            return []
+        rows = self._candidate_rows(query)
+        if prefix is not None:
+            rows = rows[[self.names[row].startswith(prefix) for row in rows]]
+        if not len(rows):
+            return []
+        vectors = self._vectors()
+        mode = settings.VECTOR_QUANTIZATION
+        if (codes := self._quantized(mode)) is not None:
+            coarse = vq.coarse_scores(
+                codes if len(rows) == len(codes) else codes[rows], query, mode
+            )
+            size = vq.shortlist_size(k, settings.VECTOR_RESCORE_OVERSAMPLING)
+            rows = vq.shortlist(coarse, rows, size)
+        scores = vectors @ query if len(rows) == len(vectors) else vectors[rows] @ query
+        return [
+            (int(self.ids[row]), score, self.names[row])
+            for row, score in _top_k(scores, rows, k)
+        ]
+
+    def _candidate_rows(self, query: NDArray[np.float32]) -> NDArray[np.int64]:
+        if self._ivf_enabled():
+            self._refresh_ivf()
+            assert self._ivf_centroids is not None and self._ivf_lists is not None
+            probes = min(settings.LOCAL_VECTOR_IVF_PROBES, len(self._ivf_centroids))
+            nearest = np.argpartition(-(self._ivf_centroids @ query), probes - 1)[
+                :probes
+            ]
+            rows = np.flatnonzero(np.isin(self._ivf_lists, nearest))
+        else:
+            rows = np.arange(len(self.ids), dtype=np.int64)
+        if self.dead:
+            rows = rows[~np.isin(rows, np.fromiter(self.dead, dtype=np.int64))]
+        return rows
+
+    def _ivf_enabled(self) -> bool:
+        return (
+            settings.LOCAL_VECTOR_INDEX == cs.LocalVectorIndex.IVF
+            and self.live_count >= settings.LOCAL_VECTOR_IVF_MIN_ROWS
+        )
+
+    def _load_ivf(self) -> None:
+        path = self._file(_IVF_FILE)
+        if not path.exists():
+            return
+        try:
+            with np.load(path) as data:
+                centroids = data["centroids"]
+                lists = data["lists"]
+                trained = int(data["trained_rows"])
+        except (OSError, KeyError, ValueError):
+            path.unlink(missing_ok=True)
+            return
+        if centroids.shape[1:] != (self.dim,) or len(lists) > len(self.ids):
+            path.unlink(missing_ok=True)
+            return
+        self._ivf_centroids = centroids.astype(_FLOAT)
+        self._ivf_lists = lists.astype(np.int32)
+        self._ivf_trained_rows = trained
+
+    def _drop_ivf(self) -> None:
+        self._ivf_centroids = None
+        self._ivf_lists = None
+        self._ivf_trained_rows = 0
+
+    def _refresh_ivf(self) -> None:
+        rows = len(self.ids)
+        if (
+            self._ivf_centroids is None
+            or rows > self._ivf_trained_rows * _IVF_RETRAIN_GROWTH
+        ):
+            self._train_ivf()
+        assert self._ivf_centroids is not None and self._ivf_lists is not None
+        if len(self._ivf_lists) == rows:
+            return
+        # Rows appended since the last search join their nearest list; the
+        # centroids stay until the partition outgrows them.
+        tail = self._assign(len(self._ivf_lists), rows)
+        self._ivf_lists = np.concatenate([self._ivf_lists, tail])
+        self._save_ivf()
+
+    def _assign(self, start: int, stop: int) -> NDArray[np.int32]:
+        assert self._ivf_centroids is not None
+        vectors = self._vectors()
+        parts = [
+            np.argmax(
+                vectors[chunk : min(chunk + _ASSIGN_CHUNK, stop)]
+                @ self._ivf_centroids.T,
+                axis=1,
+            ).astype(np.int32)
+            for chunk in range(start, stop, _ASSIGN_CHUNK)
+        ]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+
+    def _train_ivf(self) -> None:
+        live = np.asarray(sorted(self._row_of.values()), dtype=np.int64)
+        lists = int(min(_IVF_MAX_LISTS, max(1, np.sqrt(len(live)))))
+        rng = np.random.default_rng(0)
+        sample_size = min(len(live), lists * _IVF_TRAIN_PER_LIST)
+        sample = np.asarray(
+            self._vectors()[np.sort(rng.choice(live, sample_size, replace=False))]
+        )
+        centroids = sample[rng.choice(len(sample), lists, replace=False)].copy()
+        for _ in range(_IVF_ITERATIONS):
+            nearest = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, nearest, sample)
+            counts = np.bincount(nearest, minlength=lists)
+            empty = counts == 0
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = _unit_rows(sums)
+        self._ivf_centroids = centroids.astype(_FLOAT)
+        self._ivf_lists = np.empty(0, dtype=np.int32)
+        self._ivf_trained_rows = len(self.ids)
+
+    def _save_ivf(self) -> None:
+        assert self._ivf_centroids is not None and self._ivf_lists is not None
+        tmp = self._file(_IVF_TMP_FILE)
+        with open(tmp, "wb") as handle:
+            np.savez(
+                handle,
+                centroids=self._ivf_centroids,
+                lists=self._ivf_lists,
+                trained_rows=np.int64(self._ivf_trained_rows),
+            )
+        os.replace(tmp, self._file(_IVF_FILE))
+
+    def close(self) -> None:
+        self._view = None
+        self._codes = None
+
+
+class LocalVectorClient:
+    """The open partitions of one `LOCAL_VECTOR_PATH` directory.
+
+    Held as the module's vector-store client like the Qdrant and Milvus
+    clients; a lock serialises the Pass 4 writer thread against readers.
+    """
+
+    __slots__ = ("root", "dim", "_partitions", "_scanned", "_lock")
+
+    def __init__(self, root: Path, dim: int) -> None:
+        self.root = root
+        self.dim = dim
+        # Keyed by directory name, the quoted partition name.
+        self._partitions: dict[str, _Partition] = {}
+        self._scanned = False
+        self._lock = threading.Lock()
+        self._check_meta()
+
+    def _check_meta(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        meta_path = self.root / _META_FILE
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text(encoding=cs.ENCODING_UTF8))
+            if meta.get("dim") != self.dim:
+                raise ValueError(
+                    ex.LOCAL_VECTOR_DIM_MISMATCH.format(
+                        path=self.root, dim=meta.get("dim"), expected=self.dim
+                    )
+                )
+            return
+        meta_path.write_text(
+            json.dumps({"version": _META_VERSION, "dim": self.dim}),
+            encoding=cs.ENCODING_UTF8,
+        )
+
+    def _open(self, directory: str) -> _Partition:
+        if (partition := self._partitions.get(directory)) is None:
+            partition = _Partition(self.root / directory, self.dim)
+            self._partitions[directory] = partition
+        return partition
+
+    def _partition(self, name: str, create: bool) -> _Partition | None:
+        directory = quote(name, safe="") or "_"
+        if not create and not (self.root / directory).is_dir():
+            return None
+        return self._open(directory)
+
+    def _all_partitions(self) -> list[_Partition]:
+        if not self._scanned:
+            for entry in sorted(self.root.iterdir()):
+                if entry.is_dir():
+                    self._open(entry.name)
+            self._scanned = True
+        return list(self._partitions.values())
+
+    def upsert(self, points: Sequence[tuple[int, list[float], str]]) -> int:
+        # The last point for an id wins, as with an upsert to a service.
+        latest = {point[0]: point for point in points}
+        grouped: dict[str, list[tuple[int, list[float], str]]] = {}
+        for point in latest.values():
+            if len(point[1]) != self.dim:
+                raise ValueError(
+                    ex.LOCAL_VECTOR_BAD_ROW.format(dim=len(point[1]), expected=self.dim)
+                )
+            grouped.setdefault(partition_name(point[2]), []).append(point)
+        with self._lock:
+            for name, rows in grouped.items():
+                partition = self._partition(name, create=True)
+                assert partition is not None
+                # A node id lives in one partition: a definition whose
+                # project prefix changed must not keep its old row.
+                ids = [node_id for node_id, _vector, _qn in rows]
+                for other in self._all_partitions():
+                    if other is not partition:
+                        other.delete(ids)
+                partition.append(
+                    ids,
+                    np.asarray([vector for _id, vector, _qn in rows], dtype=_FLOAT),
+                    [qn for _id, _vector, qn in rows],
+                )
+                partition.maybe_compact()
+        return len(points)
+
+    def delete(self, node_ids: Sequence[int]) -> int:
+        with self._lock:
+            deleted = 0
+            for partition in self._all_partitions():
+                deleted += partition.delete(node_ids)
+                partition.maybe_compact()
+            return deleted
+
+    def existing(self, node_ids: set[int]) -> set[int]:
+        with self._lock:
+            partitions = self._all_partitions()
+            return {i for i in node_ids if any(p.contains(i) for p in partitions)}
+
+    def search(
+        self, query_embedding: list[float], top_k: int, project: str | None
+    ) -> list[tuple[int, float]]:
+        query = np.asarray(query_embedding, dtype=_FLOAT)
+        if query.shape != (self.dim,):
+            raise ValueError(
+                ex.LOCAL_VECTOR_BAD_ROW.format(dim=len(query), expected=self.dim)
+            )
+        query = _unit_rows(query[None, :])[0]
+        with self._lock:
+            if project is None:
+                partitions = self._all_partitions()
+                prefix = None
+            else:
+                partition = self._partition(partition_name(project), create=False)
+                partitions = [] if partition is None else [partition]
+                # A dotted project name is narrower than its partition.
+                prefix = f"{project}." if "." in project else None
+            hits = [
+                hit
+                for partition in partitions
+                for hit in partition.search(query, top_k, prefix)
+            ]
+        hits.sort(key=lambda hit: hit[1], reverse=True)
+        return [(node_id, score) for node_id, score, _name in hits[:top_k]]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.close()
+            shutil.rmtree(self.root, ignore_errors=True)
+            self._scanned = False
+            self._check_meta()
+
+    def close(self) -> None:
+        for partition in self._partitions.values():
+            partition.close()
+        self._partitions.clear()
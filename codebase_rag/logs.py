@@ -4,6 +4,8 @@ PROVIDER_REGISTERED = "Registered provider: {name}"
 # Graph loading logs
 LOADING_GRAPH = "Loading graph from {path}"
 LOADED_GRAPH = "Loaded {nodes} nodes and {relationships} relationships with indexes"
+COLUMNAR_GRAPH_WRITTEN = "Columnar graph written to {path}"
+OFFLINE_GRAPH_READY = "Offline query engine ready over {path} ({nodes} nodes)"
 ENSURING_PROJECT = "Ensuring Project: {name}"
 
 # Pass logs
@@ -31,6 +33,15 @@ CPP_FRONTEND_HYBRID_PENDING = (
 )
 CPP_FRONTEND_MACRO_CALLS = "Resolved {count} hybrid macro CALLS edge(s)"
 CPP_FRONTEND_EXPANSION_CALLS = "Resolved {count} hybrid expansion CALLS edge(s)"
+CPP_FRONTEND_TUS = (
+    "C/C++ libclang frontend: {reused} translation unit(s) reused, {parsed} parsed"
+)
+CPP_FRONTEND_TU_CACHE_WRITE_FAILED = (
+    "Could not write libclang translation-unit cache {path}: {error}"
+)
+CPP_FRONTEND_POOL_FAILED = (
+    "libclang worker pool failed ({error}); parsing translation units in process"
+)
 CSHARP_FRONTEND_RUNNING = "--- C# Roslyn frontend: {path} ---"
 CSHARP_FRONTEND_UNAVAILABLE = (
     "C# Roslyn frontend enabled but dotnet is unavailable; using tree-sitter"
@@ -129,14 +140,60 @@ EMBEDDING_DEVICE_UNAVAILABLE = (
     "Requested embedding device '{device}' is unavailable, falling back to"
     " automatic selection"
 )
+EMBEDDING_INT8_FORCES_CPU = (
+    "Int8 UniXcoder inference runs on the CPU; ignoring embedding device '{device}'"
+)
+EMBEDDING_INT8_MODEL_LOADED = "Loaded int8 UniXcoder weights from {path}"
+EMBEDDING_INT8_MODEL_SAVED = "Cached int8 UniXcoder weights at {path}"
+EMBEDDING_INT8_MODEL_STALE = (
+    "Ignoring int8 UniXcoder weights at {path} written for another model or"
+    " torch version"
+)
+EMBEDDING_INT8_MODEL_CACHE_FAILED = (
+    "Could not use the int8 UniXcoder weight cache at {path}: {error}"
+)
+EMBEDDING_FUSED_ATTENTION_UNAVAILABLE = (
+    "Fused attention is unavailable for UniXcoder, using the default attention: {error}"
+)
+EMBEDDING_CPU_THREADS_SET = "Embedding inference uses {threads} CPU threads"
 NO_FUNCTIONS_FOR_EMBEDDING = "No functions or methods found for embedding generation"
 GENERATING_EMBEDDINGS = "Generating embeddings for {count} functions/methods"
+GENERATING_INCREMENTAL_EMBEDDINGS = (
+    "Generating embeddings for {count} functions/methods in {files} re-parsed files"
+)
+EMBEDDING_STALE_DELETED = "Dropping {count} vectors of removed or re-parsed definitions"
+EMBEDDING_STALE_LOOKUP_FAILED = (
+    "Could not read embedded definitions of {path} before deleting it: {error}"
+)
 EMBEDDING_PROGRESS = "Generated {done}/{total} embeddings"
 EMBEDDING_FAILED = "Failed to embed {name}: {error}"
 EMBEDDING_SNIPPET_FAILED = (
     "Failed to generate embedding for code snippet of length {length}"
 )
 EMBEDDING_BATCH_COMPUTE_FAILED = "Failed to embed batch of {count}: {error}"
+EMBEDDING_STAGE_STATS = (
+    "Embedding {stage} stage: {items} snippets, {busy:.2f}s busy "
+    "({rate:.1f}/s), {waited:.2f}s waiting on neighbours"
+)
+EMBEDDING_BATCH_THROUGHPUT = (
+    "Embedded {count} snippets in {batches} batches: {tokens} tokens "
+    "at {rate:.0f} tokens/s, {padding:.1%} padding"
+)
+QUERY_EMBEDDING_BATCH = (
+    "Embedded {size} queries ({distinct} distinct) in one pass after"
+    " {wait_ms:.1f}ms queued, {elapsed_ms:.1f}ms inference; {queries} queries"
+    " so far, {cache_hits} from cache, {mean_batch_size:.1f} per batch,"
+    " {mean_wait_ms:.1f}ms mean wait"
+)
+OPENAI_EMBEDDING_RATE_LIMITED = (
+    "Embedding endpoint rate-limited a batch of {count} (attempt"
+    " {attempt}/{max_attempts}); pausing {delay:.1f}s, {concurrency} requests"
+    " in flight"
+)
+LEXICAL_INDEX_SAVED = "Saved lexical index of {count} definitions to {path}"
+LEXICAL_INDEX_SAVE_FAILED = "Failed to save lexical index {path}: {error}"
+LEXICAL_INDEX_LOAD_FAILED = "Ignoring unreadable lexical index {path}: {error}"
+LEXICAL_INDEX_UPDATE_FAILED = "Failed to update lexical index: {error}"
 CONTEXT_TOKEN_COUNT_FAILED = "Context token count failed: {error}"
 NO_SOURCE_FOR = "No source code found for {name}"
 EMBEDDINGS_COMPLETE = "Successfully generated {count} semantic embeddings"
@@ -163,6 +220,23 @@ VECTOR_STORE_DELETE_PROJECT_FAILED = (
     "Failed to delete {backend} vectors for project '{project}': {error}"
 )
 VECTOR_STORE_CLEARED = "Cleared all {backend} vectors"
+VECTOR_STORE_PROJECT_BACKFILLED = (
+    "Backfilled the project payload on {count} existing {backend} vectors"
+)
+VECTOR_STORE_MIGRATION_FAILED = (
+    "Failed to migrate the existing {backend} collection: {error}"
+)
+VECTOR_STORE_QUANTIZATION_ENABLED = (
+    "Enabled '{mode}' quantization on the existing {backend} collection"
+)
+VECTOR_STORE_QUANTIZATION_UNSUPPORTED = (
+    "'{mode}' vector quantization is not available on {backend} here; "
+    "searching full-precision vectors"
+)
+MILVUS_PROJECT_FIELD_MISSING = (
+    "Milvus collection '{collection}' predates the '{field}' field; project-"
+    "scoped searches filter client-side until it is rebuilt with --clean"
+)
 QDRANT_DELETE_PROJECT = "Deleting {count} Qdrant vectors for project '{project}'"
 QDRANT_DELETE_PROJECT_DONE = "Deleted Qdrant vectors for project '{project}'"
 QDRANT_DELETE_PROJECT_FAILED = (
@@ -179,6 +253,11 @@ EMBEDDING_CACHE_HIT = "Embedding cache hit for {count} snippets"
 EMBEDDING_CACHE_LOADED = "Loaded embedding cache with {count} entries from {path}"
 EMBEDDING_CACHE_SAVE_FAILED = "Failed to save embedding cache to {path}: {error}"
 EMBEDDING_CACHE_LOAD_FAILED = "Failed to load embedding cache from {path}: {error}"
+EMBEDDING_CACHE_MIGRATED = "Migrated {count} embeddings from legacy cache {path}"
+EMBEDDING_CACHE_COMPACTED = "Compacted embedding cache {path}: dropped {dropped} rows"
+EMBEDDING_CACHE_INDEX_REJECTED = (
+    "Embedding cache index {path} does not match its data file; rescanning"
+)
 
 # Multimodal attachment logs
 MULTIMODAL_ATTACHED = "Attached multimodal content: {path}"
@@ -256,6 +335,12 @@ GRAPH_UPDATED = "Graph updated successfully for change in: {name}"
 INITIAL_SCAN = "Performing initial full codebase scan..."
 INITIAL_SCAN_DONE = "Initial scan complete. Starting real-time watcher."
 WATCHING = "Watching for changes in: {path}"
+WATCHER_REGISTERED = "Registered {count} directory watch(es), {recursive} recursive"
+WATCHER_WATCH_LIMIT = (
+    "Directory watch limit ({limit}) reached; watching {path} recursively"
+)
+WATCHER_SUBTREE_SPLIT = "Ignored subtree grew under {path}; re-registering its watches"
+WATCHER_EVENT_COUNTS = "Watcher events: {processed} processed, {dropped} dropped"
 LOGGER_CONFIGURED = "Logger configured for Real-Time Updater."
 
 # Build logs
@@ -444,6 +529,9 @@ DIR_LIST_ERROR = "Error listing directory {path}: {error}"
 # Semantic search logs
 SEMANTIC_NO_MATCH = "No semantic matches found for query: {query}"
 SEMANTIC_FOUND = "Found {count} semantic matches for: {query}"
+SEMANTIC_LEXICAL_ANSWER = (
+    "Answered identifier query '{query}' from the lexical index ({count} hits)"
+)
 SEMANTIC_FAILED = "Semantic search failed for query '{query}': {error}"
 SEMANTIC_NODE_NOT_FOUND = "No node found with ID: {id}"
 SEMANTIC_INVALID_LOCATION = "Missing or invalid source location info for node {id}"
@@ -557,6 +645,22 @@ IMP_CACHE_SAVED = "Saved stdlib cache to {path}"
 IMP_CACHE_SAVE_ERROR = "Could not save stdlib cache: {error}"
 IMP_CACHE_CLEARED = "Cleared stdlib cache from disk"
 IMP_CACHE_CLEAR_ERROR = "Could not clear stdlib cache from disk: {error}"
+IMP_CACHE_TOOLCHAIN_CHANGED = (
+    "Dropped cached {language} stdlib results: toolchain or resolver changed"
+)
+IMP_STDLIB_HELPER_STARTED = "Started {language} stdlib introspection helper"
+IMP_STDLIB_HELPER_FAILED = "{language} stdlib introspection helper failed: {error}"
+IMP_STDLIB_PREFETCHED = "Introspected {count} {language} stdlib name(s) in one batch"
+IMP_RESOLUTION_CACHE_LOADED = (
+    "Loaded import-resolution cache from {path}: {entries} answer(s), "
+    "{listings} directory listing(s)"
+)
+IMP_RESOLUTION_CACHE_INVALIDATED = (
+    "Dropped cached import resolution for {families}: "
+    "{dirs} directory(ies) or {manifests} manifest(s) changed"
+)
+IMP_RESOLUTION_CACHE_SAVED = "Saved import-resolution cache to {path}"
+IMP_RESOLUTION_CACHE_SAVE_ERROR = "Could not save import-resolution cache: {error}"
 IMP_PARSED_COUNT = "Parsed {count} imports in {module}"
 IMP_CREATED_RELATIONSHIP = (
     "  Created IMPORTS relationship: {from_module} -> {to_module} (from {full_name})"
@@ -802,6 +906,7 @@ MCP_SERVER_TOOL_ERROR = "[GraphCode MCP] Error executing tool '{name}': {error}"
 MCP_SERVER_STARTING = "[GraphCode MCP] Starting MCP server..."
 MCP_SERVER_CREATED = "[GraphCode MCP] Server created, starting stdio transport..."
 MCP_SERVER_CONNECTED = "[GraphCode MCP] Connected to Memgraph at {host}:{port}"
+MCP_SERVER_OFFLINE = "[GraphCode MCP] Answering from offline graph {path}"
 MCP_SERVER_FATAL_ERROR = "[GraphCode MCP] Fatal error: {error}"
 MCP_SERVER_SHUTDOWN = "[GraphCode MCP] Shutting down server..."
 MCP_HTTP_SERVER_STARTING = "[GraphCode MCP] Starting HTTP server on {host}:{port}..."
@@ -827,6 +932,21 @@ INCREMENTAL_AFFECTED_CALLERS = (
 )
 INCREMENTAL_DELETED = "Removed state for {count} deleted files"
 INCREMENTAL_FORCE = "Force mode enabled, bypassing hash cache"
+WARM_STATE_SAVED = "Saved warm-state snapshot ({count} definitions) to {path}"
+WARM_STATE_LOADED = (
+    "Loaded warm-state snapshot: {count} definitions, {locations} locations"
+)
+WARM_STATE_UNAVAILABLE = (
+    "No warm-state snapshot matches the hash cache; locations rehydrate "
+    "from the graph on the first change"
+)
+WARM_STATE_SAVE_ERROR = "Could not save warm-state snapshot: {error}"
+INCREMENTAL_GIT_CHANGES = (
+    "Git change detection: {count} path(s) to check since {commit}"
+)
+INCREMENTAL_GIT_FALLBACK = (
+    "Git change detection unavailable ({reason}); walking the tree"
+)
 HASH_CACHE_ORPHANED = (
     "Hash cache exists but project '{project}' has no modules in the graph; "
     "the database was likely wiped since the last sync. Discarding the cache "
@@ -914,6 +1034,20 @@ PY_FRONTEND_UNAVAILABLE = (
 PY_FRONTEND_FACTS = (
     "Jedi facts: {calls} resolved call sites, {externals} external sites"
 )
+PY_FRONTEND_REFRESHED = (
+    "Jedi facts refreshed for {files} file(s) after {changed} changed file(s)"
+)
+PY_FRONTEND_FACT_CACHE = (
+    "Jedi fact cache: {reused} file(s) reused, {analyzed} to analyze"
+)
+PY_FRONTEND_FACT_CACHE_WRITE_FAILED = "Could not write Jedi fact cache {path}: {error}"
+PY_FRONTEND_POOL_FAILED = (
+    "Jedi worker pool failed ({error}); analyzing the remaining files in process"
+)
+FRONTEND_WORKER_STARTED = "Started persistent {language} frontend worker"
+FRONTEND_WORKER_FAILED = (
+    "Persistent {language} frontend worker failed ({error}); running in process"
+)
 PY_FRONTEND_BUDGET_DEGRADED = (
     "Jedi budget exceeded in {count} file(s); those fall back to heuristics"
 )
@@ -20,6 +20,7 @@ from codebase_rag.config import settings
 from codebase_rag.mcp.tools import create_mcp_tools_registry
 from codebase_rag.services.graph_service import MemgraphIngestor
 from codebase_rag.services.llm import CypherGenerator
+from codebase_rag.services.offline_query import OfflineQueryEngine
 from codebase_rag.types_defs import MCPToolArguments
 from codebase_rag.utils.path_utils import derive_project_name
 from codebase_rag.vector_store import close_qdrant_client
@@ -67,7 +68,25 @@ def get_project_root() -> Path:
     return project_root
 
 
-def create_server() -> tuple[Server, MemgraphIngestor]:
+type GraphBackend = MemgraphIngestor | OfflineQueryEngine
+
+
+def _create_backend() -> GraphBackend:
+    # An offline graph answers the read-only tools in-process, so sessions
+    # without a Memgraph container still get query_code_graph and
+    # get_code_snippet.
+    if settings.MCP_OFFLINE_GRAPH:
+        return OfflineQueryEngine.open(Path(settings.MCP_OFFLINE_GRAPH))
+    return MemgraphIngestor(
+        host=settings.MEMGRAPH_HOST,
+        port=settings.MEMGRAPH_PORT,
+        batch_size=settings.MEMGRAPH_BATCH_SIZE,
+        username=settings.MEMGRAPH_USERNAME,
+        password=settings.MEMGRAPH_PASSWORD,
+    )
+
+
+def create_server() -> tuple[Server, GraphBackend]:
     setup_logging()
 
     try:
@@ -90,13 +109,7 @@ def create_server() -> tuple[Server, MemgraphIngestor]:
 
     logger.info(lg.MCP_SERVER_INIT_SERVICES)
 
-    ingestor = MemgraphIngestor(
-        host=settings.MEMGRAPH_HOST,
-        port=settings.MEMGRAPH_PORT,
-        batch_size=settings.MEMGRAPH_BATCH_SIZE,
-        username=settings.MEMGRAPH_USERNAME,
-        password=settings.MEMGRAPH_PASSWORD,
-    )
+    ingestor = _create_backend()
 
     # Scope Cypher generation to this server's project (named exactly as
     # indexing names it) so queries don't bleed into other projects sharing
@@ -166,20 +179,23 @@ def create_server() -> tuple[Server, MemgraphIngestor]:
 
 
 @contextlib.contextmanager
-def _service_lifecycle(ingestor: MemgraphIngestor) -> Iterator[None]:
+def _service_lifecycle(ingestor: GraphBackend) -> Iterator[None]:
     """Manage shared service lifetimes for the MCP server.
 
-    Opens the Memgraph ingestor connection and releases the vector store client
-    on shutdown, so a CLI indexing run can reuse local resources once the server
-    stops.
+    Opens the Memgraph ingestor connection (or the offline graph) and releases
+    the vector store client on shutdown, so a CLI indexing run can reuse local
+    resources once the server stops.
     """
     try:
         with ingestor:
-            logger.info(
-                lg.MCP_SERVER_CONNECTED.format(
-                    host=settings.MEMGRAPH_HOST, port=settings.MEMGRAPH_PORT
+            if isinstance(ingestor, OfflineQueryEngine):
+                logger.info(lg.MCP_SERVER_OFFLINE.format(path=ingestor.source))
+            else:
+                logger.info(
+                    lg.MCP_SERVER_CONNECTED.format(
+                        host=settings.MEMGRAPH_HOST, port=settings.MEMGRAPH_PORT
+                    )
                 )
-            )
             yield
     finally:
         close_qdrant_client()
@@ -2,19 +2,22 @@ import asyncio
 import itertools
 import sys
 from pathlib import Path
+from typing import cast
 
 from loguru import logger
 from pydantic_ai import Agent
 from rich.console import Console
 
 from codebase_rag import constants as cs
+from codebase_rag import exceptions as ex
 from codebase_rag import logs as lg
 from codebase_rag import tool_errors as te
 from codebase_rag.graph_updater import GraphUpdater
 from codebase_rag.models import ToolMetadata
 from codebase_rag.parser_loader import load_parsers
-from codebase_rag.services.graph_service import MemgraphIngestor
+from codebase_rag.services import GraphBackendProtocol, WritableGraphBackendProtocol
 from codebase_rag.services.llm import CypherGenerator, create_rag_orchestrator
+from codebase_rag.services.offline_query import OfflineQueryEngine, OfflineQueryError
 from codebase_rag.tools import tool_descriptions as td
 from codebase_rag.tools.ast_grep_service import AstGrepService
 from codebase_rag.tools.code_retrieval import (
@@ -76,11 +79,18 @@ class MCPToolsRegistry:
     def __init__(
         self,
         project_root: str,
-        ingestor: MemgraphIngestor,
+        ingestor: GraphBackendProtocol,
         cypher_gen: CypherGenerator,
     ) -> None:
         self.project_root = project_root
         self.ingestor = ingestor
+        # An offline graph has no write surface: the tools that rebuild or
+        # drop graph data are not offered, and a direct call is refused.
+        self._writer = (
+            None
+            if isinstance(ingestor, OfflineQueryEngine)
+            else cast(WritableGraphBackendProtocol, ingestor)
+        )
         self.cypher_gen = cypher_gen
         self._ingestor_lock = asyncio.Lock()
 
@@ -459,6 +469,10 @@ class MCPToolsRegistry:
             returns_json=True,
         )
 
+        if self._writer is None:
+            for name in cs.MCP_GRAPH_WRITE_TOOLS:
+                del self._tools[name]
+
     @property
     def rag_agent(self) -> Agent:
         if self._rag_agent is None:
@@ -580,8 +594,15 @@ class MCPToolsRegistry:
         node_ids = self._get_project_node_ids(project_name)
         delete_project_embeddings(project_name, node_ids)
 
+    def _graph_writer(self, tool: str) -> WritableGraphBackendProtocol:
+        # Checked before any work, so a refused call changes nothing.
+        if self._writer is None:
+            raise OfflineQueryError(ex.OFFLINE_QUERY_READ_ONLY.format(operation=tool))
+        return self._writer
+
     def _delete_project_sync(self, project_name: str) -> DeleteProjectResult:
-        projects = self.ingestor.list_projects()
+        writer = self._graph_writer(cs.MCPToolName.DELETE_PROJECT)
+        projects = writer.list_projects()
         if project_name not in projects:
             return DeleteProjectErrorResult(
                 success=False,
@@ -590,7 +611,7 @@ class MCPToolsRegistry:
                 ),
             )
         self._cleanup_project_embeddings(project_name)
-        self.ingestor.delete_project(project_name)
+        writer.delete_project(project_name)
         return DeleteProjectSuccessResult(
             success=True,
             project=project_name,
@@ -612,7 +633,8 @@ class MCPToolsRegistry:
         logger.warning(lg.MCP_WIPING_DATABASE)
         try:
             async with self._ingestor_lock:
-                await asyncio.to_thread(self.ingestor.clean_database)
+                writer = self._graph_writer(cs.MCPToolName.WIPE_DATABASE)
+                await asyncio.to_thread(writer.clean_database)
                 await asyncio.to_thread(clear_all_embeddings)
             return cs.MCP_WIPE_SUCCESS
         except Exception as e:
@@ -620,25 +642,26 @@ class MCPToolsRegistry:
             return cs.MCP_WIPE_ERROR.format(error=e)
 
     def _index_repository_sync(self) -> str:
+        writer = self._graph_writer(cs.MCPToolName.INDEX_REPOSITORY)
         # Same collision-resistant derivation as the CLI: a bare directory
         # name would let two repos named alike delete each other's graphs.
         project_name = derive_project_name(Path(self.project_root))
         logger.info(lg.MCP_CLEARING_PROJECT.format(project_name=project_name))
         self._cleanup_project_embeddings(project_name)
-        self.ingestor.delete_project(project_name)
+        writer.delete_project(project_name)
 
-        self.ingestor.ensure_constraints()
-        self.ingestor.flush_all()
+        writer.ensure_constraints()
+        writer.flush_all()
 
         updater = GraphUpdater(
-            ingestor=self.ingestor,
+            ingestor=writer,
             repo_path=Path(self.project_root),
             parsers=self.parsers,
             queries=self.queries,
             project_name=project_name,
         )
         updater.run()
-        self.ingestor.flush_all()
+        writer.flush_all()
 
         return cs.MCP_INDEX_SUCCESS_PROJECT.format(
             path=self.project_root, project_name=project_name
@@ -654,20 +677,21 @@ class MCPToolsRegistry:
             return cs.MCP_INDEX_ERROR.format(error=e)
 
     def _update_repository_sync(self) -> str:
+        writer = self._graph_writer(cs.MCPToolName.UPDATE_REPOSITORY)
         project_name = derive_project_name(Path(self.project_root))
 
-        self.ingestor.ensure_constraints()
-        self.ingestor.flush_all()
+        writer.ensure_constraints()
+        writer.flush_all()
 
         updater = GraphUpdater(
-            ingestor=self.ingestor,
+            ingestor=writer,
             repo_path=Path(self.project_root),
             parsers=self.parsers,
             queries=self.queries,
             project_name=project_name,
         )
         updater.run()
-        self.ingestor.flush_all()
+        writer.flush_all()
         return cs.MCP_UPDATE_SUCCESS.format(path=self.project_root)
 
     async def update_repository(self) -> str:
@@ -838,7 +862,7 @@ class MCPToolsRegistry:
 
 def create_mcp_tools_registry(
     project_root: str,
-    ingestor: MemgraphIngestor,
+    ingestor: GraphBackendProtocol,
     cypher_gen: CypherGenerator,
 ) -> MCPToolsRegistry:
     return MCPToolsRegistry(
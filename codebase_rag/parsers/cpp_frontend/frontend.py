@@ -1,10 +1,23 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from importlib import metadata
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from loguru import logger
+
 from ... import constants as cs
+from ... import logs as ls
 from ...config import settings
+from ...parser_fingerprint import compute_parser_fingerprint
 from ...services import IngestorProtocol
 from ...types_defs import (
     FunctionRegistryTrieProtocol,
@@ -24,10 +37,26 @@ if TYPE_CHECKING:
 _NodeKey = tuple[str, str]
 _EdgeKey = tuple[str, str, str, str, str]
 _Scope = tuple[str, str] | None
+# (directory, source file, compiler arguments without argv[0])
+_CompileJob = tuple[str, str, tuple[str, ...]]
+# (header as libclang names it, preprocessor-flags fingerprint)
+_HeaderKey = tuple[str, str]
+# (st_mtime_ns, st_size); (-1, -1) for a file that is gone
+_FileSignature = tuple[int, int]
 
 _COMPILE_COMMANDS = "compile_commands.json"
 _BUILD_DIR = "build"
 
+# Below this many TUs to parse, spawning workers (each loads libclang and
+# rebuilds the module-qn map it was sent) costs more than it saves.
+_PARALLEL_MIN_TUS = 8
+_CHUNKS_PER_WORKER = 4
+_MAX_AUTO_WORKERS = 8
+# Bump when the per-TU record layout or the collected facts change shape.
+_TU_CACHE_VERSION = 1
+_OUTPUT_FLAGS = frozenset({"-c", "-MD", "-MMD"})
+_OUTPUT_FLAGS_WITH_VALUE = frozenset({"-o", "-MF", "-MT", "-MQ"})
+
 
 def cpp_frontend_available() -> bool:
     try:
@@ -100,6 +129,22 @@ def _classify(cursor: Cursor) -> str | None:
     return None
 
 
+@dataclass
+class _TuFacts:
+    """What a batch of translation units added to a `_Collector`: picklable
+    (a worker's return value) and JSON-able (the per-TU cache entry)."""
+
+    nodes: dict[_NodeKey, tuple[str, PropertyDict, bool]]
+    modules: dict[str, PropertyDict]
+    edges: set[_EdgeKey]
+    covered: set[str]
+    macro_calls: set[tuple[str, int, str, str]]
+    macro_body_refs: dict[str, set[str]]
+    expansion_calls: set[tuple[str, int, str, str, int]]
+    usr_definitions: dict[str, tuple[str, int]]
+    internal_linkage_keys: set[_NodeKey]
+
+
 class _Collector:
     def __init__(
         self,
@@ -754,6 +799,49 @@ class _Collector:
             pending.append(PendingMacroCall(rel, line, callee_qn, module_qn))
         return pending
 
+    def take_facts(self) -> _TuFacts:
+        # Hand over everything collected since the last call and start
+        # afresh; the per-file lookup caches (include info, instantiation
+        # extents) stay, they describe files, not translation units.
+        facts = _TuFacts(
+            self.nodes,
+            self.modules,
+            self.edges,
+            self.covered,
+            self._pending_macro_calls,
+            self._macro_body_refs,
+            self._pending_expansion_calls,
+            self._usr_definitions,
+            self._internal_linkage_keys,
+        )
+        self.nodes = {}
+        self.modules = {}
+        self.edges = set()
+        self.covered = set()
+        self._pending_macro_calls = set()
+        self._macro_body_refs = {}
+        self._pending_expansion_calls = set()
+        self._usr_definitions = {}
+        self._internal_linkage_keys = set()
+        return facts
+
+    def merge(self, facts: _TuFacts) -> None:
+        # Merging per-TU facts in compile-command order reproduces the
+        # sequential walk: the same definition-wins node rule, first Module
+        # wins, the last USR definition wins.
+        for (label, qn), (_, props, is_def) in facts.nodes.items():
+            self._add_node(label, qn, props, is_def)
+        for module_qn, props in facts.modules.items():
+            self.modules.setdefault(module_qn, props)
+        self.edges |= facts.edges
+        self.covered |= facts.covered
+        self._pending_macro_calls |= facts.macro_calls
+        for macro_qn, refs in facts.macro_body_refs.items():
+            self._macro_body_refs.setdefault(macro_qn, set()).update(refs)
+        self._pending_expansion_calls |= facts.expansion_calls
+        self._usr_definitions.update(facts.usr_definitions)
+        self._internal_linkage_keys |= facts.internal_linkage_keys
+
     def flush(self, ingestor: IngestorProtocol) -> None:
         self._resolve_macro_body_refs()
         if not self.hybrid:
@@ -894,23 +982,402 @@ def run_cpp_frontend_hybrid(
     return collector.pending_macro_calls(), collector.pending_expansion_calls()
 
 
-def _parse_and_collect(collector: _Collector, compdb_dir: Path) -> None:
+@dataclass
+class _TuRecord:
+    """One translation unit's facts plus what decides whether a later run
+    may reuse them: every file it included (with its stat signature), the
+    module qns its facts were named with, and the shared headers it walked
+    (`owned`) or left to the TU that walked them first (`skipped`)."""
+
+    facts: _TuFacts
+    deps: dict[str, _FileSignature]
+    module_qns: dict[str, str]
+    owned: set[_HeaderKey] = field(default_factory=set)
+    skipped: set[_HeaderKey] = field(default_factory=set)
+
+
+def _compile_jobs(compdb_dir: Path) -> list[_CompileJob]:
     import clang.cindex as ci
 
     db = ci.CompilationDatabase.fromDirectory(str(Path(compdb_dir).resolve()))
-    index = ci.Index.create()
-    for command in db.getAllCompileCommands():
-        args = list(command.arguments)[1:]
+    jobs = [
+        (command.directory, command.filename, tuple(command.arguments)[1:])
+        for command in db.getAllCompileCommands()
+    ]
+    # A command listed twice contributes nothing new the second time.
+    return list(dict.fromkeys(jobs))
+
+
+def _job_key(job: _CompileJob) -> str:
+    return hashlib.md5(
+        json.dumps(job).encode(cs.ENCODING_UTF8), usedforsecurity=False
+    ).hexdigest()
+
+
+def _preprocessor_fingerprint(job: _CompileJob) -> str:
+    # The flags that can change what a header expands to: everything but the
+    # TU's own source and its output/dependency-file plumbing, so the TUs of
+    # one target share their headers.
+    _, filename, args = job
+    kept: list[str] = []
+    skip_next = False
+    for arg in args:
+        if skip_next:
+            skip_next = False
+            continue
+        if arg in _OUTPUT_FLAGS_WITH_VALUE:
+            skip_next = True
+            continue
+        if arg in _OUTPUT_FLAGS or arg == filename or arg.startswith("-o"):
+            continue
+        kept.append(arg)
+    return hashlib.md5(
+        "\0".join(kept).encode(cs.ENCODING_UTF8), usedforsecurity=False
+    ).hexdigest()
+
+
+def _file_signature(path: str) -> _FileSignature:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (-1, -1)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _is_include_guarded(tu, file) -> bool:
+    import clang.cindex as ci
+
+    try:
+        return bool(ci.conf.lib.clang_isFileMultipleIncludeGuarded(tu, file))
+    except Exception:
+        return False
+
+
+class _TuParser:
+    """Parses translation units into `_TuRecord`s, one process's worth: its
+    own libclang Index, scratch collector, and registry of the include-
+    guarded headers already walked under a given set of preprocessor flags.
+    A guarded header parsed under the same flags yields the same cursors in
+    every TU (the precompiled-header assumption), so only the first TU to
+    reach it walks it; `#include` edges are still read from every TU."""
+
+    def __init__(
+        self,
+        resolver: CppQnResolver,
+        hybrid: bool,
+        seen_headers: frozenset[_HeaderKey],
+        share_headers: bool,
+    ) -> None:
+        import clang.cindex as ci
+
+        self._resolver = resolver
+        self._index = ci.Index.create()
+        self._collector = _Collector(resolver, hybrid=hybrid)
+        self._seen = set(seen_headers)
+        self._share_headers = share_headers
+
+    def parse(self, job: _CompileJob) -> _TuRecord | None:
+        import clang.cindex as ci
+
         try:
             # the detailed record exposes MACRO_DEFINITION /
             # MACRO_INSTANTIATION cursors (preprocessing entities are
             # otherwise absent from the cursor tree)
-            tu = index.parse(
+            tu = self._index.parse(
                 None,
-                args=args,
+                args=list(job[2]),
                 options=ci.TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD,
             )
         except ci.TranslationUnitLoadError:
-            continue
-        _walk(tu.cursor, collector)
-        collector.process_includes(tu)
+            return None
+        owned, skipped = self._walk(
+            tu, _preprocessor_fingerprint(job) if self._share_headers else None
+        )
+        self._collector.process_includes(tu)
+        files = {tu.spelling}
+        files.update(inclusion.include.name for inclusion in tu.get_includes())
+        module_qns: dict[str, str] = {}
+        for name in files:
+            if (rel := self._resolver.rel_path(name)) is not None:
+                module_qns[rel] = self._resolver.module_qn_for_rel(rel) or ""
+        return _TuRecord(
+            self._collector.take_facts(),
+            {name: _file_signature(name) for name in sorted(files)},
+            module_qns,
+            owned,
+            skipped,
+        )
+
+    def _walk(
+        self, tu, fingerprint: str | None
+    ) -> tuple[set[_HeaderKey], set[_HeaderKey]]:
+        owned: set[_HeaderKey] = set()
+        skipped: set[_HeaderKey] = set()
+        guarded: dict[str, bool] = {}
+        for child in tu.cursor.get_children():
+            file = child.location.file
+            if (
+                fingerprint is not None
+                and file is not None
+                and file.name != tu.spelling
+            ):
+                key = (file.name, fingerprint)
+                if key in self._seen:
+                    skipped.add(key)
+                    continue
+                if file.name not in guarded:
+                    guarded[file.name] = _is_include_guarded(tu, file)
+                if guarded[file.name]:
+                    owned.add(key)
+            produced = self._collector.process(child, None)
+            _walk(child, self._collector, produced)
+        # Marked only once the TU is done: a header's top-level cursors all
+        # belong to this walk, even when another header interleaves them.
+        self._seen |= owned
+        return owned, skipped
+
+
+_worker_parser: _TuParser | None = None
+
+
+def _init_worker(
+    resolver: CppQnResolver,
+    hybrid: bool,
+    seen_headers: frozenset[_HeaderKey],
+    share_headers: bool,
+) -> None:
+    global _worker_parser
+    _worker_parser = _TuParser(resolver, hybrid, seen_headers, share_headers)
+
+
+def _parse_chunk(jobs: list[_CompileJob]) -> list[_TuRecord | None]:
+    assert _worker_parser is not None
+    return [_worker_parser.parse(job) for job in jobs]
+
+
+def _worker_count() -> int:
+    workers = settings.CPP_FRONTEND_WORKERS
+    if workers == 0:
+        workers = min(os.cpu_count() or 1, _MAX_AUTO_WORKERS)
+    return workers
+
+
+def _parse_jobs(
+    jobs: list[_CompileJob],
+    resolver: CppQnResolver,
+    hybrid: bool,
+    seen_headers: frozenset[_HeaderKey],
+) -> list[_TuRecord | None]:
+    share_headers = settings.CPP_FRONTEND_SHARE_HEADERS
+    workers = _worker_count()
+    if workers > 1 and len(jobs) >= _PARALLEL_MIN_TUS:
+        # Contiguous chunks keep a directory's TUs (and so their shared
+        # headers) on one worker; several chunks per worker balance the load.
+        size = max(1, -(-len(jobs) // (workers * _CHUNKS_PER_WORKER)))
+        chunks = [jobs[i : i + size] for i in range(0, len(jobs), size)]
+        try:
+            # spawn, not fork: the indexer has live threads (flush pool,
+            # loguru) whose held locks a forked child would inherit.
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(chunks)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(resolver, hybrid, seen_headers, share_headers),
+            ) as pool:
+                return [
+                    record
+                    for chunk in pool.map(_parse_chunk, chunks)
+                    for record in chunk
+                ]
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(ls.CPP_FRONTEND_POOL_FAILED, error=e)
+    parser = _TuParser(resolver, hybrid, seen_headers, share_headers)
+    return [parser.parse(job) for job in jobs]
+
+
+def _libclang_version() -> str:
+    try:
+        return metadata.version("libclang")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _encode_record(record: _TuRecord) -> dict:
+    facts = record.facts
+    return {
+        "nodes": [
+            [label, qn, props, is_def]
+            for (label, qn), (_, props, is_def) in facts.nodes.items()
+        ],
+        "modules": facts.modules,
+        "edges": sorted([str(edge[0]), *edge[1:]] for edge in facts.edges),
+        "covered": sorted(facts.covered),
+        "macro_calls": sorted(facts.macro_calls),
+        "macro_body_refs": {
+            qn: sorted(refs) for qn, refs in facts.macro_body_refs.items()
+        },
+        "expansion_calls": sorted(facts.expansion_calls),
+        "usr_definitions": facts.usr_definitions,
+        "internal_linkage": sorted(facts.internal_linkage_keys),
+        "deps": record.deps,
+        "module_qns": record.module_qns,
+        "owned": sorted(record.owned),
+        "skipped": sorted(record.skipped),
+    }
+
+
+def _decode_record(raw: dict) -> _TuRecord:
+    facts = _TuFacts(
+        {
+            (label, qn): (label, props, is_def)
+            for label, qn, props, is_def in raw["nodes"]
+        },
+        raw["modules"],
+        {
+            (cs.RelationshipType(rel), from_label, from_qn, to_label, to_qn)
+            for rel, from_label, from_qn, to_label, to_qn in raw["edges"]
+        },
+        set(raw["covered"]),
+        {(rel, line, qn, name) for rel, line, qn, name in raw["macro_calls"]},
+        {qn: set(refs) for qn, refs in raw["macro_body_refs"].items()},
+        {tuple(call) for call in raw["expansion_calls"]},
+        {usr: (rel, line) for usr, (rel, line) in raw["usr_definitions"].items()},
+        {(label, qn) for label, qn in raw["internal_linkage"]},
+    )
+    return _TuRecord(
+        facts,
+        {name: (mtime, size) for name, (mtime, size) in raw["deps"].items()},
+        dict(raw["module_qns"]),
+        {(name, fp) for name, fp in raw["owned"]},
+        {(name, fp) for name, fp in raw["skipped"]},
+    )
+
+
+class _TuCache:
+    """Per-TU records of earlier runs, one JSON file per compile command
+    under CGR_HOME. The directory is keyed by the repo, compile database and
+    mode (full and hybrid runs keep separate records), and beneath that by
+    everything else the facts depend on: the project name, the parser code
+    and libclang version, and header sharing.
+    A record is reused while its compile command is unchanged (it is part of
+    the key), every file it included has the same stat signature, and every
+    in-repo file still maps to the module qn its facts were named with."""
+
+    def __init__(self, collector: _Collector, compdb_dir: Path) -> None:
+        resolver = collector.resolver
+        scope = hashlib.md5(
+            "\0".join(
+                (
+                    resolver.repo_path.as_posix(),
+                    Path(compdb_dir).resolve().as_posix(),
+                    str(collector.hybrid),
+                )
+            ).encode(cs.ENCODING_UTF8),
+            usedforsecurity=False,
+        ).hexdigest()
+        config = hashlib.md5(
+            "\0".join(
+                (
+                    str(_TU_CACHE_VERSION),
+                    resolver.project_name,
+                    compute_parser_fingerprint(),
+                    _libclang_version(),
+                    str(settings.CPP_FRONTEND_SHARE_HEADERS),
+                )
+            ).encode(cs.ENCODING_UTF8),
+            usedforsecurity=False,
+        ).hexdigest()
+        self._root = settings.CGR_HOME.expanduser() / "cpp_libclang" / scope
+        self._dir = self._root / config
+        self._resolver = resolver
+
+    def reusable(self, keys: list[str]) -> dict[str, _TuRecord]:
+        signatures: dict[str, _FileSignature] = {}
+        records: dict[str, _TuRecord] = {}
+        for key in keys:
+            try:
+                raw = json.loads(
+                    (self._dir / f"{key}.json").read_text(cs.ENCODING_UTF8)
+                )
+                record = _decode_record(raw)
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            if self._fresh(record, signatures):
+                records[key] = record
+        return records
+
+    def _fresh(self, record: _TuRecord, signatures: dict[str, _FileSignature]) -> bool:
+        for name, signature in record.deps.items():
+            if name not in signatures:
+                signatures[name] = _file_signature(name)
+            if signatures[name] != signature:
+                return False
+        return all(
+            (self._resolver.module_qn_for_rel(rel) or "") == qn
+            for rel, qn in record.module_qns.items()
+        )
+
+    def save(self, fresh: dict[str, _TuRecord], keys: list[str]) -> None:
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            for key, record in fresh.items():
+                path = self._dir / f"{key}.json"
+                tmp = path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(_encode_record(record)), cs.ENCODING_UTF8)
+                tmp.replace(path)
+            live = {f"{key}.json" for key in keys}
+            for path in self._dir.iterdir():
+                if path.name not in live:
+                    path.unlink(missing_ok=True)
+            # Records written under another configuration can never match
+            # again; drop them rather than let them pile up.
+            for path in self._root.iterdir():
+                if path != self._dir and path.is_dir():
+                    shutil.rmtree(path, ignore_errors=True)
+        except OSError as e:
+            logger.warning(
+                ls.CPP_FRONTEND_TU_CACHE_WRITE_FAILED, path=self._dir, error=e
+            )
+
+
+def _walked_headers(records: dict[str, _TuRecord]) -> frozenset[_HeaderKey]:
+    return frozenset().union(*(record.owned for record in records.values()))
+
+
+def _parse_and_collect(collector: _Collector, compdb_dir: Path) -> None:
+    jobs = {_job_key(job): job for job in _compile_jobs(compdb_dir)}
+    cache = _TuCache(collector, compdb_dir) if settings.CPP_FRONTEND_TU_CACHE else None
+    records = cache.reusable(list(jobs)) if cache is not None else {}
+    reused = len(records)
+    fresh: dict[str, _TuRecord] = {}
+    pending = [key for key in jobs if key not in records]
+    parsed = 0
+    while pending:
+        results = _parse_jobs(
+            [jobs[key] for key in pending],
+            collector.resolver,
+            collector.hybrid,
+            _walked_headers(records),
+        )
+        parsed += len(pending)
+        for key, record in zip(pending, results):
+            if record is not None:
+                fresh[key] = records[key] = record
+        # A reused record that skipped a shared header relied on another TU's
+        # walk of it; when that TU failed to parse or is gone, reparse the
+        # skipper so the header's facts are not lost.
+        walked = _walked_headers(records)
+        pending = [
+            key
+            for key, record in records.items()
+            if key not in fresh and not record.skipped <= walked
+        ]
+        for key in pending:
+            del records[key]
+            reused -= 1
+    for key in jobs:
+        if (record := records.get(key)) is not None:
+            collector.merge(record.facts)
+    logger.info(ls.CPP_FRONTEND_TUS, reused=reused, parsed=parsed)
+    if cache is not None:
+        cache.save(fresh, list(jobs))
@@ -10,6 +10,10 @@ top as an OPTIONAL fact provider. Two shapes are supported:
   (the libclang/C++ shape: macro-expanded nodes, `#include` edges), in a declared
   run phase.
 
+An `IncrementalFrontend` also refreshes only the files an edit affects, and a
+`PersistentFrontend` keeps its toolchain warm in a worker process
+(`frontends.worker`).
+
 The invariant every frontend preserves: the compiler is an oracle, tree-sitter is
 the backbone, and a missing toolchain degrades to the pure tree-sitter graph --
 never worse.
@@ -28,9 +32,14 @@ from .protocol import (
     FrontendEmitContext,
     FrontendEmitResult,
     FrontendPhase,
+    IncrementalFacts,
+    IncrementalFrontend,
     LanguageFrontend,
+    PersistentFrontend,
     ResolvedCallSite,
     SemanticFacts,
+    WorkerMethod,
+    drop_file_facts,
     empty_facts,
 )
 from .registry import (
@@ -48,9 +57,14 @@ __all__ = [
     "FrontendEmitContext",
     "FrontendEmitResult",
     "FrontendPhase",
+    "IncrementalFacts",
+    "IncrementalFrontend",
     "LanguageFrontend",
+    "PersistentFrontend",
     "ResolvedCallSite",
     "SemanticFacts",
+    "WorkerMethod",
+    "drop_file_facts",
     "empty_facts",
     "register_emitting_frontend",
     "register_frontend",
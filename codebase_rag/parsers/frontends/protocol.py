@@ -3,7 +3,7 @@ bundle (issue #1178). Generalized from the proven Roslyn/C# integration."""
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Iterable, MutableMapping, MutableSet, Sequence
 from dataclasses import dataclass, field
 from enum import StrEnum
 from pathlib import Path
@@ -123,6 +123,36 @@ def empty_facts() -> SemanticFacts:
     return SemanticFacts()
 
 
+@dataclass
+class IncrementalFacts:
+    """What an incremental refresh learned: fresh facts for `refreshed_files`
+    only. The consumer drops every fact keyed in a refreshed file and merges
+    `facts` in place; facts for the other files stay as they are. A None
+    `refreshed_files` means the frontend had no usable state and ran in full,
+    so `facts` replace everything."""
+
+    facts: SemanticFacts
+    refreshed_files: frozenset[str] | None = None
+
+
+def drop_file_facts[V](
+    family: MutableMapping[CallSiteKey, V] | MutableSet[CallSiteKey],
+    rel_files: Iterable[str],
+) -> None:
+    """Remove, in place, every CallSiteKey-keyed fact whose site lies in one of
+    `rel_files` (a refreshed file's old positions must not keep binding)."""
+    files = frozenset(rel_files)
+    if not files:
+        return
+    stale = [key for key in family if key[0] in files]
+    if isinstance(family, MutableMapping):
+        for key in stale:
+            del family[key]
+    else:
+        for key in stale:
+            family.discard(key)
+
+
 @runtime_checkable
 class LanguageFrontend(Protocol):
     """A compiler fact provider for one language. `available()` gates on the
@@ -138,6 +168,43 @@ class LanguageFrontend(Protocol):
     def run(self, repo_path: Path, files: Sequence[Path]) -> SemanticFacts: ...
 
 
+@runtime_checkable
+class IncrementalFrontend(LanguageFrontend, Protocol):
+    """A fact provider that keeps per-file facts between runs (watch mode).
+    `run()` seeds the state; `run_incremental()` re-infers only the `changed`
+    files whose content differs plus the files whose facts depend on them,
+    out of the current `files` set. Frontends whose compiler only answers for
+    a whole module keep the plain `run()` contract."""
+
+    def run_incremental(
+        self, repo_path: Path, files: Sequence[Path], changed: Sequence[Path]
+    ) -> IncrementalFacts: ...
+
+
+@runtime_checkable
+class PersistentFrontend(IncrementalFrontend, Protocol):
+    """An incremental frontend whose toolchain lives in a long-lived worker
+    process, started on the first query and kept warm across runs, so watch
+    mode and repeated updates stop paying the cold start. The worker answers
+    "changed files -> facts" over stdin/stdout in the versioned JSON-lines
+    schema of `frontends.worker`; any worker failure degrades to running the
+    toolchain in process. `stop()` shuts the worker down (it also exits on
+    its own when the parent's end of the pipe closes)."""
+
+    def stop(self) -> None: ...
+
+
+# Version of the worker message schema; both ends refuse any other.
+WORKER_PROTOCOL_VERSION = 1
+WORKER_READER_THREAD = "cgr-frontend-worker-reader"
+
+
+class WorkerMethod(StrEnum):
+    RUN = "run"
+    REFRESH = "refresh"
+    SHUTDOWN = "shutdown"
+
+
 class FrontendPhase(StrEnum):
     # Run before the tree-sitter definition pass (libclang LIBCLANG mode emits its
     # own Function nodes, and Pass 2 skips the files it covered).
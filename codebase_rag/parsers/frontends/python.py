@@ -1,23 +1,39 @@
-"""Python LanguageFrontend registration (issue #1183): the in-process Jedi
-fact provider. No subprocess, no toolchain — availability is just the
-optional `jedi` import (the `python-semantics` extra)."""
+"""Python LanguageFrontend registration (issue #1183): the Jedi fact
+provider. No toolchain — availability is just the optional `jedi` import
+(the `python-semantics` extra). Inference runs in process, or with
+PYTHON_FRONTEND_WORKER in a long-lived worker that keeps jedi warm."""
 
 from __future__ import annotations
 
+import sys
 from collections.abc import Sequence
 from pathlib import Path
 
+from loguru import logger
+
+from ... import logs as ls
+from ...config import settings
 from ...constants.languages import SupportedLanguage
-from ..py_frontend import python_frontend_available, run_python_frontend
-from .protocol import SemanticFacts
+from ..py_frontend import PythonFactCache, python_frontend_available
+from .protocol import IncrementalFacts, SemanticFacts
 from .registry import register_frontend
+from .worker import FrontendWorkerClient, FrontendWorkerError
+
+_WORKER_MODULE = "codebase_rag.parsers.py_frontend.worker"
 
 
 class PythonJediFrontend:
-    """Jedi fact provider for Python."""
+    """Jedi fact provider for Python; incremental, so watch mode re-infers an
+    edited file and its importers only. `in_process` pins inference to this
+    process (the worker itself serves through one)."""
 
     language: SupportedLanguage = SupportedLanguage.PYTHON
 
+    def __init__(self, *, in_process: bool = False) -> None:
+        self._cache = PythonFactCache()
+        self._in_process = in_process
+        self._client: FrontendWorkerClient | None = None
+
     def available(self) -> bool:
         return python_frontend_available()
 
@@ -27,7 +43,42 @@ class PythonJediFrontend:
         return repo_path.exists()
 
     def run(self, repo_path: Path, files: Sequence[Path]) -> SemanticFacts:
-        return run_python_frontend(repo_path, list(files))
+        if (client := self._worker()) is not None:
+            try:
+                return client.run(repo_path, files)
+            except FrontendWorkerError as e:
+                logger.warning(
+                    ls.FRONTEND_WORKER_FAILED, language=self.language, error=e
+                )
+        return self._cache.run(repo_path, files)
+
+    def run_incremental(
+        self, repo_path: Path, files: Sequence[Path], changed: Sequence[Path]
+    ) -> IncrementalFacts:
+        if (client := self._worker()) is not None:
+            try:
+                return client.refresh(repo_path, files, changed)
+            except FrontendWorkerError as e:
+                logger.warning(
+                    ls.FRONTEND_WORKER_FAILED, language=self.language, error=e
+                )
+        # Without in-process state this is a full run, which the consumer
+        # applies wholesale.
+        return self._cache.refresh(repo_path, files, changed)
+
+    def stop(self) -> None:
+        if self._client is not None:
+            self._client.stop()
+
+    def _worker(self) -> FrontendWorkerClient | None:
+        if self._in_process or not settings.PYTHON_FRONTEND_WORKER:
+            return None
+        if self._client is None:
+            self._client = FrontendWorkerClient(
+                [sys.executable, "-m", _WORKER_MODULE],
+                timeout=settings.PYTHON_FRONTEND_WORKER_TIMEOUT,
+            )
+        return self._client
 
 
 register_frontend(PythonJediFrontend())
@@ -0,0 +1,322 @@
+"""The persistent frontend worker transport (issue #1178 follow-up).
+
+A `PersistentFrontend` keeps its toolchain warm in a child process that
+speaks JSON lines over stdin/stdout. The worker announces itself with a
+`ready` line carrying the protocol version; every request and response
+carries it too, so a client never decodes a payload it does not understand.
+
+    <- {"protocol": 1, "ready": true, "language": "python"}
+    -> {"protocol": 1, "id": 1, "method": "run",
+        "params": {"repo_path": "...", "files": ["..."]}}
+    <- {"protocol": 1, "id": 1, "facts": {"calls": [...], "externals": [...]}}
+    -> {"protocol": 1, "id": 2, "method": "refresh",
+        "params": {"repo_path": "...", "files": [...], "changed": [...]}}
+    <- {"protocol": 1, "id": 2, "facts": {...}, "refreshed_files": [...]}
+    -> {"protocol": 1, "id": 3, "method": "shutdown", "params": {}}
+    <- {"protocol": 1, "id": 3}
+
+A failed request answers `{"protocol": 1, "id": n, "error": "..."}`. Facts
+travel in the two families every compiler frontend fills, with the field
+names the Go tool's payload already uses (`file/line/col/name` plus
+`tfile/tline/tcol` for a resolved target).
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import subprocess
+import sys
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import IO, Any
+
+from loguru import logger
+
+from ... import exceptions as ex
+from ... import logs as ls
+from .protocol import (
+    WORKER_PROTOCOL_VERSION,
+    WORKER_READER_THREAD,
+    IncrementalFacts,
+    IncrementalFrontend,
+    ResolvedCallSite,
+    SemanticFacts,
+    WorkerMethod,
+)
+
+# How long `stop` waits for a worker to acknowledge shutdown and exit.
+_STOP_TIMEOUT = 5.0
+
+
+class FrontendWorkerError(RuntimeError):
+    pass
+
+
+def encode_facts(facts: SemanticFacts) -> dict[str, list[dict[str, Any]]]:
+    return {
+        "calls": [
+            {
+                "file": file,
+                "line": line,
+                "col": col,
+                "name": name,
+                "tfile": site.target_file,
+                "tline": site.target_line,
+                "tcol": site.target_col,
+            }
+            for (file, line, col, name), site in facts.resolved_call_sites.items()
+        ],
+        "externals": [
+            {"file": file, "line": line, "col": col, "name": name}
+            for file, line, col, name in facts.external_sites
+        ],
+    }
+
+
+def decode_facts(payload: dict[str, Any]) -> SemanticFacts:
+    try:
+        return SemanticFacts(
+            resolved_call_sites={
+                (
+                    site["file"],
+                    int(site["line"]),
+                    int(site["col"]),
+                    site["name"],
+                ): ResolvedCallSite(
+                    site["name"], site["tfile"], int(site["tline"]), int(site["tcol"])
+                )
+                for site in payload.get("calls", [])
+            },
+            external_sites={
+                (site["file"], int(site["line"]), int(site["col"]), site["name"])
+                for site in payload.get("externals", [])
+            },
+        )
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        raise FrontendWorkerError(ex.FRONTEND_WORKER_BAD_FACTS.format(error=e)) from e
+
+
+def _dispatch(
+    worker: IncrementalFrontend, method: str, params: dict[str, Any]
+) -> dict[str, Any]:
+    repo_path = Path(params["repo_path"])
+    files = [Path(path) for path in params["files"]]
+    if method == WorkerMethod.RUN:
+        return {"facts": encode_facts(worker.run(repo_path, files))}
+    if method == WorkerMethod.REFRESH:
+        changed = [Path(path) for path in params["changed"]]
+        result = worker.run_incremental(repo_path, files, changed)
+        refreshed = result.refreshed_files
+        return {
+            "facts": encode_facts(result.facts),
+            "refreshed_files": None if refreshed is None else sorted(refreshed),
+        }
+    raise FrontendWorkerError(ex.FRONTEND_WORKER_UNKNOWN_METHOD.format(method=method))
+
+
+def serve(
+    worker: IncrementalFrontend,
+    stdin: IO[str] | None = None,
+    stdout: IO[str] | None = None,
+) -> None:
+    """Answer requests until `shutdown` or end of input. Anything else that
+    writes to stdout (a chatty import, a stray print) is redirected to stderr
+    so it cannot corrupt the message stream."""
+    stdin = stdin or sys.stdin
+    if stdout is None:
+        stdout = sys.stdout
+        sys.stdout = sys.stderr
+
+    def send(message: dict[str, Any]) -> None:
+        stdout.write(json.dumps({"protocol": WORKER_PROTOCOL_VERSION, **message}))
+        stdout.write("\n")
+        stdout.flush()
+
+    send({"ready": True, "language": str(worker.language)})
+    for line in stdin:
+        if not line.strip():
+            continue
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            if request.get("protocol") != WORKER_PROTOCOL_VERSION:
+                raise FrontendWorkerError(
+                    ex.FRONTEND_WORKER_PROTOCOL.format(
+                        expected=WORKER_PROTOCOL_VERSION, got=request.get("protocol")
+                    )
+                )
+            method = request.get("method")
+            if method == WorkerMethod.SHUTDOWN:
+                send({"id": request_id})
+                return
+            send({"id": request_id, **_dispatch(worker, method, request["params"])})
+        except Exception as e:
+            # One bad request must not take the warm worker down with it.
+            send({"id": request_id, "error": f"{type(e).__name__}: {e}"})
+
+
+def _pump(stream: IO[str], lines: queue.Queue[str]) -> None:
+    # `readline` cannot time out, so a thread reads the worker's stdout into
+    # a queue the client waits on with a deadline. The empty string marks
+    # end of output, as `readline` does.
+    try:
+        for line in stream:
+            lines.put(line)
+    except (OSError, ValueError):
+        pass
+    finally:
+        lines.put("")
+
+
+class FrontendWorkerClient:
+    """The client end: starts `command` on first use, checks its protocol
+    version, and restarts it after a crash. Requests are serialized; a
+    worker answers one at a time. A worker silent for `timeout` seconds is
+    treated as crashed, so a hung toolchain cannot block the caller."""
+
+    def __init__(self, command: Sequence[str], timeout: float | None = None) -> None:
+        self._command = list(command)
+        self._timeout = timeout
+        self._process: subprocess.Popen[str] | None = None
+        self._lines: queue.Queue[str] = queue.Queue()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def run(self, repo_path: Path, files: Sequence[Path]) -> SemanticFacts:
+        response = self._request(
+            WorkerMethod.RUN,
+            {"repo_path": str(repo_path), "files": [str(path) for path in files]},
+        )
+        return decode_facts(response["facts"])
+
+    def refresh(
+        self, repo_path: Path, files: Sequence[Path], changed: Sequence[Path]
+    ) -> IncrementalFacts:
+        response = self._request(
+            WorkerMethod.REFRESH,
+            {
+                "repo_path": str(repo_path),
+                "files": [str(path) for path in files],
+                "changed": [str(path) for path in changed],
+            },
+        )
+        refreshed = response.get("refreshed_files")
+        return IncrementalFacts(
+            decode_facts(response["facts"]),
+            None if refreshed is None else frozenset(refreshed),
+        )
+
+    def stop(self) -> None:
+        with self._lock:
+            process, self._process = self._process, None
+            if process is None:
+                return
+            try:
+                self._send(process, WorkerMethod.SHUTDOWN, {})
+                self._receive(_STOP_TIMEOUT)
+                process.wait(timeout=_STOP_TIMEOUT)
+            except (FrontendWorkerError, OSError, subprocess.TimeoutExpired):
+                process.kill()
+                process.wait()
+
+    def _start(self) -> subprocess.Popen[str]:
+        process = subprocess.Popen(
+            self._command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+        )
+        assert process.stdout is not None
+        # A fresh queue per process: lines a dead worker left behind must
+        # not answer the next one's requests.
+        self._lines = queue.Queue()
+        threading.Thread(
+            target=_pump,
+            args=(process.stdout, self._lines),
+            name=WORKER_READER_THREAD,
+            daemon=True,
+        ).start()
+        try:
+            hello = self._receive(self._timeout)
+            if not hello.get("ready"):
+                raise FrontendWorkerError(
+                    ex.FRONTEND_WORKER_BAD_MESSAGE.format(message=hello)
+                )
+        except FrontendWorkerError:
+            process.kill()
+            process.wait()
+            raise
+        logger.info(ls.FRONTEND_WORKER_STARTED, language=hello.get("language"))
+        return process
+
+    def _send(
+        self, process: subprocess.Popen[str], method: str, params: dict[str, Any]
+    ) -> int:
+        assert process.stdin is not None
+        self._next_id += 1
+        message = {
+            "protocol": WORKER_PROTOCOL_VERSION,
+            "id": self._next_id,
+            "method": str(method),
+            "params": params,
+        }
+        try:
+            process.stdin.write(json.dumps(message) + "\n")
+            process.stdin.flush()
+        except OSError as e:
+            raise FrontendWorkerError(ex.FRONTEND_WORKER_EXITED) from e
+        return self._next_id
+
+    def _receive(self, timeout: float | None) -> dict[str, Any]:
+        try:
+            line = self._lines.get(timeout=timeout)
+        except queue.Empty as e:
+            raise FrontendWorkerError(
+                ex.FRONTEND_WORKER_TIMEOUT.format(seconds=timeout)
+            ) from e
+        if not line:
+            raise FrontendWorkerError(ex.FRONTEND_WORKER_EXITED)
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise FrontendWorkerError(
+                ex.FRONTEND_WORKER_BAD_MESSAGE.format(message=line.strip())
+            ) from e
+        if not isinstance(message, dict):
+            raise FrontendWorkerError(
+                ex.FRONTEND_WORKER_BAD_MESSAGE.format(message=line.strip())
+            )
+        if message.get("protocol") != WORKER_PROTOCOL_VERSION:
+            raise FrontendWorkerError(
+                ex.FRONTEND_WORKER_PROTOCOL.format(
+                    expected=WORKER_PROTOCOL_VERSION, got=message.get("protocol")
+                )
+            )
+        return message
+
+    def _request(self, method: str, params: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._process = self._start()
+            process = self._process
+            try:
+                request_id = self._send(process, method, params)
+                response = self._receive(self._timeout)
+                if response.get("id") != request_id:
+                    raise FrontendWorkerError(
+                        ex.FRONTEND_WORKER_BAD_MESSAGE.format(message=response)
+                    )
+            except FrontendWorkerError:
+                # A dead, hung, garbled or out-of-step worker is dropped; the
+                # next request starts a fresh one.
+                self._process = None
+                process.kill()
+                process.wait()
+                raise
+        if "error" in response:
+            raise FrontendWorkerError(response["error"])
+        return response
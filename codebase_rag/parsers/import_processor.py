@@ -13,6 +13,7 @@ from tree_sitter import Node
 
 from .. import constants as cs
 from .. import logs as ls
+from ..config import settings
 from ..language_spec import LANGUAGE_SPECS, LanguageSpec
 from ..services import IngestorProtocol
 from ..types_defs import (
@@ -26,6 +27,7 @@ from ..utils.path_utils import should_keep_dir, should_skip_rel_file
 from .cpp_frontend.qn import build_module_qn_map
 from .dart import dart_extract_uri, dart_local_name, dart_resolve_import
 from .go import discover_go_module_paths, resolve_go_import_path
+from .import_resolution_cache import ImportResolutionCache, json_object, json_rows
 from .js_ts.module_paths import (
     discover_js_workspace_packages,
     resolve_js_workspace_import,
@@ -411,6 +413,13 @@ def _parse_tsconfig_aliases(data: dict, dir_prefix: str) -> list[tuple[str, str,
     return aliases
 
 
+def _list_dir_names(directory: Path) -> frozenset[str]:
+    try:
+        return frozenset(entry.name for entry in directory.iterdir())
+    except OSError:
+        return frozenset()
+
+
 def _load_ts_path_aliases(repo_path: Path) -> list[tuple[str, str, bool]]:
     # Aggregate `paths` aliases from every tsconfig at or below the repo root, each
     # target prefixed by the tsconfig's own directory so `@/util` resolves against
@@ -479,6 +488,7 @@ class ImportProcessor:
         "js_ts_bare_imports",
         "js_path_aliases",
         "stdlib_extractor",
+        "resolution_cache",
         "_is_local_module_cached",
         "_is_local_java_import_cached",
         "_java_source_root_prefix_cached",
@@ -691,11 +701,23 @@ class ImportProcessor:
         # being suppressed. Ordinary package specifiers (bare, scoped, node:/npm:)
         # are excluded, so genuine external calls stay suppressed.
         self.js_ts_bare_imports: dict[str, set[str]] = {}
+        # Discovery walks and per-import probes answered by an earlier run
+        # whose directories and manifests are unchanged (see
+        # import_resolution_cache); saved by GraphUpdater after each run.
+        self.resolution_cache = resolution_cache = ImportResolutionCache.load(
+            repo_path, settings.IMPORT_RESOLUTION_CACHE
+        )
         # tsconfig `paths` aliases (match_prefix, target_prefix, is_wildcard), parsed
         # once from the repo-root tsconfig so `@/util` imports resolve to the real
         # first-party module instead of being dropped as external.
-        self.js_path_aliases: list[tuple[str, str, bool]] = _load_ts_path_aliases(
-            repo_path
+        self.js_path_aliases: list[tuple[str, str, bool]] = resolution_cache.discovered(
+            cs.ImportResolutionFamily.TS_PATH_ALIASES,
+            lambda: _load_ts_path_aliases(repo_path),
+            lambda aliases: [list(alias) for alias in aliases],
+            lambda stored: [
+                (str(match), str(target), bool(wildcard))
+                for match, target, wildcard in json_rows(stored)
+            ],
         )
         self.stdlib_extractor = StdlibExtractor(
             function_registry, repo_path, project_name
@@ -718,11 +740,30 @@ class ImportProcessor:
         # their repo-relative path, so absolute imports of them cannot resolve by the
         # import-name == path assumption. Discover the name -> dotted-path map once
         # so those imports resolve first-party.
-        py_source_roots = discover_python_source_roots(repo_path)
+        py_source_roots = resolution_cache.discovered(
+            cs.ImportResolutionFamily.PY_SOURCE_ROOTS,
+            lambda: discover_python_source_roots(repo_path),
+            lambda roots: {
+                name: [list(candidate) for candidate in candidates]
+                for name, candidates in roots.items()
+            },
+            lambda stored: {
+                str(name): [
+                    (str(prefix), str(path)) for prefix, path in json_rows(candidates)
+                ]
+                for name, candidates in json_object(stored).items()
+            },
+        )
 
         @lru_cache(maxsize=4096)
         def _map_py_source_root_cached(module_name: str) -> str | None:
-            return resolve_via_source_roots(repo_path, py_source_roots, module_name)
+            return resolution_cache.resolve(
+                cs.ImportResolutionFamily.PY_SOURCE_ROOT,
+                module_name,
+                lambda: resolve_via_source_roots(
+                    repo_path, py_source_roots, module_name
+                ),
+            )
 
         self._map_py_source_root = _map_py_source_root_cached
 
@@ -731,11 +772,31 @@ class ImportProcessor:
         # assumption. Map each go.mod module directive to its directory once so local
         # imports rewrite to project-prefixed qns and unmapped (external) paths stay
         # recognisably slash-separated.
-        go_module_paths = discover_go_module_paths(repo_path)
+        go_module_paths = resolution_cache.discovered(
+            cs.ImportResolutionFamily.GO_MODULE_PATHS,
+            lambda: discover_go_module_paths(repo_path),
+            lambda mappings: [
+                [module, dotted, anchor.relative_to(repo_path).as_posix()]
+                for module, dotted, anchor in mappings
+            ],
+            lambda stored: [
+                (str(module), str(dotted), repo_path / str(anchor))
+                for module, dotted, anchor in json_rows(stored)
+            ],
+        )
+        go_module_roots = frozenset(module for module, _, _ in go_module_paths)
 
         @lru_cache(maxsize=4096)
         def _map_go_import_path_cached(import_path: str) -> str | None:
-            return resolve_go_import_path(go_module_paths, import_path)
+            # A module-ROOT import is decided by the package clause of the
+            # root's .go files, content no directory mtime tracks.
+            if import_path in go_module_roots:
+                return resolve_go_import_path(go_module_paths, import_path)
+            return resolution_cache.resolve(
+                cs.ImportResolutionFamily.GO_IMPORT_PATH,
+                import_path,
+                lambda: resolve_go_import_path(go_module_paths, import_path),
+            )
 
         self._map_go_import_path = _map_go_import_path_cached
 
@@ -743,14 +804,29 @@ class ImportProcessor:
         # (`@acme/sdk/admin`), which no relative-path arithmetic resolves, so
         # map every first-party package.json name to its directory once, the
         # same way go.mod module directives are mapped above (issue #945).
-        js_workspace_packages = discover_js_workspace_packages(repo_path)
+        js_workspace_packages = resolution_cache.discovered(
+            cs.ImportResolutionFamily.JS_WORKSPACE_PACKAGES,
+            lambda: discover_js_workspace_packages(repo_path),
+            lambda packages: [
+                [name, package_dir.relative_to(repo_path).as_posix()]
+                for name, package_dir in packages
+            ],
+            lambda stored: [
+                (str(name), repo_path / str(package_dir))
+                for name, package_dir in json_rows(stored)
+            ],
+        )
 
         @lru_cache(maxsize=4096)
         def _map_js_workspace_import_cached(
             import_path: str, require: bool = False
         ) -> str | None:
-            return resolve_js_workspace_import(
-                js_workspace_packages, import_path, repo_path, require
+            return resolution_cache.resolve(
+                cs.ImportResolutionFamily.JS_WORKSPACE_IMPORT,
+                f"{import_path}{cs.IMPORT_RESOLUTION_KEY_SEP}{int(require)}",
+                lambda: resolve_js_workspace_import(
+                    js_workspace_packages, import_path, repo_path, require
+                ),
             )
 
         self._map_js_workspace_import = _map_js_workspace_import_cached
@@ -762,18 +838,21 @@ class ImportProcessor:
             # top-level names, so a bare top-level import resolves externally.
             if repo_is_package:
                 return module_name == project_name
-            return (
-                (repo_path / module_name).is_dir()
-                or (repo_path / f"{module_name}{cs.EXT_PY}").is_file()
-                or (repo_path / module_name / cs.INIT_PY).is_file()
+            return resolution_cache.resolve_flag(
+                cs.ImportResolutionFamily.PY_LOCAL_MODULE,
+                module_name,
+                lambda: (
+                    (repo_path / module_name).is_dir()
+                    or (repo_path / f"{module_name}{cs.EXT_PY}").is_file()
+                    or (repo_path / module_name / cs.INIT_PY).is_file()
+                ),
             )
 
         # Discovered annotation-processor roots (issue #1140): mutated via
         # set_java_generated_roots, which clears the probe cache below.
         self.java_generated_roots: tuple[tuple[str, ...], ...] = ()
 
-        @lru_cache(maxsize=4096)
-        def _java_source_root_prefix_cached(import_path: str) -> str | None:
+        def _java_source_root_prefix(import_path: str) -> str | None:
             # The registered Module qns carry the build-tool source root
             # (src.main.java.), so a local import's qn must too; a flat
             # layout keeps the empty prefix and is unchanged (issue #1121).
@@ -804,6 +883,18 @@ class ImportProcessor:
                     )
             return None
 
+        @lru_cache(maxsize=4096)
+        def _java_source_root_prefix_cached(import_path: str) -> str | None:
+            # Generated roots sit under build output the indexer's walk
+            # prunes, so no tracked directory mtime would see them change.
+            if self.java_generated_roots:
+                return _java_source_root_prefix(import_path)
+            return resolution_cache.resolve(
+                cs.ImportResolutionFamily.JAVA_SOURCE_ROOT,
+                import_path,
+                lambda: _java_source_root_prefix(import_path),
+            )
+
         def _is_local_java_import_cached(import_path: str) -> bool:
             return _java_source_root_prefix_cached(import_path) is not None
 
@@ -961,6 +1052,11 @@ class ImportProcessor:
         if not deferred or self.ingestor is None:
             return 0
         self._deferred_import_edges = []
+        # The stdlib lookups below were queued all through Pass 2; introspect
+        # them in one batch per language before resolving each.
+        self.stdlib_extractor.prefetch(
+            (entry.full_name, entry.language) for entry in deferred
+        )
         known_module_qns = set(known_module_paths)
         module_aliases = self._module_alias_map(known_module_qns)
         emitted = 0
@@ -1266,11 +1362,9 @@ class ImportProcessor:
         key = str(directory)
         cached = self._rust_dir_listing.get(key)
         if cached is None:
-            try:
-                cached = frozenset(entry.name for entry in directory.iterdir())
-            except OSError:
-                cached = frozenset()
-            self._rust_dir_listing[key] = cached
+            cached = self._rust_dir_listing[key] = self.resolution_cache.listing(
+                directory, lambda: _list_dir_names(directory)
+            )
         return cached
 
     def _rust_file_is_indexed(self, rel_parts: Sequence[str]) -> bool:
@@ -3014,6 +3108,14 @@ class ImportProcessor:
             self.import_mapping[module_qn][local_name] = imported_path
             logger.debug(ls.IMP_CSHARP, name=local_name, path=imported_path)
 
+    def revalidate_resolution_cache(self) -> None:
+        # Called per run with the path-cache resets below: a watch session's
+        # later runs re-check what the persisted answers were computed under.
+        self.resolution_cache.revalidate()
+
+    def save_resolution_cache(self, dir_mtimes: dict[str, float]) -> None:
+        self.resolution_cache.save(dir_mtimes)
+
     def reset_java_path_caches(self) -> None:
         # Same contract as reset_rust_path_caches: the filesystem may have
         # gained or lost files since the layout decisions were cached.
@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path, PurePosixPath
+
+from loguru import logger
+
+from .. import constants as cs
+from .. import logs as ls
+from ..types_defs import JsonValue
+
+# Import resolution persisted per project (the repo's IMPORT_RESOLUTION_FILENAME
+# state file) so an incremental run does not redo the discovery walks and the
+# per-import filesystem probes of the previous one. Every answer is stored
+# with the directory mtimes of the run that computed it: a directory that
+# gained or lost an entry changes its mtime, so any such change drops the
+# stored answers (their probes may have looked there), while a Rust directory
+# listing depends on its own directory alone and survives changes elsewhere.
+# Manifest CONTENT does not move a directory mtime, so each manifest is
+# digested too and an edit drops only the families that read it.
+
+_DECODE_ERRORS = (TypeError, ValueError, KeyError, IndexError, AttributeError)
+
+
+def json_rows(stored: JsonValue) -> list[list[JsonValue]]:
+    # Narrows a stored list of rows for a `discovered` decoder; a mistyped
+    # file raises into _DECODE_ERRORS and the answer is recomputed.
+    if not isinstance(stored, list):
+        raise TypeError(stored)
+    rows: list[list[JsonValue]] = []
+    for row in stored:
+        if not isinstance(row, list):
+            raise TypeError(row)
+        rows.append(row)
+    return rows
+
+
+def json_object(stored: JsonValue) -> dict[str, JsonValue]:
+    if not isinstance(stored, dict):
+        raise TypeError(stored)
+    return stored
+
+
+def _digest(path: Path) -> str | None:
+    try:
+        return hashlib.md5(path.read_bytes(), usedforsecurity=False).hexdigest()
+    except OSError:
+        return None
+
+
+def _mtime(path: Path) -> float | None:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+class ImportResolutionCache:
+    """Import-resolution answers persisted between runs.
+
+    Invalidation is coarse on purpose. A directory mtime only says that an
+    entry was added or removed there, not which one. A probe's answer can
+    also turn on names its key does not spell, such as an `index.ts`,
+    `__init__.py` or `.go` file. So one added or removed file anywhere
+    drops every discovery result and per-import answer, and that run
+    recomputes them. Only the Rust listings of unchanged directories
+    survive. A manifest edit that moves no mtime drops just the families
+    that read that manifest. A warm incremental run therefore saves the
+    probes only when no file was added or removed.
+    """
+
+    __slots__ = (
+        "repo_path",
+        "enabled",
+        "_dirs",
+        "_manifests",
+        "_discovery",
+        "_entries",
+        "_listings",
+        "_observed",
+        "_fresh",
+        "_stale",
+    )
+
+    def __init__(self, repo_path: Path, enabled: bool = True) -> None:
+        self.repo_path = repo_path
+        self.enabled = enabled
+        # Directory mtimes the stored answers were computed under, and the
+        # mtimes this process last observed for them.
+        self._dirs: dict[str, float] = {}
+        self._observed: dict[str, float] = {}
+        # Manifest path -> content digest; None re-collects on save.
+        self._manifests: dict[str, str] | None = None
+        self._discovery: dict[str, JsonValue] = {}
+        self._entries: dict[str, dict[str, JsonValue]] = {}
+        self._listings: dict[str, list[str]] = {}
+        # `_fresh`: validated by load and not yet consumed by a run.
+        # `_stale`: the filesystem moved under answers this process already
+        # handed out (discovery is never redone in process), so nothing may
+        # be persisted until a new process rediscovers.
+        self._fresh = False
+        self._stale = False
+
+    @classmethod
+    def load(cls, repo_path: Path, enabled: bool = True) -> ImportResolutionCache:
+        cache = cls(repo_path, enabled)
+        if enabled:
+            cache._read()
+            cache._validate()
+            cache._fresh = True
+        return cache
+
+    @property
+    def path(self) -> Path:
+        return self.repo_path / cs.IMPORT_RESOLUTION_FILENAME
+
+    def discovered[T](
+        self,
+        family: cs.ImportResolutionFamily,
+        compute: Callable[[], T],
+        encode: Callable[[T], JsonValue],
+        decode: Callable[[JsonValue], T],
+    ) -> T:
+        if (stored := self._discovery.get(family)) is not None:
+            try:
+                return decode(stored)
+            except _DECODE_ERRORS:
+                pass
+        value = compute()
+        if self.enabled:
+            self._discovery[family] = encode(value)
+        return value
+
+    def resolve(
+        self,
+        family: cs.ImportResolutionFamily,
+        key: str,
+        compute: Callable[[], str | None],
+    ) -> str | None:
+        if not self.enabled:
+            return compute()
+        entries = self._entries.setdefault(family, {})
+        if key in entries and isinstance(stored := entries[key], str | None):
+            return stored
+        value = entries[key] = compute()
+        return value
+
+    def resolve_flag(
+        self,
+        family: cs.ImportResolutionFamily,
+        key: str,
+        compute: Callable[[], bool],
+    ) -> bool:
+        if not self.enabled:
+            return compute()
+        entries = self._entries.setdefault(family, {})
+        if isinstance(stored := entries.get(key), bool):
+            return stored
+        value = entries[key] = compute()
+        return value
+
+    def listing(
+        self, directory: Path, compute: Callable[[], frozenset[str]]
+    ) -> frozenset[str]:
+        key = self._dir_key(directory)
+        if not self.enabled or key is None:
+            return compute()
+        if (names := self._listings.get(key)) is not None:
+            return frozenset(names)
+        value = compute()
+        self._listings[key] = sorted(value)
+        return value
+
+    def revalidate(self) -> None:
+        """Re-check the stored answers at the start of a run.
+
+        The first run after `load` was validated there. A later run in the
+        same process (watch mode) re-stats the directories; a change drops
+        the affected answers and, because this process's discovery results
+        predate it, keeps the file from being rewritten.
+        """
+        if not self.enabled:
+            return
+        if self._fresh:
+            self._fresh = False
+            return
+        if not self._dirs or self._validate():
+            self._stale = True
+
+    def save(self, dir_mtimes: dict[str, float]) -> None:
+        """Persist this run's answers under the directory mtimes its walk saw.
+
+        A directory whose mtime moved between validation and the walk means
+        answers were computed from a view the walk did not see, so the file
+        is dropped instead.
+        """
+        if not self.enabled or not dir_mtimes:
+            return
+        path = self.path
+        if self._stale or any(
+            dir_mtimes.get(key, mtime) != mtime for key, mtime in self._observed.items()
+        ):
+            path.unlink(missing_ok=True)
+            return
+        if self._manifests is None or dir_mtimes.keys() != self._dirs.keys():
+            self._manifests = self._collect_manifests(dir_mtimes)
+        listings = {
+            key: names for key, names in self._listings.items() if key in dir_mtimes
+        }
+        payload = {
+            cs.IMPORT_RESOLUTION_KEY_VERSION: cs.IMPORT_RESOLUTION_VERSION,
+            cs.IMPORT_RESOLUTION_KEY_DIRS: dir_mtimes,
+            cs.IMPORT_RESOLUTION_KEY_MANIFESTS: self._manifests,
+            cs.IMPORT_RESOLUTION_KEY_DISCOVERY: self._discovery,
+            cs.IMPORT_RESOLUTION_KEY_ENTRIES: self._entries,
+            cs.IMPORT_RESOLUTION_KEY_LISTINGS: listings,
+        }
+        try:
+            with path.open("w", encoding=cs.ENCODING_UTF8) as f:
+                json.dump(payload, f)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(ls.IMP_RESOLUTION_CACHE_SAVE_ERROR, error=e)
+            return
+        self._dirs = dict(dir_mtimes)
+        self._observed = dict(dir_mtimes)
+        logger.debug(ls.IMP_RESOLUTION_CACHE_SAVED, path=path)
+
+    def _dir_key(self, directory: Path) -> str | None:
+        # Path(".").as_posix() is already cs.ROOT_DIR_KEY.
+        try:
+            return directory.relative_to(self.repo_path).as_posix()
+        except ValueError:
+            return None
+
+    def _dir_path(self, key: str) -> Path:
+        return self.repo_path if key == cs.ROOT_DIR_KEY else self.repo_path / key
+
+    def _read(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding=cs.ENCODING_UTF8))
+        except (OSError, ValueError):
+            return
+        if (
+            not isinstance(data, dict)
+            or data.get(cs.IMPORT_RESOLUTION_KEY_VERSION)
+            != cs.IMPORT_RESOLUTION_VERSION
+        ):
+            return
+        dirs = data.get(cs.IMPORT_RESOLUTION_KEY_DIRS)
+        manifests = data.get(cs.IMPORT_RESOLUTION_KEY_MANIFESTS)
+        discovery = data.get(cs.IMPORT_RESOLUTION_KEY_DISCOVERY)
+        entries = data.get(cs.IMPORT_RESOLUTION_KEY_ENTRIES)
+        listings = data.get(cs.IMPORT_RESOLUTION_KEY_LISTINGS)
+        if not (
+            isinstance(dirs, dict)
+            and isinstance(manifests, dict)
+            and isinstance(discovery, dict)
+            and isinstance(entries, dict)
+            and isinstance(listings, dict)
+        ):
+            return
+        self._dirs = {
+            key: float(mtime)
+            for key, mtime in dirs.items()
+            if isinstance(mtime, int | float)
+        }
+        self._manifests = {
+            rel: digest for rel, digest in manifests.items() if isinstance(digest, str)
+        }
+        self._discovery = discovery
+        self._entries = {
+            family: answers
+            for family, answers in entries.items()
+            if isinstance(answers, dict)
+        }
+        self._listings = {
+            key: names for key, names in listings.items() if isinstance(names, list)
+        }
+
+    def _validate(self) -> bool:
+        # Returns whether anything was dropped.
+        observed: dict[str, float] = {}
+        changed_dirs: list[str] = []
+        for key, mtime in self._dirs.items():
+            current = _mtime(self._dir_path(key))
+            if current is not None:
+                observed[key] = current
+            if current != mtime:
+                changed_dirs.append(key)
+        dropped: set[str] = set()
+        changed_manifests = 0
+        if changed_dirs:
+            # A probe may have looked in any directory, so every answer goes;
+            # only listings of unchanged directories still describe them.
+            dropped = {*self._discovery, *self._entries}
+            for key in changed_dirs:
+                self._listings.pop(key, None)
+            self._manifests = None
+        elif self._manifests is not None:
+            current_manifests: dict[str, str] = {}
+            for rel, digest in self._manifests.items():
+                current = _digest(self.repo_path / rel)
+                if current is None:
+                    continue
+                current_manifests[rel] = current
+                if current != digest:
+                    changed_manifests += 1
+                    dropped |= cs.IMPORT_RESOLUTION_MANIFEST_FAMILIES.get(
+                        PurePosixPath(rel).name, frozenset()
+                    )
+            self._manifests = current_manifests
+        for family in dropped:
+            self._discovery.pop(family, None)
+            self._entries.pop(family, None)
+        self._observed = observed
+        if dropped or changed_dirs:
+            logger.debug(
+                ls.IMP_RESOLUTION_CACHE_INVALIDATED,
+                families=", ".join(sorted(dropped)) or "-",
+                dirs=len(changed_dirs),
+                manifests=changed_manifests,
+            )
+        elif self._dirs:
+            logger.debug(
+                ls.IMP_RESOLUTION_CACHE_LOADED,
+                path=self.path,
+                entries=sum(len(answers) for answers in self._entries.values()),
+                listings=len(self._listings),
+            )
+        return bool(dropped or changed_dirs)
+
+    def _collect_manifests(self, dir_mtimes: dict[str, float]) -> dict[str, str]:
+        names = cs.IMPORT_RESOLUTION_MANIFEST_FAMILIES.keys()
+        manifests: dict[str, str] = {}
+        for key in dir_mtimes:
+            directory = self._dir_path(key)
+            try:
+                present = names & set(os.listdir(directory))
+            except OSError:
+                continue
+            prefix = "" if key == cs.ROOT_DIR_KEY else f"{key}{cs.SEPARATOR_SLASH}"
+            for name in present:
+                if (digest := _digest(directory / name)) is not None:
+                    manifests[f"{prefix}{name}"] = digest
+        return manifests
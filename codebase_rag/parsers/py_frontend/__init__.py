@@ -1,10 +1,12 @@
 from .frontend import (
+    PythonFactCache,
     python_frontend_available,
     resolve_python_frontend,
     run_python_frontend,
 )
 
 __all__ = [
+    "PythonFactCache",
     "python_frontend_available",
     "resolve_python_frontend",
     "run_python_frontend",
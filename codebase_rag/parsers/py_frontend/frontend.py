@@ -16,15 +16,26 @@ jedi to infer each callee, and emits the two standard fact families:
 
 Cost control: only attribute calls and import-bound bare calls are queried
 (module-local bare calls are the heuristics' home turf), one jedi Project is
-shared across files, and a per-file time budget degrades that file to the
-heuristics rather than stalling the index. Ambiguity is a ceiling: multiple
+shared across the files of a process (large runs split files across a
+process pool), target modules are read once per run, facts of unchanged
+files are reused from an on-disk cache, and a per-file time budget degrades
+that file to the heuristics rather than stalling the index. Ambiguity is a ceiling: multiple
 or empty inferences emit no fact, never a guess.
 """
 
 from __future__ import annotations
 
 import ast
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
 import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from loguru import logger
@@ -32,13 +43,25 @@ from loguru import logger
 from ... import constants as cs
 from ... import logs as ls
 from ...config import settings
-from ..frontends.protocol import CallSiteKey, ResolvedCallSite, SemanticFacts
+from ..frontends.protocol import (
+    CallSiteKey,
+    IncrementalFacts,
+    ResolvedCallSite,
+    SemanticFacts,
+)
 
 # Generous enough for jedi's cold-start typeshed parse (the dominant cost,
 # amortized by its on-disk cache after the first file); a stuck module still
 # degrades to heuristics instead of stalling the index.
 _FILE_BUDGET_SECONDS = 10.0
 _RESOLVABLE_TYPES = frozenset({"function", "class"})
+# Below this many files to infer, spawning workers (each re-imports jedi and
+# re-parses typeshed) costs more than it saves.
+_PARALLEL_MIN_FILES = 32
+_PARALLEL_CHUNK_FILES = 8
+_MAX_AUTO_WORKERS = 8
+# Bump when the persisted entry layout or the fact semantics change.
+_FACT_CACHE_VERSION = 1
 
 
 def python_frontend_available() -> bool:
@@ -116,6 +139,22 @@ def _single_resolvable_target(names):
     return name
 
 
+# Target-module line tables, memoized for one run: a hot utility module is
+# the target of thousands of call sites and is read once, not once per site.
+type LineTables = dict[str, list[str] | None]
+
+
+def _target_lines(module_path: str, line_tables: LineTables) -> list[str] | None:
+    if module_path not in line_tables:
+        try:
+            line_tables[module_path] = (
+                Path(module_path).read_text(encoding=cs.ENCODING_UTF8).splitlines()
+            )
+        except (OSError, UnicodeDecodeError):
+            line_tables[module_path] = None
+    return line_tables[module_path]
+
+
 def _record_site(
     script,
     source_lines: list[str],
@@ -123,6 +162,7 @@ def _record_site(
     site: tuple[str, int, int],
     repo_path: Path,
     facts: SemanticFacts,
+    line_tables: LineTables,
 ) -> None:
     import jedi
 
@@ -145,11 +185,8 @@ def _record_site(
         facts.external_sites.add(key)
         return
     target_rel = Path(module_path).relative_to(repo_path).as_posix()
-    try:
-        target_lines = (
-            Path(module_path).read_text(encoding=cs.ENCODING_UTF8).splitlines()
-        )
-    except (OSError, UnicodeDecodeError):
+    target_lines = _target_lines(str(module_path), line_tables)
+    if target_lines is None:
         return
     if target.line is None or target.line - 1 >= len(target_lines):
         return
@@ -171,17 +208,22 @@ def _resolve_file(
     repo_path: Path,
     facts: SemanticFacts,
     deadline: float,
+    line_tables: LineTables | None = None,
 ) -> bool:
     # File-local collection makes degradation ATOMIC: a file that blows its
     # budget contributes nothing, instead of a half-resolved prefix. jedi has
     # no cancellation API, so one slow infer() can overshoot the deadline;
     # the post-call check then discards the whole file's facts, bounding the
     # damage to a single call's wall time.
+    if line_tables is None:
+        line_tables = {}
     file_facts = SemanticFacts()
     for site in sites:
         if time.monotonic() > deadline:
             return False
-        _record_site(script, source_lines, rel_file, site, repo_path, file_facts)
+        _record_site(
+            script, source_lines, rel_file, site, repo_path, file_facts, line_tables
+        )
     if time.monotonic() > deadline:
         return False
     facts.resolved_call_sites.update(file_facts.resolved_call_sites)
@@ -189,41 +231,494 @@ def _resolve_file(
     return True
 
 
-def run_python_frontend(repo_path: Path, files: list[Path]) -> SemanticFacts:
-    facts = SemanticFacts()
-    if not files:
-        return facts
+def _is_package_init(rel_file: str) -> bool:
+    return rel_file.rpartition("/")[2] == cs.INIT_PY
+
+
+def _module_name(rel_file: str) -> str:
+    parts = rel_file.split("/")
+    if _is_package_init(rel_file):
+        parts.pop()
+    else:
+        parts[-1] = parts[-1].removesuffix(cs.EXT_PY)
+    return ".".join(parts)
+
+
+def _imported_modules(
+    tree: ast.Module, module: str, is_package: bool
+) -> frozenset[str]:
+    # Every dotted name an import can bind, relative imports anchored at the
+    # importer's package: `from a.b import c` may name module a.b.c as well
+    # as attribute c of a.b, and `import a.b.c` executes a and a.b too.
+    package = module.split(".") if is_package else module.split(".")[:-1]
+    found: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            heads = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                if node.level - 1 > len(package):
+                    continue
+                anchor = package[: len(package) - node.level + 1]
+                base = ".".join([*anchor, *([node.module] if node.module else [])])
+            else:
+                base = node.module or ""
+            heads = [
+                f"{base}.{alias.name}" if base else alias.name for alias in node.names
+            ]
+            if base:
+                heads.append(base)
+        else:
+            continue
+        for head in heads:
+            parts = head.split(".")
+            found.update(".".join(parts[: i + 1]) for i in range(len(parts)))
+    return frozenset(found)
+
+
+@dataclass
+class _FileEntry:
+    digest: str
+    module: str
+    imports: frozenset[str]
+    facts: SemanticFacts
+    # rel_file -> digest of every repo file these facts were inferred
+    # against (the modules it imports and the files its targets live in);
+    # a changed dependency invalidates the cached facts.
+    deps: dict[str, str] = field(default_factory=dict)
+    # False when the file blew its budget: it contributes no facts, and is
+    # never persisted so the next full run retries it.
+    complete: bool = True
+
+
+def _file_digest(data: bytes) -> str:
+    return hashlib.md5(data, usedforsecurity=False).hexdigest()
+
+
+def _analyze_file(
+    project,
+    repo_path: Path,
+    file_path: Path,
+    rel_file: str,
+    line_tables: LineTables,
+    budget: float,
+) -> _FileEntry | None:
+    """One file's facts plus what the dependency walk needs."""
     import jedi
 
-    repo_path = repo_path.resolve()
-    project = jedi.Project(str(repo_path))
-    degraded = 0
+    try:
+        data = file_path.read_bytes()
+    except OSError:
+        return None
+    module = _module_name(rel_file)
+    entry = _FileEntry(_file_digest(data), module, frozenset(), SemanticFacts())
+    try:
+        source = data.decode(cs.ENCODING_UTF8)
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return entry
+    entry.imports = _imported_modules(tree, module, _is_package_init(rel_file))
+    collector = _CallSite()
+    collector.visit(tree)
+    if not collector.sites:
+        return entry
+    script = jedi.Script(path=str(file_path), project=project)
+    entry.complete = _resolve_file(
+        script,
+        source.splitlines(),
+        rel_file,
+        collector.sites,
+        repo_path,
+        entry.facts,
+        time.monotonic() + budget,
+        line_tables,
+    )
+    return entry
+
+
+@dataclass
+class _WorkerState:
+    repo_path: Path
+    project: object
+    budget: float
+    line_tables: LineTables
+
+
+_worker_state: _WorkerState | None = None
+
+
+def _init_worker(repo_path: str, budget: float, jedi_cache: str) -> None:
+    # Each worker owns its jedi Project (and inference caches) and its line
+    # tables for the run; the parent's are never shared across processes.
+    global _worker_state
+    import jedi
+
+    jedi.settings.cache_directory = jedi_cache
+    _worker_state = _WorkerState(Path(repo_path), jedi.Project(repo_path), budget, {})
+
+
+def _analyze_chunk(
+    items: list[tuple[str, str]],
+) -> list[tuple[str, _FileEntry | None]]:
+    state = _worker_state
+    assert state is not None
+    return [
+        (
+            rel_file,
+            _analyze_file(
+                state.project,
+                state.repo_path,
+                Path(path),
+                rel_file,
+                state.line_tables,
+                state.budget,
+            ),
+        )
+        for rel_file, path in items
+    ]
+
+
+def _worker_count() -> int:
+    workers = settings.PYTHON_FRONTEND_WORKERS
+    if workers == 0:
+        workers = min(os.cpu_count() or 1, _MAX_AUTO_WORKERS)
+    return workers
+
+
+def _rel_files(repo_path: Path, files: Sequence[Path]) -> dict[str, Path]:
+    by_rel: dict[str, Path] = {}
     for file_path in files:
-        try:
-            source = file_path.read_text(encoding=cs.ENCODING_UTF8)
-            tree = ast.parse(source)
-        except (OSError, SyntaxError, ValueError):
-            continue
-        collector = _CallSite()
-        collector.visit(tree)
-        if not collector.sites:
-            continue
         try:
             rel_file = file_path.resolve().relative_to(repo_path).as_posix()
         except ValueError:
             continue
-        script = jedi.Script(path=str(file_path), project=project)
-        deadline = time.monotonic() + _FILE_BUDGET_SECONDS
-        if not _resolve_file(
-            script,
-            source.splitlines(),
-            rel_file,
-            collector.sites,
-            repo_path,
-            facts,
-            deadline,
+        by_rel[rel_file] = file_path
+    return by_rel
+
+
+def _merge_facts(into: SemanticFacts, facts: SemanticFacts) -> None:
+    into.resolved_call_sites.update(facts.resolved_call_sites)
+    into.external_sites.update(facts.external_sites)
+
+
+def _module_index(entries: dict[str, _FileEntry]) -> dict[str, set[str]]:
+    # Every dotted suffix of a repo module name -> its files, so an absolute
+    # import resolves whatever source-root prefix the file sits under.
+    index: dict[str, set[str]] = {}
+    for rel_file, entry in entries.items():
+        parts = entry.module.split(".")
+        for i in range(len(parts)):
+            index.setdefault(".".join(parts[i:]), set()).add(rel_file)
+    return index
+
+
+def _link_deps(
+    entry: _FileEntry,
+    rel_file: str,
+    index: dict[str, set[str]],
+    entries: dict[str, _FileEntry],
+) -> None:
+    dep_files = {
+        target.target_file for target in entry.facts.resolved_call_sites.values()
+    }
+    for imported in entry.imports:
+        dep_files.update(index.get(imported, ()))
+    dep_files.discard(rel_file)
+    entry.deps = {
+        dep: entries[dep].digest for dep in sorted(dep_files) if dep in entries
+    }
+
+
+def _environment_key(project) -> str:
+    # Cached facts are only as good as the interpreter jedi inferred them
+    # against: a different jedi release or Python environment can bind the
+    # same call elsewhere (or prove it external where it was not).
+    import jedi
+
+    try:
+        environment = project.get_environment()
+        interpreter = f"{environment.executable}:{environment.version_info}"
+    except jedi.InvalidPythonEnvironment:
+        interpreter = f"{sys.executable}:{sys.version_info}"
+    return f"{_FACT_CACHE_VERSION}:{jedi.__version__}:{interpreter}"
+
+
+def _fact_cache_path(repo_path: Path) -> Path:
+    name = hashlib.md5(
+        repo_path.as_posix().encode(cs.ENCODING_UTF8), usedforsecurity=False
+    ).hexdigest()
+    return settings.CGR_HOME.expanduser() / "python_jedi" / f"{name}.json"
+
+
+def _encode_entry(entry: _FileEntry) -> dict:
+    return {
+        "digest": entry.digest,
+        "imports": sorted(entry.imports),
+        "deps": entry.deps,
+        "resolved": [
+            [line, col, name, t.target_file, t.target_line, t.target_col]
+            for (_, line, col, name), t in entry.facts.resolved_call_sites.items()
+        ],
+        "external": [
+            [line, col, name] for _, line, col, name in entry.facts.external_sites
+        ],
+    }
+
+
+def _decode_entry(rel_file: str, raw: dict) -> _FileEntry:
+    facts = SemanticFacts()
+    for line, col, name, target_file, target_line, target_col in raw["resolved"]:
+        facts.resolved_call_sites[(rel_file, line, col, name)] = ResolvedCallSite(
+            name, target_file, target_line, target_col
+        )
+    facts.external_sites.update(
+        (rel_file, line, col, name) for line, col, name in raw["external"]
+    )
+    return _FileEntry(
+        raw["digest"],
+        _module_name(rel_file),
+        frozenset(raw["imports"]),
+        facts,
+        dict(raw["deps"]),
+    )
+
+
+def _load_fact_cache(path: Path, env_key: str) -> dict[str, dict]:
+    try:
+        payload = json.loads(path.read_text(encoding=cs.ENCODING_UTF8))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("env") != env_key:
+        return {}
+    files = payload.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _save_fact_cache(path: Path, env_key: str, entries: dict[str, _FileEntry]) -> None:
+    payload = {
+        "env": env_key,
+        "files": {
+            rel_file: _encode_entry(entry)
+            for rel_file, entry in entries.items()
+            if entry.complete
+        },
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f"{path.suffix}.tmp")
+        tmp.write_text(json.dumps(payload), encoding=cs.ENCODING_UTF8)
+        tmp.replace(path)
+    except OSError as e:
+        logger.warning(ls.PY_FRONTEND_FACT_CACHE_WRITE_FAILED, path=path, error=e)
+
+
+class PythonFactCache:
+    """Per-file Jedi facts keyed by content hash, kept between runs so a watch
+    event re-infers the edited file and its importers instead of the repo.
+
+    A file's facts depend on the modules it imports, so an edit refreshes the
+    edited file plus every file importing it; a package `__init__` re-exports
+    what it imports, so the refresh follows importers of an affected
+    `__init__` onward. Deeper inference chains (a return type flowing through
+    an intermediate module) are picked up by the next full run.
+
+    With `PYTHON_FRONTEND_FACT_CACHE` on, the entries are also persisted per
+    repo under CGR_HOME, tagged with the jedi version and Python environment;
+    a full run reuses every entry whose file and dependencies are unchanged
+    and only infers the rest, across a process pool when there are enough."""
+
+    def __init__(self) -> None:
+        self._repo_path: Path | None = None
+        self._project = None
+        self._entries: dict[str, _FileEntry] = {}
+        self._env_key = ""
+
+    def run(self, repo_path: Path, files: Sequence[Path]) -> SemanticFacts:
+        import jedi
+
+        repo_path = repo_path.resolve()
+        self._repo_path = repo_path
+        self._project = jedi.Project(str(repo_path))
+        self._entries = {}
+        facts = SemanticFacts()
+        if not files:
+            return facts
+        by_rel = _rel_files(repo_path, files)
+        pending = by_rel
+        if settings.PYTHON_FRONTEND_FACT_CACHE:
+            self._env_key = _environment_key(self._project)
+            pending = self._reuse_cached(repo_path, by_rel)
+            logger.info(
+                ls.PY_FRONTEND_FACT_CACHE,
+                reused=len(by_rel) - len(pending),
+                analyzed=len(pending),
+            )
+        self._analyze(pending)
+        for entry in self._entries.values():
+            _merge_facts(facts, entry.facts)
+        self._persist()
+        return facts
+
+    def refresh(
+        self, repo_path: Path, files: Sequence[Path], changed: Sequence[Path]
+    ) -> IncrementalFacts:
+        repo_path = repo_path.resolve()
+        if self._repo_path != repo_path or self._project is None:
+            return IncrementalFacts(self.run(repo_path, files))
+        by_rel = _rel_files(repo_path, files)
+        dirty = {rel for rel in by_rel if rel not in self._entries}
+        for rel in set(_rel_files(repo_path, changed)) | (
+            self._entries.keys() - by_rel.keys()
         ):
-            degraded += 1
-    if degraded:
-        logger.info(ls.PY_FRONTEND_BUDGET_DEGRADED, count=degraded)
-    return facts
+            if rel not in by_rel:
+                if self._entries.pop(rel, None) is not None:
+                    dirty.add(rel)
+                continue
+            entry = self._entries.get(rel)
+            try:
+                digest = _file_digest(by_rel[rel].read_bytes())
+            except OSError:
+                digest = None
+            if entry is None or entry.digest != digest:
+                dirty.add(rel)
+        if not dirty:
+            return IncrementalFacts(SemanticFacts(), frozenset())
+        affected = self._importers_of(dirty)
+        refreshed = {rel: by_rel[rel] for rel in affected if rel in by_rel}
+        self._analyze(refreshed)
+        facts = SemanticFacts()
+        for rel in refreshed:
+            if (entry := self._entries.get(rel)) is not None:
+                _merge_facts(facts, entry.facts)
+        self._persist()
+        logger.info(ls.PY_FRONTEND_REFRESHED, changed=len(dirty), files=len(affected))
+        return IncrementalFacts(facts, frozenset(affected))
+
+    def _reuse_cached(
+        self, repo_path: Path, by_rel: dict[str, Path]
+    ) -> dict[str, Path]:
+        digests: dict[str, str] = {}
+        for rel_file, file_path in by_rel.items():
+            try:
+                digests[rel_file] = _file_digest(file_path.read_bytes())
+            except OSError:
+                continue
+        stored = _load_fact_cache(_fact_cache_path(repo_path), self._env_key)
+        pending: dict[str, Path] = {}
+        for rel_file, file_path in by_rel.items():
+            raw = stored.get(rel_file)
+            try:
+                fresh = (
+                    raw is not None
+                    and raw["digest"] == digests.get(rel_file)
+                    and all(
+                        digests.get(dep) == digest
+                        for dep, digest in raw["deps"].items()
+                    )
+                )
+                if fresh:
+                    self._entries[rel_file] = _decode_entry(rel_file, raw)
+                    continue
+            except (KeyError, TypeError, ValueError):
+                pass
+            pending[rel_file] = file_path
+        return pending
+
+    def _persist(self) -> None:
+        if settings.PYTHON_FRONTEND_FACT_CACHE and self._repo_path is not None:
+            _save_fact_cache(
+                _fact_cache_path(self._repo_path), self._env_key, self._entries
+            )
+
+    def _importers_of(self, dirty: set[str]) -> set[str]:
+        affected = set(dirty)
+        frontier = {_module_name(rel) for rel in dirty}
+        while frontier:
+            reached: set[str] = set()
+            for rel, entry in self._entries.items():
+                if rel in affected:
+                    continue
+                if entry.deps.keys().isdisjoint(dirty) and not any(
+                    _names_module(imported, module)
+                    for imported in entry.imports
+                    for module in frontier
+                ):
+                    continue
+                affected.add(rel)
+                if _is_package_init(rel):
+                    reached.add(entry.module)
+            frontier = reached
+        return affected
+
+    def _analyze(self, by_rel: dict[str, Path]) -> None:
+        assert self._repo_path is not None
+        results: dict[str, _FileEntry | None] = {}
+        workers = _worker_count()
+        if workers > 1 and len(by_rel) >= _PARALLEL_MIN_FILES:
+            results = self._analyze_parallel(by_rel, workers)
+        line_tables: LineTables = {}
+        for rel_file, file_path in by_rel.items():
+            if rel_file not in results:
+                results[rel_file] = _analyze_file(
+                    self._project,
+                    self._repo_path,
+                    file_path,
+                    rel_file,
+                    line_tables,
+                    _FILE_BUDGET_SECONDS,
+                )
+        degraded = 0
+        for rel_file, entry in results.items():
+            if entry is None:
+                self._entries.pop(rel_file, None)
+                continue
+            degraded += not entry.complete
+            self._entries[rel_file] = entry
+        index = _module_index(self._entries)
+        for rel_file in results:
+            if (entry := self._entries.get(rel_file)) is not None:
+                _link_deps(entry, rel_file, index, self._entries)
+        if degraded:
+            logger.info(ls.PY_FRONTEND_BUDGET_DEGRADED, count=degraded)
+
+    def _analyze_parallel(
+        self, by_rel: dict[str, Path], workers: int
+    ) -> dict[str, _FileEntry | None]:
+        import jedi
+
+        assert self._repo_path is not None
+        items = [(rel_file, str(path)) for rel_file, path in by_rel.items()]
+        chunks = [
+            items[i : i + _PARALLEL_CHUNK_FILES]
+            for i in range(0, len(items), _PARALLEL_CHUNK_FILES)
+        ]
+        results: dict[str, _FileEntry | None] = {}
+        # spawn, not fork: the indexer has live threads (flush pool, loguru)
+        # whose held locks a forked child would inherit.
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(chunks)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(
+                    str(self._repo_path),
+                    _FILE_BUDGET_SECONDS,
+                    str(jedi.settings.cache_directory),
+                ),
+            ) as pool:
+                for chunk in pool.map(_analyze_chunk, chunks):
+                    results.update(chunk)
+        except (BrokenProcessPool, OSError) as e:
+            # Whatever the pool did not finish is analyzed in process.
+            logger.warning(ls.PY_FRONTEND_POOL_FAILED, error=e)
+        return results
+
+
+def _names_module(imported: str, module: str) -> bool:
+    # Repo-relative module names carry any source-root prefix (src/pkg/x.py
+    # is src.pkg.x) that an absolute import omits.
+    return module == imported or module.endswith(f".{imported}")
+
+
+def run_python_frontend(repo_path: Path, files: list[Path]) -> SemanticFacts:
+    return PythonFactCache().run(repo_path, files)
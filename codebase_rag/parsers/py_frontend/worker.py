@@ -0,0 +1,16 @@
+"""Entry point of the persistent Jedi worker (`PYTHON_FRONTEND_WORKER`):
+serves "changed files -> facts" over stdin/stdout until shut down, keeping
+the jedi Project and the per-file facts warm between requests."""
+
+from __future__ import annotations
+
+from ..frontends.python import PythonJediFrontend
+from ..frontends.worker import serve
+
+
+def main() -> None:
+    serve(PythonJediFrontend(in_process=True))
+
+
+if __name__ == "__main__":
+    main()
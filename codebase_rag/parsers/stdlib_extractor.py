@@ -1,5 +1,12 @@
+import atexit
+import hashlib
 import json
-import time
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from collections.abc import Iterable, Sequence
 from pathlib import Path
 from typing import TypedDict
 
@@ -18,18 +25,117 @@ class StdlibCacheStats(TypedDict):
 
 
 _STDLIB_CACHE: dict[str, dict[str, str]] = {}
-_CACHE_TTL = cs.IMPORT_CACHE_TTL
-_CACHE_TIMESTAMPS: dict[str, float] = {}
+# {language: toolchain version its cached results were computed with}; a
+# result stays valid until that toolchain changes, across runs.
+_CACHE_TOOLCHAINS: dict[str, str] = {}
+_TOOLCHAIN_VERSIONS: dict[str, str] = {}
 
 _EXTERNAL_TOOLS: dict[str, bool] = {}
 
+# {(language, module, entity): does the module declare the entity}, answered
+# by the language's introspection helper.
+_INTROSPECTED: dict[tuple[str, str, str], bool] = {}
+
+_TOOLCHAIN_UNAVAILABLE = "unavailable"
+# _TOOLCHAIN_VERSIONS slot memoizing _resolver_revision().
+_RESOLVER_REVISION = "@resolver"
+_HELPER_YES = "cgr:1"
+_HELPER_NO = "cgr:0"
+
+# Both helpers read `module<TAB>entity` lines and answer each with `cgr:1` or
+# `cgr:0`; any other output (a chatty module loaded by `require`) is skipped.
+_LUA_HELPER = """
+io.stdout:setvbuf("line")
+for line in io.lines() do
+    local module_name, entity_name = line:match("^([^\t]*)\t(.*)$")
+    local found = false
+    if module_name then
+        -- Built-in modules are global tables; anything else goes through require.
+        local module_table = _G[module_name]
+        if type(module_table) ~= "table" then
+            local ok, loaded = pcall(require, module_name)
+            module_table = ok and loaded or nil
+        end
+        found = type(module_table) == "table" and module_table[entity_name] ~= nil
+    end
+    print(found and "cgr:1" or "cgr:0")
+end
+"""
+
+_GO_HELPER = """
+package main
+
+import (
+	"bufio"
+	"fmt"
+	"go/build"
+	"go/doc"
+	"go/parser"
+	"go/token"
+	"os"
+	"strings"
+)
+
+func declared(dir string) map[string]bool {
+	names := map[string]bool{}
+	fset := token.NewFileSet()
+	pkgs, err := parser.ParseDir(fset, dir, nil, parser.ParseComments)
+	if err != nil {
+		return names
+	}
+	for _, pkg := range pkgs {
+		d := doc.New(pkg, dir, doc.AllDecls)
+		values := append(d.Consts, d.Vars...)
+		for _, f := range d.Funcs {
+			names[f.Name] = true
+		}
+		for _, t := range d.Types {
+			names[t.Name] = true
+			for _, f := range t.Funcs {
+				names[f.Name] = true
+			}
+			values = append(append(values, t.Consts...), t.Vars...)
+		}
+		for _, v := range values {
+			for _, name := range v.Names {
+				names[name] = true
+			}
+		}
+	}
+	return names
+}
+
+func main() {
+	cwd, _ := os.Getwd()
+	packages := map[string]map[string]bool{}
+	in := bufio.NewScanner(os.Stdin)
+	in.Buffer(make([]byte, 1<<20), 1<<20)
+	out := bufio.NewWriter(os.Stdout)
+	for in.Scan() {
+		pkgPath, entity, _ := strings.Cut(in.Text(), "\t")
+		names, ok := packages[pkgPath]
+		if !ok {
+			names = map[string]bool{}
+			if p, err := build.Default.Import(pkgPath, cwd, build.FindOnly); err == nil {
+				names = declared(p.Dir)
+			}
+			packages[pkgPath] = names
+		}
+		if names[entity] {
+			fmt.Fprintln(out, "cgr:1")
+		} else {
+			fmt.Fprintln(out, "cgr:0")
+		}
+		out.Flush()
+	}
+}
+"""
+
 
 def _is_tool_available(tool_name: str) -> bool:
     if tool_name in _EXTERNAL_TOOLS:
         return _EXTERNAL_TOOLS[tool_name]
 
-    import subprocess
-
     try:
         subprocess.run(
             [tool_name, "--version"], check=False, capture_output=True, timeout=2
@@ -46,27 +152,210 @@ def _is_tool_available(tool_name: str) -> bool:
         return False
 
 
+def _resolver_revision() -> str:
+    # The name heuristics and their stdlib tables: results computed by an
+    # older revision of either are recomputed.
+    hasher = hashlib.md5(usedforsecurity=False)
+    for source in (Path(__file__), Path(cs.__file__).parent / "stdlib_types.py"):
+        try:
+            hasher.update(source.read_bytes())
+        except OSError:
+            pass
+    return hasher.hexdigest()
+
+
+def _toolchain_version(language: str) -> str:
+    # What a language's cached results were derived from: the resolver code,
+    # plus the interpreter (and its site-packages) for Python and the
+    # introspection tool for Go and Lua.
+    if language in _TOOLCHAIN_VERSIONS:
+        return _TOOLCHAIN_VERSIONS[language]
+    match language:
+        case cs.SupportedLanguage.PYTHON:
+            version = f"{sys.version} {sys.prefix}"
+        case cs.SupportedLanguage.GO | cs.SupportedLanguage.LUA:
+            command = (
+                ["go", "version"]
+                if language == cs.SupportedLanguage.GO
+                else ["lua", "-v"]
+            )
+            try:
+                completed = subprocess.run(
+                    command, check=False, capture_output=True, text=True, timeout=5
+                )
+                version = (completed.stdout + completed.stderr).strip()
+            except (OSError, subprocess.SubprocessError):
+                version = _TOOLCHAIN_UNAVAILABLE
+        case _:
+            version = ""
+    if _RESOLVER_REVISION not in _TOOLCHAIN_VERSIONS:
+        _TOOLCHAIN_VERSIONS[_RESOLVER_REVISION] = _resolver_revision()
+    version = f"{_TOOLCHAIN_VERSIONS[_RESOLVER_REVISION]} {version}".strip()
+    _TOOLCHAIN_VERSIONS[language] = version
+    return version
+
+
+class _IntrospectionHelper:
+    """One long-lived toolchain process answering batched "does `module`
+    declare `entity`" queries over a pipe, instead of a process per name. A
+    helper that fails (exits, hangs past the timeout, garbles a reply) is
+    not restarted: its queries, and every later one, come back unanswered
+    and the name heuristics decide."""
+
+    def __init__(self, language: str) -> None:
+        self.language = language
+        self._process: subprocess.Popen[str] | None = None
+        self._workdir: Path | None = None
+        self._broken = False
+        self._lock = threading.Lock()
+
+    def query(self, pairs: Sequence[tuple[str, str]]) -> list[bool | None]:
+        with self._lock:
+            answers: list[bool | None] = []
+            for start in range(0, len(pairs), cs.STDLIB_HELPER_BATCH_SIZE):
+                answers.extend(
+                    self._round_trip(pairs[start : start + cs.STDLIB_HELPER_BATCH_SIZE])
+                )
+            return answers
+
+    def stop(self) -> None:
+        process, self._process = self._process, None
+        if process is not None:
+            process.kill()
+            process.wait()
+        if self._workdir is not None:
+            shutil.rmtree(self._workdir, ignore_errors=True)
+            self._workdir = None
+
+    def _command(self) -> list[str] | None:
+        if self.language == cs.SupportedLanguage.LUA:
+            return ["lua", "-e", _LUA_HELPER] if _is_tool_available("lua") else None
+        if not _is_tool_available("go"):
+            return None
+        # `go run` would leave the compiled child behind on kill; build once
+        # and run the binary directly.
+        self._workdir = Path(tempfile.mkdtemp(prefix="cgr-go-introspect-"))
+        source = self._workdir / "main.go"
+        binary = self._workdir / "introspect"
+        source.write_text(_GO_HELPER, encoding=cs.ENCODING_UTF8)
+        subprocess.run(
+            ["go", "build", "-o", str(binary), str(source)],
+            check=True,
+            capture_output=True,
+            timeout=cs.STDLIB_HELPER_BUILD_TIMEOUT,
+        )
+        return [str(binary)]
+
+    def _start(self) -> subprocess.Popen[str] | None:
+        if self._process is not None and self._process.poll() is None:
+            return self._process
+        if self._broken:
+            return None
+        try:
+            command = self._command()
+            if command is None:
+                self._broken = True
+                return None
+            self._process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding=cs.ENCODING_UTF8,
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            self._fail(e)
+            return None
+        logger.debug(ls.IMP_STDLIB_HELPER_STARTED, language=self.language)
+        return self._process
+
+    def _fail(self, error: Exception) -> None:
+        logger.debug(ls.IMP_STDLIB_HELPER_FAILED, language=self.language, error=error)
+        self._broken = True
+        self.stop()
+
+    def _round_trip(self, pairs: Sequence[tuple[str, str]]) -> list[bool | None]:
+        process = self._start()
+        if process is None:
+            return [None] * len(pairs)
+        assert process.stdin is not None and process.stdout is not None
+        # A hung lookup (a `require` that blocks) kills the helper; the
+        # pending readline then sees end of file.
+        watchdog = threading.Timer(cs.STDLIB_HELPER_TIMEOUT, process.kill)
+        watchdog.start()
+        try:
+            process.stdin.write(
+                "".join(f"{module}\t{entity}\n" for module, entity in pairs)
+            )
+            process.stdin.flush()
+            answers: list[bool | None] = []
+            while len(answers) < len(pairs):
+                line = process.stdout.readline()
+                if not line:
+                    raise EOFError(process.poll())
+                if (reply := line.strip()) in (_HELPER_YES, _HELPER_NO):
+                    answers.append(reply == _HELPER_YES)
+            return answers
+        except (OSError, ValueError, EOFError) as e:
+            self._fail(e)
+            return [None] * len(pairs)
+        finally:
+            watchdog.cancel()
+
+
+_HELPERS: dict[str, _IntrospectionHelper] = {}
+
+
+def stop_stdlib_helpers() -> None:
+    for helper in _HELPERS.values():
+        helper.stop()
+    _HELPERS.clear()
+
+
+def _query_helper(language: str, pairs: Sequence[tuple[str, str]]) -> list[bool | None]:
+    if (helper := _HELPERS.get(language)) is None:
+        if not _HELPERS:
+            atexit.register(stop_stdlib_helpers)
+        helper = _HELPERS[language] = _IntrospectionHelper(language)
+    return helper.query(pairs)
+
+
+def _introspect(language: str, pairs: Iterable[tuple[str, str]]) -> None:
+    # A name the line protocol cannot carry is left to the heuristics.
+    pending = sorted(
+        {
+            pair
+            for pair in pairs
+            if (language, *pair) not in _INTROSPECTED
+            and not any(c in part for part in pair for c in "\t\n\r")
+        }
+    )
+    if not pending:
+        return
+    for pair, answer in zip(pending, _query_helper(language, pending)):
+        if answer is not None:
+            _INTROSPECTED[(language, *pair)] = answer
+
+
+def _declares(language: str, module: str, entity: str) -> bool:
+    _introspect(language, [(module, entity)])
+    return _INTROSPECTED.get((language, module, entity), False)
+
+
 def _get_cached_stdlib_result(language: str, full_qualified_name: str) -> str | None:
     cache_key = f"{language}:{full_qualified_name}"
 
     if cache_key not in _STDLIB_CACHE:
         return None
 
-    if (
-        cache_key in _CACHE_TIMESTAMPS
-        and time.time() - _CACHE_TIMESTAMPS[cache_key] > _CACHE_TTL
-    ):
-        del _STDLIB_CACHE[cache_key]
-        del _CACHE_TIMESTAMPS[cache_key]
-        return None
-
     return _STDLIB_CACHE[cache_key].get(full_qualified_name)
 
 
 def _cache_stdlib_result(language: str, full_qualified_name: str, result: str) -> None:
     cache_key = f"{language}:{full_qualified_name}"
+    _CACHE_TOOLCHAINS[language] = _toolchain_version(language)
     _STDLIB_CACHE.setdefault(cache_key, {})[full_qualified_name] = result
-    _CACHE_TIMESTAMPS[cache_key] = time.time()
 
 
 def load_persistent_cache() -> None:
@@ -75,8 +364,19 @@ def load_persistent_cache() -> None:
         if cache_file.exists():
             with cache_file.open() as f:
                 data = json.load(f)
-                _STDLIB_CACHE.update(data.get(cs.IMPORT_CACHE_KEY, {}))
-                _CACHE_TIMESTAMPS.update(data.get(cs.IMPORT_TIMESTAMPS_KEY, {}))
+            toolchains = data.get(cs.IMPORT_TOOLCHAINS_KEY, {})
+            stale: set[str] = set()
+            for cache_key, result in data.get(cs.IMPORT_CACHE_KEY, {}).items():
+                language = cache_key.split(":", 1)[0]
+                # A language without a recorded toolchain (a file from before
+                # toolchain keying) reads as changed.
+                if toolchains.get(language) != _toolchain_version(language):
+                    stale.add(language)
+                    continue
+                _STDLIB_CACHE.setdefault(cache_key, result)
+                _CACHE_TOOLCHAINS[language] = toolchains[language]
+            for language in sorted(stale):
+                logger.debug(ls.IMP_CACHE_TOOLCHAIN_CHANGED, language=language)
             logger.debug(ls.IMP_CACHE_LOADED, path=cache_file)
     except (json.JSONDecodeError, OSError) as e:
         logger.debug(ls.IMP_CACHE_LOAD_ERROR, error=e)
@@ -92,7 +392,7 @@ def save_persistent_cache() -> None:
             json.dump(
                 {
                     cs.IMPORT_CACHE_KEY: _STDLIB_CACHE,
-                    cs.IMPORT_TIMESTAMPS_KEY: _CACHE_TIMESTAMPS,
+                    cs.IMPORT_TOOLCHAINS_KEY: _CACHE_TOOLCHAINS,
                 },
                 f,
                 indent=2,
@@ -108,7 +408,8 @@ def flush_stdlib_cache() -> None:
 
 def clear_stdlib_cache() -> None:
     _STDLIB_CACHE.clear()
-    _CACHE_TIMESTAMPS.clear()
+    _CACHE_TOOLCHAINS.clear()
+    _INTROSPECTED.clear()
     try:
         cache_file = Path.home() / cs.IMPORT_CACHE_DIR / cs.IMPORT_CACHE_FILE
         if cache_file.exists():
@@ -178,6 +479,38 @@ class StdlibExtractor:
             case _:
                 return self._extract_generic_stdlib_path(full_qualified_name)
 
+    def prefetch(self, names: Iterable[tuple[str, cs.SupportedLanguage]]) -> None:
+        """Answer the introspection every uncached name below will need in
+        one batch per language, so the per-name resolution that follows
+        (`flush_deferred_import_edges`) never waits on a helper round trip."""
+        queries: dict[str, set[tuple[str, str]]] = {}
+        for full_qualified_name, language in names:
+            if (
+                self.function_registry and full_qualified_name in self.function_registry
+            ) or _get_cached_stdlib_result(language, full_qualified_name) is not None:
+                continue
+            match language:
+                case cs.SupportedLanguage.GO:
+                    package_path, _, entity_name = full_qualified_name.rpartition(
+                        cs.SEPARATOR_SLASH
+                    )
+                    # A name the heuristics fold anyway needs no answer.
+                    if package_path and not entity_name[:1].isupper():
+                        queries.setdefault(language, set()).add(
+                            (package_path, entity_name)
+                        )
+                case cs.SupportedLanguage.LUA:
+                    parts = full_qualified_name.split(cs.SEPARATOR_DOT)
+                    if (
+                        len(parts) >= 2
+                        and not parts[-1][:1].isupper()
+                        and parts[-1] not in cs.LUA_STDLIB_MODULES
+                    ):
+                        queries.setdefault(language, set()).add((parts[0], parts[-1]))
+        for language, pairs in queries.items():
+            _introspect(language, pairs)
+            logger.debug(ls.IMP_STDLIB_PREFETCHED, count=len(pairs), language=language)
+
     def _extract_python_stdlib_path(self, full_qualified_name: str) -> str:
         parts = full_qualified_name.split(cs.SEPARATOR_DOT)
         if len(parts) >= 3:
@@ -271,77 +604,13 @@ class StdlibExtractor:
 
         parts = full_qualified_name.split(cs.SEPARATOR_DOT)
         if len(parts) >= 2:
-            return self._resolve_js_entity_module_path(parts, full_qualified_name)
+            # A JS import names a binding of its module whatever node would
+            # report about it, so the module is the answer without asking.
+            result = cs.SEPARATOR_DOT.join(parts[:-1])
+            _cache_stdlib_result(cs.SupportedLanguage.JS, full_qualified_name, result)
+            return result
         return full_qualified_name
 
-    def _resolve_js_entity_module_path(
-        self, parts: list[str], full_qualified_name: str
-    ) -> str:
-        module_name = parts[0]
-        entity_name = parts[-1]
-
-        if _is_tool_available("node"):
-            try:
-                import os
-                import subprocess
-
-                node_script = """
-                    const moduleName = process.env.MODULE_NAME;
-                    const entityName = process.env.ENTITY_NAME;
-
-                    if (!moduleName || !entityName) {
-                        console.log(JSON.stringify({hasEntity: false, entityType: null}));
-                        process.exit(0);
-                    }
-
-                    try {
-                        const module = require(moduleName);
-                        const hasEntity = entityName in module;
-                        const entityType = hasEntity ? typeof module[entityName] : null;
-                        console.log(JSON.stringify({hasEntity, entityType}));
-                    } catch (e) {
-                        console.log(JSON.stringify({hasEntity: false, entityType: null}));
-                    }
-                    """
-
-                env = os.environ.copy()
-                env["MODULE_NAME"] = module_name
-                env["ENTITY_NAME"] = entity_name
-
-                subprocess_result = subprocess.run(
-                    ["node", "-e", node_script],
-                    check=False,
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                    env=env,
-                )
-
-                if subprocess_result.returncode == 0:
-                    data = json.loads(subprocess_result.stdout.strip())
-                    if data[cs.JSON_KEY_HAS_ENTITY] and data[
-                        cs.JSON_KEY_ENTITY_TYPE
-                    ] in {
-                        cs.TS_FIELD_FUNCTION,
-                        cs.TS_FIELD_OBJECT,
-                    }:
-                        module_path = cs.SEPARATOR_DOT.join(parts[:-1])
-                        _cache_stdlib_result(
-                            cs.SupportedLanguage.JS, full_qualified_name, module_path
-                        )
-                        return module_path
-
-            except (
-                subprocess.TimeoutExpired,
-                subprocess.CalledProcessError,
-                json.JSONDecodeError,
-            ):
-                pass
-
-        result = cs.SEPARATOR_DOT.join(parts[:-1])
-        _cache_stdlib_result(cs.SupportedLanguage.JS, full_qualified_name, result)
-        return result
-
     def _extract_go_stdlib_path(self, full_qualified_name: str) -> str:
         if cached := _get_cached_stdlib_result(
             cs.SupportedLanguage.GO, full_qualified_name
@@ -350,140 +619,15 @@ class StdlibExtractor:
 
         parts = full_qualified_name.split(cs.SEPARATOR_SLASH)
         if len(parts) >= 2:
-            try:
-                import os
-                import subprocess
-
-                package_path = cs.SEPARATOR_SLASH.join(parts[:-1])
-                entity_name = parts[-1]
-
-                resolve_result = subprocess.run(
-                    ["go", "list", "-f", "{{.Dir}}", package_path],
-                    check=False,
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                )
-
-                if resolve_result.returncode != 0:
-                    raise subprocess.CalledProcessError(
-                        resolve_result.returncode, resolve_result.args
-                    )
-
-                package_dir = resolve_result.stdout.strip()
-                if not package_dir:
-                    raise subprocess.CalledProcessError(1, ["go", "list"])
-
-                go_script = """
-package main
-
-import (
-    "encoding/json"
-    "fmt"
-    "go/doc"
-    "go/parser"
-    "go/token"
-    "os"
-)
-
-func main() {
-    packagePath := os.Getenv("PACKAGE_PATH")
-    entityName := os.Getenv("ENTITY_NAME")
-
-    if packagePath == "" || entityName == "" {
-        fmt.Print("{\"hasEntity\": false}")
-        return
-    }
-
-    fset := token.NewFileSet()
-    pkgs, err := parser.ParseDir(fset, packagePath, nil, parser.ParseComments)
-    if err != nil {
-        fmt.Print("{\"hasEntity\": false}")
-        return
-    }
-
-    for _, pkg := range pkgs {
-        d := doc.New(pkg, packagePath, doc.AllDecls)
-
-        // Check functions
-        for _, f := range d.Funcs {
-            if f.Name == entityName {
-                fmt.Print("{\"hasEntity\": true, \"entityType\": \"function\"}")
-                return
-            }
-        }
-
-        // Check types (structs, interfaces, etc.)
-        for _, t := range d.Types {
-            if t.Name == entityName {
-                fmt.Print("{\"hasEntity\": true, \"entityType\": \"type\"}")
-                return
-            }
-        }
-
-        // Check constants and variables
-        for _, v := range d.Vars {
-            for _, name := range v.Names {
-                if name == entityName {
-                    fmt.Print("{\"hasEntity\": true, \"entityType\": \"variable\"}")
-                    return
-                }
-            }
-        }
-
-        for _, c := range d.Consts {
-            for _, name := range c.Names {
-                if name == entityName {
-                    fmt.Print("{\"hasEntity\": true, \"entityType\": \"constant\"}")
-                    return
-                }
-            }
-        }
-    }
-
-    fmt.Print("{\"hasEntity\": false}")
-}
-                """
-
-                env = os.environ.copy()
-                env["PACKAGE_PATH"] = package_dir
-                env["ENTITY_NAME"] = entity_name
-
-                with subprocess.Popen(
-                    ["go", "run", "-"],
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    env=env,
-                ) as proc:
-                    stdout, _ = proc.communicate(go_script, timeout=10)
-
-                    if proc.returncode == 0:
-                        data = json.loads(stdout.strip())
-                        if data[cs.JSON_KEY_HAS_ENTITY]:
-                            _cache_stdlib_result(
-                                cs.SupportedLanguage.GO,
-                                full_qualified_name,
-                                package_path,
-                            )
-                            return package_path
-
-            except (
-                subprocess.TimeoutExpired,
-                subprocess.CalledProcessError,
-                json.JSONDecodeError,
-                FileNotFoundError,
-            ):
-                pass
-
+            package_path = cs.SEPARATOR_SLASH.join(parts[:-1])
             entity_name = parts[-1]
-            if entity_name[:1].isupper():
-                result = cs.SEPARATOR_SLASH.join(parts[:-1])
+            if entity_name[:1].isupper() or _declares(
+                cs.SupportedLanguage.GO, package_path, entity_name
+            ):
                 _cache_stdlib_result(
-                    cs.SupportedLanguage.GO, full_qualified_name, result
+                    cs.SupportedLanguage.GO, full_qualified_name, package_path
                 )
-                return result
+                return package_path
 
         _cache_stdlib_result(
             cs.SupportedLanguage.GO, full_qualified_name, full_qualified_name
@@ -613,80 +757,25 @@ func main() {
         return result
 
     def _extract_lua_stdlib_path(self, full_qualified_name: str) -> str:
+        cached_result = _get_cached_stdlib_result(
+            cs.SupportedLanguage.LUA, full_qualified_name
+        )
+        if cached_result is not None:
+            return cached_result
+
         parts = full_qualified_name.split(cs.SEPARATOR_DOT)
+        result = full_qualified_name
         if len(parts) >= 2:
-            module_name = parts[0]
             entity_name = parts[-1]
-
-            try:
-                import os
-                import subprocess
-
-                lua_script = """
--- Get module and entity names from environment
-local module_name = os.getenv("MODULE_NAME")
-local entity_name = os.getenv("ENTITY_NAME")
-
-if not module_name or not entity_name then
-    print("hasEntity=false")
-    return
-end
-
--- Check built-in modules first (they're global tables in Lua)
-local module_table = _G[module_name]
-if module_table and type(module_table) == "table" then
-    local hasEntity = module_table[entity_name] ~= nil
-    if hasEntity then
-        print("hasEntity=true")
-    else
-        print("hasEntity=false")
-    end
-else
-    -- Try require for user modules
-    local success, loaded_module = pcall(require, module_name)
-    if success and type(loaded_module) == "table" then
-        local hasEntity = loaded_module[entity_name] ~= nil
-        if hasEntity then
-            print("hasEntity=true")
-        else
-            print("hasEntity=false")
-        end
-    else
-        print("hasEntity=false")
-    end
-end
-                """
-
-                env = os.environ.copy()
-                env["MODULE_NAME"] = module_name
-                env["ENTITY_NAME"] = entity_name
-
-                result = subprocess.run(
-                    ["lua", "-e", lua_script],
-                    check=False,
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                    env=env,
-                )
-
-                if result.returncode == 0:
-                    output = result.stdout.strip()
-                    if "hasEntity=true" in output:
-                        return cs.SEPARATOR_DOT.join(parts[:-1])
-
-            except (
-                subprocess.TimeoutExpired,
-                subprocess.CalledProcessError,
-                FileNotFoundError,
+            if (
+                entity_name[:1].isupper()
+                or entity_name in cs.LUA_STDLIB_MODULES
+                or _declares(cs.SupportedLanguage.LUA, parts[0], entity_name)
             ):
-                pass
-
-            entity_name = parts[-1]
-            if entity_name[:1].isupper() or entity_name in cs.LUA_STDLIB_MODULES:
-                return cs.SEPARATOR_DOT.join(parts[:-1])
+                result = cs.SEPARATOR_DOT.join(parts[:-1])
 
-        return full_qualified_name
+        _cache_stdlib_result(cs.SupportedLanguage.LUA, full_qualified_name, result)
+        return result
 
     def _extract_generic_stdlib_path(self, full_qualified_name: str) -> str:
         parts = full_qualified_name.split(cs.SEPARATOR_DOT)
@@ -0,0 +1,220 @@
+# Query embeddings for semantic search, micro-batched across callers. Each
+# MCP or agent search runs on its own worker thread; instead of every thread
+# running a one-row forward pass against the shared model, queries arriving
+# within a short window are embedded together by a single scheduler thread
+# and each caller blocks on its own future. A small LRU in front serves
+# repeated queries without touching the model at all. Every queued future
+# is resolved even when a batch fails, and callers wait with a timeout.
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import TypedDict
+
+from loguru import logger
+
+from . import embedder
+from . import logs as ls
+from .config import settings
+
+
+class QueryEmbeddingStats(TypedDict):
+    queries: int
+    cache_hits: int
+    batches: int
+    mean_batch_size: float
+    max_batch_size: int
+    mean_wait_ms: float
+    max_wait_ms: float
+
+
+@dataclass(slots=True)
+class _Pending:
+    key: tuple[str, str]
+    future: Future[list[float]]
+    enqueued: float
+
+
+class QueryBatcher:
+    """Coalesces concurrent `embed` calls into batched forward passes.
+
+    The first query to arrive opens a window of `window_seconds`; queries
+    arriving before it closes (up to `max_batch`) share one model call, and
+    duplicates within a batch are embedded once. Wait time is measured from
+    a query's arrival to the start of the forward pass that serves it.
+    """
+
+    def __init__(
+        self,
+        *,
+        window_seconds: float,
+        max_batch: int,
+        cache_size: int,
+        timeout_seconds: float | None = None,
+    ) -> None:
+        self._window = window_seconds
+        self._timeout = timeout_seconds
+        self._max_batch = max_batch
+        self._cache_size = cache_size
+        self._cache: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+        self._pending: list[_Pending] = []
+        self._cond = threading.Condition()
+        self._worker: threading.Thread | None = None
+        self._queries = 0
+        self._cache_hits = 0
+        self._batches = 0
+        self._batched = 0
+        self._max_batch_size = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def embed(self, query: str) -> list[float]:
+        # The namespace keeps a provider or model switch from replaying
+        # vectors of another embedding space, as in the on-disk cache.
+        key = (embedder._cache_namespace(), query)
+        with self._cond:
+            self._queries += 1
+            if (cached := self._cache.get(key)) is not None:
+                self._cache.move_to_end(key)
+                self._cache_hits += 1
+                return cached
+            pending = _Pending(key, Future(), time.perf_counter())
+            self._pending.append(pending)
+            # A worker killed by something _serve cannot catch is replaced
+            # rather than leaving every later query queued forever.
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="cgr-query-embedder", daemon=True
+                )
+                self._worker.start()
+            self._cond.notify_all()
+        try:
+            return pending.future.result(timeout=self._timeout)
+        except TimeoutError:
+            with self._cond:
+                # Still queued: withdraw it so the model never embeds it.
+                if pending.future.cancel():
+                    self._pending.remove(pending)
+            raise
+
+    def _next_batch(self) -> list[_Pending]:
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = self._pending[0].enqueued + self._window
+            while len(self._pending) < self._max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._pending[: self._max_batch]
+            del self._pending[: self._max_batch]
+            # Marked running under the lock, so a timed-out caller can no
+            # longer cancel a future this batch is about to resolve.
+            for pending in batch:
+                pending.future.set_running_or_notify_cancel()
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            self._serve(self._next_batch())
+
+    def _serve(self, batch: list[_Pending]) -> None:
+        started = time.perf_counter()
+        queries = list(dict.fromkeys(pending.key[1] for pending in batch))
+        try:
+            # One distinct query keeps the single-row path; it skips the
+            # tokenizer's length bucketing and padding entirely.
+            vectors = (
+                [embedder.embed_code(queries[0])]
+                if len(queries) == 1
+                else embedder.embed_code_batch(queries)
+            )
+            by_query = dict(zip(queries, vectors, strict=True))
+            results = [by_query[pending.key[1]] for pending in batch]
+            waits = [started - pending.enqueued for pending in batch]
+            with self._cond:
+                for pending, vector in zip(batch, results):
+                    self._remember(pending.key, vector)
+                self._batches += 1
+                self._batched += len(batch)
+                self._max_batch_size = max(self._max_batch_size, len(batch))
+                self._wait_total += sum(waits)
+                self._wait_max = max(self._wait_max, *waits)
+        except Exception as e:
+            for pending in batch:
+                pending.future.set_exception(e)
+            return
+
+        logger.debug(
+            ls.QUERY_EMBEDDING_BATCH,
+            size=len(batch),
+            distinct=len(queries),
+            wait_ms=max(waits) * 1000,
+            elapsed_ms=(time.perf_counter() - started) * 1000,
+            **self.stats(),
+        )
+        for pending, vector in zip(batch, results):
+            pending.future.set_result(vector)
+
+    def _remember(self, key: tuple[str, str], vector: list[float]) -> None:
+        if self._cache_size <= 0:
+            return
+        self._cache[key] = vector
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def stats(self) -> QueryEmbeddingStats:
+        with self._cond:
+            return QueryEmbeddingStats(
+                queries=self._queries,
+                cache_hits=self._cache_hits,
+                batches=self._batches,
+                mean_batch_size=self._batched / self._batches if self._batches else 0.0,
+                max_batch_size=self._max_batch_size,
+                mean_wait_ms=(
+                    self._wait_total / self._batched * 1000 if self._batched else 0.0
+                ),
+                max_wait_ms=self._wait_max * 1000,
+            )
+
+    def clear(self) -> None:
+        with self._cond:
+            self._cache.clear()
+
+
+_batcher: QueryBatcher | None = None
+_batcher_lock = threading.Lock()
+
+
+def _get_batcher() -> QueryBatcher:
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = QueryBatcher(
+                window_seconds=settings.QUERY_EMBEDDING_BATCH_WINDOW_MS / 1000,
+                max_batch=settings.QUERY_EMBEDDING_MAX_BATCH,
+                cache_size=settings.QUERY_EMBEDDING_CACHE_SIZE,
+                timeout_seconds=settings.QUERY_EMBEDDING_TIMEOUT_S,
+            )
+        return _batcher
+
+
+def embed_query(query: str) -> list[float]:
+    """Embed a search query, sharing a forward pass with concurrent callers."""
+    return _get_batcher().embed(query)
+
+
+def get_query_embedding_stats() -> QueryEmbeddingStats:
+    """Batch sizes, queue wait times and cache hits since the process started."""
+    return _get_batcher().stats()
+
+
+def clear_query_embedding_cache() -> None:
+    if _batcher is not None:
+        _batcher.clear()
@@ -27,6 +27,24 @@ class QueryProtocol(Protocol):
     def execute_write(self, query: str, params: PropertyDict | None = None) -> None: ...
 
 
+class GraphBackendProtocol(QueryProtocol, Protocol):
+    def list_projects(self) -> list[str]: ...
+
+    def delete_project(self, project_name: str) -> None: ...
+
+    def clean_database(self) -> None: ...
+
+
+class WritableGraphBackendProtocol(GraphBackendProtocol, IngestorProtocol, Protocol):
+    def ensure_constraints(self) -> None: ...
+
+
 from .filtering import FilteringIngestor  # noqa: E402
 
-__all__ = ["IngestorProtocol", "QueryProtocol", "FilteringIngestor"]
+__all__ = [
+    "GraphBackendProtocol",
+    "IngestorProtocol",
+    "QueryProtocol",
+    "WritableGraphBackendProtocol",
+    "FilteringIngestor",
+]
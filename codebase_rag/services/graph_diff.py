@@ -8,23 +8,50 @@ Rust cfg-twin cases (#1017) — and relationships on (source, type, target).
 Renames report as remove+add for the first cut. Cross-schema diffs are
 refused: both artifacts must record the same codec schema hash in their
 manifests, because field semantics may differ between schema versions.
+
+The writer emits nodes and relationships in canonical sorted order (#1138),
+so the diff is a two-pointer merge over the lazily read record streams: it
+holds one record per side plus the per-language coverage counters, however
+large the graphs. `iter_diff` yields the deltas as they are found (the
+NDJSON form of `cgr diff-index --stream`); `diff_indexes` folds them into
+the per-category report.
 """
 
 from __future__ import annotations
 
 import json
+from collections.abc import Callable, Iterator
 from pathlib import Path
 from typing import Any, NamedTuple
 
 import codec.schema_pb2 as pb
 
 from .. import constants as cs
-from .provenance import MANIFEST_FILE, _coverage_from_nodes
+from .protobuf_service import (
+    NAME_BASED_LABELS,
+    ONEOF_FIELD_TO_LABEL,
+    PATH_BASED_LABELS,
+)
+from .protobuf_stream import (
+    NODE_ARTIFACTS,
+    RELATIONSHIP_ARTIFACTS,
+    iter_index_nodes,
+    iter_index_relationships,
+    present_artifacts,
+)
+from .provenance import MANIFEST_FILE, _module_language
 
 type JsonDict = dict[str, Any]
+type RelKey = tuple[str, int, str]
 
-_NODE_FILES = (cs.PROTOBUF_INDEX_FILE, cs.PROTOBUF_NODES_FILE)
-_REL_FILES = (cs.PROTOBUF_INDEX_FILE, cs.PROTOBUF_RELS_FILE)
+DIFF_NODES = "nodes"
+DIFF_RELATIONSHIPS = "relationships"
+DIFF_COVERAGE = "coverage"
+CHANGE_ADDED = "added"
+CHANGE_REMOVED = "removed"
+CHANGE_CHANGED = "changed"
+CHANGE_FLOW_FLIP = "flow_covered_flip"
+CHANGE_PER_LANGUAGE = "per_language"
 
 
 class NodeKey(NamedTuple):
@@ -37,18 +64,12 @@ class DiffError(ValueError):
     """The two artifacts cannot be diffed meaningfully."""
 
 
-def _load_indexes(index_dir: Path, names: tuple[str, ...]) -> list[pb.GraphCodeIndex]:
-    found = []
-    for name in names:
-        artifact = index_dir / name
-        if not artifact.is_file():
-            continue
-        index = pb.GraphCodeIndex()
-        index.ParseFromString(artifact.read_bytes())
-        found.append(index)
-    if not found:
-        raise DiffError(f"no index artifacts in {index_dir}")
-    return found
+def _require_artifacts(index_dir: Path) -> None:
+    # Records are read lazily from whichever layout is present (joint, split
+    # or streamed); only their absence is checked up front.
+    for names in (NODE_ARTIFACTS, RELATIONSHIP_ARTIFACTS):
+        if not present_artifacts(index_dir, names):
+            raise DiffError(f"no index artifacts in {index_dir}")
 
 
 def _schema_hash(index_dir: Path) -> str | None:
@@ -118,29 +139,63 @@ def _node_key(node: pb.Node) -> NodeKey | None:
     return NodeKey(kind, identity, path)
 
 
-def _node_map(indexes: list[pb.GraphCodeIndex]) -> dict[NodeKey, JsonDict]:
-    nodes: dict[NodeKey, JsonDict] = {}
-    for index in indexes:
-        for node in index.nodes:
-            key = _node_key(node)
-            if key is None:
-                continue
-            kind = node.WhichOneof(cs.PROTOBUF_PAYLOAD_ONEOF)
-            nodes[key] = _payload_fields(getattr(node, kind))
-    return nodes
-
-
-def _rel_map(indexes: list[pb.GraphCodeIndex]) -> dict[tuple[str, str, str], JsonDict]:
-    rels: dict[tuple[str, str, str], JsonDict] = {}
-    for index in indexes:
-        for rel in index.relationships:
-            key = (
-                rel.source_id,
-                pb.Relationship.RelationshipType.Name(rel.type),
-                rel.target_id,
+def _canonical_id(kind: str, payload) -> str:
+    # The id the writer sorted by (ProtobufFileIngestor._get_node_id); the
+    # merge must walk both sides in exactly that order.
+    label = ONEOF_FIELD_TO_LABEL.get(kind)
+    if label in PATH_BASED_LABELS:
+        return payload.path
+    if label in NAME_BASED_LABELS:
+        return payload.name
+    return payload.qualified_name
+
+
+def _check_order[K: (str, RelKey)](
+    keys: Iterator[tuple[K, Any]], index_dir: Path
+) -> Iterator[tuple[K, Any]]:
+    previous: K | None = None
+    for key, value in keys:
+        if previous is not None and not previous < key:
+            raise DiffError(
+                f"artifacts in {index_dir} are not in canonical order; "
+                "re-export them before diffing"
             )
-            rels[key] = dict(rel.properties)
-    return rels
+        previous = key
+        yield key, value
+
+
+def _keyed_nodes(index_dir: Path) -> Iterator[tuple[str, pb.Node]]:
+    for node in iter_index_nodes(index_dir):
+        kind = node.WhichOneof(cs.PROTOBUF_PAYLOAD_ONEOF)
+        if kind is None:
+            continue
+        yield _canonical_id(kind, getattr(node, kind)), node
+
+
+def _keyed_relationships(
+    index_dir: Path,
+) -> Iterator[tuple[RelKey, pb.Relationship]]:
+    for rel in iter_index_relationships(index_dir):
+        yield (rel.source_id, rel.type, rel.target_id), rel
+
+
+def _merge[K: (str, RelKey), V](
+    old: Iterator[tuple[K, V]], new: Iterator[tuple[K, V]]
+) -> Iterator[tuple[V | None, V | None]]:
+    """Pair two strictly ascending keyed streams; a missing side is None."""
+    old_item = next(old, None)
+    new_item = next(new, None)
+    while old_item is not None or new_item is not None:
+        if old_item is not None and (new_item is None or old_item[0] < new_item[0]):
+            yield old_item[1], None
+            old_item = next(old, None)
+        elif new_item is not None and (old_item is None or new_item[0] < old_item[0]):
+            yield None, new_item[1]
+            new_item = next(new, None)
+        elif old_item is not None and new_item is not None:
+            yield old_item[1], new_item[1]
+            old_item = next(old, None)
+            new_item = next(new, None)
 
 
 def _changed_fields(old: JsonDict, new: JsonDict) -> JsonDict:
@@ -151,88 +206,178 @@ def _changed_fields(old: JsonDict, new: JsonDict) -> JsonDict:
     return delta
 
 
-def _node_delta(
-    old_nodes: dict[NodeKey, JsonDict], new_nodes: dict[NodeKey, JsonDict]
-) -> JsonDict:
-    added = sorted(set(new_nodes) - set(old_nodes))
-    removed = sorted(set(old_nodes) - set(new_nodes))
-    changed = {}
-    for key in sorted(set(old_nodes) & set(new_nodes)):
-        delta = _changed_fields(old_nodes[key], new_nodes[key])
-        if delta:
-            changed["::".join(key)] = delta
-    return {
-        "added": ["::".join(k) for k in added],
-        "removed": ["::".join(k) for k in removed],
-        "changed": changed,
-    }
+def _count_module(coverage: dict[str, dict[str, int]], node: pb.Node) -> None:
+    # Same tally as provenance._coverage_from_nodes, folded in during the
+    # merge so coverage needs no second pass over the artifacts.
+    if node.WhichOneof(cs.PROTOBUF_PAYLOAD_ONEOF) != cs.ONEOF_MODULE:
+        return
+    language = _module_language(node.module.path)
+    row = coverage.setdefault(language, {"modules": 0, "flow_covered": 0})
+    row["modules"] += 1
+    if node.module.flow_covered:
+        row["flow_covered"] += 1
 
 
-def _rel_delta(
-    old_rels: dict[tuple[str, str, str], JsonDict],
-    new_rels: dict[tuple[str, str, str], JsonDict],
-) -> JsonDict:
-    by_type: dict[str, dict[str, list[str] | JsonDict]] = {}
+def _node_event(change: str, key: NodeKey, **extra: Any) -> JsonDict:
+    return {"category": DIFF_NODES, "change": change, "key": "::".join(key), **extra}
 
-    def _bucket(rel_type: str) -> dict:
-        return by_type.setdefault(rel_type, {"added": [], "removed": [], "changed": {}})
 
-    for src, rel_type, dst in sorted(set(new_rels) - set(old_rels)):
-        _bucket(rel_type)["added"].append(f"{src} -> {dst}")
-    for src, rel_type, dst in sorted(set(old_rels) - set(new_rels)):
-        _bucket(rel_type)["removed"].append(f"{src} -> {dst}")
-    for key in sorted(set(old_rels) & set(new_rels)):
-        delta = _changed_fields(old_rels[key], new_rels[key])
-        if delta:
-            src, rel_type, dst = key
-            _bucket(rel_type)["changed"][f"{src} -> {dst}"] = delta
-    return dict(sorted(by_type.items()))
-
-
-def _coverage_delta(
-    old_indexes: list[pb.GraphCodeIndex], new_indexes: list[pb.GraphCodeIndex]
-) -> JsonDict:
-    old_nodes = [n for i in old_indexes for n in i.nodes]
-    new_nodes = [n for i in new_indexes for n in i.nodes]
-    old_cov = _coverage_from_nodes(old_nodes)
-    new_cov = _coverage_from_nodes(new_nodes)
-    flips = {}
-    old_flow = {
-        _node_key(n): n.module.flow_covered
-        for n in old_nodes
-        if n.WhichOneof(cs.PROTOBUF_PAYLOAD_ONEOF) == cs.ONEOF_MODULE
-    }
-    for n in new_nodes:
-        if n.WhichOneof(cs.PROTOBUF_PAYLOAD_ONEOF) != cs.ONEOF_MODULE:
+def _iter_node_diff(
+    old_dir: Path,
+    new_dir: Path,
+    coverage: tuple[dict[str, dict[str, int]], dict[str, dict[str, int]]],
+) -> Iterator[JsonDict]:
+    old_cov, new_cov = coverage
+    pairs = _merge(
+        _check_order(_keyed_nodes(old_dir), old_dir),
+        _check_order(_keyed_nodes(new_dir), new_dir),
+    )
+    for old, new in pairs:
+        old_key = _node_key(old) if old is not None else None
+        new_key = _node_key(new) if new is not None else None
+        if old is not None:
+            _count_module(old_cov, old)
+        if new is not None:
+            _count_module(new_cov, new)
+        if old_key != new_key:
+            # Same canonical id under another kind or path: the first cut
+            # reports it as remove+add, like any other identity change.
+            if old_key is not None:
+                yield _node_event(CHANGE_REMOVED, old_key)
+            if new_key is not None:
+                yield _node_event(CHANGE_ADDED, new_key)
             continue
-        key = _node_key(n)
-        if (
-            key is not None
-            and key in old_flow
-            and old_flow[key] != n.module.flow_covered
+        if old is None or new is None or new_key is None:
+            continue
+        kind = new_key.kind
+        delta = _changed_fields(
+            _payload_fields(getattr(old, kind)), _payload_fields(getattr(new, kind))
+        )
+        if delta:
+            yield _node_event(CHANGE_CHANGED, new_key, fields=delta)
+        if kind == cs.ONEOF_MODULE and (
+            old.module.flow_covered != new.module.flow_covered
         ):
-            flips["::".join(key)] = {
-                "old": old_flow[key],
-                "new": n.module.flow_covered,
+            yield {
+                "category": DIFF_COVERAGE,
+                "change": CHANGE_FLOW_FLIP,
+                "key": "::".join(new_key),
+                "old": old.module.flow_covered,
+                "new": new.module.flow_covered,
             }
-    return {
-        "flow_covered_flips": flips,
-        "per_language": _changed_fields(old_cov, new_cov),
-    }
+
+
+def _iter_relationship_diff(old_dir: Path, new_dir: Path) -> Iterator[JsonDict]:
+    pairs = _merge(
+        _check_order(_keyed_relationships(old_dir), old_dir),
+        _check_order(_keyed_relationships(new_dir), new_dir),
+    )
+    for old, new in pairs:
+        rel = new if new is not None else old
+        if rel is None:
+            continue
+        event = {
+            "category": DIFF_RELATIONSHIPS,
+            "type": pb.Relationship.RelationshipType.Name(rel.type),
+            "edge": f"{rel.source_id} -> {rel.target_id}",
+        }
+        if old is None:
+            yield {**event, "change": CHANGE_ADDED}
+        elif new is None:
+            yield {**event, "change": CHANGE_REMOVED}
+        elif delta := _changed_fields(dict(old.properties), dict(new.properties)):
+            yield {**event, "change": CHANGE_CHANGED, "fields": delta}
+
+
+def iter_diff(old_dir: Path, new_dir: Path) -> Iterator[JsonDict]:
+    """The structural delta as a stream of events, in canonical order.
+
+    Every event is a flat JSON object with a `category` (nodes,
+    relationships, coverage) and a `change`; the per-language coverage
+    summary, only known once every node was seen, comes last.
+    """
+    _require_same_schema(old_dir, new_dir)
+    _require_artifacts(old_dir)
+    _require_artifacts(new_dir)
+    old_cov: dict[str, dict[str, int]] = {}
+    new_cov: dict[str, dict[str, int]] = {}
+    yield from _iter_node_diff(old_dir, new_dir, (old_cov, new_cov))
+    yield from _iter_relationship_diff(old_dir, new_dir)
+    per_language = _changed_fields(
+        {lang: old_cov[lang] for lang in sorted(old_cov)},
+        {lang: new_cov[lang] for lang in sorted(new_cov)},
+    )
+    if per_language:
+        yield {
+            "category": DIFF_COVERAGE,
+            "change": CHANGE_PER_LANGUAGE,
+            "fields": per_language,
+        }
+
+
+def _fold_node(report: JsonDict, event: JsonDict) -> None:
+    bucket = report[DIFF_NODES]
+    if event["change"] == CHANGE_CHANGED:
+        bucket[CHANGE_CHANGED][event["key"]] = event["fields"]
+    else:
+        bucket[event["change"]].append(event["key"])
+
+
+def _fold_relationship(report: JsonDict, event: JsonDict) -> None:
+    bucket = report[DIFF_RELATIONSHIPS].setdefault(
+        event["type"], {CHANGE_ADDED: [], CHANGE_REMOVED: [], CHANGE_CHANGED: {}}
+    )
+    if event["change"] == CHANGE_CHANGED:
+        bucket[CHANGE_CHANGED][event["edge"]] = event["fields"]
+    else:
+        bucket[event["change"]].append(event["edge"])
+
+
+def _fold_coverage(report: JsonDict, event: JsonDict) -> None:
+    coverage = report[DIFF_COVERAGE]
+    if event["change"] == CHANGE_FLOW_FLIP:
+        coverage["flow_covered_flips"][event["key"]] = {
+            "old": event["old"],
+            "new": event["new"],
+        }
+    else:
+        coverage[CHANGE_PER_LANGUAGE] = event["fields"]
+
+
+_FOLDERS: dict[str, Callable[[JsonDict, JsonDict], None]] = {
+    DIFF_NODES: _fold_node,
+    DIFF_RELATIONSHIPS: _fold_relationship,
+    DIFF_COVERAGE: _fold_coverage,
+}
+
+
+def _sorted_report(report: JsonDict) -> JsonDict:
+    # Merge order is canonical-id order; the report keeps its historical
+    # (kind, identity, path) ordering. Only the deltas are sorted here.
+    nodes = report[DIFF_NODES]
+    nodes[CHANGE_ADDED].sort()
+    nodes[CHANGE_REMOVED].sort()
+    nodes[CHANGE_CHANGED] = dict(sorted(nodes[CHANGE_CHANGED].items()))
+    for bucket in report[DIFF_RELATIONSHIPS].values():
+        bucket[CHANGE_ADDED].sort()
+        bucket[CHANGE_REMOVED].sort()
+        bucket[CHANGE_CHANGED] = dict(sorted(bucket[CHANGE_CHANGED].items()))
+    report[DIFF_RELATIONSHIPS] = dict(sorted(report[DIFF_RELATIONSHIPS].items()))
+    flips = report[DIFF_COVERAGE]["flow_covered_flips"]
+    report[DIFF_COVERAGE]["flow_covered_flips"] = dict(sorted(flips.items()))
+    return report
 
 
 def diff_indexes(old_dir: Path, new_dir: Path) -> JsonDict:
     """The structural delta between two canonical exports, per category."""
-    _require_same_schema(old_dir, new_dir)
-    old_nodes_idx = _load_indexes(old_dir, _NODE_FILES)
-    new_nodes_idx = _load_indexes(new_dir, _NODE_FILES)
-    old_rels_idx = _load_indexes(old_dir, _REL_FILES)
-    new_rels_idx = _load_indexes(new_dir, _REL_FILES)
-    return {
-        "nodes": _node_delta(_node_map(old_nodes_idx), _node_map(new_nodes_idx)),
-        "relationships": _rel_delta(_rel_map(old_rels_idx), _rel_map(new_rels_idx)),
-        "coverage": _coverage_delta(old_nodes_idx, new_nodes_idx),
+    report: JsonDict = {
+        DIFF_NODES: {CHANGE_ADDED: [], CHANGE_REMOVED: [], CHANGE_CHANGED: {}},
+        DIFF_RELATIONSHIPS: {},
+        DIFF_COVERAGE: {"flow_covered_flips": {}, CHANGE_PER_LANGUAGE: {}},
     }
+    for event in iter_diff(old_dir, new_dir):
+        _FOLDERS[event["category"]](report, event)
+    return _sorted_report(report)
 
 
 def diff_is_empty(diff: JsonDict) -> bool:
@@ -0,0 +1,1382 @@
+"""Read-only Cypher over an exported graph, without a running Memgraph.
+
+`OfflineQueryEngine` implements `QueryProtocol.fetch_all` against a loaded
+`GraphLoader` (JSON export), a `ColumnarGraphLoader` or a protobuf index
+directory, so MCP and agent sessions on laptops and CI sandboxes can answer
+`query_code_graph` and `get_code_snippet` locally.
+
+The supported subset is what the tools and the Cypher generator actually
+emit: `MATCH` / `OPTIONAL MATCH` over comma-separated path patterns (labels,
+inline property maps, typed and variable-length relationships in any
+direction), `WHERE` with boolean logic, comparisons, `STARTS WITH` /
+`ENDS WITH` / `CONTAINS`, `IN`, `IS NULL` and label tests, then `RETURN
+[DISTINCT]` with aliases and `count` / `collect` / `min` / `max` / `sum` /
+`avg`, `ORDER BY`, `SKIP` and `LIMIT`. Anything else (writes, `WITH`,
+`CALL`, `UNWIND`) raises `OfflineQueryError` instead of answering wrongly.
+
+Each pattern starts from its most selective node: equality and prefix
+conjuncts of the WHERE clause are answered from property indexes (the
+loader's hash index, and a sorted index for prefixes) and labels from the
+label index, before the remaining hops walk the adjacency lists. Variable-
+length hops visit each node once at its shortest depth, where Memgraph
+would enumerate every trail; results are the same set of endpoints.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+import types
+from collections.abc import Callable, Iterable, Iterator
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from loguru import logger
+
+import codec.schema_pb2 as pb
+
+from .. import constants as cs
+from .. import exceptions as ex
+from .. import logs as ls
+from ..graph_columnar import ColumnarGraphLoader
+from ..graph_loader import GraphLoader, load_graph
+from ..models import GraphNode, GraphRelationship
+from ..types_defs import (
+    GraphData,
+    GraphMetadata,
+    GraphReaderProtocol,
+    PropertyDict,
+    ResultRow,
+)
+from .protobuf_service import (
+    NAME_BASED_LABELS,
+    ONEOF_FIELD_TO_LABEL,
+    PATH_BASED_LABELS,
+)
+from .protobuf_stream import iter_index_nodes, iter_index_relationships
+
+type Graph = GraphReaderProtocol
+type Row = dict[str, Any]
+
+_OUT = "out"
+_IN = "in"
+_BOTH = "both"
+
+_WRITE_KEYWORDS = frozenset(
+    {"CREATE", "MERGE", "DELETE", "DETACH", "SET", "REMOVE", "DROP", "LOAD"}
+)
+_AGGREGATES = frozenset({"count", "collect", "min", "max", "sum", "avg"})
+_HASHABLE_SCALARS = (str, int, float, bool)
+
+
+class OfflineQueryError(ValueError):
+    """The query is malformed or outside the offline Cypher subset."""
+
+
+# --- graph sources --------------------------------------------------------
+
+
+def _index_properties(payload) -> PropertyDict:
+    # Descriptor order, like the diff: proto3 leaves unset strings empty, and
+    # an empty string here is an absent property in the live graph.
+    properties: PropertyDict = {}
+    for descriptor in payload.DESCRIPTOR.fields:
+        value = getattr(payload, descriptor.name)
+        if hasattr(value, "extend"):
+            if value:
+                properties[descriptor.name] = list(value)
+        elif value != "":
+            properties[descriptor.name] = value
+    return properties
+
+
+def _struct_value(value: Any) -> Any:
+    # google.protobuf.Struct stores every number as a double.
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def graph_data_from_index(index_dir: Path) -> GraphData:
+    """Rebuild the JSON-export shape of a protobuf index (any layout)."""
+    nodes: list[dict[str, Any]] = []
+    ids: dict[tuple[str, str], int] = {}
+    for node in iter_index_nodes(index_dir):
+        kind = node.WhichOneof(cs.PROTOBUF_PAYLOAD_ONEOF)
+        label = ONEOF_FIELD_TO_LABEL.get(kind) if kind else None
+        if label is None:
+            continue
+        payload = getattr(node, kind)
+        if label in PATH_BASED_LABELS:
+            identity = payload.path
+        elif label in NAME_BASED_LABELS:
+            identity = payload.name
+        else:
+            identity = payload.qualified_name
+        node_id = len(nodes)
+        ids[(str(label), identity)] = node_id
+        nodes.append(
+            {
+                cs.KEY_NODE_ID: node_id,
+                cs.KEY_LABELS: [str(label)],
+                cs.KEY_PROPERTIES: _index_properties(payload),
+            }
+        )
+    relationships: list[dict[str, Any]] = []
+    for rel in iter_index_relationships(index_dir):
+        from_id = ids.get((rel.source_label, rel.source_id))
+        to_id = ids.get((rel.target_label, rel.target_id))
+        if from_id is None or to_id is None:
+            continue
+        relationships.append(
+            {
+                cs.KEY_FROM_ID: from_id,
+                cs.KEY_TO_ID: to_id,
+                cs.KEY_TYPE: pb.Relationship.RelationshipType.Name(rel.type),
+                cs.KEY_PROPERTIES: {
+                    key: _struct_value(value) for key, value in rel.properties.items()
+                },
+            }
+        )
+    return GraphData(
+        nodes=nodes,
+        relationships=relationships,
+        metadata=GraphMetadata(
+            total_nodes=len(nodes),
+            total_relationships=len(relationships),
+            exported_at="",
+        ),
+    )
+
+
+def load_offline_graph(path: Path) -> Graph:
+    """Load a JSON or columnar graph file, or a protobuf index directory."""
+    if path.is_dir():
+        return GraphLoader.from_data(graph_data_from_index(path), str(path))
+    if not path.is_file():
+        raise FileNotFoundError(ex.OFFLINE_GRAPH_NOT_FOUND.format(path=path))
+    return load_graph(str(path))
+
+
+# --- parsing --------------------------------------------------------------
+
+
+class _Token(NamedTuple):
+    kind: str
+    text: str
+    pos: int
+    end: int
+
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>\s+|//[^\n]*)
+    |(?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+    |(?P<number>\d+\.\d+|\d+)
+    |(?P<param>\$[A-Za-z_][A-Za-z0-9_]*)
+    |(?P<name>[A-Za-z_][A-Za-z0-9_]*|`[^`]+`)
+    |(?P<op>->|<-|<>|<=|>=|!=|=~|\.\.|[()\[\]{}:,.=<>\-*|+;])
+    """,
+    re.VERBOSE,
+)
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "\\": "\\", "'": "'", '"': '"'}
+
+
+def _tokenize(query: str) -> list[_Token]:
+    tokens: list[_Token] = []
+    pos = 0
+    while pos < len(query):
+        match = _TOKEN_RE.match(query, pos)
+        if match is None:
+            raise OfflineQueryError(
+                ex.OFFLINE_QUERY_SYNTAX.format(expected="a token", pos=pos)
+            )
+        kind = match.lastgroup or ""
+        if kind != "ws":
+            tokens.append(_Token(kind, match.group(), pos, match.end()))
+        pos = match.end()
+    tokens.append(_Token("eof", "", len(query), len(query)))
+    return tokens
+
+
+def _unquote(text: str) -> str:
+    body = text[1:-1]
+    return re.sub(r"\\(.)", lambda m: _ESCAPES.get(m.group(1), m.group(1)), body)
+
+
+class _Lit(NamedTuple):
+    value: Any
+
+
+class _Param(NamedTuple):
+    name: str
+
+
+class _Var(NamedTuple):
+    name: str
+
+
+class _Prop(NamedTuple):
+    subject: Any
+    key: str
+
+
+class _Index(NamedTuple):
+    subject: Any
+    index: Any
+
+
+class _Call(NamedTuple):
+    name: str
+    args: tuple
+    distinct: bool
+
+
+class _CountStar(NamedTuple):
+    pass
+
+
+class _Op(NamedTuple):
+    op: str
+    left: Any
+    right: Any
+
+
+class _Not(NamedTuple):
+    operand: Any
+
+
+class _Neg(NamedTuple):
+    operand: Any
+
+
+class _IsNull(NamedTuple):
+    operand: Any
+    negated: bool
+
+
+class _HasLabels(NamedTuple):
+    var: str
+    labels: tuple[str, ...]
+
+
+class _List(NamedTuple):
+    items: tuple
+
+
+class _NodePat(NamedTuple):
+    var: str
+    labels: tuple[str, ...]
+    props: tuple[tuple[str, Any], ...]
+
+
+class _RelPat(NamedTuple):
+    var: str
+    types: frozenset[str]
+    direction: str
+    props: tuple[tuple[str, Any], ...]
+    min_hops: int
+    max_hops: int | None
+    variable: bool
+
+
+class _Path(NamedTuple):
+    nodes: tuple[_NodePat, ...]
+    rels: tuple[_RelPat, ...]
+
+
+class _Match(NamedTuple):
+    optional: bool
+    paths: tuple[_Path, ...]
+    where: Any
+
+
+class _ReturnItem(NamedTuple):
+    expr: Any
+    alias: str
+
+
+class _Query(NamedTuple):
+    matches: tuple[_Match, ...]
+    items: tuple[_ReturnItem, ...]
+    distinct: bool
+    order: tuple[tuple[Any, bool], ...]
+    skip: Any
+    limit: Any
+
+
+class _Parser:
+    __slots__ = ("_query", "_tokens", "_pos", "_anonymous")
+
+    def __init__(self, query: str) -> None:
+        self._query = query
+        self._tokens = _tokenize(query)
+        self._pos = 0
+        self._anonymous = 0
+
+    # token helpers
+
+    def _peek(self, offset: int = 0) -> _Token:
+        return self._tokens[min(self._pos + offset, len(self._tokens) - 1)]
+
+    def _next(self) -> _Token:
+        token = self._peek()
+        self._pos += 1
+        return token
+
+    def _is_keyword(self, word: str, offset: int = 0) -> bool:
+        token = self._peek(offset)
+        return token.kind == "name" and token.text.upper() == word
+
+    def _accept_keyword(self, *words: str) -> bool:
+        if all(self._is_keyword(word, i) for i, word in enumerate(words)):
+            self._pos += len(words)
+            return True
+        return False
+
+    def _expect_keyword(self, word: str) -> None:
+        if not self._accept_keyword(word):
+            self._fail(word)
+
+    def _is_op(self, text: str) -> bool:
+        token = self._peek()
+        return token.kind == "op" and token.text == text
+
+    def _accept_op(self, text: str) -> bool:
+        if self._is_op(text):
+            self._pos += 1
+            return True
+        return False
+
+    def _expect_op(self, text: str) -> None:
+        if not self._accept_op(text):
+            self._fail(f"'{text}'")
+
+    def _fail(self, expected: str) -> None:
+        token = self._peek()
+        if token.kind == "name" and token.text.upper() in _WRITE_KEYWORDS:
+            raise OfflineQueryError(
+                ex.OFFLINE_QUERY_READ_ONLY.format(operation=token.text.upper())
+            )
+        if token.kind == "name" and token.text.upper() in _UNSUPPORTED_CLAUSES:
+            raise OfflineQueryError(
+                ex.OFFLINE_QUERY_UNSUPPORTED.format(feature=token.text.upper())
+            )
+        raise OfflineQueryError(
+            ex.OFFLINE_QUERY_SYNTAX.format(expected=expected, pos=token.pos)
+        )
+
+    def _name(self) -> str:
+        token = self._next()
+        if token.kind != "name":
+            self._pos -= 1
+            self._fail("a name")
+        return token.text.strip("`")
+
+    def _hidden(self, prefix: str) -> str:
+        # A space can never appear in a Cypher identifier, so anonymous
+        # pattern elements cannot collide with user variables.
+        self._anonymous += 1
+        return f" {prefix}{self._anonymous}"
+
+    # clauses
+
+    def parse(self) -> _Query:
+        matches: list[_Match] = []
+        while True:
+            optional = self._accept_keyword("OPTIONAL")
+            if not self._accept_keyword("MATCH"):
+                if optional:
+                    self._fail("MATCH")
+                break
+            paths = [self._path()]
+            while self._accept_op(","):
+                paths.append(self._path())
+            where = self._expr() if self._accept_keyword("WHERE") else None
+            matches.append(_Match(optional, tuple(paths), where))
+        self._expect_keyword("RETURN")
+        distinct = self._accept_keyword("DISTINCT")
+        items = [self._return_item()]
+        while self._accept_op(","):
+            items.append(self._return_item())
+        order: list[tuple[Any, bool]] = []
+        if self._accept_keyword("ORDER", "BY"):
+            while True:
+                expr = self._expr()
+                descending = False
+                if self._accept_keyword("DESC") or self._accept_keyword("DESCENDING"):
+                    descending = True
+                elif not self._accept_keyword("ASC"):
+                    self._accept_keyword("ASCENDING")
+                order.append((expr, descending))
+                if not self._accept_op(","):
+                    break
+        skip = self._expr() if self._accept_keyword("SKIP") else None
+        limit = self._expr() if self._accept_keyword("LIMIT") else None
+        self._accept_op(";")
+        if self._peek().kind != "eof":
+            self._fail("end of query")
+        return _Query(tuple(matches), tuple(items), distinct, tuple(order), skip, limit)
+
+    def _return_item(self) -> _ReturnItem:
+        start = self._peek().pos
+        expr = self._expr()
+        end = self._tokens[self._pos - 1].end
+        if self._accept_keyword("AS"):
+            return _ReturnItem(expr, self._name())
+        return _ReturnItem(expr, self._query[start:end])
+
+    # patterns
+
+    def _path(self) -> _Path:
+        nodes = [self._node_pattern()]
+        rels: list[_RelPat] = []
+        while self._is_op("-") or self._is_op("<-"):
+            rels.append(self._rel_pattern())
+            nodes.append(self._node_pattern())
+        return _Path(tuple(nodes), tuple(rels))
+
+    def _node_pattern(self) -> _NodePat:
+        self._expect_op("(")
+        var = self._name() if self._peek().kind == "name" else self._hidden("n")
+        labels = self._labels()
+        props = self._property_map() if self._is_op("{") else ()
+        self._expect_op(")")
+        return _NodePat(var, labels, props)
+
+    def _labels(self) -> tuple[str, ...]:
+        labels: list[str] = []
+        while self._accept_op(":"):
+            labels.append(self._name())
+        return tuple(labels)
+
+    def _property_map(self) -> tuple[tuple[str, Any], ...]:
+        self._expect_op("{")
+        props: list[tuple[str, Any]] = []
+        if not self._is_op("}"):
+            while True:
+                key = self._name()
+                self._expect_op(":")
+                props.append((key, self._expr()))
+                if not self._accept_op(","):
+                    break
+        self._expect_op("}")
+        return tuple(props)
+
+    def _rel_pattern(self) -> _RelPat:
+        incoming = self._accept_op("<-")
+        if not incoming:
+            self._expect_op("-")
+        var = self._hidden("r")
+        types_: list[str] = []
+        props: tuple[tuple[str, Any], ...] = ()
+        min_hops, max_hops, variable = 1, 1, False
+        if self._accept_op("["):
+            if self._peek().kind == "name":
+                var = self._name()
+            if self._accept_op(":"):
+                types_.append(self._name())
+                while self._accept_op("|"):
+                    self._accept_op(":")
+                    types_.append(self._name())
+            if self._accept_op("*"):
+                variable = True
+                min_hops, max_hops = self._hop_range()
+            if self._is_op("{"):
+                props = self._property_map()
+            self._expect_op("]")
+        if self._accept_op("->"):
+            if incoming:
+                self._fail("a single direction")
+            direction = _OUT
+        else:
+            self._expect_op("-")
+            direction = _IN if incoming else _BOTH
+        return _RelPat(
+            var, frozenset(types_), direction, props, min_hops, max_hops, variable
+        )
+
+    def _hop_range(self) -> tuple[int, int | None]:
+        low = self._int() if self._peek().kind == "number" else None
+        if self._accept_op(".."):
+            high = self._int() if self._peek().kind == "number" else None
+            return (1 if low is None else low), high
+        if low is None:
+            return 1, None
+        return low, low
+
+    def _int(self) -> int:
+        return int(self._next().text)
+
+    # expressions
+
+    def _expr(self) -> Any:
+        left = self._and()
+        while self._accept_keyword("OR"):
+            left = _Op("OR", left, self._and())
+        return left
+
+    def _and(self) -> Any:
+        left = self._not()
+        while self._accept_keyword("AND"):
+            left = _Op("AND", left, self._not())
+        return left
+
+    def _not(self) -> Any:
+        if self._accept_keyword("NOT"):
+            return _Not(self._not())
+        return self._comparison()
+
+    def _comparison(self) -> Any:
+        left = self._additive()
+        while True:
+            token = self._peek()
+            if token.kind == "op" and token.text in ("=", "<>", "!=", "<", ">"):
+                self._pos += 1
+                op = "<>" if token.text == "!=" else token.text
+                left = _Op(op, left, self._additive())
+            elif token.kind == "op" and token.text in ("<=", ">=", "=~"):
+                self._pos += 1
+                left = _Op(token.text, left, self._additive())
+            elif self._accept_keyword("STARTS", "WITH"):
+                left = _Op("STARTS WITH", left, self._additive())
+            elif self._accept_keyword("ENDS", "WITH"):
+                left = _Op("ENDS WITH", left, self._additive())
+            elif self._accept_keyword("CONTAINS"):
+                left = _Op("CONTAINS", left, self._additive())
+            elif self._accept_keyword("IN"):
+                left = _Op("IN", left, self._additive())
+            elif self._accept_keyword("IS", "NOT", "NULL"):
+                left = _IsNull(left, True)
+            elif self._accept_keyword("IS", "NULL"):
+                left = _IsNull(left, False)
+            else:
+                return left
+
+    def _additive(self) -> Any:
+        left = self._unary()
+        while self._is_op("+") or self._is_op("-"):
+            op = self._next().text
+            left = _Op(op, left, self._unary())
+        return left
+
+    def _unary(self) -> Any:
+        if self._accept_op("-"):
+            return _Neg(self._unary())
+        return self._postfix()
+
+    def _postfix(self) -> Any:
+        expr = self._atom()
+        while True:
+            if self._accept_op("."):
+                expr = _Prop(expr, self._name())
+            elif self._accept_op("["):
+                index = self._expr()
+                self._expect_op("]")
+                expr = _Index(expr, index)
+            elif self._is_op(":") and isinstance(expr, _Var):
+                expr = _HasLabels(expr.name, self._labels())
+            else:
+                return expr
+
+    def _atom(self) -> Any:
+        token = self._next()
+        if token.kind == "string":
+            return _Lit(_unquote(token.text))
+        if token.kind == "number":
+            return _Lit(float(token.text) if "." in token.text else int(token.text))
+        if token.kind == "param":
+            return _Param(token.text[1:])
+        if token.kind == "op" and token.text == "(":
+            expr = self._expr()
+            self._expect_op(")")
+            return expr
+        if token.kind == "op" and token.text == "[":
+            items: list[Any] = []
+            if not self._is_op("]"):
+                items.append(self._expr())
+                while self._accept_op(","):
+                    items.append(self._expr())
+            self._expect_op("]")
+            return _List(tuple(items))
+        if token.kind == "name":
+            word = token.text.upper()
+            if word in ("TRUE", "FALSE"):
+                return _Lit(word == "TRUE")
+            if word == "NULL":
+                return _Lit(None)
+            if self._is_op("("):
+                return self._call(token.text)
+            if word in _UNSUPPORTED_CLAUSES:
+                raise OfflineQueryError(
+                    ex.OFFLINE_QUERY_UNSUPPORTED.format(feature=word)
+                )
+            return _Var(token.text.strip("`"))
+        self._pos -= 1
+        self._fail("an expression")
+        raise AssertionError  # unreachable; _fail always raises
+
+    def _call(self, name: str) -> Any:
+        self._expect_op("(")
+        lowered = name.lower()
+        if lowered not in _FUNCTIONS and lowered not in _AGGREGATES:
+            if name.upper() in _UNSUPPORTED_CLAUSES:
+                raise OfflineQueryError(
+                    ex.OFFLINE_QUERY_UNSUPPORTED.format(feature=name.upper())
+                )
+            raise OfflineQueryError(ex.OFFLINE_QUERY_UNKNOWN_FUNCTION.format(name=name))
+        if lowered == "count" and self._accept_op("*"):
+            self._expect_op(")")
+            return _CountStar()
+        distinct = self._accept_keyword("DISTINCT")
+        args: list[Any] = []
+        if not self._is_op(")"):
+            args.append(self._expr())
+            while self._accept_op(","):
+                args.append(self._expr())
+        self._expect_op(")")
+        return _Call(lowered, tuple(args), distinct)
+
+
+_UNSUPPORTED_CLAUSES = _WRITE_KEYWORDS | {
+    "WITH",
+    "CALL",
+    "UNWIND",
+    "UNION",
+    "FOREACH",
+    "EXISTS",
+    "CASE",
+}
+
+
+@lru_cache(maxsize=256)
+def _parse(query: str) -> _Query:
+    return _Parser(query).parse()
+
+
+# --- evaluation helpers ---------------------------------------------------
+
+
+def _free_vars(expr: Any) -> set[str]:
+    if isinstance(expr, _Var):
+        return {expr.name}
+    if isinstance(expr, _HasLabels):
+        return {expr.var}
+    found: set[str] = set()
+    if isinstance(expr, tuple) and not isinstance(expr, _Lit):
+        for part in expr:
+            if isinstance(part, tuple):
+                found |= _free_vars(part)
+    return found
+
+
+def _conjuncts(expr: Any) -> Iterator[Any]:
+    if isinstance(expr, _Op) and expr.op == "AND":
+        yield from _conjuncts(expr.left)
+        yield from _conjuncts(expr.right)
+    elif expr is not None:
+        yield expr
+
+
+def _label_union(expr: Any) -> tuple[str, tuple[str, ...]] | None:
+    # `(n:Function OR n:Method)`: every disjunct a single label test on the
+    # same variable, so the label index answers it as a union.
+    if isinstance(expr, _HasLabels) and len(expr.labels) == 1:
+        return expr.var, expr.labels
+    if isinstance(expr, _Op) and expr.op == "OR":
+        left, right = _label_union(expr.left), _label_union(expr.right)
+        if left and right and left[0] == right[0]:
+            return left[0], left[1] + right[1]
+    return None
+
+
+def _key(value: Any) -> Any:
+    # Hashable, comparable identity for DISTINCT, grouping, `=` and `IN`.
+    if isinstance(value, GraphNode):
+        return ("node", value.node_id)
+    if isinstance(value, GraphRelationship):
+        return ("rel", value.from_id, value.type, value.to_id)
+    if isinstance(value, list | tuple):
+        return tuple(_key(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _key(v)) for k, v in value.items()))
+    return value
+
+
+def _rel_key(rel: GraphRelationship) -> tuple[int, str, int]:
+    return rel.from_id, rel.type, rel.to_id
+
+
+def _result(value: Any) -> Any:
+    if isinstance(value, GraphNode | GraphRelationship):
+        return dict(value.properties)
+    if isinstance(value, list | tuple):
+        return [_result(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _result(v) for k, v in value.items()}
+    return value
+
+
+def _sort_key(value: Any) -> tuple[int, Any]:
+    # Cypher orders null after every other value, so it sorts last
+    # ascending and first descending.
+    if value is None:
+        return (9, 0)
+    if isinstance(value, bool):
+        return (2, value)
+    if isinstance(value, int | float):
+        return (1, value)
+    if isinstance(value, str):
+        return (0, value)
+    return (3, str(_key(value)))
+
+
+def _compare(op: str, left: Any, right: Any) -> bool | None:
+    if left is None or right is None:
+        return None
+    if op == "=":
+        return _key(left) == _key(right)
+    if op == "<>":
+        return _key(left) != _key(right)
+    if op == "=~":
+        if not isinstance(left, str) or not isinstance(right, str):
+            return None
+        return re.fullmatch(right, left) is not None
+    if op in ("STARTS WITH", "ENDS WITH", "CONTAINS"):
+        if not isinstance(left, str) or not isinstance(right, str):
+            return None
+        if op == "STARTS WITH":
+            return left.startswith(right)
+        if op == "ENDS WITH":
+            return left.endswith(right)
+        return right in left
+    if op == "IN":
+        if not isinstance(right, list | tuple):
+            return None
+        return _key(left) in {_key(item) for item in right}
+    try:
+        if op == "<":
+            return left < right
+        if op == ">":
+            return left > right
+        if op == "<=":
+            return left <= right
+        return left >= right
+    except TypeError:
+        return None
+
+
+def _labels(value: Any) -> list[str] | None:
+    return list(value.labels) if isinstance(value, GraphNode) else None
+
+
+def _type(value: Any) -> str | None:
+    return value.type if isinstance(value, GraphRelationship) else None
+
+
+def _id(value: Any) -> int | None:
+    return value.node_id if isinstance(value, GraphNode) else None
+
+
+def _properties(value: Any) -> dict[str, Any] | None:
+    if isinstance(value, GraphNode | GraphRelationship):
+        return dict(value.properties)
+    return value if isinstance(value, dict) else None
+
+
+def _keys(value: Any) -> list[str] | None:
+    properties = _properties(value)
+    return None if properties is None else list(properties)
+
+
+def _coalesce(*values: Any) -> Any:
+    return next((v for v in values if v is not None), None)
+
+
+def _lower(value: Any) -> str | None:
+    return value.lower() if isinstance(value, str) else None
+
+
+def _upper(value: Any) -> str | None:
+    return value.upper() if isinstance(value, str) else None
+
+
+def _size(value: Any) -> int | None:
+    return len(value) if isinstance(value, str | list | tuple) else None
+
+
+def _to_string(value: Any) -> str | None:
+    return None if value is None else str(value)
+
+
+_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "labels": _labels,
+    "type": _type,
+    "id": _id,
+    "properties": _properties,
+    "keys": _keys,
+    "coalesce": _coalesce,
+    "tolower": _lower,
+    "toupper": _upper,
+    "size": _size,
+    "tostring": _to_string,
+}
+
+
+def _is_aggregate(expr: Any) -> bool:
+    return isinstance(expr, _CountStar) or (
+        isinstance(expr, _Call) and expr.name in _AGGREGATES
+    )
+
+
+class _Aggregate:
+    __slots__ = ("_expr", "_values", "_seen", "_count")
+
+    def __init__(self, expr: Any) -> None:
+        self._expr = expr
+        self._values: list[Any] = []
+        self._seen: set[Any] = set()
+        self._count = 0
+
+    def add(self, value: Any) -> None:
+        if isinstance(self._expr, _CountStar):
+            self._count += 1
+            return
+        if value is None:
+            return
+        if self._expr.distinct:
+            key = _key(value)
+            if key in self._seen:
+                return
+            self._seen.add(key)
+        self._values.append(value)
+
+    def result(self) -> Any:
+        if isinstance(self._expr, _CountStar):
+            return self._count
+        values = self._values
+        match self._expr.name:
+            case "count":
+                return len(values)
+            case "collect":
+                return values
+            case "min":
+                return min(values, key=_sort_key) if values else None
+            case "max":
+                return max(values, key=_sort_key) if values else None
+            case "sum":
+                return sum(values)
+            case _:
+                return sum(values) / len(values) if values else None
+
+
+# --- engine ---------------------------------------------------------------
+
+
+class OfflineQueryEngine:
+    """`QueryProtocol` over an in-process graph; read-only by design."""
+
+    __slots__ = ("graph", "source", "_prefix_indexes")
+
+    def __init__(self, graph: Graph, source: str = "") -> None:
+        self.graph = graph
+        self.source = source
+        self._prefix_indexes: dict[str, tuple[list[str], list[GraphNode]]] = {}
+
+    @classmethod
+    def open(cls, path: Path) -> OfflineQueryEngine:
+        graph = load_offline_graph(path)
+        logger.info(ls.OFFLINE_GRAPH_READY.format(path=path, nodes=len(graph.nodes)))
+        return cls(graph, str(path))
+
+    def __enter__(self) -> OfflineQueryEngine:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type | None,
+        exc_val: Exception | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        if isinstance(self.graph, ColumnarGraphLoader):
+            self.graph.close()
+
+    # QueryProtocol
+
+    def fetch_all(
+        self, query: str, params: PropertyDict | None = None
+    ) -> list[ResultRow]:
+        return _Execution(self, _parse(query.strip()), params or {}).run()
+
+    def execute_write(self, query: str, params: PropertyDict | None = None) -> None:
+        raise OfflineQueryError(ex.OFFLINE_QUERY_READ_ONLY.format(operation=query))
+
+    # The read side of the MemgraphIngestor surface the MCP tools call.
+
+    def list_projects(self) -> list[str]:
+        return sorted(
+            str(node.properties.get(cs.KEY_NAME))
+            for node in self.graph.find_nodes_by_label(cs.NodeLabel.PROJECT)
+        )
+
+    def delete_project(self, project_name: str) -> None:
+        raise OfflineQueryError(
+            ex.OFFLINE_QUERY_READ_ONLY.format(operation=f"delete {project_name}")
+        )
+
+    def clean_database(self) -> None:
+        raise OfflineQueryError(ex.OFFLINE_QUERY_READ_ONLY.format(operation="wipe"))
+
+    # indexes
+
+    def _prefix_scan(self, key: str, prefix: str) -> list[GraphNode]:
+        index = self._prefix_indexes.get(key)
+        if index is None:
+            pairs = sorted(
+                (
+                    (value, node)
+                    for node in self.graph.nodes
+                    if isinstance(value := node.properties.get(key), str)
+                ),
+                key=lambda pair: pair[0],
+            )
+            index = ([value for value, _ in pairs], [node for _, node in pairs])
+            self._prefix_indexes[key] = index
+        values, nodes = index
+        low = bisect.bisect_left(values, prefix)
+        high = low
+        while high < len(values) and values[high].startswith(prefix):
+            high += 1
+        return nodes[low:high]
+
+
+class _Hints(NamedTuple):
+    equal: list[tuple[str, Any]]
+    prefix: list[tuple[str, Any]]
+    labels: list[tuple[str, ...]]
+
+
+class _Execution:
+    """One query run: parameters bound, anchor candidates memoized."""
+
+    __slots__ = ("_engine", "_graph", "_query", "_params", "_candidates")
+
+    def __init__(self, engine: OfflineQueryEngine, query: _Query, params: PropertyDict):
+        self._engine = engine
+        self._graph = engine.graph
+        self._query = query
+        self._params = params
+        self._candidates: dict[tuple[int, int, int], list[GraphNode]] = {}
+
+    def run(self) -> list[ResultRow]:
+        rows: Iterable[Row] = [{}]
+        for number, match in enumerate(self._query.matches):
+            rows = self._match(number, match, rows)
+        return self._project(rows)
+
+    # expressions
+
+    def _eval(self, expr: Any, row: Row) -> Any:
+        if isinstance(expr, _Lit):
+            return expr.value
+        if isinstance(expr, _Var):
+            if expr.name not in row:
+                raise OfflineQueryError(ex.OFFLINE_QUERY_UNBOUND.format(name=expr.name))
+            return row[expr.name]
+        if isinstance(expr, _Prop):
+            subject = self._eval(expr.subject, row)
+            if isinstance(subject, GraphNode | GraphRelationship):
+                return subject.properties.get(expr.key)
+            if isinstance(subject, dict):
+                return subject.get(expr.key)
+            return None
+        if isinstance(expr, _Param):
+            if expr.name not in self._params:
+                raise OfflineQueryError(
+                    ex.OFFLINE_QUERY_MISSING_PARAM.format(name=expr.name)
+                )
+            return self._params[expr.name]
+        if isinstance(expr, _Op):
+            return self._eval_op(expr, row)
+        if isinstance(expr, _Not):
+            value = self._eval(expr.operand, row)
+            return None if value is None else not value
+        if isinstance(expr, _IsNull):
+            is_null = self._eval(expr.operand, row) is None
+            return not is_null if expr.negated else is_null
+        if isinstance(expr, _HasLabels):
+            node = row.get(expr.var)
+            if not isinstance(node, GraphNode):
+                return None
+            return all(label in node.labels for label in expr.labels)
+        if isinstance(expr, _Call):
+            if expr.name in _AGGREGATES:
+                raise OfflineQueryError(
+                    ex.OFFLINE_QUERY_UNSUPPORTED.format(
+                        feature=f"nested aggregate {expr.name}()"
+                    )
+                )
+            return _FUNCTIONS[expr.name](*(self._eval(a, row) for a in expr.args))
+        if isinstance(expr, _Index):
+            subject = self._eval(expr.subject, row)
+            index = self._eval(expr.index, row)
+            if isinstance(subject, list) and isinstance(index, int):
+                return subject[index] if -len(subject) <= index < len(subject) else None
+            if isinstance(subject, dict) and isinstance(index, str):
+                return subject.get(index)
+            return None
+        if isinstance(expr, _List):
+            return [self._eval(item, row) for item in expr.items]
+        if isinstance(expr, _Neg):
+            value = self._eval(expr.operand, row)
+            return -value if isinstance(value, int | float) else None
+        raise OfflineQueryError(
+            ex.OFFLINE_QUERY_UNSUPPORTED.format(feature=type(expr).__name__)
+        )
+
+    def _eval_op(self, expr: _Op, row: Row) -> Any:
+        if expr.op in ("AND", "OR"):
+            # Three-valued logic: a definite answer from one side wins over
+            # null from the other.
+            left = self._eval(expr.left, row)
+            decisive = expr.op == "OR"
+            if left is not None and bool(left) is decisive:
+                return decisive
+            right = self._eval(expr.right, row)
+            if right is not None and bool(right) is decisive:
+                return decisive
+            if left is None or right is None:
+                return None
+            return not decisive
+        left = self._eval(expr.left, row)
+        right = self._eval(expr.right, row)
+        if expr.op in ("+", "-"):
+            if left is None or right is None:
+                return None
+            try:
+                return left + right if expr.op == "+" else left - right
+            except TypeError:
+                return None
+        return _compare(expr.op, left, right)
+
+    def _holds(self, expr: Any, row: Row) -> bool:
+        return expr is None or self._eval(expr, row) is True
+
+    # matching
+
+    def _match(self, number: int, match: _Match, rows: Iterable[Row]) -> Iterator[Row]:
+        hints = self._hints(match.where)
+        introduced = [
+            element.var for path in match.paths for element in (*path.nodes, *path.rels)
+        ]
+        for row in rows:
+            matched = False
+            for extended in self._match_paths(number, match.paths, 0, row, hints):
+                if self._holds(match.where, extended):
+                    matched = True
+                    yield extended
+            if match.optional and not matched:
+                yield {**row, **{var: None for var in introduced if var not in row}}
+
+    def _hints(self, where: Any) -> dict[str, _Hints]:
+        hints: dict[str, _Hints] = {}
+
+        def of(var: str) -> _Hints:
+            return hints.setdefault(var, _Hints([], [], []))
+
+        for conjunct in _conjuncts(where):
+            if union := _label_union(conjunct):
+                of(union[0]).labels.append(union[1])
+                continue
+            if not isinstance(conjunct, _Op) or conjunct.op not in ("=", "STARTS WITH"):
+                continue
+            sides = [(conjunct.left, conjunct.right)]
+            if conjunct.op == "=":
+                sides.append((conjunct.right, conjunct.left))
+            for prop, value in sides:
+                if (
+                    isinstance(prop, _Prop)
+                    and isinstance(prop.subject, _Var)
+                    and not _free_vars(value)
+                ):
+                    hint = of(prop.subject.name)
+                    target = hint.equal if conjunct.op == "=" else hint.prefix
+                    target.append((prop.key, value))
+                    break
+        return hints
+
+    def _match_paths(
+        self,
+        number: int,
+        paths: tuple[_Path, ...],
+        index: int,
+        row: Row,
+        hints: dict[str, _Hints],
+    ) -> Iterator[Row]:
+        if index == len(paths):
+            yield row
+            return
+        for extended in self._match_path(number, index, paths[index], row, hints):
+            yield from self._match_paths(number, paths, index + 1, extended, hints)
+
+    def _match_path(
+        self,
+        number: int,
+        path_index: int,
+        path: _Path,
+        row: Row,
+        hints: dict[str, _Hints],
+    ) -> Iterator[Row]:
+        bound = [i for i, pat in enumerate(path.nodes) if pat.var in row]
+        if bound:
+            anchor = bound[0]
+            start = row[path.nodes[anchor].var]
+            starts: Iterable[GraphNode] = [start] if start is not None else []
+        else:
+            options = [
+                self._anchor_candidates(
+                    (number, path_index, i), pat, hints.get(pat.var)
+                )
+                for i, pat in enumerate(path.nodes)
+            ]
+            sizes = [len(o) if o is not None else 1 << 62 for o in options]
+            anchor = min(range(len(options)), key=sizes.__getitem__)
+            candidates = options[anchor]
+            starts = candidates if candidates is not None else self._graph.nodes
+        steps = [(i, i, i + 1, False) for i in range(anchor, len(path.rels))]
+        steps += [(i, i + 1, i, True) for i in range(anchor - 1, -1, -1)]
+        pattern = path.nodes[anchor]
+        for node in starts:
+            if self._node_ok(pattern, node, row):
+                yield from self._walk(
+                    path, steps, 0, {**row, pattern.var: node}, frozenset()
+                )
+
+    def _anchor_candidates(
+        self, slot: tuple[int, int, int], pat: _NodePat, hint: _Hints | None
+    ) -> list[GraphNode] | None:
+        # Parameters are fixed for the run and hints never reference pattern
+        # variables, so each pattern position resolves its candidates once.
+        if slot in self._candidates:
+            return self._candidates[slot]
+        options: list[list[GraphNode]] = []
+        equal = list(pat.props) + (hint.equal if hint else [])
+        for key, expr in equal:
+            if _free_vars(expr):
+                continue
+            value = self._eval(expr, {})
+            if isinstance(value, _HASHABLE_SCALARS):
+                options.append(self._graph.find_node_by_property(key, value))
+        for key, expr in hint.prefix if hint else []:
+            value = self._eval(expr, {})
+            if isinstance(value, str):
+                options.append(self._engine._prefix_scan(key, value))
+        for label in pat.labels:
+            options.append(self._graph.find_nodes_by_label(label))
+        for union in hint.labels if hint else []:
+            merged: dict[int, GraphNode] = {}
+            for label in union:
+                for node in self._graph.find_nodes_by_label(label):
+                    merged[node.node_id] = node
+            options.append(list(merged.values()))
+        best = min(options, key=len) if options else None
+        if best is not None:
+            self._candidates[slot] = best
+        return best
+
+    def _node_ok(self, pat: _NodePat, node: GraphNode | None, row: Row) -> bool:
+        if node is None:
+            return False
+        if pat.var in row:
+            bound = row[pat.var]
+            if bound is None or bound.node_id != node.node_id:
+                return False
+        if any(label not in node.labels for label in pat.labels):
+            return False
+        return all(
+            _compare("=", node.properties.get(key), self._eval(expr, row)) is True
+            for key, expr in pat.props
+        )
+
+    def _rel_ok(self, pat: _RelPat, rel: GraphRelationship, row: Row) -> bool:
+        return all(
+            _compare("=", rel.properties.get(key), self._eval(expr, row)) is True
+            for key, expr in pat.props
+        )
+
+    def _neighbours(
+        self, node: GraphNode, direction: str, rel_types: frozenset[str]
+    ) -> Iterator[tuple[GraphRelationship, GraphNode | None]]:
+        graph = self._graph
+        if direction != _OUT:
+            for rel in graph.get_incoming_relationships(node.node_id):
+                if not rel_types or rel.type in rel_types:
+                    yield rel, graph.get_node_by_id(rel.from_id)
+        if direction != _IN:
+            for rel in graph.get_outgoing_relationships(node.node_id):
+                if not rel_types or rel.type in rel_types:
+                    yield rel, graph.get_node_by_id(rel.to_id)
+
+    def _expand(
+        self, node: GraphNode, pat: _RelPat, direction: str, row: Row
+    ) -> Iterator[tuple[list[GraphRelationship], GraphNode | None]]:
+        if not pat.variable:
+            for rel, other in self._neighbours(node, direction, pat.types):
+                if self._rel_ok(pat, rel, row):
+                    yield [rel], other
+            return
+        # Breadth first, each node once at its shortest depth.
+        if pat.min_hops == 0:
+            yield [], node
+        seen = {node.node_id}
+        frontier: list[tuple[GraphNode, list[GraphRelationship]]] = [(node, [])]
+        depth = 0
+        while frontier and (pat.max_hops is None or depth < pat.max_hops):
+            depth += 1
+            following: list[tuple[GraphNode, list[GraphRelationship]]] = []
+            for current, trail in frontier:
+                for rel, other in self._neighbours(current, direction, pat.types):
+                    if other is None or other.node_id in seen:
+                        continue
+                    if not self._rel_ok(pat, rel, row):
+                        continue
+                    seen.add(other.node_id)
+                    extended = trail + [rel]
+                    if depth >= pat.min_hops:
+                        yield extended, other
+                    following.append((other, extended))
+            frontier = following
+
+    def _walk(
+        self,
+        path: _Path,
+        steps: list[tuple[int, int, int, bool]],
+        step: int,
+        row: Row,
+        used: frozenset[tuple[int, str, int]],
+    ) -> Iterator[Row]:
+        if step == len(steps):
+            yield row
+            return
+        rel_index, source_index, target_index, backwards = steps[step]
+        pat = path.rels[rel_index]
+        target = path.nodes[target_index]
+        direction = pat.direction
+        if backwards and direction != _BOTH:
+            direction = _IN if direction == _OUT else _OUT
+        source = row[path.nodes[source_index].var]
+        for rels, other in self._expand(source, pat, direction, row):
+            keys = {_rel_key(rel) for rel in rels}
+            if keys & used or not self._node_ok(target, other, row):
+                continue
+            bound: Any = rels if pat.variable else rels[0]
+            if pat.variable and backwards:
+                bound = rels[::-1]
+            if pat.var in row and _key(row[pat.var]) != _key(bound):
+                continue
+            yield from self._walk(
+                path,
+                steps,
+                step + 1,
+                {**row, pat.var: bound, target.var: other},
+                used | keys,
+            )
+
+    # projection
+
+    def _project(self, rows: Iterable[Row]) -> list[ResultRow]:
+        query = self._query
+        items = query.items
+        if any(_is_aggregate(item.expr) for item in items):
+            projected: Iterable[tuple[list[Any], Row]] = self._aggregate(rows)
+        else:
+            projected = (
+                ([self._eval(item.expr, row) for item in items], row) for row in rows
+            )
+        if query.distinct:
+            projected = self._distinct(projected)
+        if query.order:
+            projected = self._ordered(list(projected))
+        skip = self._count_param(query.skip) or 0
+        limit = self._count_param(query.limit)
+        window = islice(projected, skip, None if limit is None else skip + limit)
+        aliases = [item.alias for item in items]
+        return [
+            {alias: _result(value) for alias, value in zip(aliases, values)}
+            for values, _row in window
+        ]
+
+    def _count_param(self, expr: Any) -> int | None:
+        if expr is None:
+            return None
+        value = self._eval(expr, {})
+        if not isinstance(value, int) or value < 0:
+            raise OfflineQueryError(
+                ex.OFFLINE_QUERY_SYNTAX.format(expected="a non-negative integer", pos=0)
+            )
+        return value
+
+    def _aggregate(self, rows: Iterable[Row]) -> Iterator[tuple[list[Any], Row]]:
+        items = self._query.items
+        grouping = [i for i, item in enumerate(items) if not _is_aggregate(item.expr)]
+        groups: dict[tuple, tuple[list[Any], list[_Aggregate]]] = {}
+        for row in rows:
+            keys = [self._eval(items[i].expr, row) for i in grouping]
+            group_key = tuple(_key(k) for k in keys)
+            if group_key not in groups:
+                aggregates = [
+                    _Aggregate(item.expr) for item in items if _is_aggregate(item.expr)
+                ]
+                groups[group_key] = (keys, aggregates)
+            for aggregate, item in zip(
+                groups[group_key][1], (it for it in items if _is_aggregate(it.expr))
+            ):
+                argument = None
+                if isinstance(item.expr, _Call) and item.expr.args:
+                    argument = self._eval(item.expr.args[0], row)
+                aggregate.add(argument)
+        if not groups and not grouping:
+            groups[()] = ([], [_Aggregate(item.expr) for item in items])
+        for keys, aggregates in groups.values():
+            plain, folded = iter(keys), iter(aggregates)
+            values = [
+                next(folded).result() if _is_aggregate(item.expr) else next(plain)
+                for item in items
+            ]
+            yield values, {}
+
+    def _distinct(
+        self, projected: Iterable[tuple[list[Any], Row]]
+    ) -> Iterator[tuple[list[Any], Row]]:
+        seen: set[tuple] = set()
+        for values, row in projected:
+            key = tuple(_key(v) for v in values)
+            if key not in seen:
+                seen.add(key)
+                yield values, row
+
+    def _ordered(
+        self, projected: list[tuple[list[Any], Row]]
+    ) -> list[tuple[list[Any], Row]]:
+        items = self._query.items
+        positions = {item.expr: i for i, item in enumerate(items)}
+        aliases = {item.alias: i for i, item in enumerate(items)}
+
+        def order_value(expr: Any, values: list[Any], row: Row) -> Any:
+            if expr in positions:
+                return values[positions[expr]]
+            if isinstance(expr, _Var) and expr.name in aliases:
+                return values[aliases[expr.name]]
+            env = {**row, **{item.alias: v for item, v in zip(items, values)}}
+            return self._eval(expr, env)
+
+        # Stable sorts from the last key to the first give the lexicographic
+        # order with per-key direction.
+        for expr, descending in reversed(self._query.order):
+            projected.sort(
+                key=lambda entry: _sort_key(order_value(expr, *entry)),
+                reverse=descending,
+            )
+        return projected
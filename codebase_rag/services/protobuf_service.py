@@ -9,6 +9,7 @@ import codec.schema_pb2 as pb
 from .. import constants as cs
 from .. import logs as ls
 from ..types_defs import PropertyDict, PropertyValue
+from .protobuf_stream import IndexRecordWriter
 
 LABEL_TO_ONEOF_FIELD: dict[cs.NodeLabel, str] = {
     cs.NodeLabel.PROJECT: cs.ONEOF_PROJECT,
@@ -48,6 +49,7 @@ class ProtobufFileIngestor:
         "_nodes",
         "_relationships",
         "split_index",
+        "stream_index",
         "_repo_prefix",
     )
 
@@ -56,11 +58,13 @@ class ProtobufFileIngestor:
         output_path: str,
         split_index: bool = False,
         repo_path: str | None = None,
+        stream_index: bool = False,
     ):
         self.output_dir = Path(output_path)
         self._nodes: dict[str, pb.Node] = {}
         self._relationships: dict[tuple[str, int, str], pb.Relationship] = {}
         self.split_index = split_index
+        self.stream_index = stream_index
         # File/Folder identities are ABSOLUTE paths in the live graph (the
         # realtime watcher deletes by absolute path, issue #1141), which would
         # make the artifact differ per checkout location. The canonical export
@@ -209,21 +213,35 @@ class ProtobufFileIngestor:
         # order with the type enum's integer as the middle tiebreak.
         return [rel for _key, rel in sorted(self._relationships.items())]
 
-    def _flush_joint(self) -> None:
-        index = pb.GraphCodeIndex()
-        index.nodes.extend(self._sorted_nodes())
-        index.relationships.extend(self._sorted_relationships())
-
-        serialised_file = index.SerializeToString(deterministic=True)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-        out_path = self.output_dir / cs.PROTOBUF_INDEX_FILE
-        with open(out_path, "wb") as f:
-            f.write(serialised_file)
-        # The two layouts are mutually exclusive: a leftover split pair beside
-        # a fresh joint index would double every manifest coverage count.
-        (self.output_dir / cs.PROTOBUF_NODES_FILE).unlink(missing_ok=True)
-        (self.output_dir / cs.PROTOBUF_RELS_FILE).unlink(missing_ok=True)
-
+    def _write_artifact(
+        self, name: str, nodes: bool, relationships: bool, header: bool = False
+    ) -> None:
+        # Records go out one at a time: the bytes equal a GraphCodeIndex
+        # serialization, but no message ever holds the whole graph.
+        with open(self.output_dir / name, "wb", buffering=1 << 20) as f:
+            writer = IndexRecordWriter(f)
+            if header:
+                writer.write_header(len(self._nodes), len(self._relationships))
+            if nodes:
+                for node in self._sorted_nodes():
+                    writer.write_node(node)
+            if relationships:
+                for rel in self._sorted_relationships():
+                    writer.write_relationship(rel)
+
+    def _remove_other_layouts(self, *keep: str) -> None:
+        # The layouts are mutually exclusive: a leftover artifact of another
+        # layout beside a fresh one would double every manifest coverage count.
+        for name in (
+            cs.PROTOBUF_INDEX_FILE,
+            cs.PROTOBUF_NODES_FILE,
+            cs.PROTOBUF_RELS_FILE,
+            cs.PROTOBUF_STREAM_FILE,
+        ):
+            if name not in keep:
+                (self.output_dir / name).unlink(missing_ok=True)
+
+    def _log_flushed(self) -> None:
         logger.success(
             ls.PROTOBUF_FLUSH_SUCCESS.format(
                 nodes=len(self._nodes),
@@ -232,36 +250,30 @@ class ProtobufFileIngestor:
             )
         )
 
-    def _flush_split(self) -> None:
-        nodes_index = pb.GraphCodeIndex()
-        rels_index = pb.GraphCodeIndex()
-        nodes_index.nodes.extend(self._sorted_nodes())
-        rels_index.relationships.extend(self._sorted_relationships())
-
-        serialised_nodes = nodes_index.SerializeToString(deterministic=True)
-        serialised_rels = rels_index.SerializeToString(deterministic=True)
-
+    def _flush_joint(self) -> None:
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        nodes_path = self.output_dir / cs.PROTOBUF_NODES_FILE
-        rels_path = self.output_dir / cs.PROTOBUF_RELS_FILE
-
-        with open(nodes_path, "wb") as f:
-            f.write(serialised_nodes)
+        self._write_artifact(cs.PROTOBUF_INDEX_FILE, nodes=True, relationships=True)
+        self._remove_other_layouts(cs.PROTOBUF_INDEX_FILE)
+        self._log_flushed()
 
-        with open(rels_path, "wb") as f:
-            f.write(serialised_rels)
-
-        (self.output_dir / cs.PROTOBUF_INDEX_FILE).unlink(missing_ok=True)
+    def _flush_split(self) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._write_artifact(cs.PROTOBUF_NODES_FILE, nodes=True, relationships=False)
+        self._write_artifact(cs.PROTOBUF_RELS_FILE, nodes=False, relationships=True)
+        self._remove_other_layouts(cs.PROTOBUF_NODES_FILE, cs.PROTOBUF_RELS_FILE)
+        self._log_flushed()
 
-        logger.success(
-            ls.PROTOBUF_FLUSH_SUCCESS.format(
-                nodes=len(self._nodes),
-                rels=len(self._relationships),
-                path=self.output_dir,
-            )
+    def _flush_stream(self) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._write_artifact(
+            cs.PROTOBUF_STREAM_FILE, nodes=True, relationships=True, header=True
         )
+        self._remove_other_layouts(cs.PROTOBUF_STREAM_FILE)
+        self._log_flushed()
 
     def flush_all(self) -> None:
         logger.info(ls.PROTOBUF_FLUSHING.format(path=self.output_dir))
 
+        if self.stream_index:
+            return self._flush_stream()
         return self._flush_split() if self.split_index else self._flush_joint()
@@ -0,0 +1,208 @@
+"""Length-delimited record I/O for the protobuf index.
+
+On the wire a `GraphCodeIndex` is only a run of records: each node is the
+field-1 tag, a varint length and the serialized `Node`; each relationship is
+the same under field 2. Writing those records one at a time yields exactly
+the bytes `SerializeToString` would (the joint and split layouts stay
+byte-identical to earlier exports, issue #1138) without ever building the
+whole message, and reading them one at a time never parses it whole either.
+That keeps large monorepos clear of the 2 GB protobuf message limit and of
+holding the graph in memory twice.
+
+The streamed layout (`index.pbs`) prefixes the same records with a header:
+magic bytes, a format version and the node/relationship counts. Stripping
+the header leaves a valid `GraphCodeIndex`, so every reader here accepts all
+three layouts.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import BinaryIO, NamedTuple
+
+import codec.schema_pb2 as pb
+
+from .. import constants as cs
+
+# Field number << 3 | wire type 2 (length-delimited), as protobuf encodes the
+# two repeated fields of GraphCodeIndex.
+_NODE_TAG = 0x0A
+_REL_TAG = 0x12
+_MAX_VARINT_SHIFT = 64
+
+NODE_ARTIFACTS = (
+    cs.PROTOBUF_STREAM_FILE,
+    cs.PROTOBUF_INDEX_FILE,
+    cs.PROTOBUF_NODES_FILE,
+)
+RELATIONSHIP_ARTIFACTS = (
+    cs.PROTOBUF_STREAM_FILE,
+    cs.PROTOBUF_INDEX_FILE,
+    cs.PROTOBUF_RELS_FILE,
+)
+
+type IndexRecord = pb.Node | pb.Relationship
+type Opener = Callable[[Path], BinaryIO]
+
+
+class StreamHeader(NamedTuple):
+    version: int
+    node_count: int
+    relationship_count: int
+
+
+class IndexFormatError(ValueError):
+    """An index artifact is truncated or not in a known layout."""
+
+
+def _encode_varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        bits = value & 0x7F
+        value >>= 7
+        if not value:
+            out.append(bits)
+            return bytes(out)
+        out.append(bits | 0x80)
+
+
+def _decode_varint(buffer: mmap.mmap | bytes, pos: int) -> tuple[int, int]:
+    result = 0
+    shift = 0
+    end = len(buffer)
+    while True:
+        if pos >= end:
+            raise IndexFormatError("truncated varint in index artifact")
+        byte = buffer[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift >= _MAX_VARINT_SHIFT:
+            raise IndexFormatError("malformed varint in index artifact")
+
+
+class IndexRecordWriter:
+    """Appends length-delimited node/relationship records to a binary handle.
+
+    Callers own ordering: the canonical export writes every node before any
+    relationship, each group sorted, exactly as the joint message would.
+    """
+
+    __slots__ = ("_handle", "nodes_written", "relationships_written")
+
+    def __init__(self, handle: BinaryIO) -> None:
+        self._handle = handle
+        self.nodes_written = 0
+        self.relationships_written = 0
+
+    def write_header(self, node_count: int, relationship_count: int) -> None:
+        self._handle.write(
+            cs.PROTOBUF_STREAM_MAGIC
+            + _encode_varint(cs.PROTOBUF_STREAM_VERSION)
+            + _encode_varint(node_count)
+            + _encode_varint(relationship_count)
+        )
+
+    def write_node(self, node: pb.Node) -> None:
+        self._write(_NODE_TAG, node.SerializeToString(deterministic=True))
+        self.nodes_written += 1
+
+    def write_relationship(self, rel: pb.Relationship) -> None:
+        self._write(_REL_TAG, rel.SerializeToString(deterministic=True))
+        self.relationships_written += 1
+
+    def _write(self, tag: int, payload: bytes) -> None:
+        self._handle.write(bytes((tag,)) + _encode_varint(len(payload)))
+        self._handle.write(payload)
+
+
+def _read_header(view: mmap.mmap | bytes) -> tuple[StreamHeader | None, int]:
+    magic = cs.PROTOBUF_STREAM_MAGIC
+    if view[: len(magic)] != magic:
+        return None, 0
+    version, pos = _decode_varint(view, len(magic))
+    if version != cs.PROTOBUF_STREAM_VERSION:
+        raise IndexFormatError(f"unsupported index stream version {version}")
+    node_count, pos = _decode_varint(view, pos)
+    rel_count, pos = _decode_varint(view, pos)
+    return StreamHeader(version, node_count, rel_count), pos
+
+
+def _open_binary(path: Path) -> BinaryIO:
+    return open(path, "rb")
+
+
+def read_stream_header(
+    path: Path, opener: Opener = _open_binary
+) -> StreamHeader | None:
+    """The header of a streamed artifact; None for the headerless layouts."""
+    with opener(path) as handle:
+        head = handle.read(len(cs.PROTOBUF_STREAM_MAGIC) + 30)
+    return _read_header(head)[0]
+
+
+def iter_index_records(
+    path: Path,
+    *,
+    nodes: bool = True,
+    relationships: bool = True,
+    opener: Opener = _open_binary,
+) -> Iterator[IndexRecord]:
+    """Lazily decode the records of one artifact, in file order.
+
+    The file is memory-mapped and each record parsed on its own, so peak
+    memory is one record regardless of the artifact size. Records of an
+    unwanted kind are skipped without being parsed.
+    """
+    with opener(path) as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            _header, pos = _read_header(view)
+            while pos < size:
+                tag = view[pos]
+                length, start = _decode_varint(view, pos + 1)
+                end = start + length
+                if end > size:
+                    raise IndexFormatError(f"truncated record in {path.name}")
+                if tag == _NODE_TAG:
+                    if nodes:
+                        yield pb.Node.FromString(view[start:end])
+                elif tag == _REL_TAG:
+                    if relationships:
+                        yield pb.Relationship.FromString(view[start:end])
+                else:
+                    raise IndexFormatError(
+                        f"unexpected field tag {tag:#x} in {path.name}"
+                    )
+                pos = end
+
+
+def present_artifacts(index_dir: Path, names: tuple[str, ...]) -> list[Path]:
+    return [index_dir / name for name in names if (index_dir / name).is_file()]
+
+
+def iter_index_nodes(
+    index_dir: Path, opener: Opener = _open_binary
+) -> Iterator[pb.Node]:
+    """Every node of the export in `index_dir`, whatever its layout."""
+    for artifact in present_artifacts(index_dir, NODE_ARTIFACTS):
+        for record in iter_index_records(artifact, relationships=False, opener=opener):
+            assert isinstance(record, pb.Node)
+            yield record
+
+
+def iter_index_relationships(
+    index_dir: Path, opener: Opener = _open_binary
+) -> Iterator[pb.Relationship]:
+    """Every relationship of the export in `index_dir`, whatever its layout."""
+    for artifact in present_artifacts(index_dir, RELATIONSHIP_ARTIFACTS):
+        for record in iter_index_records(artifact, nodes=False, opener=opener):
+            assert isinstance(record, pb.Relationship)
+            yield record
@@ -16,6 +16,7 @@ import hashlib
 import json
 import os
 import subprocess
+from collections.abc import Iterator
 from datetime import UTC, datetime
 from importlib import metadata
 from pathlib import Path
@@ -24,6 +25,7 @@ import codec.schema_pb2 as pb
 
 from .. import constants as cs
 from ..language_spec import get_language_spec
+from .protobuf_stream import NODE_ARTIFACTS, iter_index_records, present_artifacts
 
 type JsonDict = dict[str, object]
 _DIST_NAME = "code-graph-rag"
@@ -36,6 +38,13 @@ _ARTIFACT_FILES = (
     cs.PROTOBUF_INDEX_FILE,
     cs.PROTOBUF_NODES_FILE,
     cs.PROTOBUF_RELS_FILE,
+    cs.PROTOBUF_STREAM_FILE,
+)
+# One entry per layout; an export directory must hold exactly one of them.
+_LAYOUT_MARKERS = (
+    cs.PROTOBUF_INDEX_FILE,
+    cs.PROTOBUF_NODES_FILE,
+    cs.PROTOBUF_STREAM_FILE,
 )
 
 
@@ -103,20 +112,25 @@ def _coverage_from_nodes(nodes) -> JsonDict:
     return {lang: per_language[lang] for lang in sorted(per_language)}
 
 
-def _coverage_summary(index_dir: Path) -> JsonDict:
-    nodes = []
-    for name in (cs.PROTOBUF_INDEX_FILE, cs.PROTOBUF_NODES_FILE):
-        artifact = index_dir / name
-        if not artifact.is_file():
-            continue
-        index = pb.GraphCodeIndex()
+def _readable_nodes(index_dir: Path) -> Iterator[pb.Node]:
+    for artifact in present_artifacts(index_dir, NODE_ARTIFACTS):
+        # Open eagerly so an unreadable (or symlinked) artifact is skipped
+        # here rather than failing mid-iteration.
         try:
-            with _open_nofollow(artifact) as handle:
-                index.ParseFromString(handle.read())
+            handle = _open_nofollow(artifact)
         except OSError:
             continue
-        nodes.extend(index.nodes)
-    return _coverage_from_nodes(nodes)
+        for record in iter_index_records(
+            artifact, relationships=False, opener=lambda _path, h=handle: h
+        ):
+            assert isinstance(record, pb.Node)
+            yield record
+
+
+def _coverage_summary(index_dir: Path) -> JsonDict:
+    # Nodes stream record by record: coverage needs one pass and no more than
+    # one decoded node at a time, whatever the artifact size.
+    return _coverage_from_nodes(_readable_nodes(index_dir))
 
 
 def _analyzer_version() -> str:
@@ -148,11 +162,10 @@ def build_manifest(
     source: JsonDict,
     capture: JsonDict,
 ) -> JsonDict:
-    joint = (index_dir / cs.PROTOBUF_INDEX_FILE).is_file()
-    split = (index_dir / cs.PROTOBUF_NODES_FILE).is_file()
-    if joint and split:
+    layouts = [name for name in _LAYOUT_MARKERS if (index_dir / name).is_file()]
+    if len(layouts) > 1:
         raise ValueError(
-            "mixed index layouts: both the joint and the split artifacts exist"
+            f"mixed index layouts: artifacts of several layouts exist ({layouts})"
         )
     artifacts = {
         name: {_HASH_ALGORITHM: _sha256(index_dir / name)}
@@ -245,9 +258,9 @@ def _artifact_problem(index_dir: Path, name: str, expected: object) -> str | Non
 
 def _check_artifacts(index_dir: Path, artifacts: dict) -> list[str]:
     problems: list[str] = []
-    if cs.PROTOBUF_INDEX_FILE in artifacts and cs.PROTOBUF_NODES_FILE in artifacts:
+    if sum(name in artifacts for name in _LAYOUT_MARKERS) > 1:
         problems.append(
-            "mixed index layouts: manifest covers both joint and split artifacts"
+            "mixed index layouts: manifest covers artifacts of several layouts"
         )
     for name, hashes in artifacts.items():
         expected = hashes.get(_HASH_ALGORITHM) if isinstance(hashes, dict) else None
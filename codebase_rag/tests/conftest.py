@@ -151,6 +151,14 @@ def assert_no_pass_failures(failures: list[str]) -> None:
     assert not failures, "a per-file pass failed:\n" + "\n".join(failures)
 
 
+@pytest.fixture(autouse=True)
+def _clear_query_embedding_cache() -> None:
+    # Tests patch embed_code with a different vector per test; a query the
+    # process-wide LRU kept from an earlier test would bypass the patch.
+    if (module := sys.modules.get("codebase_rag.query_embedding")) is not None:
+        module.clear_query_embedding_cache()
+
+
 @pytest.fixture(autouse=True)
 def _disable_stack_autostart() -> Generator[None, None, None]:
     from unittest.mock import patch
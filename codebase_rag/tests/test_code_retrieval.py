@@ -7,6 +7,7 @@ import pytest
 
 from codebase_rag.schemas import CodeSnippet
 from codebase_rag.tools.code_retrieval import CodeRetriever, create_code_retrieval_tool
+from codebase_rag.utils.source_extraction import SourceLines
 
 
 class TestCodeRetrieverInit:
@@ -216,6 +217,41 @@ class TestFindCodeSnippet:
         assert params == {"qn": "module.func"}
 
 
+class TestFindCodeSnippets:
+    @pytest.mark.asyncio
+    async def test_reads_each_file_once_and_keeps_order(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        (tmp_path / "mod.py").write_text("def a():\n    pass\ndef b():\n    pass\n")
+        spans = {"m.a": (1, 2), "m.b": (3, 4), "m.c": (3, 9)}
+        ingestor = MagicMock()
+        ingestor.fetch_all.side_effect = lambda _query, params=None: (
+            []
+            if params is None or params["qn"] not in spans
+            else [
+                {
+                    "path": "mod.py",
+                    "start": spans[params["qn"]][0],
+                    "end": spans[params["qn"]][1],
+                }
+            ]
+        )
+        spy = MagicMock(wraps=SourceLines.read_text)
+        monkeypatch.setattr(SourceLines, "read_text", spy)
+        retriever = CodeRetriever(str(tmp_path), ingestor)
+
+        snippets = await retriever.find_code_snippets(["m.b", "m.x", "m.a", "m.c"])
+
+        assert [s.source_code for s in snippets] == [
+            "def b():\n    pass\n",
+            "",
+            "def a():\n    pass\n",
+            "",
+        ]
+        assert [s.found for s in snippets] == [True, False, True, False]
+        assert spy.call_count == 1
+
+
 class TestCreateCodeRetrievalTool:
     def test_creates_tool_with_description(self) -> None:
         mock_retriever = MagicMock(spec=CodeRetriever)
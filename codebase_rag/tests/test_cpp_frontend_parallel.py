@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from codebase_rag.config import settings
+from codebase_rag.parsers.cpp_frontend import (
+    cpp_frontend_available,
+    run_cpp_frontend,
+    run_cpp_frontend_hybrid,
+)
+from codebase_rag.parsers.cpp_frontend import frontend as cpp_frontend
+
+pytestmark = pytest.mark.skipif(
+    not cpp_frontend_available(),
+    reason="libclang not available",
+)
+
+# Translation units parse in worker processes, an include-guarded header is
+# walked once per worker and flag set instead of once per TU, and per-TU facts
+# persist under CGR_HOME so only TUs whose sources or headers changed are
+# reparsed. Every variant must emit exactly what the sequential walk did.
+_COMMON_H = """\
+#ifndef COMMON_H
+#define COMMON_H
+#define TWICE(x) ((x) * 2)
+namespace geo {
+struct Shape { virtual ~Shape() {} virtual int area() const { return 0; } };
+inline int scale(int v) { return TWICE(v); }
+}
+#endif
+"""
+
+_EXTRA_H = """\
+#pragma once
+#include "common.h"
+namespace geo {
+struct Square : Shape { int side = 2; int area() const override { return scale(side); } };
+}
+"""
+
+_UNITS = 10
+_EXTRA_UNITS = 3
+
+
+def _source(i: int) -> str:
+    extra = '#include "extra.h"\n' if i < _EXTRA_UNITS else ""
+    return (
+        f'#include "common.h"\n{extra}'
+        f"int unit{i}(int v) {{ return geo::scale(v) + TWICE({i}); }}\n"
+    )
+
+
+def _write(root: Path) -> None:
+    root.mkdir()
+    (root / "common.h").write_text(_COMMON_H, encoding="utf-8")
+    (root / "extra.h").write_text(_EXTRA_H, encoding="utf-8")
+    commands = []
+    for i in range(_UNITS):
+        source = root / f"unit{i}.cpp"
+        source.write_text(_source(i), encoding="utf-8")
+        commands.append(
+            {
+                "directory": str(root),
+                "arguments": [
+                    "c++",
+                    "-std=c++17",
+                    f"-I{root}",
+                    "-c",
+                    str(source),
+                    "-o",
+                    str(root / f"unit{i}.o"),
+                ],
+                "file": str(source),
+            }
+        )
+    (root / "compile_commands.json").write_text(json.dumps(commands), encoding="utf-8")
+
+
+def _snapshot(ingestor: MagicMock) -> tuple[set[str], set[str]]:
+    nodes = {
+        json.dumps([c.args[0], c.args[1]], sort_keys=True, default=str)
+        for c in ingestor.ensure_node_batch.call_args_list
+    }
+    edges = {
+        json.dumps([c.args[0], c.args[1], c.args[2]], default=str)
+        for c in ingestor.ensure_relationship_batch.call_args_list
+    }
+    return nodes, edges
+
+
+def _index(root: Path) -> tuple[set[str], set[str]]:
+    ingestor = MagicMock()
+    run_cpp_frontend(ingestor, root, "proj", root)
+    return _snapshot(ingestor)
+
+
+@pytest.fixture
+def parsed(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    # In process, so every parse is observable.
+    monkeypatch.setattr(settings, "CPP_FRONTEND_WORKERS", 1)
+    seen: list[str] = []
+    parse = cpp_frontend._TuParser.parse
+
+    def spy(self: cpp_frontend._TuParser, job: cpp_frontend._CompileJob):
+        seen.append(Path(job[1]).name)
+        return parse(self, job)
+
+    monkeypatch.setattr(cpp_frontend._TuParser, "parse", spy)
+    return seen
+
+
+def _sequential(
+    monkeypatch: pytest.MonkeyPatch, root: Path
+) -> tuple[set[str], set[str]]:
+    with monkeypatch.context() as m:
+        m.setattr(settings, "CPP_FRONTEND_WORKERS", 1)
+        m.setattr(settings, "CPP_FRONTEND_SHARE_HEADERS", False)
+        m.setattr(settings, "CPP_FRONTEND_TU_CACHE", False)
+        return _index(root)
+
+
+def test_shared_headers_emit_the_sequential_facts(
+    temp_repo: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    root = temp_repo / "proj"
+    _write(root)
+    expected = _sequential(monkeypatch, root)
+    assert any("geo.Square" in node for node in expected[0])
+
+    monkeypatch.setattr(settings, "CPP_FRONTEND_WORKERS", 1)
+    monkeypatch.setattr(settings, "CPP_FRONTEND_TU_CACHE", False)
+    assert _index(root) == expected
+
+
+def test_worker_pool_emits_the_sequential_facts(
+    temp_repo: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    root = temp_repo / "proj"
+    _write(root)
+    expected = _sequential(monkeypatch, root)
+
+    monkeypatch.setattr(settings, "CPP_FRONTEND_WORKERS", 2)
+    monkeypatch.setattr(settings, "CPP_FRONTEND_TU_CACHE", False)
+    assert _index(root) == expected
+
+
+def test_unchanged_units_are_reused_from_the_cache(
+    temp_repo: Path, monkeypatch: pytest.MonkeyPatch, parsed: list[str]
+) -> None:
+    root = temp_repo / "proj"
+    _write(root)
+    first = _index(root)
+    assert len(parsed) == _UNITS
+
+    parsed.clear()
+    assert _index(root) == first
+    assert parsed == []
+
+
+def test_editing_a_header_reparses_only_its_includers(
+    temp_repo: Path, monkeypatch: pytest.MonkeyPatch, parsed: list[str]
+) -> None:
+    root = temp_repo / "proj"
+    _write(root)
+    _index(root)
+    (root / "extra.h").write_text(
+        _EXTRA_H.replace("int side = 2;", "int side = 3; int perimeter() const;"),
+        encoding="utf-8",
+    )
+
+    parsed.clear()
+    refreshed = _index(root)
+
+    assert sorted(parsed) == [f"unit{i}.cpp" for i in range(_EXTRA_UNITS)]
+    assert refreshed == _sequential(monkeypatch, root)
+
+
+def test_hybrid_cache_is_separate_from_full_mode(
+    temp_repo: Path, monkeypatch: pytest.MonkeyPatch, parsed: list[str]
+) -> None:
+    root = temp_repo / "proj"
+    _write(root)
+    _index(root)
+
+    parsed.clear()
+    macro_calls, _ = run_cpp_frontend_hybrid(MagicMock(), root, "proj", root)
+
+    assert len(parsed) == _UNITS
+    assert {call[2] for call in macro_calls} == {"proj.common.TWICE"}
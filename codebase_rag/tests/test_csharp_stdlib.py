@@ -12,7 +12,7 @@ def _reset_stdlib_cache() -> None:
     # The extractor memoizes (and disk-persists) results; clear so a stale
     # entry from another test or run cannot mask the real resolution.
     se._STDLIB_CACHE.clear()
-    se._CACHE_TIMESTAMPS.clear()
+    se._CACHE_TOOLCHAINS.clear()
 
 
 def _path(fqn: str) -> str:
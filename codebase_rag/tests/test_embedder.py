@@ -39,6 +39,7 @@ def mock_unixcoder() -> MagicMock:
     mock_param = MagicMock()
     mock_param.device = "cpu"
     mock_model.parameters.return_value = iter([mock_param])
+    mock_model.config.pad_token_id = 1
 
     mock_model.tokenize.return_value = [[1, 2, 3, 4, 5]]
 
@@ -230,6 +231,61 @@ def test_get_model_moves_to_mps_when_available(reset_model_cache: None) -> None:
     mock_instance.to.assert_called_once_with("mps")
 
 
+def test_int8_variant_keys_the_cache_apart() -> None:
+    cache = EmbeddingCache()
+    cache.put("def f(): pass", [1.0, 2.0])
+
+    with patch("codebase_rag.embedder.settings.EMBEDDING_CPU_INT8", True):
+        assert cache.get("def f(): pass") is None
+        cache.put("def f(): pass", [3.0, 4.0])
+
+    assert cache.get("def f(): pass") == [1.0, 2.0]
+
+
+@pytest.mark.skipif(not _has_semantic_deps(), reason="torch/transformers not installed")
+def test_select_device_int8_forces_cpu() -> None:
+    from codebase_rag.embedder import (
+        _select_device,  # ty: ignore[possibly-missing-import]
+    )
+
+    with (
+        patch("codebase_rag.embedder.settings.EMBEDDING_CPU_INT8", True),
+        patch(
+            "codebase_rag.embedder.settings.EMBEDDING_DEVICE", cs.EmbeddingDevice.CUDA
+        ),
+        patch("codebase_rag.embedder.torch.cuda.is_available", return_value=True),
+    ):
+        assert _select_device() == cs.EmbeddingDevice.CPU
+
+
+@pytest.mark.skipif(not _has_semantic_deps(), reason="torch/transformers not installed")
+def test_get_model_int8_quantizes_once_then_loads_cached_weights(
+    reset_model_cache: None, tmp_path: Path
+) -> None:
+    from codebase_rag.embedder import get_model  # ty: ignore[possibly-missing-import]
+
+    with (
+        patch("codebase_rag.embedder.settings.EMBEDDING_CPU_INT8", True),
+        patch("codebase_rag.embedder.settings.EMBEDDING_CPU_THREADS", 2),
+        patch("codebase_rag.embedder.settings.QDRANT_DB_PATH", str(tmp_path)),
+        patch("codebase_rag.embedder.UniXcoder") as mock_unixcoder_class,
+        patch("codebase_rag.embedder.torch.ao.quantization.quantize_dynamic") as quant,
+        patch("codebase_rag.embedder.torch.set_num_threads") as set_threads,
+    ):
+        mock_unixcoder_class.return_value.state_dict.return_value = {}
+        get_model()
+        get_model.cache_clear()
+        get_model()
+
+    assert (tmp_path / cs.UNIXCODER_INT8_CACHE_FILENAME).is_file()
+    assert quant.call_count == 2
+    set_threads.assert_called_with(2)
+    assert mock_unixcoder_class.call_args_list[0].kwargs == {"pretrained": True}
+    assert mock_unixcoder_class.call_args_list[1].kwargs == {"pretrained": False}
+    mock_unixcoder_class.return_value.load_state_dict.assert_called_once_with({})
+    mock_unixcoder_class.return_value.to.assert_not_called()
+
+
 @needs_local_weights
 @pytest.mark.slow
 def test_embed_code_integration(reset_model_cache: None) -> None:
@@ -342,14 +398,14 @@ def test_embedding_cache_save_and_load() -> None:
     with tempfile.TemporaryDirectory() as tmpdir:
         cache_path = Path(tmpdir) / "test_cache.json"
         cache = EmbeddingCache(path=cache_path)
-        cache.put("hello", [0.5, 0.6])
+        cache.put("hello", [0.5, 0.625])
         cache.save()
 
         assert cache_path.exists()
 
         cache2 = EmbeddingCache(path=cache_path)
         cache2.load()
-        assert cache2.get("hello") == [0.5, 0.6]
+        assert cache2.get("hello") == [0.5, 0.625]
 
 
 def test_embedding_cache_load_nonexistent_path() -> None:
@@ -446,7 +502,7 @@ def test_embed_code_batch_returns_correct_count(
 
 
 @pytest.mark.skipif(not _has_semantic_deps(), reason="torch/transformers not installed")
-def test_embed_code_batch_uses_padding(
+def test_embed_code_batch_pads_per_length_sorted_batch(
     mock_unixcoder: MagicMock, reset_model_cache: None
 ) -> None:
     import torch
@@ -454,16 +510,21 @@ def test_embed_code_batch_uses_padding(
     from codebase_rag.embedder import embed_code_batch
 
     snippets = ["short", "longer code here"]
-    mock_unixcoder.tokenize.return_value = [[1, 2, 3, 0, 0], [1, 2, 3, 4, 5]]
-    mock_embedding = torch.zeros(2, 768)
-    mock_unixcoder.return_value = (torch.zeros(2, 5, 768), mock_embedding)
+    mock_unixcoder.tokenize.return_value = [[0, 7, 2], [0, 7, 8, 9, 2]]
+
+    def forward(tensor: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor]:
+        lengths = tensor.ne(1).sum(-1, keepdim=True).float()
+        return torch.zeros(*tensor.shape, 768), lengths.expand(-1, 768)
+
+    mock_unixcoder.side_effect = forward
 
     with patch("codebase_rag.embedder.get_model", return_value=mock_unixcoder):
-        embed_code_batch(snippets)
+        results = embed_code_batch(snippets)
 
-    mock_unixcoder.tokenize.assert_called_once_with(
-        snippets, max_length=512, padding=True
-    )
+    mock_unixcoder.tokenize.assert_called_once_with(snippets, max_length=512)
+    (tensor,), _ = mock_unixcoder.call_args
+    assert tensor.tolist() == [[0, 7, 8, 9, 2], [0, 7, 2, 1, 1]]
+    assert [row[0] for row in results] == [3.0, 5.0]
 
 
 @pytest.mark.skipif(not _has_semantic_deps(), reason="torch/transformers not installed")
@@ -503,7 +564,7 @@ def test_embed_code_batch_partial_cache(
 
     assert results[0] == [1.0] * 768
     assert results[1] == [3.0] * 768
-    mock_unixcoder.tokenize.assert_called_once_with(["b"], max_length=512, padding=True)
+    mock_unixcoder.tokenize.assert_called_once_with(["b"], max_length=512)
 
 
 @pytest.mark.skipif(not _has_semantic_deps(), reason="torch/transformers not installed")
@@ -535,8 +596,8 @@ def test_embed_code_batch_respects_batch_size(
 
     snippets = [f"def f{i}(): pass" for i in range(5)]
 
-    def side_effect_tokenize(batch: list[str], **kwargs: int | bool) -> list[list[int]]:
-        return [[1, 2, 3]] * len(batch)
+    def side_effect_tokenize(batch: list[str], **kwargs: int) -> list[list[int]]:
+        return [[0, 5, 2]] * len(batch)
 
     mock_unixcoder.tokenize.side_effect = side_effect_tokenize
 
@@ -550,7 +611,26 @@ def test_embed_code_batch_respects_batch_size(
         results = embed_code_batch(snippets, batch_size=2)
 
     assert len(results) == 5
-    assert mock_unixcoder.tokenize.call_count == 3
+    assert mock_unixcoder.tokenize.call_count == 1
+    assert mock_unixcoder.call_count == 3
+
+
+@pytest.mark.parametrize(
+    ("lengths", "budget", "max_rows", "expected"),
+    [
+        ([3, 9, 5, 9], 100, 64, [[1, 3, 2, 0]]),
+        ([3, 9, 5, 9], 18, 64, [[1, 3], [2, 0]]),
+        ([3, 9, 5, 9], 100, 3, [[1, 3, 2], [0]]),
+        ([40, 4], 16, 64, [[0], [1]]),
+        ([], 16, 64, []),
+    ],
+)
+def test_plan_token_batches_sorts_and_respects_budget(
+    lengths: list[int], budget: int, max_rows: int, expected: list[list[int]]
+) -> None:
+    from codebase_rag.embedder import _plan_token_batches
+
+    assert _plan_token_batches(lengths, budget, max_rows) == expected
 
 
 def test_embed_code_batch_raises_without_dependencies() -> None:
@@ -574,13 +654,180 @@ def test_embedding_cache_persistence_roundtrip() -> None:
         cache_path = Path(tmpdir) / "subdir" / "cache.json"
 
         cache1 = EmbeddingCache(path=cache_path)
-        cache1.put("fn_a", [0.1, 0.2])
-        cache1.put("fn_b", [0.3, 0.4])
+        cache1.put("fn_a", [0.125, 0.25])
+        cache1.put("fn_b", [0.375, 0.5])
         cache1.save()
 
         cache2 = EmbeddingCache(path=cache_path)
         cache2.load()
-        assert cache2.get("fn_a") == [0.1, 0.2]
-        assert cache2.get("fn_b") == [0.3, 0.4]
+        assert cache2.get("fn_a") == [0.125, 0.25]
+        assert cache2.get("fn_b") == [0.375, 0.5]
         assert cache2.get("fn_c") is None
         assert len(cache2) == 2
+
+
+# The cache file is append-only binary: saves write only new rows, loads
+# index offsets without decoding vectors, stale rows are compacted away.
+def test_embedding_cache_save_appends_only_new_rows(tmp_path: Path) -> None:
+    cache_path = tmp_path / "cache.bin"
+    cache = EmbeddingCache(path=cache_path)
+    cache.put("a", [0.5] * 8)
+    cache.save()
+    first = cache_path.read_bytes()
+    cache.put("b", [0.25] * 8)
+    cache.save()
+    second = cache_path.read_bytes()
+    assert second.startswith(first)
+    assert len(second) - len(first) == len(first) - len(cs.EMBEDDING_CACHE_MAGIC) - 8
+
+    reloaded = EmbeddingCache(path=cache_path)
+    reloaded.load()
+    assert len(reloaded) == 2
+    assert reloaded.get("b") == [0.25] * 8
+    reloaded.close()
+    cache.close()
+
+
+def test_embedding_cache_float32_rounds_and_float16_halves(tmp_path: Path) -> None:
+    values = [0.1, -0.2, 0.3]
+    sizes = {}
+    for dtype in (cs.EmbeddingCacheDtype.FLOAT32, cs.EmbeddingCacheDtype.FLOAT16):
+        cache_path = tmp_path / f"{dtype}.bin"
+        with patch("codebase_rag.embedder.settings.EMBEDDING_CACHE_DTYPE", dtype):
+            cache = EmbeddingCache(path=cache_path)
+            cache.put("x", [v * 1000 for v in values] * 64)
+            cache.save()
+        reloaded = EmbeddingCache(path=cache_path)
+        reloaded.load()
+        stored = reloaded.get("x")
+        assert stored is not None
+        assert stored[:3] == pytest.approx([100.0, -200.0, 300.0], rel=1e-3)
+        sizes[dtype] = cache_path.stat().st_size
+        reloaded.close()
+        cache.close()
+    assert sizes[cs.EmbeddingCacheDtype.FLOAT16] < sizes[cs.EmbeddingCacheDtype.FLOAT32]
+
+
+def test_embedding_cache_int8_quarters_rows_within_a_step(tmp_path: Path) -> None:
+    embedding = [((i * 37) % 101 - 50) / 50 for i in range(768)]
+    sizes = {}
+    for dtype in (cs.EmbeddingCacheDtype.FLOAT32, cs.EmbeddingCacheDtype.INT8):
+        cache_path = tmp_path / f"{dtype}.bin"
+        with patch("codebase_rag.embedder.settings.EMBEDDING_CACHE_DTYPE", dtype):
+            cache = EmbeddingCache(path=cache_path)
+            cache.put("x", embedding)
+            cache.put("zero", [0.0] * 4)
+            cache.save()
+            cache.close()
+        reloaded = EmbeddingCache(path=cache_path)
+        reloaded.load()
+        stored = reloaded.get("x")
+        assert stored is not None
+        # One quantization step is max|x| / 127; rounding stays within half.
+        assert stored == pytest.approx(embedding, abs=0.5 / 127 + 1e-6)
+        assert reloaded.get("zero") == [0.0] * 4
+        sizes[dtype] = cache_path.stat().st_size
+        reloaded.close()
+    assert (
+        sizes[cs.EmbeddingCacheDtype.INT8] * 3.5 < sizes[cs.EmbeddingCacheDtype.FLOAT32]
+    )
+
+
+def test_embedding_cache_compacts_stale_rows(tmp_path: Path) -> None:
+    cache_path = tmp_path / "cache.bin"
+    cache = EmbeddingCache(path=cache_path)
+    cache.put("a", [1.0, 2.0])
+    cache.save()
+    single = cache_path.stat().st_size
+    cache.put("a", [3.0, 4.0])
+    cache.save()
+    assert cache_path.stat().st_size > single
+    cache.put("a", [5.0, 6.0])
+    cache.save()
+    assert cache_path.stat().st_size == single
+    assert cache.get("a") == [5.0, 6.0]
+    cache.put("a", [3.0, 4.0])
+    cache.save()
+    assert cache.get("a") == [3.0, 4.0]
+    cache.close()
+
+
+def test_embedding_cache_drops_torn_tail_and_migrates_json(tmp_path: Path) -> None:
+    import json
+
+    legacy = tmp_path / cs.LEGACY_EMBEDDING_CACHE_FILENAME
+    key = EmbeddingCache._content_hash("old")
+    legacy.write_text(json.dumps({key.hex(): [0.5, 1.5]}), encoding="utf-8")
+    cache_path = tmp_path / cs.EMBEDDING_CACHE_FILENAME
+    cache = EmbeddingCache(path=cache_path)
+    cache.load()
+    assert cache.get("old") == [0.5, 1.5]
+    cache.put("new", [2.5, 3.5])
+    cache.save()
+    cache.close()
+    assert not legacy.exists()
+
+    with cache_path.open("ab") as f:
+        f.write(b"\x01" * 20)
+    reloaded = EmbeddingCache(path=cache_path)
+    reloaded.load()
+    assert len(reloaded) == 2
+    reloaded.put("later", [4.5])
+    reloaded.save()
+    reloaded.close()
+    again = EmbeddingCache(path=cache_path)
+    again.load()
+    assert again.get("later") == [4.5]
+    assert again.get("old") == [0.5, 1.5]
+    again.close()
+
+
+def test_embedding_cache_loads_offsets_from_the_sidecar_index(tmp_path: Path) -> None:
+    cache_path = tmp_path / "cache.bin"
+    sidecar = tmp_path / f"cache.bin{cs.EMBEDDING_CACHE_INDEX_SUFFIX}"
+    cache = EmbeddingCache(path=cache_path)
+    cache.put("a", [1.0, 2.0])
+    cache.put("z", [0.5])
+    cache.save()
+    covered = sidecar.read_bytes()
+    cache.put("b", [3.0, 4.0])
+    cache.save()
+    cache.close()
+    # A crash between the append and the sidecar write leaves an older
+    # sidecar; the rows past its coverage are scanned.
+    sidecar.write_bytes(covered)
+    # Scrambling the first record's key shows its offset came from the
+    # sidecar rather than a scan of the data file.
+    with cache_path.open("r+b") as f:
+        f.seek(len(cs.EMBEDDING_CACHE_MAGIC) + 8)
+        f.write(b"\xff" * 32)
+
+    reloaded = EmbeddingCache(path=cache_path)
+    reloaded.load()
+    assert reloaded.get("a") == [1.0, 2.0]
+    assert reloaded.get("b") == [3.0, 4.0]
+    assert len(reloaded) == 3
+    reloaded.close()
+
+
+def test_embedding_cache_rescans_when_the_sidecar_is_stale(tmp_path: Path) -> None:
+    cache_path = tmp_path / "cache.bin"
+    sidecar = tmp_path / f"cache.bin{cs.EMBEDDING_CACHE_INDEX_SUFFIX}"
+    cache = EmbeddingCache(path=cache_path)
+    cache.put("a", [1.0, 2.0])
+    cache.put("b", [3.0, 4.0])
+    cache.save()
+    old = sidecar.read_bytes()
+    cache.clear()
+    cache.put("c", [5.0, 6.0])
+    cache.put("d", [7.0, 8.0])
+    cache.save()
+    cache.close()
+    sidecar.write_bytes(old)
+
+    reloaded = EmbeddingCache(path=cache_path)
+    reloaded.load()
+    assert reloaded.get("a") is None
+    assert reloaded.get("c") == [5.0, 6.0]
+    assert len(reloaded) == 2
+    reloaded.close()
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import json
+import threading
+import time
 from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch
 
 import httpx
 import pytest
 
 from codebase_rag import constants as cs
+from codebase_rag import embedder
 from codebase_rag.config import AppConfig, settings
 from codebase_rag.embedder import clear_embedding_cache
 
@@ -362,3 +366,130 @@ def test_openai_batch_mixes_cache_hits_and_misses(openai_provider: None) -> None
 
     assert second[0] == first[0]
     assert handler.requests[1]["input"] == ["def c(): pass"]
+
+
+def test_openai_batches_are_packed_by_token_budget(
+    openai_provider: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from codebase_rag.embedder import embed_code_batch
+
+    # 40 characters is about 11 estimated tokens; three fit under 35.
+    monkeypatch.setattr(settings, "OPENAI_EMBEDDING_TOKEN_BUDGET", 35)
+    monkeypatch.setattr(settings, "OPENAI_EMBEDDING_CONCURRENCY", 1)
+    handler = RecordingHandler()
+    snippets = [f"{i:02d}".ljust(40, "x") for i in range(7)]
+    with patch(
+        "codebase_rag.embedder._openai_client", side_effect=lambda: _client_for(handler)
+    ):
+        embed_code_batch(snippets)
+
+    assert [req["input"] for req in handler.requests] == [
+        snippets[0:3],
+        snippets[3:6],
+        snippets[6:7],
+    ]
+
+
+def test_openai_429_backs_off_for_the_advertised_delay(
+    openai_provider: None,
+) -> None:
+    from codebase_rag.embedder import embed_code_batch
+
+    handler = RecordingHandler()
+    answers = iter(
+        [httpx.Response(429, headers={"retry-after-ms": "20"}, text="slow down")]
+    )
+
+    def throttled(request: httpx.Request) -> httpx.Response:
+        return next(answers, None) or handler(request)
+
+    client = httpx.Client(
+        transport=httpx.MockTransport(throttled), base_url="http://embeddings.test/v1"
+    )
+    with (
+        patch("codebase_rag.embedder._openai_client", return_value=client),
+        patch.object(
+            embedder._OpenAIRateLimiter, "pause", autospec=True, side_effect=None
+        ) as pause,
+    ):
+        assert embed_code_batch(["def a(): pass"]) == [[1.0] * 4]
+
+    assert pause.call_args.args[1] == pytest.approx(0.02)
+
+
+def test_openai_rate_limit_headers_pause_before_quota_runs_out() -> None:
+    response = httpx.Response(
+        200,
+        headers={
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "1m2.5s",
+            "x-ratelimit-remaining-tokens": "10",
+            "x-ratelimit-reset-tokens": "9h",
+        },
+    )
+    assert embedder._rate_limit_delay(response) == pytest.approx(62.5)
+    assert embedder._rate_limit_delay(httpx.Response(200)) is None
+
+
+class _StubEmbeddingServer(ThreadingHTTPServer):
+    # A real local endpoint: each request sleeps briefly so overlapping
+    # requests are observable, and the peak in-flight count is recorded.
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _StubEmbeddingHandler)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+
+class _StubEmbeddingHandler(BaseHTTPRequestHandler):
+    server: _StubEmbeddingServer
+
+    def do_POST(self) -> None:
+        with self.server.lock:
+            self.server.in_flight += 1
+            self.server.peak = max(self.server.peak, self.server.in_flight)
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(0.05)
+        body = json.dumps(
+            {
+                "data": [
+                    {"index": i, "embedding": [float(len(text))]}
+                    for i, text in enumerate(payload["input"])
+                ]
+            }
+        ).encode()
+        with self.server.lock:
+            self.server.in_flight -= 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def test_openai_requests_overlap_against_a_local_server(
+    openai_provider: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from codebase_rag.embedder import embed_code_batch
+
+    server = _StubEmbeddingServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        monkeypatch.setattr(
+            settings, "OPENAI_EMBEDDING_BASE_URL", f"http://{host}:{port}/v1"
+        )
+        monkeypatch.setattr(settings, "OPENAI_EMBEDDING_BATCH_SIZE", 1)
+        monkeypatch.setattr(settings, "OPENAI_EMBEDDING_CONCURRENCY", 3)
+        snippets = ["x" * n for n in range(1, 10)]
+
+        assert embed_code_batch(snippets) == [[float(n)] for n in range(1, 10)]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert 1 < server.peak <= 3
@@ -0,0 +1,85 @@
+# Pass 4's extract/embed/store stages run concurrently over bounded queues;
+# results, failure handling and reconciliation ids match the serial loop.
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from codebase_rag import constants as cs
+from codebase_rag.embedding_pipeline import EmbeddingPoint, run_embedding_pipeline
+
+
+def _extract(row: int) -> tuple[int, str, str] | None:
+    return None if row % 3 == 0 else (row, f"q{row}", f"src{row}")
+
+
+def _embed(snippets: list[str]) -> list[list[float]]:
+    return [[float(len(s))] for s in snippets]
+
+
+def test_stores_every_extracted_row_in_batches() -> None:
+    stored: list[list[EmbeddingPoint]] = []
+
+    def store(points: list[EmbeddingPoint]) -> int:
+        stored.append(points)
+        return len(points)
+
+    result = run_embedding_pipeline(
+        range(10), _extract, _embed, store, batch_size=2, depth=1
+    )
+
+    assert [len(batch) for batch in stored] == [2, 2, 2]
+    assert [point[0] for batch in stored for point in batch] == [1, 2, 4, 5, 7, 8]
+    assert stored[0][0] == (1, [4.0], "q1")
+    assert result.stored == 6
+    assert result.expected_ids == {1, 2, 4, 5, 7, 8}
+    assert [(s.stage, s.items) for s in result.stages] == [
+        (cs.EmbeddingStage.EXTRACT, 6),
+        (cs.EmbeddingStage.EMBED, 6),
+        (cs.EmbeddingStage.STORE, 6),
+    ]
+
+
+def test_failed_inference_batch_is_dropped_and_the_rest_continue() -> None:
+    def embed(snippets: list[str]) -> list[list[float]]:
+        if "src1" in snippets:
+            raise RuntimeError("model failed")
+        return _embed(snippets)
+
+    result = run_embedding_pipeline(
+        range(10), _extract, embed, len, batch_size=2, depth=1
+    )
+
+    assert result.expected_ids == {4, 5, 7, 8}
+    assert result.stored == 4
+
+
+def test_store_error_stops_the_pipeline_and_propagates() -> None:
+    def store(points: list[EmbeddingPoint]) -> int:
+        raise ConnectionError("vector store down")
+
+    with pytest.raises(ConnectionError):
+        run_embedding_pipeline(
+            range(1000), _extract, _embed, store, batch_size=2, depth=1
+        )
+
+
+def test_extraction_overlaps_inference() -> None:
+    second_batch_extracted = threading.Event()
+
+    def extract(row: int) -> tuple[int, str, str]:
+        if row == 2:
+            second_batch_extracted.set()
+        return row, f"q{row}", "src"
+
+    overlapped: list[bool] = []
+
+    def embed(snippets: list[str]) -> list[list[float]]:
+        if not overlapped:
+            overlapped.append(second_batch_extracted.wait(timeout=5))
+        return _embed(snippets)
+
+    run_embedding_pipeline(range(4), extract, embed, len, batch_size=2, depth=1)
+
+    assert overlapped == [True]
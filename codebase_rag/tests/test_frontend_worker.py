@@ -0,0 +1,170 @@
+"""The persistent frontend worker: versioned JSON lines over stdin/stdout,
+warm state across requests, and in-process fallback when the worker fails."""
+
+from __future__ import annotations
+
+import io
+import json
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+import pytest
+
+from codebase_rag import constants as cs
+from codebase_rag.config import settings
+from codebase_rag.parsers.frontends import (
+    FRONTENDS,
+    IncrementalFacts,
+    PersistentFrontend,
+    ResolvedCallSite,
+    SemanticFacts,
+)
+from codebase_rag.parsers.frontends.python import PythonJediFrontend
+from codebase_rag.parsers.frontends.worker import (
+    FrontendWorkerClient,
+    FrontendWorkerError,
+    decode_facts,
+    encode_facts,
+    serve,
+)
+
+
+def _facts() -> SemanticFacts:
+    return SemanticFacts(
+        resolved_call_sites={
+            ("a.py", 5, 4, "f"): ResolvedCallSite("f", "pkg/impl.py", 1, 0)
+        },
+        external_sites={("a.py", 6, 7, "getenv")},
+    )
+
+
+class _FakeFrontend:
+    language = cs.SupportedLanguage.PYTHON
+
+    def available(self) -> bool:
+        return True
+
+    def applies(self, repo_path: Path) -> bool:
+        return True
+
+    def run(self, repo_path: Path, files: Sequence[Path]) -> SemanticFacts:
+        return _facts()
+
+    def run_incremental(
+        self, repo_path: Path, files: Sequence[Path], changed: Sequence[Path]
+    ) -> IncrementalFacts:
+        return IncrementalFacts(_facts(), frozenset(str(p) for p in changed))
+
+
+def _serve(*requests: dict) -> list[dict]:
+    stdin = io.StringIO("".join(json.dumps(r) + "\n" for r in requests))
+    stdout = io.StringIO()
+    serve(_FakeFrontend(), stdin, stdout)
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+def test_facts_round_trip_through_the_wire_format() -> None:
+    assert decode_facts(json.loads(json.dumps(encode_facts(_facts())))) == _facts()
+
+
+def test_worker_answers_each_request_in_the_versioned_schema() -> None:
+    params = {"repo_path": "/r", "files": ["/r/a.py"], "changed": ["a.py"]}
+    ready, run, refresh, stale, done = _serve(
+        {"protocol": 1, "id": 1, "method": "run", "params": params},
+        {"protocol": 1, "id": 2, "method": "refresh", "params": params},
+        {"protocol": 0, "id": 3, "method": "run", "params": params},
+        {"protocol": 1, "id": 4, "method": "shutdown", "params": {}},
+        {"protocol": 1, "id": 5, "method": "run", "params": params},
+    )
+    assert ready == {"protocol": 1, "ready": True, "language": "python"}
+    assert decode_facts(run["facts"]) == _facts()
+    assert refresh["refreshed_files"] == ["a.py"]
+    assert stale["id"] == 3 and "protocol mismatch" in stale["error"]
+    assert done == {"protocol": 1, "id": 4}
+
+
+def test_client_reports_a_worker_that_dies(tmp_path: Path) -> None:
+    client = FrontendWorkerClient([sys.executable, "-c", "pass"])
+    with pytest.raises(FrontendWorkerError):
+        client.run(tmp_path, [])
+
+
+# Announces itself, then never answers.
+_HUNG_WORKER = (
+    "import json, sys, time\n"
+    "print(json.dumps({'protocol': 1, 'ready': True, 'language': 'python'}))\n"
+    "sys.stdout.flush()\n"
+    "time.sleep(60)\n"
+)
+
+
+def test_client_kills_a_worker_that_stops_answering(tmp_path: Path) -> None:
+    client = FrontendWorkerClient([sys.executable, "-c", _HUNG_WORKER], timeout=0.5)
+    with pytest.raises(FrontendWorkerError, match="did not answer"):
+        client.run(tmp_path, [])
+    assert client._process is None
+
+
+def test_hung_worker_degrades_to_in_process(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pytest.importorskip("jedi")
+    monkeypatch.setattr(settings, "PYTHON_FRONTEND_WORKER", True)
+    (tmp_path / "a.py").write_text("import os\n\n\ndef f():\n    os.getenv('X')\n")
+    frontend = PythonJediFrontend()
+    frontend._client = FrontendWorkerClient(
+        [sys.executable, "-c", _HUNG_WORKER], timeout=0.5
+    )
+
+    facts = frontend.run(tmp_path, [tmp_path / "a.py"])
+
+    assert ("a.py", 5, 7, "getenv") in facts.external_sites
+
+
+def test_python_frontend_is_persistent() -> None:
+    assert isinstance(FRONTENDS[cs.SupportedLanguage.PYTHON], PersistentFrontend)
+
+
+def test_failed_worker_degrades_to_in_process(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pytest.importorskip("jedi")
+    monkeypatch.setattr(settings, "PYTHON_FRONTEND_WORKER", True)
+    (tmp_path / "a.py").write_text("import os\n\n\ndef f():\n    os.getenv('X')\n")
+    frontend = PythonJediFrontend()
+    frontend._client = FrontendWorkerClient([sys.executable, "-c", "pass"])
+
+    facts = frontend.run(tmp_path, [tmp_path / "a.py"])
+
+    assert ("a.py", 5, 7, "getenv") in facts.external_sites
+
+
+def test_jedi_worker_stays_warm_across_requests(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pytest.importorskip("jedi")
+    # The worker is a separate process: isolate its caches through the env.
+    monkeypatch.setenv("CGR_HOME", str(tmp_path / "cgr-home"))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg-cache"))
+    monkeypatch.setattr(settings, "PYTHON_FRONTEND_WORKER", True)
+    repo = tmp_path / "proj"
+    (repo / "pkg").mkdir(parents=True)
+    (repo / "pkg/__init__.py").write_text("from .impl import f\n")
+    (repo / "pkg/impl.py").write_text("def f():\n    return 1\n")
+    (repo / "caller.py").write_text("from pkg import f\n\n\ndef use():\n    f()\n")
+    (repo / "lone.py").write_text("def g():\n    return 2\n")
+    files = sorted(repo.rglob("*.py"))
+    frontend = PythonJediFrontend()
+    try:
+        facts = frontend.run(repo, files)
+        assert ("caller.py", 5, 4, "f") in facts.resolved_call_sites
+
+        (repo / "pkg/impl.py").write_text("\n\ndef f():\n    return 1\n")
+        result = frontend.run_incremental(repo, files, [repo / "pkg/impl.py"])
+    finally:
+        frontend.stop()
+
+    assert result.refreshed_files == {"pkg/impl.py", "pkg/__init__.py", "caller.py"}
+    target = result.facts.resolved_call_sites[("caller.py", 5, 4, "f")]
+    assert target.target_line == 3
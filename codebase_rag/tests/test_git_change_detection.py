@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from codebase_rag import constants as cs
+from codebase_rag.config import settings
+from codebase_rag.graph_updater import GraphUpdater
+from codebase_rag.parser_loader import load_parsers
+
+# With CGR_GIT_CHANGE_DETECTION an incremental run asks git which paths can
+# differ from the last indexed state instead of stat-ing the whole tree.
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-C", str(repo), *args],
+        check=True,
+        capture_output=True,
+        env={
+            **os.environ,
+            "GIT_AUTHOR_NAME": "t",
+            "GIT_AUTHOR_EMAIL": "t@example.com",
+            "GIT_COMMITTER_NAME": "t",
+            "GIT_COMMITTER_EMAIL": "t@example.com",
+            "GIT_CONFIG_GLOBAL": "/dev/null",
+            "GIT_CONFIG_NOSYSTEM": "1",
+        },
+    )
+
+
+@pytest.fixture(autouse=True)
+def git_detection(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "GIT_CHANGE_DETECTION", True)
+
+
+@pytest.fixture
+def repo(temp_repo: Path) -> Path:
+    (temp_repo / "pkg").mkdir()
+    (temp_repo / "pkg" / "__init__.py").touch()
+    (temp_repo / "pkg" / "a.py").write_text("def a():\n    pass\n")
+    (temp_repo / "pkg" / "b.py").write_text("def b():\n    pass\n")
+    (temp_repo / ".gitignore").write_text(".cgr-*\n")
+    _git(temp_repo, "init", "-q")
+    _git(temp_repo, "add", "-A")
+    _git(temp_repo, "commit", "-q", "-m", "init")
+    return temp_repo
+
+
+def _updater(repo: Path, ingestor: MagicMock) -> GraphUpdater:
+    parsers, queries = load_parsers()
+    return GraphUpdater(
+        ingestor=ingestor, repo_path=repo, parsers=parsers, queries=queries
+    )
+
+
+def _run(repo: Path, ingestor: MagicMock) -> list[Path]:
+    updater = _updater(repo, ingestor)
+    with patch.object(
+        updater, "_process_single_file", wraps=updater._process_single_file
+    ) as spy:
+        updater.run()
+    return [call.args[0] for call in spy.call_args_list]
+
+
+def _state(repo: Path) -> dict:
+    return json.loads((repo / cs.GIT_INDEX_STATE_FILENAME).read_text())
+
+
+def test_first_run_records_a_complete_state(
+    repo: Path, mock_ingestor: MagicMock
+) -> None:
+    _run(repo, mock_ingestor)
+
+    state = _state(repo)
+    assert state[cs.GIT_STATE_KEY_COMPLETE] is True
+    assert state[cs.GIT_STATE_KEY_DIRTY] == []
+
+
+def test_unchanged_files_are_not_stat_ed(repo: Path, mock_ingestor: MagicMock) -> None:
+    _run(repo, mock_ingestor)
+    (repo / "pkg" / "a.py").write_text("def a():\n    return 1\n")
+
+    updater = _updater(repo, mock_ingestor)
+    with (
+        patch.object(updater, "_collect_eligible_files") as walk,
+        patch.object(
+            updater, "_process_single_file", wraps=updater._process_single_file
+        ) as spy,
+    ):
+        updater.run()
+
+    walk.assert_not_called()
+    assert [call.args[0] for call in spy.call_args_list] == [repo / "pkg" / "a.py"]
+    assert _state(repo)[cs.GIT_STATE_KEY_DIRTY] == ["pkg/a.py"]
+
+
+def test_commits_since_the_last_run_are_picked_up(
+    repo: Path, mock_ingestor: MagicMock
+) -> None:
+    _run(repo, mock_ingestor)
+    (repo / "pkg" / "c.py").write_text("def c():\n    pass\n")
+    (repo / "pkg" / "b.py").unlink()
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "second")
+
+    processed = _run(repo, mock_ingestor)
+
+    assert processed == [repo / "pkg" / "c.py"]
+    hashes = json.loads((repo / cs.HASH_CACHE_FILENAME).read_text())
+    assert "pkg/b.py" not in hashes
+    assert "pkg/c.py" in hashes
+
+
+def test_reverted_edit_is_reindexed(repo: Path, mock_ingestor: MagicMock) -> None:
+    # The edited bytes were indexed but never committed; reverting makes the
+    # tree clean again, so only the recorded dirty set still names the file.
+    original = (repo / "pkg" / "a.py").read_text()
+    _run(repo, mock_ingestor)
+    (repo / "pkg" / "a.py").write_text("def a():\n    return 2\n")
+    _run(repo, mock_ingestor)
+    (repo / "pkg" / "a.py").write_text(original)
+
+    assert _run(repo, mock_ingestor) == [repo / "pkg" / "a.py"]
+
+
+def test_in_sync_fast_path_uses_git(repo: Path, mock_ingestor: MagicMock) -> None:
+    _run(repo, mock_ingestor)
+
+    assert _updater(repo, mock_ingestor)._is_already_in_sync() is True
+    (repo / "pkg" / "b.py").write_text("def b():\n    return 3\n")
+    assert _updater(repo, mock_ingestor)._is_already_in_sync() is False
+
+
+def test_ignored_eligible_file_forces_the_walk(
+    repo: Path, mock_ingestor: MagicMock
+) -> None:
+    (repo / ".git" / "info" / "exclude").write_text("pkg/b.py\n")
+    _git(repo, "rm", "-q", "--cached", "pkg/b.py")
+    _git(repo, "commit", "-q", "-m", "untrack")
+    _run(repo, mock_ingestor)
+    assert _state(repo)[cs.GIT_STATE_KEY_COMPLETE] is False
+
+    (repo / "pkg" / "b.py").write_text("def b():\n    return 4\n")
+
+    assert repo / "pkg" / "b.py" in _run(repo, mock_ingestor)
+
+
+def test_gitignore_change_forces_the_walk(repo: Path, mock_ingestor: MagicMock) -> None:
+    _run(repo, mock_ingestor)
+    (repo / ".gitignore").write_text(".cgr-*\nbuild/\n")
+
+    updater = _updater(repo, mock_ingestor)
+    with patch.object(
+        updater, "_collect_eligible_files", wraps=updater._collect_eligible_files
+    ) as walk:
+        updater.run()
+
+    walk.assert_called_once()
+
+
+def test_outside_a_repository_the_walk_is_used(
+    temp_repo: Path, mock_ingestor: MagicMock
+) -> None:
+    (temp_repo / "a.py").write_text("def a():\n    pass\n")
+    with patch.dict("os.environ", {"GIT_CEILING_DIRECTORIES": str(temp_repo.parent)}):
+        _run(temp_repo, mock_ingestor)
+
+    assert not (temp_repo / cs.GIT_INDEX_STATE_FILENAME).exists()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from codebase_rag.graph_columnar import (
+    ColumnarGraphLoader,
+    convert_graph_file,
+    is_columnar_graph,
+    write_columnar_graph,
+)
+from codebase_rag.graph_loader import GraphLoader, load_graph
+from codebase_rag.tests.test_graph_loader import create_test_graph
+
+
+@pytest.fixture
+def graph_files(tmp_path: Path) -> tuple[Path, Path]:
+    json_path = tmp_path / "graph.json"
+    json_path.write_text(json.dumps(create_test_graph()), encoding="utf-8")
+    columnar_path = tmp_path / "graph.cgrg"
+    convert_graph_file(json_path, columnar_path)
+    return json_path, columnar_path
+
+
+def test_load_graph_detects_the_columnar_format(
+    graph_files: tuple[Path, Path],
+) -> None:
+    json_path, columnar_path = graph_files
+    assert is_columnar_graph(columnar_path)
+    assert not is_columnar_graph(json_path)
+    assert isinstance(load_graph(str(columnar_path)), ColumnarGraphLoader)
+    assert isinstance(load_graph(str(json_path)), GraphLoader)
+
+
+def test_queries_match_the_json_loader(graph_files: tuple[Path, Path]) -> None:
+    json_path, columnar_path = graph_files
+    expected = load_graph(str(json_path))
+    columnar = load_graph(str(columnar_path))
+    assert columnar.summary() == expected.summary()
+    assert columnar.metadata == expected.metadata
+    assert columnar.relationships == expected.relationships
+    assert columnar.nodes == sorted(expected.nodes, key=lambda n: n.node_id)
+    for node_id in range(6):
+        assert columnar.get_node_by_id(node_id) == expected.get_node_by_id(node_id)
+        assert columnar.get_outgoing_relationships(
+            node_id
+        ) == expected.get_outgoing_relationships(node_id)
+        assert columnar.get_incoming_relationships(
+            node_id
+        ) == expected.get_incoming_relationships(node_id)
+    for label in ("Function", "Class", "Module", "Missing"):
+        assert columnar.find_nodes_by_label(label) == expected.find_nodes_by_label(
+            label
+        )
+
+
+def test_property_lookup_uses_the_interned_index(
+    graph_files: tuple[Path, Path],
+) -> None:
+    _json_path, columnar_path = graph_files
+    loader = ColumnarGraphLoader(columnar_path)
+    assert [n.node_id for n in loader.find_node_by_property("name", "foo")] == [1]
+    assert loader.find_node_by_property("name", "nope") == []
+    assert loader.find_node_by_property("missing_key", "foo") == []
+    assert [n.node_id for n in loader.find_node_by_property("path", "mod.py")] == [4]
+
+
+def test_typed_and_null_properties_round_trip(tmp_path: Path) -> None:
+    data = create_test_graph()
+    data["nodes"][0]["properties"].update(
+        {"start_line": 3, "is_exported": True, "decorators": ["@a"], "doc": None}
+    )
+    out = tmp_path / "graph.cgrg"
+    write_columnar_graph(data, out)
+    loader = ColumnarGraphLoader(out)
+    node = loader.get_node_by_id(1)
+    assert node is not None
+    assert node.properties["start_line"] == 3
+    assert node.properties["is_exported"] is True
+    assert node.properties["decorators"] == ["@a"]
+    assert node.properties["doc"] is None
+    assert loader.find_node_by_property("start_line", 3) == [node]
+    assert loader.find_node_by_property("doc", None) == []
+
+
+def test_rejects_a_non_columnar_file(graph_files: tuple[Path, Path]) -> None:
+    json_path, _columnar_path = graph_files
+    with pytest.raises(ValueError, match="Not a columnar graph file"):
+        ColumnarGraphLoader(json_path).load()
+
+
+def test_close_releases_the_mapping(graph_files: tuple[Path, Path]) -> None:
+    _json_path, columnar_path = graph_files
+    loader = ColumnarGraphLoader(columnar_path)
+    assert loader.find_nodes_by_label("Class")
+    loader.close()
+    assert [n.node_id for n in loader.find_nodes_by_label("Class")] == [3]
@@ -155,3 +155,85 @@ def test_bool_flip_reports_declared_defaults_not_null(tmp_path: Path) -> None:
     assert flips
     for flip in flips:
         assert flip == {"old": False, "new": True}
+
+
+def test_stream_events_fold_into_the_report(tmp_path: Path) -> None:
+    from codebase_rag.services.graph_diff import iter_diff
+
+    repo_old = tmp_path / "old" / "proj"
+    repo_new = tmp_path / "new" / "proj"
+    _write(repo_old, _BASE)
+    _write(repo_new, _WITH_CALL + "\n\ndef extra():\n    return 3\n")
+    out_old = tmp_path / "out_old"
+    out_new = tmp_path / "out_new"
+    _export(repo_old, out_old)
+    _export(repo_new, out_new)
+    events = list(iter_diff(out_old, out_new))
+    added_edges = [
+        e["edge"]
+        for e in events
+        if e["category"] == "relationships"
+        and e["type"] == "CALLS"
+        and e["change"] == "added"
+    ]
+    assert added_edges == ["proj.app.use -> proj.app.helper"]
+    added_nodes = [
+        e["key"] for e in events if e["category"] == "nodes" and e["change"] == "added"
+    ]
+    assert added_nodes == diff_indexes(out_old, out_new)["nodes"]["added"]
+    assert added_nodes == ["function::proj.app.extra::"]
+
+
+def test_non_canonical_artifact_refuses_to_diff(tmp_path: Path) -> None:
+    import codec.schema_pb2 as pb
+
+    repo = tmp_path / "proj"
+    _write(repo, _BASE)
+    out_a = tmp_path / "out_a"
+    out_b = tmp_path / "out_b"
+    _export(repo, out_a)
+    _export(repo, out_b)
+    index = pb.GraphCodeIndex.FromString((out_b / "index.bin").read_bytes())
+    reversed_nodes = list(reversed(index.nodes))
+    del index.nodes[:]
+    index.nodes.extend(reversed_nodes)
+    (out_b / "index.bin").write_bytes(index.SerializeToString())
+    with pytest.raises(DiffError, match="canonical order"):
+        diff_indexes(out_a, out_b)
+
+
+def test_cli_stream_writes_ndjson(tmp_path: Path) -> None:
+    from typer.testing import CliRunner
+
+    from codebase_rag.cli import app
+
+    repo_old = tmp_path / "old" / "proj"
+    repo_new = tmp_path / "new" / "proj"
+    _write(repo_old, _BASE)
+    _write(repo_new, _WITH_CALL)
+    out_old = tmp_path / "out_old"
+    out_new = tmp_path / "out_new"
+    _export(repo_old, out_old)
+    _export(repo_new, out_new)
+    target = tmp_path / "delta.ndjson"
+    result = CliRunner().invoke(
+        app,
+        [
+            "diff-index",
+            "--old",
+            str(out_old),
+            "--new",
+            str(out_new),
+            "--stream",
+            "--json-out",
+            str(target),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    lines = [json.loads(line) for line in target.read_text().splitlines()]
+    assert {
+        "category": "relationships",
+        "change": "added",
+        "edge": "proj.app.use -> proj.app.helper",
+        "type": "CALLS",
+    } in lines
@@ -333,3 +333,136 @@ class TestBatchedEmbeddingDispatch:
         assert mock_embed_batch.call_count == 1
         snippets_arg = mock_embed_batch.call_args[0][0]
         assert len(snippets_arg) == 3
+
+
+_PATCH_DELETE = patch("codebase_rag.vector_store.delete_project_embeddings")
+
+
+class TestIncrementalEmbeddings:
+    @_PATCH_DEPS
+    @_PATCH_EMBED_BATCH
+    @_PATCH_STORE_BATCH
+    @_PATCH_RECONCILE
+    @_PATCH_DELETE
+    def test_embeds_only_reparsed_files_and_drops_stale_vectors(
+        self,
+        mock_delete: MagicMock,
+        _mock_reconcile: MagicMock,
+        mock_store_batch: MagicMock,
+        mock_embed_batch: MagicMock,
+        _mock_deps: MagicMock,
+        updater_with_query: GraphUpdater,
+        query_ingestor: MagicMock,
+        temp_repo: Path,
+    ) -> None:
+        (temp_repo / "a.py").write_text("def f1():\n    return 1\n")
+        query_ingestor.fetch_all.return_value = [
+            {
+                cs.KEY_NODE_ID: 11,
+                cs.KEY_QUALIFIED_NAME: "proj.a.f1",
+                cs.KEY_START_LINE: 1,
+                cs.KEY_END_LINE: 2,
+                cs.KEY_PATH: "a.py",
+            }
+        ]
+        updater_with_query._embedding_paths = {"a.py"}
+        updater_with_query._stale_embedding_ids = {3, 4}
+
+        updater_with_query._generate_semantic_embeddings()
+
+        query, params = query_ingestor.fetch_all.call_args[0]
+        assert query == cs.CYPHER_QUERY_EMBEDDINGS_FOR_PATHS
+        assert params[cs.KEY_PATHS] == ["a.py"]
+        mock_delete.assert_called_once_with(updater_with_query.project_name, [3, 4])
+        assert len(mock_embed_batch.call_args[0][0]) == 1
+        assert [point[0] for point in mock_store_batch.call_args[0][0]] == [11]
+        assert not updater_with_query._stale_embedding_ids
+
+    @_PATCH_DEPS
+    @_PATCH_EMBED_BATCH
+    @_PATCH_DELETE
+    def test_deletion_only_sync_skips_the_embedding_query(
+        self,
+        mock_delete: MagicMock,
+        mock_embed_batch: MagicMock,
+        _mock_deps: MagicMock,
+        updater_with_query: GraphUpdater,
+        query_ingestor: MagicMock,
+    ) -> None:
+        updater_with_query._embedding_paths = set()
+        updater_with_query._stale_embedding_ids = {9}
+
+        updater_with_query._generate_semantic_embeddings()
+
+        query_ingestor.fetch_all.assert_not_called()
+        mock_delete.assert_called_once_with(updater_with_query.project_name, [9])
+        mock_embed_batch.assert_not_called()
+
+    @_PATCH_DEPS
+    def test_module_delete_records_its_embedded_ids(
+        self,
+        _mock_deps: MagicMock,
+        updater_with_query: GraphUpdater,
+        query_ingestor: MagicMock,
+    ) -> None:
+        query_ingestor.fetch_all.return_value = [{cs.KEY_NODE_ID: 5}]
+
+        updater_with_query._delete_module_entities("a.py")
+
+        query, params = query_ingestor.fetch_all.call_args[0]
+        assert query == cs.CYPHER_QUERY_MODULE_EMBEDDING_IDS
+        assert params[cs.KEY_PATH] == "a.py"
+        assert updater_with_query._stale_embedding_ids == {5}
+        assert query_ingestor.execute_write.call_args[0][0] == cs.CYPHER_DELETE_MODULE
+
+    @_PATCH_DEPS
+    @_PATCH_EMBED_BATCH
+    @_PATCH_STORE_BATCH
+    @_PATCH_RECONCILE
+    def test_lexical_index_follows_reparsed_files(
+        self,
+        _mock_reconcile: MagicMock,
+        _mock_store_batch: MagicMock,
+        _mock_embed_batch: MagicMock,
+        _mock_deps: MagicMock,
+        updater_with_query: GraphUpdater,
+        query_ingestor: MagicMock,
+        temp_repo: Path,
+    ) -> None:
+        from codebase_rag.lexical_index import search_lexical
+
+        project = updater_with_query.project_name
+        (temp_repo / "a.py").write_text("def refund_order():\n    return 1\n")
+        (temp_repo / "b.py").write_text("def ship_order():\n    return 2\n")
+        query_ingestor.fetch_all.return_value = [
+            {
+                cs.KEY_NODE_ID: node_id,
+                cs.KEY_QUALIFIED_NAME: f"{project}.{path[0]}.{name}",
+                cs.KEY_START_LINE: 1,
+                cs.KEY_END_LINE: 2,
+                cs.KEY_PATH: path,
+            }
+            for node_id, path, name in [
+                (1, "a.py", "refund_order"),
+                (2, "b.py", "ship_order"),
+            ]
+        ]
+        updater_with_query._generate_semantic_embeddings()
+        assert search_lexical("refund_order", 5)[0][0] == 1
+
+        (temp_repo / "a.py").write_text("def refund_invoice():\n    return 1\n")
+        query_ingestor.fetch_all.return_value = [
+            {
+                cs.KEY_NODE_ID: 3,
+                cs.KEY_QUALIFIED_NAME: f"{project}.a.refund_invoice",
+                cs.KEY_START_LINE: 1,
+                cs.KEY_END_LINE: 2,
+                cs.KEY_PATH: "a.py",
+            }
+        ]
+        updater_with_query._embedding_paths = {"a.py"}
+        updater_with_query._generate_semantic_embeddings()
+
+        assert search_lexical("refund_invoice", 5)[0][0] == 3
+        assert 1 not in {hit[0] for hit in search_lexical("refund_order", 5)}
+        assert search_lexical("ship_order", 5)[0][0] == 2
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from codebase_rag import constants as cs
+from codebase_rag.config import settings
+from codebase_rag.parsers import import_processor as ip
+from codebase_rag.parsers.import_processor import ImportProcessor
+
+# Discovery walks and per-import probes are answered from the previous run's
+# state file while the directories and manifests it saw are unchanged.
+
+
+def _write(root: Path) -> None:
+    (root / "src" / "acme").mkdir(parents=True)
+    (root / "src" / "acme" / "__init__.py").write_text("")
+    (root / "src" / "acme" / "util.py").write_text("X = 1\n")
+    (root / "svc").mkdir()
+    (root / "svc" / "go.mod").write_text("module example.com/svc\n")
+    (root / "svc" / "api").mkdir()
+    (root / "svc" / "api" / "api.go").write_text("package api\n")
+    (root / "crate" / "src").mkdir(parents=True)
+    (root / "crate" / "src" / "lib.rs").write_text("mod a;\n")
+
+
+def _dir_mtimes(root: Path) -> dict[str, float]:
+    mtimes: dict[str, float] = {}
+    for dirpath, _dirnames, _filenames in os.walk(root):
+        rel = Path(dirpath).relative_to(root).as_posix()
+        mtimes[rel] = os.stat(dirpath).st_mtime
+    return mtimes
+
+
+def _run(root: Path) -> ImportProcessor:
+    # GraphUpdater's order: revalidate, create the state file before the
+    # walk (so creating it does not move the root mtime the walk records),
+    # resolve, save.
+    processor = ImportProcessor(root, "proj", MagicMock(), MagicMock())
+    processor.revalidate_resolution_cache()
+    (root / cs.IMPORT_RESOLUTION_FILENAME).touch()
+    processor._map_py_source_root("acme.util")
+    processor._map_go_import_path("example.com/svc/api")
+    processor._rust_dir_entries(root / "crate" / "src")
+    processor.save_resolution_cache(_dir_mtimes(root))
+    return processor
+
+
+@pytest.fixture
+def repo(temp_repo: Path) -> Path:
+    _write(temp_repo)
+    return temp_repo
+
+
+@pytest.fixture
+def calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    seen: list[str] = []
+
+    def spy(name: str, fn):
+        def wrapper(*args, **kwargs):
+            seen.append(name)
+            return fn(*args, **kwargs)
+
+        monkeypatch.setattr(ip, name, wrapper)
+
+    spy("discover_python_source_roots", ip.discover_python_source_roots)
+    spy("discover_go_module_paths", ip.discover_go_module_paths)
+    spy("resolve_via_source_roots", ip.resolve_via_source_roots)
+    spy("resolve_go_import_path", ip.resolve_go_import_path)
+    spy("_list_dir_names", ip._list_dir_names)
+    return seen
+
+
+def test_unchanged_tree_answers_from_the_previous_run(
+    repo: Path, calls: list[str]
+) -> None:
+    first = _run(repo)
+    assert (repo / cs.IMPORT_RESOLUTION_FILENAME).is_file()
+    assert first._map_py_source_root("acme.util") == "src.acme.util"
+
+    calls.clear()
+    second = _run(repo)
+
+    assert calls == []
+    assert second._map_py_source_root("acme.util") == "src.acme.util"
+    assert second._map_go_import_path("example.com/svc/api") == "svc.api"
+    assert second._rust_dir_entries(repo / "crate" / "src") == {"lib.rs"}
+
+
+def test_added_file_drops_answers_but_keeps_unchanged_listings(
+    repo: Path, calls: list[str]
+) -> None:
+    _run(repo)
+    (repo / "src" / "acme" / "extra.py").write_text("")
+
+    calls.clear()
+    _run(repo)
+
+    assert "discover_python_source_roots" in calls
+    assert "resolve_go_import_path" in calls
+    assert "_list_dir_names" not in calls
+
+
+def test_manifest_edit_drops_only_its_families(repo: Path, calls: list[str]) -> None:
+    _run(repo)
+    gomod = repo / "svc" / "go.mod"
+    mtime = os.stat(repo / "svc").st_mtime
+    gomod.write_text("module example.com/renamed\n")
+    os.utime(repo / "svc", (mtime, mtime))
+
+    calls.clear()
+    processor = _run(repo)
+
+    assert "discover_go_module_paths" in calls
+    assert "discover_python_source_roots" not in calls
+    assert processor._map_go_import_path("example.com/svc/api") is None
+    assert processor._map_go_import_path("example.com/renamed/api") == "svc.api"
+
+
+def test_mistyped_stored_answers_are_recomputed(repo: Path, calls: list[str]) -> None:
+    _run(repo)
+    state = repo / cs.IMPORT_RESOLUTION_FILENAME
+    data = json.loads(state.read_text())
+    data[cs.IMPORT_RESOLUTION_KEY_DISCOVERY][
+        cs.ImportResolutionFamily.PY_SOURCE_ROOTS
+    ] = "src"
+    data[cs.IMPORT_RESOLUTION_KEY_ENTRIES][cs.ImportResolutionFamily.GO_IMPORT_PATH][
+        "example.com/svc/api"
+    ] = ["svc", "api"]
+    state.write_text(json.dumps(data))
+
+    calls.clear()
+    processor = _run(repo)
+
+    assert "discover_python_source_roots" in calls
+    assert "resolve_go_import_path" in calls
+    assert "discover_go_module_paths" not in calls
+    assert processor._map_go_import_path("example.com/svc/api") == "svc.api"
+
+
+def test_later_run_in_process_never_persists_older_discovery(
+    repo: Path,
+) -> None:
+    processor = _run(repo)
+    (repo / "go.mod").write_text("module example.com/root\n")
+
+    processor.revalidate_resolution_cache()
+    processor.save_resolution_cache(_dir_mtimes(repo))
+
+    assert not (repo / cs.IMPORT_RESOLUTION_FILENAME).exists()
+
+
+def test_disabled_cache_probes_every_run(
+    repo: Path, calls: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "IMPORT_RESOLUTION_CACHE", False)
+    _run(repo)
+
+    calls.clear()
+    _run(repo)
+
+    assert (repo / cs.IMPORT_RESOLUTION_FILENAME).read_text() == ""
+    assert "discover_python_source_roots" in calls
+    assert "_list_dir_names" in calls
@@ -0,0 +1,196 @@
+# The BM25 symbol index: identifier tokenisation, exact and partial name
+# matches, incremental updates, persistence, and the semantic-search path
+# that answers identifier queries without running the model.
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from codebase_rag import lexical_index as lx
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> lx.LexicalIndex:
+    index = lx.LexicalIndex(tmp_path / "proj.json")
+    index.add(
+        1,
+        "proj.recovery.parse_with_preproc_recovery",
+        "recovery.py",
+        'def parse_with_preproc_recovery(source):\n    """Re-run the parser."""\n',
+    )
+    index.add(
+        2,
+        "proj.orders.OrderService.refund",
+        "orders.py",
+        "def refund(self, order):\n    return self.gateway.reverse(order)\n",
+    )
+    index.add(
+        3,
+        "proj.orders.audit",
+        "orders.py",
+        "def audit(order):\n    refund = order.refund_total\n    return refund\n",
+    )
+    return index
+
+
+def test_identifiers_are_split_into_their_parts() -> None:
+    assert lx.tokenize("parseHTTPRequest_v2") == [
+        "parsehttprequest_v2",
+        "parse",
+        "http",
+        "request",
+        "v2",
+    ]
+    assert lx.tokenize("refund") == ["refund"]
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("parse_with_preproc_recovery", True),
+        ("OrderService.refund", True),
+        ("std::vector", True),
+        ("refund", False),
+        ("functions that refund orders", False),
+    ],
+)
+def test_identifier_query_shape(query: str, expected: bool) -> None:
+    assert lx.is_identifier_query(query) is expected
+
+
+def test_exact_qualified_name_ranks_first(index: lx.LexicalIndex) -> None:
+    assert index.search("OrderService.refund", 3)[0][0] == 2
+    assert index.search("parse_with_preproc_recovery", 3)[0][0] == 1
+
+
+def test_hits_report_exact_qualified_name_matches(index: lx.LexicalIndex) -> None:
+    hits = index.search("OrderService.refund", 3)
+    assert [(hit.node_id, hit.exact) for hit in hits][:1] == [(2, True)]
+    assert not any(hit.exact for hit in index.search("preproc_recov", 3))
+
+
+def test_partial_name_matches_through_trigrams(index: lx.LexicalIndex) -> None:
+    assert index.search("preproc_recov", 3)[0][0] == 1
+    assert [hit[0] for hit in index.search("Servic", 3)] == [2]
+
+
+def test_docstring_words_are_searchable(index: lx.LexicalIndex) -> None:
+    assert [hit[0] for hit in index.search("parser", 3)] == [1]
+
+
+def test_scope_and_incremental_removal(index: lx.LexicalIndex) -> None:
+    assert {hit[0] for hit in index.search("refund", 5, scope="proj.orders")} == {
+        2,
+        3,
+    }
+    assert index.search("refund", 5, scope="proj.recovery") == []
+
+    index.remove_paths({"orders.py"})
+
+    assert index.search("refund", 5) == []
+    assert index.search("Servic", 5) == []
+    assert len(index) == 1
+
+
+def test_saved_index_is_reloaded_when_rewritten(index: lx.LexicalIndex) -> None:
+    index.save()
+    reader = lx.LexicalIndex(index.path)
+    reader.load()
+    assert reader.search("OrderService.refund", 1) == index.search(
+        "OrderService.refund", 1
+    )
+
+    index.remove_ids({2})
+    index.save()
+    reader._mtime = -1.0
+    reader.reload_if_changed()
+    assert [hit[0] for hit in reader.search("OrderService.refund", 3)] == [3]
+
+
+def test_fusion_blends_normalised_lexical_scores() -> None:
+    fused = lx.fuse_scores(
+        [(1, 0.9), (2, 0.8)],
+        [lx.LexicalHit(2, 12.0, True), lx.LexicalHit(3, 6.0, False)],
+        3,
+        0.5,
+    )
+    assert fused == [
+        (2, pytest.approx(0.9)),
+        (1, pytest.approx(0.45)),
+        (3, pytest.approx(0.25)),
+    ]
+    assert lx.fuse_scores([(1, 0.9)], [], 3, 0.5) == [(1, 0.9)]
+
+
+def test_identifier_search_skips_the_model() -> None:
+    from codebase_rag.tools.semantic_search import semantic_code_search
+
+    saved = lx.get_lexical_index("proj")
+    saved.add(
+        7, "proj.orders.OrderService.refund", "orders.py", "def refund(self): ..."
+    )
+    saved.save()
+    ingestor = MagicMock()
+    ingestor.fetch_all.return_value = [
+        {
+            "node_id": 7,
+            "qualified_name": "proj.orders.OrderService.refund",
+            "name": "refund",
+            "type": ["Method"],
+        }
+    ]
+
+    with (
+        patch(
+            "codebase_rag.tools.semantic_search.has_semantic_dependencies",
+            return_value=True,
+        ),
+        patch("codebase_rag.embedder.embed_code") as embed,
+        patch("codebase_rag.vector_store.search_embeddings") as search,
+    ):
+        results = semantic_code_search(ingestor, "OrderService.refund")
+
+    embed.assert_not_called()
+    search.assert_not_called()
+    assert [(r["node_id"], r["score"]) for r in results] == [(7, 1.0)]
+
+
+def test_unknown_identifier_falls_through_to_hybrid_search() -> None:
+    from codebase_rag.tools.semantic_search import semantic_code_search
+
+    saved = lx.get_lexical_index("proj")
+    saved.add(
+        7,
+        "proj.accounts.fetch_account",
+        "accounts.py",
+        "def fetch_account(user):\n    return user.profile\n",
+    )
+    saved.add(8, "proj.orders.refund", "orders.py", "def refund(user): return user.id")
+    saved.save()
+    ingestor = MagicMock()
+    ingestor.fetch_all.return_value = [
+        {
+            "node_id": 9,
+            "qualified_name": "proj.users.load_profile",
+            "name": "load_profile",
+            "type": ["Function"],
+        }
+    ]
+
+    with (
+        patch(
+            "codebase_rag.tools.semantic_search.has_semantic_dependencies",
+            return_value=True,
+        ),
+        patch("codebase_rag.embedder.embed_code", return_value=[0.1]) as embed,
+        patch(
+            "codebase_rag.vector_store.search_embeddings", return_value=[(9, 0.9)]
+        ) as search,
+    ):
+        results = semantic_code_search(ingestor, "get_user_profile")
+
+    embed.assert_called_once_with("get_user_profile")
+    search.assert_called_once()
+    assert results[0]["node_id"] == 9
@@ -0,0 +1,141 @@
+# The embedded "local" vector backend: per-project memory-mapped matrices
+# behind the same VectorStore API as Qdrant and Milvus, with no service.
+from __future__ import annotations
+
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from codebase_rag import constants as cs
+from codebase_rag import vector_store as vs
+from codebase_rag.constants import LocalVectorIndex, VectorStoreBackend
+
+np = pytest.importorskip("numpy")
+lvs = pytest.importorskip("codebase_rag.local_vector_store")
+
+_DIM = 8
+
+
+@pytest.fixture
+def local_backend(tmp_path: Path) -> Generator[Path, None, None]:
+    root = tmp_path / "vectors"
+    vs.close_vector_store_client()
+    with (
+        patch.object(vs.settings, "VECTOR_STORE_BACKEND", VectorStoreBackend.LOCAL),
+        patch.object(vs.settings, "LOCAL_VECTOR_PATH", str(root)),
+        patch.object(vs.settings, "LOCAL_VECTOR_DIM", _DIM),
+    ):
+        yield root
+        vs.close_vector_store_client()
+
+
+def _vector(seed: int) -> list[float]:
+    return np.random.default_rng(seed).standard_normal(_DIM).tolist()
+
+
+def _points(ids: range, project: str = "proj") -> list[tuple[int, list[float], str]]:
+    return [(i, _vector(i), f"{project}.mod.f{i}") for i in ids]
+
+
+def test_store_search_verify_delete_roundtrip(local_backend: Path) -> None:
+    assert vs.store_embedding_batch(_points(range(20))) == 20
+    assert vs.store_embedding_batch(_points(range(100, 105), "other")) == 5
+
+    hits = vs.search_embeddings(_vector(7), top_k=3)
+    assert hits[0][0] == 7
+    assert hits[0][1] == pytest.approx(1.0, abs=1e-5)
+    assert len(hits) == 3
+
+    scoped = vs.search_embeddings(_vector(7), top_k=10, project="other")
+    assert sorted(node_id for node_id, _ in scoped) == list(range(100, 105))
+
+    assert vs.verify_stored_ids({1, 2, 104, 999}) == {1, 2, 104}
+    vs.delete_project_embeddings("proj", [1, 7])
+    assert vs.verify_stored_ids({1, 2, 7}) == {2}
+    assert 7 not in [node_id for node_id, _ in vs.search_embeddings(_vector(7))]
+
+    vs.clear_all_embeddings()
+    assert vs.search_embeddings(_vector(2)) == []
+
+
+def test_partitions_persist_and_torn_tail_is_cut(local_backend: Path) -> None:
+    vs.store_embedding_batch(_points(range(5)))
+    vs.close_vector_store_client()
+    with open(local_backend / "proj" / "vectors.f32", "ab") as handle:
+        handle.write(b"\x00" * 12)
+
+    assert vs.verify_stored_ids(set(range(6))) == set(range(5))
+    assert vs.search_embeddings(_vector(3), top_k=1)[0][0] == 3
+    assert (local_backend / "proj" / "vectors.f32").stat().st_size == 5 * _DIM * 4
+
+
+def test_overwrite_tombstones_then_compacts(local_backend: Path) -> None:
+    with patch.object(lvs, "_COMPACT_MIN_DEAD", 2):
+        vs.store_embedding_batch(_points(range(3)))
+        vs.store_embedding_batch([(0, _vector(50), "proj.mod.f0")])
+        assert vs.search_embeddings(_vector(50), top_k=1)[0][0] == 0
+        vs.store_embedding_batch([(1, _vector(51), "proj.mod.f1")])
+        vs.store_embedding_batch([(2, _vector(52), "proj.mod.f2")])
+        vs.store_embedding_batch([(0, _vector(53), "proj.mod.f0")])
+
+    vectors = local_backend / "proj" / "vectors.f32"
+    assert vectors.stat().st_size == 3 * _DIM * 4
+    assert not (local_backend / "proj" / "dead.i64").exists()
+    assert vs.search_embeddings(_vector(53), top_k=1)[0][0] == 0
+
+
+def test_dimension_mismatch_is_refused(local_backend: Path) -> None:
+    assert vs.store_embedding_batch([(1, [1.0, 0.0], "proj.f")]) == 0
+
+
+def test_ivf_with_every_list_probed_matches_exact_search(
+    local_backend: Path,
+) -> None:
+    vs.store_embedding_batch(_points(range(400)))
+    exact = [vs.search_embeddings(_vector(1000 + q), top_k=5) for q in range(10)]
+
+    with (
+        patch.object(vs.settings, "LOCAL_VECTOR_INDEX", LocalVectorIndex.IVF),
+        patch.object(vs.settings, "LOCAL_VECTOR_IVF_MIN_ROWS", 100),
+        patch.object(vs.settings, "LOCAL_VECTOR_IVF_PROBES", 4096),
+    ):
+        indexed = [vs.search_embeddings(_vector(1000 + q), top_k=5) for q in range(10)]
+        assert (local_backend / "proj" / "ivf.npz").exists()
+        vs.store_embedding_batch(_points(range(400, 410)))
+        assert vs.search_embeddings(_vector(405), top_k=1)[0][0] == 405
+
+    assert [[i for i, _ in hits] for hits in indexed] == [
+        [i for i, _ in hits] for hits in exact
+    ]
+
+
+@pytest.mark.parametrize(
+    ("mode", "codes_file", "row_bytes"),
+    [
+        (cs.VectorQuantization.INT8, "codes.i8", _DIM),
+        (cs.VectorQuantization.BINARY, "codes.b1", 1),
+    ],
+)
+def test_quantized_search_rescores_a_shortlist_exactly(
+    local_backend: Path, mode: cs.VectorQuantization, codes_file: str, row_bytes: int
+) -> None:
+    vs.store_embedding_batch(_points(range(200)))
+    exact = [vs.search_embeddings(_vector(1000 + q), top_k=3) for q in range(5)]
+
+    with (
+        patch.object(vs.settings, "VECTOR_QUANTIZATION", mode),
+        # A shortlist wider than the partition must reproduce exact search.
+        patch.object(vs.settings, "VECTOR_RESCORE_OVERSAMPLING", 100.0),
+    ):
+        wide = [vs.search_embeddings(_vector(1000 + q), top_k=3) for q in range(5)]
+    with patch.object(vs.settings, "VECTOR_QUANTIZATION", mode):
+        assert vs.search_embeddings(_vector(42), top_k=1)[0][0] == 42
+        codes = local_backend / "proj" / codes_file
+        assert codes.stat().st_size == 200 * row_bytes
+        vs.store_embedding_batch(_points(range(200, 210)))
+        assert vs.search_embeddings(_vector(205), top_k=1)[0][0] == 205
+        assert codes.stat().st_size == 210 * row_bytes
+
+    assert wide == exact
@@ -0,0 +1,225 @@
+# The offline query engine answers the tools' Cypher subset over an exported
+# graph (JSON, columnar or protobuf index) without a running Memgraph.
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from codebase_rag import constants as cs
+from codebase_rag import exceptions as ex
+from codebase_rag.cypher_queries import (
+    CYPHER_EXPORT_RELATIONSHIPS,
+    CYPHER_FIND_BY_QUALIFIED_NAME,
+    CYPHER_LIST_PROJECTS,
+    CYPHER_TRACE_CALLABLES,
+)
+from codebase_rag.graph_columnar import convert_graph_file
+from codebase_rag.mcp.tools import MCPToolsRegistry
+from codebase_rag.services import QueryProtocol
+from codebase_rag.services.offline_query import OfflineQueryEngine, OfflineQueryError
+from codebase_rag.services.protobuf_service import ProtobufFileIngestor
+from codebase_rag.tools.code_retrieval import CodeRetriever
+
+
+def _graph() -> dict:
+    nodes = [
+        ("Project", {"name": "proj", "root_path": "/repo"}),
+        ("Module", {"name": "app", "qualified_name": "proj.app", "path": "app.py"}),
+        (
+            "Function",
+            {"name": "helper", "qualified_name": "proj.app.helper", "start_line": 1},
+        ),
+        ("Class", {"name": "Svc", "qualified_name": "proj.app.Svc", "start_line": 4}),
+        (
+            "Method",
+            {
+                "name": "run",
+                "qualified_name": "proj.app.Svc.run",
+                "start_line": 5,
+                "end_line": 6,
+            },
+        ),
+        ("Module", {"name": "lib", "qualified_name": "other.lib", "path": "lib.py"}),
+    ]
+    rels = [
+        (1, 2, "DEFINES", {}),
+        (1, 3, "DEFINES", {}),
+        (3, 4, "DEFINES_METHOD", {}),
+        (4, 2, "CALLS", {"line": 6}),
+    ]
+    return {
+        "nodes": [
+            {"node_id": i, "labels": [label], "properties": props}
+            for i, (label, props) in enumerate(nodes)
+        ],
+        "relationships": [
+            {"from_id": a, "to_id": b, "type": t, "properties": p}
+            for a, b, t, p in rels
+        ],
+        "metadata": {"total_nodes": 6, "total_relationships": 4, "exported_at": ""},
+    }
+
+
+@pytest.fixture(params=["json", "columnar"])
+def engine(request: pytest.FixtureRequest, tmp_path: Path) -> OfflineQueryEngine:
+    json_path = tmp_path / "graph.json"
+    json_path.write_text(json.dumps(_graph()), encoding="utf-8")
+    if request.param == "json":
+        return OfflineQueryEngine.open(json_path)
+    columnar_path = tmp_path / "graph.cgrg"
+    convert_graph_file(json_path, columnar_path)
+    return OfflineQueryEngine.open(columnar_path)
+
+
+def test_engine_satisfies_query_protocol(engine: OfflineQueryEngine) -> None:
+    assert isinstance(engine, QueryProtocol)
+
+
+def test_snippet_lookup_finds_the_defining_module(engine: OfflineQueryEngine) -> None:
+    rows = engine.fetch_all(CYPHER_FIND_BY_QUALIFIED_NAME, {"qn": "proj.app.Svc.run"})
+    assert rows == [
+        {
+            "name": "run",
+            "start": 5,
+            "end": 6,
+            "path": "app.py",
+            "absolute_path": None,
+            "docstring": None,
+        }
+    ]
+
+
+def test_tool_queries_run_offline(engine: OfflineQueryEngine) -> None:
+    assert engine.fetch_all(CYPHER_LIST_PROJECTS) == [
+        {"name": "proj", "root_path": "/repo"}
+    ]
+    assert engine.list_projects() == ["proj"]
+    callables = engine.fetch_all(CYPHER_TRACE_CALLABLES, {"prefix": "proj."})
+    assert sorted(row["qualified_name"] for row in callables) == [
+        "proj.app",
+        "proj.app.Svc.run",
+        "proj.app.helper",
+    ]
+    rels = engine.fetch_all(CYPHER_EXPORT_RELATIONSHIPS)
+    assert {
+        "from_id": 4,
+        "to_id": 2,
+        "type": "CALLS",
+        "properties": {"line": 6},
+    } in rels
+
+
+def test_two_hop_pattern_with_prefix_order_and_limit(
+    engine: OfflineQueryEngine,
+) -> None:
+    rows = engine.fetch_all(
+        "MATCH (c:Class)-[:DEFINES_METHOD]->(m)-[r:CALLS]->(f:Function) "
+        "WHERE c.qualified_name STARTS WITH 'proj.' "
+        "RETURN c.name AS cls, m.name AS method, r.line AS line, f.name AS callee"
+    )
+    assert rows == [{"cls": "Svc", "method": "run", "line": 6, "callee": "helper"}]
+    rows = engine.fetch_all(
+        "MATCH (m:Module)-[:DEFINES]->(d) "
+        "RETURN m.name AS module, count(d) AS defs ORDER BY module"
+    )
+    assert rows == [{"module": "app", "defs": 2}]
+    rows = engine.fetch_all(
+        "MATCH (n) WHERE n:Function OR n:Method "
+        "RETURN n.name AS name ORDER BY n.start_line DESC LIMIT $n",
+        {"n": 1},
+    )
+    assert rows == [{"name": "run"}]
+
+
+def test_optional_match_keeps_unmatched_rows(engine: OfflineQueryEngine) -> None:
+    rows = engine.fetch_all(
+        "MATCH (m:Module) OPTIONAL MATCH (m)-[:DEFINES]->(d:Class) "
+        "RETURN m.name AS module, d.name AS cls ORDER BY module"
+    )
+    assert rows == [
+        {"module": "app", "cls": "Svc"},
+        {"module": "lib", "cls": None},
+    ]
+
+
+@pytest.mark.parametrize(
+    ("query", "message"),
+    [
+        ("MATCH (n) DETACH DELETE n", "read-only"),
+        ("CREATE (n:Function {name: 'x'}) RETURN n", "read-only"),
+        ("MATCH (n) WITH n RETURN n.name", "WITH"),
+        ("CALL nxalg.pagerank() YIELD node RETURN node", "CALL"),
+        ("MATCH (n) RETURN shortestPath(n)", "shortestPath"),
+    ],
+)
+def test_queries_outside_the_subset_are_refused(
+    engine: OfflineQueryEngine, query: str, message: str
+) -> None:
+    with pytest.raises(OfflineQueryError, match=message):
+        engine.fetch_all(query)
+    with pytest.raises(OfflineQueryError, match="read-only"):
+        engine.execute_write("MATCH (n) SET n.x = 1")
+
+
+def test_protobuf_index_is_queryable(tmp_path: Path) -> None:
+    ingestor = ProtobufFileIngestor(str(tmp_path), stream_index=True)
+    ingestor.ensure_node_batch("Project", {"name": "proj", "qualified_name": "proj"})
+    for name, line in (("use", 5), ("helper", 1)):
+        ingestor.ensure_node_batch(
+            "Function",
+            {"qualified_name": f"proj.app.{name}", "name": name, "start_line": line},
+        )
+    ingestor.ensure_relationship_batch(
+        ("Function", "qualified_name", "proj.app.use"),
+        "CALLS",
+        ("Function", "qualified_name", "proj.app.helper"),
+        {"line": 6},
+    )
+    ingestor.flush_all()
+    with OfflineQueryEngine.open(tmp_path) as engine:
+        rows = engine.fetch_all(
+            "MATCH (a:Function)-[r:CALLS]->(b:Function {name: $name}) "
+            "RETURN a.qualified_name AS caller, r.line AS line",
+            {"name": "helper"},
+        )
+    assert rows == [{"caller": "proj.app.use", "line": 6}]
+
+
+async def test_code_snippet_served_from_offline_graph(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "app.py").write_text(
+        "def helper():\n    return 1\n\n\nclass Svc:\n    def run(self):\n"
+        "        return helper()\n",
+        encoding="utf-8",
+    )
+    graph = _graph()
+    graph["nodes"][0]["properties"]["root_path"] = str(repo)
+    graph["nodes"][4]["properties"].update(start_line=6, end_line=7)
+    json_path = tmp_path / "graph.json"
+    json_path.write_text(json.dumps(graph), encoding="utf-8")
+    retriever = CodeRetriever(str(repo), OfflineQueryEngine.open(json_path))
+    snippet = await retriever.find_code_snippet("proj.app.Svc.run")
+    assert snippet.found
+    assert snippet.source_code == "    def run(self):\n        return helper()\n"
+
+
+async def test_write_tools_refuse_an_offline_graph(
+    engine: OfflineQueryEngine, tmp_path: Path
+) -> None:
+    registry = MCPToolsRegistry(str(tmp_path), engine, MagicMock())
+    offered = {schema.name for schema in registry.get_tool_schemas()}
+    assert not offered & cs.MCP_GRAPH_WRITE_TOOLS
+
+    with patch("codebase_rag.mcp.tools.GraphUpdater") as updater_cls:
+        result = await registry.update_repository()
+
+    updater_cls.assert_not_called()
+    assert result == cs.MCP_UPDATE_ERROR.format(
+        error=ex.OFFLINE_QUERY_READ_ONLY.format(
+            operation=cs.MCPToolName.UPDATE_REPOSITORY
+        )
+    )
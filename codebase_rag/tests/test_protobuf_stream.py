@@ -0,0 +1,139 @@
+# The streamed index layout: records are written one at a time, the joint and
+# split layouts keep their exact GraphCodeIndex bytes, and every reader walks
+# any layout lazily (diff and provenance included).
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import codec.schema_pb2 as pb
+from codebase_rag.capture import ALL_ENABLED
+from codebase_rag.graph_updater import GraphUpdater
+from codebase_rag.parser_loader import load_parsers
+from codebase_rag.services.graph_diff import diff_indexes, diff_is_empty
+from codebase_rag.services.protobuf_service import ProtobufFileIngestor
+from codebase_rag.services.protobuf_stream import (
+    IndexFormatError,
+    iter_index_nodes,
+    iter_index_records,
+    iter_index_relationships,
+    read_stream_header,
+)
+from codebase_rag.services.provenance import (
+    capture_description,
+    source_state,
+    verify_index,
+    write_manifest,
+)
+
+_STREAM_FILE = "index.pbs"
+
+
+def _ingestor(out: Path, **kwargs) -> ProtobufFileIngestor:
+    ingestor = ProtobufFileIngestor(str(out), **kwargs)
+    ingestor.ensure_node_batch("Project", {"name": "proj", "qualified_name": "proj"})
+    ingestor.ensure_node_batch(
+        "Function",
+        {"qualified_name": "proj.app.use", "name": "use", "start_line": 5},
+    )
+    ingestor.ensure_node_batch(
+        "Function",
+        {"qualified_name": "proj.app.helper", "name": "helper", "start_line": 1},
+    )
+    ingestor.ensure_relationship_batch(
+        ("Function", "qualified_name", "proj.app.use"),
+        "CALLS",
+        ("Function", "qualified_name", "proj.app.helper"),
+        {"line": 6},
+    )
+    return ingestor
+
+
+def _export(repo: Path, out: Path, **kwargs) -> None:
+    parsers, queries = load_parsers()
+    ingestor = ProtobufFileIngestor(output_path=str(out), repo_path=str(repo), **kwargs)
+    GraphUpdater(
+        ingestor=ingestor,
+        repo_path=repo,
+        parsers=parsers,
+        queries=queries,
+        capture=ALL_ENABLED,
+    ).run(force=True)
+    ingestor.flush_all()
+    write_manifest(out, source_state(repo), capture_description(ALL_ENABLED))
+
+
+def test_joint_records_match_message_serialization(tmp_path: Path) -> None:
+    ingestor = _ingestor(tmp_path)
+    ingestor.flush_all()
+    index = pb.GraphCodeIndex()
+    index.nodes.extend(ingestor._sorted_nodes())
+    index.relationships.extend(ingestor._sorted_relationships())
+    expected = index.SerializeToString(deterministic=True)
+    assert (tmp_path / "index.bin").read_bytes() == expected
+
+
+def test_stream_layout_has_header_and_canonical_records(tmp_path: Path) -> None:
+    _ingestor(tmp_path, stream_index=True).flush_all()
+    artifact = tmp_path / _STREAM_FILE
+    assert not (tmp_path / "index.bin").exists()
+    header = read_stream_header(artifact)
+    assert header is not None
+    assert (header.node_count, header.relationship_count) == (3, 1)
+    records = list(iter_index_records(artifact))
+    assert [type(r) for r in records] == [pb.Node, pb.Node, pb.Node, pb.Relationship]
+    names = [r.function.qualified_name or r.project.name for r in records[:3]]
+    assert names == ["proj", "proj.app.helper", "proj.app.use"]
+    assert records[3].properties["line"] == 6
+
+
+def test_stream_body_is_a_valid_graph_code_index(tmp_path: Path) -> None:
+    _ingestor(tmp_path, stream_index=True).flush_all()
+    raw = (tmp_path / _STREAM_FILE).read_bytes()
+    _ingestor(tmp_path / "joint").flush_all()
+    joint = (tmp_path / "joint" / "index.bin").read_bytes()
+    assert raw.endswith(joint)
+    assert read_stream_header(tmp_path / "joint" / "index.bin") is None
+
+
+def test_readers_filter_kinds_across_layouts(tmp_path: Path) -> None:
+    split = tmp_path / "split"
+    stream = tmp_path / "stream"
+    _ingestor(split, split_index=True).flush_all()
+    _ingestor(stream, stream_index=True).flush_all()
+    for out in (split, stream):
+        assert len(list(iter_index_nodes(out))) == 3
+        rels = list(iter_index_relationships(out))
+        assert [r.target_id for r in rels] == ["proj.app.helper"]
+
+
+def test_truncated_record_is_reported(tmp_path: Path) -> None:
+    _ingestor(tmp_path, stream_index=True).flush_all()
+    artifact = tmp_path / _STREAM_FILE
+    artifact.write_bytes(artifact.read_bytes()[:-3])
+    with pytest.raises(IndexFormatError, match="truncated"):
+        list(iter_index_records(artifact))
+
+
+def test_stream_layout_verifies_and_diffs_like_joint(tmp_path: Path) -> None:
+    repo = tmp_path / "proj"
+    repo.mkdir()
+    (repo / "app.py").write_text(
+        "def helper():\n    return 1\n\n\ndef use():\n    return helper()\n",
+        encoding="utf-8",
+    )
+    joint = tmp_path / "joint"
+    stream = tmp_path / "stream"
+    _export(repo, joint)
+    _export(repo, stream, stream_index=True)
+    assert verify_index(stream) == []
+    assert diff_is_empty(diff_indexes(joint, stream))
+
+
+def test_stream_flush_removes_other_layouts(tmp_path: Path) -> None:
+    _ingestor(tmp_path, split_index=True).flush_all()
+    _ingestor(tmp_path, stream_index=True).flush_all()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [_STREAM_FILE]
+    _ingestor(tmp_path).flush_all()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["index.bin"]
@@ -170,3 +170,178 @@ def test_column_conversions_round_trip() -> None:
     for char_col in range(len(line)):
         byte_col = _char_to_byte_col(line, char_col)
         assert _byte_to_char_col(line, byte_col) == char_col
+
+
+_INCREMENTAL_REPO = {
+    "pkg/__init__.py": "from .impl import f\n",
+    "pkg/impl.py": "def f():\n    return 1\n",
+    "caller.py": "from pkg import f\n\n\ndef use():\n    f()\n",
+    "other.py": "from helpers import g\n\n\ndef run():\n    g()\n",
+    "helpers.py": "def g():\n    return 2\n",
+}
+
+
+def _write_repo(repo: Path, files: dict[str, str]) -> list[Path]:
+    for rel, content in files.items():
+        path = repo / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+    return [repo / rel for rel in files]
+
+
+def test_incremental_refresh_reinfers_the_edit_and_its_importers(
+    tmp_path: Path,
+) -> None:
+    # caller.py reaches impl.py only through the pkg/__init__ re-export, so
+    # the refresh follows the package on to its importers; other.py imports
+    # neither and keeps its facts untouched.
+    repo = tmp_path / "proj"
+    files = _write_repo(repo, _INCREMENTAL_REPO)
+    cache = py_fe.PythonFactCache()
+    cache.run(repo, files)
+
+    (repo / "pkg/impl.py").write_text("\n\ndef f():\n    return 1\n")
+    result = cache.refresh(repo, files, [repo / "pkg/impl.py"])
+
+    assert result.refreshed_files == {"pkg/impl.py", "pkg/__init__.py", "caller.py"}
+    target = result.facts.resolved_call_sites[("caller.py", 5, 4, "f")]
+    assert (target.target_file, target.target_line) == ("pkg/impl.py", 3)
+
+
+def test_unchanged_content_refreshes_nothing(tmp_path: Path) -> None:
+    repo = tmp_path / "proj"
+    files = _write_repo(repo, _INCREMENTAL_REPO)
+    cache = py_fe.PythonFactCache()
+    cache.run(repo, files)
+
+    (repo / "helpers.py").write_text(_INCREMENTAL_REPO["helpers.py"])
+    result = cache.refresh(repo, files, [repo / "helpers.py"])
+
+    assert result.refreshed_files == frozenset()
+    assert result.facts.is_empty()
+
+
+def test_refresh_without_state_runs_in_full(tmp_path: Path) -> None:
+    repo = tmp_path / "proj"
+    files = _write_repo(repo, _INCREMENTAL_REPO)
+    result = py_fe.PythonFactCache().refresh(repo, files, [repo / "helpers.py"])
+
+    assert result.refreshed_files is None
+    assert ("other.py", 5, 4, "g") in result.facts.resolved_call_sites
+
+
+def test_watch_refresh_replaces_only_the_refreshed_files_facts(
+    tmp_path: Path,
+) -> None:
+    parsers, queries = load_parsers()
+    repo = tmp_path / "proj"
+    _write_repo(repo, _INCREMENTAL_REPO)
+    previous = settings.PYTHON_FRONTEND
+    settings.PYTHON_FRONTEND = cs.PythonFrontend.JEDI
+    try:
+        updater = GraphUpdater(
+            ingestor=MagicMock(),
+            repo_path=repo,
+            parsers=parsers,
+            queries=queries,
+            capture=ALL_ENABLED,
+        )
+        updater.run()
+        dp = updater.factory.definition_processor
+        other_fact = dp.python_call_sites[("other.py", 5, 4, "g")]
+
+        (repo / "caller.py").write_text(
+            "from pkg import f\n\n\ndef use():\n    return f()\n"
+        )
+        updater._run_python_frontend(changed=[repo / "caller.py"])
+    finally:
+        settings.PYTHON_FRONTEND = previous
+
+    assert dp.python_call_sites[("other.py", 5, 4, "g")] is other_fact
+    assert ("caller.py", 5, 11, "f") in dp.python_call_sites
+    assert ("caller.py", 5, 4, "f") not in dp.python_call_sites
+
+
+def _analyzed_files(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    analyzed: list[str] = []
+    analyze = py_fe._analyze_file
+
+    def spy(project, repo_path, file_path, rel_file, line_tables, budget):
+        analyzed.append(rel_file)
+        return analyze(project, repo_path, file_path, rel_file, line_tables, budget)
+
+    monkeypatch.setattr(py_fe, "_analyze_file", spy)
+    return analyzed
+
+
+def test_target_module_is_read_once_per_run(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo = tmp_path / "proj"
+    files = _write_repo(
+        repo,
+        {
+            "helpers.py": "def g():\n    return 2\n",
+            "a.py": "import helpers\n\n\ndef f():\n    helpers.g()\n    helpers.g()\n",
+            "b.py": "import helpers\n\n\ndef h():\n    helpers.g()\n",
+        },
+    )
+    reads: list[Path] = []
+    read_text = Path.read_text
+
+    def counting(self: Path, *args, **kwargs) -> str:
+        reads.append(self)
+        return read_text(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "read_text", counting)
+    facts = run_python_frontend(repo, files)
+
+    assert len(facts.resolved_call_sites) == 3
+    assert reads.count(repo.resolve() / "helpers.py") == 1
+
+
+def test_unchanged_files_reuse_the_on_disk_facts(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo = tmp_path / "proj"
+    files = _write_repo(repo, _INCREMENTAL_REPO)
+    first = run_python_frontend(repo, files)
+
+    analyzed = _analyzed_files(monkeypatch)
+    assert run_python_frontend(repo, files) == first
+    assert analyzed == []
+
+    # other.py's facts point into helpers.py, so moving g re-infers both.
+    (repo / "helpers.py").write_text("\n\ndef g():\n    return 2\n")
+    facts = run_python_frontend(repo, files)
+    assert sorted(analyzed) == ["helpers.py", "other.py"]
+    assert facts.resolved_call_sites[("other.py", 5, 4, "g")].target_line == 3
+
+
+def test_fact_cache_is_scoped_to_the_jedi_environment(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo = tmp_path / "proj"
+    files = _write_repo(repo, _INCREMENTAL_REPO)
+    run_python_frontend(repo, files)
+
+    monkeypatch.setattr(py_fe, "_environment_key", lambda project: "other-env")
+    analyzed = _analyzed_files(monkeypatch)
+    run_python_frontend(repo, files)
+    assert sorted(analyzed) == sorted(_INCREMENTAL_REPO)
+
+
+def test_worker_pool_matches_the_in_process_facts(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo = tmp_path / "proj"
+    files = _write_repo(repo, _INCREMENTAL_REPO)
+    monkeypatch.setattr(settings, "PYTHON_FRONTEND_FACT_CACHE", False)
+    serial = run_python_frontend(repo, files)
+
+    monkeypatch.setattr(py_fe, "_PARALLEL_MIN_FILES", 0)
+    monkeypatch.setattr(py_fe, "_PARALLEL_CHUNK_FILES", 2)
+    monkeypatch.setattr(settings, "PYTHON_FRONTEND_WORKERS", 2)
+    analyzed = _analyzed_files(monkeypatch)
+    assert run_python_frontend(repo, files) == serial
+    assert analyzed == []
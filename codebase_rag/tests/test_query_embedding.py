@@ -0,0 +1,124 @@
+# Concurrent semantic-search queries share one batched forward pass, each
+# caller gets its own vector back, and repeated queries skip the model.
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from codebase_rag import query_embedding
+from codebase_rag.query_embedding import QueryBatcher
+
+
+def _vector(query: str) -> list[float]:
+    return [float(len(query)), float(ord(query[0]))]
+
+
+def test_concurrent_queries_share_one_batched_pass() -> None:
+    batcher = QueryBatcher(window_seconds=0.5, max_batch=4, cache_size=8)
+    batches: list[list[str]] = []
+    queries = ["alpha", "beta", "gamma", "alpha"]
+    arrived = threading.Barrier(len(queries))
+
+    def embed_batch(snippets: list[str]) -> list[list[float]]:
+        batches.append(snippets)
+        return [_vector(s) for s in snippets]
+
+    def call(query: str) -> list[float]:
+        arrived.wait()
+        return batcher.embed(query)
+
+    with (
+        patch("codebase_rag.embedder.embed_code_batch", side_effect=embed_batch),
+        ThreadPoolExecutor(len(queries)) as pool,
+    ):
+        results = list(pool.map(call, queries))
+
+    assert results == [_vector(q) for q in queries]
+    assert len(batches) == 1
+    assert sorted(batches[0]) == ["alpha", "beta", "gamma"]
+    stats = batcher.stats()
+    assert stats["batches"] == 1
+    assert stats["max_batch_size"] == 4
+    assert stats["mean_wait_ms"] > 0
+
+
+def test_repeated_query_is_served_from_the_lru() -> None:
+    batcher = QueryBatcher(window_seconds=0.0, max_batch=4, cache_size=1)
+
+    with patch("codebase_rag.embedder.embed_code", side_effect=_vector) as embed:
+        assert batcher.embed("alpha") == _vector("alpha")
+        assert batcher.embed("alpha") == _vector("alpha")
+        batcher.embed("beta")
+        batcher.embed("alpha")
+
+    assert [c.args[0] for c in embed.call_args_list] == ["alpha", "beta", "alpha"]
+    stats = batcher.stats()
+    assert stats["queries"] == 4
+    assert stats["cache_hits"] == 1
+
+
+def test_model_failure_reaches_the_caller_and_the_worker_survives() -> None:
+    batcher = QueryBatcher(window_seconds=0.0, max_batch=4, cache_size=8)
+
+    with patch("codebase_rag.embedder.embed_code", side_effect=RuntimeError("oom")):
+        with pytest.raises(RuntimeError, match="oom"):
+            batcher.embed("alpha")
+    with patch("codebase_rag.embedder.embed_code", side_effect=_vector):
+        assert batcher.embed("alpha") == _vector("alpha")
+
+
+def test_a_failure_after_inference_still_resolves_every_caller() -> None:
+    batcher = QueryBatcher(window_seconds=0.0, max_batch=4, cache_size=8)
+
+    # Bookkeeping after inference used to run outside the try, so a failure
+    # there killed the worker and left the caller blocked on its future.
+    with (
+        patch.object(batcher, "_remember", side_effect=KeyError("boom")),
+        patch("codebase_rag.embedder.embed_code", side_effect=_vector),
+    ):
+        with pytest.raises(KeyError, match="boom"):
+            batcher.embed("beta")
+    with patch("codebase_rag.embedder.embed_code", side_effect=_vector):
+        assert batcher.embed("gamma") == _vector("gamma")
+
+
+def test_a_stalled_model_times_the_caller_out() -> None:
+    batcher = QueryBatcher(
+        window_seconds=0.0, max_batch=4, cache_size=8, timeout_seconds=0.05
+    )
+    release = threading.Event()
+
+    def stalled(query: str) -> list[float]:
+        release.wait()
+        return _vector(query)
+
+    with patch("codebase_rag.embedder.embed_code", side_effect=stalled):
+        with pytest.raises(TimeoutError):
+            batcher.embed("alpha")
+        # Queued behind the stalled pass: withdrawn on timeout, never embedded.
+        with pytest.raises(TimeoutError):
+            batcher.embed("beta")
+        release.set()
+        assert batcher.embed("gamma") == _vector("gamma")
+    assert batcher.stats()["batches"] == 2
+
+
+def test_module_stats_report_the_shared_batcher(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    batcher = QueryBatcher(window_seconds=0.0, max_batch=4, cache_size=8)
+    monkeypatch.setattr(query_embedding, "_batcher", batcher)
+
+    with patch("codebase_rag.embedder.embed_code", side_effect=_vector):
+        query_embedding.embed_query("alpha")
+        query_embedding.embed_query("alpha")
+
+    stats = query_embedding.get_query_embedding_stats()
+    assert stats == batcher.stats()
+    assert stats["queries"] == 2
+    assert stats["cache_hits"] == 1
+    assert stats["batches"] == 1
+    assert stats["max_batch_size"] == 1
@@ -157,8 +157,7 @@ class TestSemanticFrontendReruns:
         self._fire(event_handler, mock_updater.repo_path / "svc.go")
         mock_updater._run_go_frontend.assert_called_once()
         mock_updater._run_csharp_frontend.assert_not_called()
-        mock_updater._rehydrate_go_type_locations.assert_called_once()
-        mock_updater._rehydrate_function_locations.assert_called_once()
+        mock_updater.ensure_warm_state.assert_called_once()
         mock_updater._join_go_implements.assert_called_once()
 
     def test_csharp_change_reruns_the_roslyn_frontend(
@@ -167,7 +166,7 @@ class TestSemanticFrontendReruns:
         self._fire(event_handler, mock_updater.repo_path / "Svc.cs")
         mock_updater._run_csharp_frontend.assert_called_once()
         mock_updater._run_go_frontend.assert_not_called()
-        mock_updater._rehydrate_csharp_type_locations.assert_called_once()
+        mock_updater.ensure_warm_state.assert_called_once()
         mock_updater._join_csharp_partials.assert_called_once()
 
     def test_java_change_reruns_the_javac_frontend(
@@ -178,7 +177,7 @@ class TestSemanticFrontendReruns:
         # positions, and a stale external proof would keep suppressing an edge.
         self._fire(event_handler, mock_updater.repo_path / "Svc.java")
         mock_updater._run_java_frontend.assert_called_once()
-        mock_updater._rehydrate_function_locations.assert_called_once()
+        mock_updater.ensure_warm_state.assert_called_once()
         mock_updater._run_go_frontend.assert_not_called()
 
     def test_python_change_touches_no_semantic_frontend(
@@ -2,8 +2,10 @@ from pathlib import Path
 
 import pytest
 
+from codebase_rag import constants as cs
 from codebase_rag.utils.dependencies import (
     has_local_embedding_weights,
+    has_numpy,
     has_semantic_dependencies,
 )
 from evals import constants as ec
@@ -11,6 +13,8 @@ from evals.semantic_search import (
     SemanticCase,
     cgr_semantic_ranking,
     function_snippets,
+    index_bytes,
+    rank_snippets,
     score_semantic,
 )
 
@@ -83,3 +87,36 @@ def test_score_semantic_counts_misses() -> None:
     row = next(r for r in result.rows if r["label"] == ec.SEMANTIC_LABEL)
     assert (row["tp"], row["fn"]) == (1, 1)
     assert row["recall"] == 0.5
+
+
+@pytest.mark.skipif(not has_numpy(), reason="numpy not installed")
+@pytest.mark.parametrize(
+    "mode", [cs.VectorQuantization.INT8, cs.VectorQuantization.BINARY]
+)
+def test_quantized_ranking_keeps_recall_and_shrinks_the_index(
+    mode: cs.VectorQuantization,
+) -> None:
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    snippet_vecs = rng.standard_normal((300, 64)).tolist()
+    qns = [f"proj.m.f{i}" for i in range(300)]
+    # Each query is a lightly perturbed copy of one snippet's embedding.
+    targets = list(range(0, 300, 30))
+    query_vecs = [
+        (np.asarray(snippet_vecs[i]) + 0.1 * rng.standard_normal(64)).tolist()
+        for i in targets
+    ]
+    queries = [f"q{i}" for i in targets]
+    cases = [SemanticCase(f"q{i}", f"proj.m.f{i}") for i in targets]
+
+    exact = rank_snippets(queries, query_vecs, qns, snippet_vecs, 3)
+    quantized = rank_snippets(queries, query_vecs, qns, snippet_vecs, 3, mode)
+
+    def recall(ranking: dict[str, list[str]]) -> float:
+        result = score_semantic(cases, ranking)
+        return next(r for r in result.rows if r["label"] == ec.SEMANTIC_LABEL)["recall"]
+
+    assert recall(exact) == recall(quantized) == 1.0
+    assert all(quantized[q][0] == exact[q][0] for q in queries)
+    assert index_bytes(300, 768, mode) * 4 <= index_bytes(300, 768)
@@ -2,11 +2,12 @@
 
 With several repositories indexed into one graph, an unfiltered vector search
 mixes hits from every project. Passing a project name must confine results to
-qualified names under that project's prefix, on both vector-store backends.
+qualified names under that project's prefix, on every vector-store backend.
 """
 
 from __future__ import annotations
 
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -29,14 +30,17 @@ def _qdrant_point(node_id: int, qualified_name: str, score: float) -> MagicMock:
 
 
 @pytest.mark.skipif(not has_qdrant_client(), reason="qdrant-client not installed")
-def test_qdrant_search_filters_by_project_prefix() -> None:
+def test_qdrant_scoped_search_filters_on_project_payload() -> None:
+    # One round trip: the project payload filter runs inside Qdrant, so the
+    # limit stays top_k instead of an over-fetch window.
+    from qdrant_client.models import FieldCondition, Filter, MatchValue
+
     import codebase_rag.vector_store as vs
 
     mock_client = MagicMock()
     mock_result = MagicMock()
     mock_result.points = [
         _qdrant_point(1, "user-service__aaaa1111.src.handlers.get_user", 0.95),
-        _qdrant_point(2, "order-service__bbbb2222.src.orders.create", 0.90),
         _qdrant_point(3, "user-service__aaaa1111.src.models.User", 0.85),
     ]
     mock_client.query_points.return_value = mock_result
@@ -52,27 +56,16 @@ def test_qdrant_search_filters_by_project_prefix() -> None:
         vs.close_vector_store_client()
 
     assert results == [(1, 0.95), (3, 0.85)]
-
-
-@pytest.mark.skipif(not has_qdrant_client(), reason="qdrant-client not installed")
-def test_qdrant_search_overfetches_when_project_given() -> None:
-    import codebase_rag.vector_store as vs
-
-    mock_client = MagicMock()
-    mock_result = MagicMock()
-    mock_result.points = []
-    mock_client.query_points.return_value = mock_result
-
-    with (
-        patch.object(vs.settings, "VECTOR_STORE_BACKEND", VectorStoreBackend.QDRANT),
-        patch("codebase_rag.vector_store.get_qdrant_client", return_value=mock_client),
-    ):
-        vs.close_vector_store_client()
-        vs.search_embeddings(_EMBEDDING, top_k=5, project="proj__12345678")
-        vs.close_vector_store_client()
-
-    limit = mock_client.query_points.call_args.kwargs["limit"]
-    assert limit > 5, "project filter must over-fetch to compensate for filtering"
+    mock_client.query_points.assert_called_once()
+    kwargs = mock_client.query_points.call_args.kwargs
+    assert kwargs["limit"] == 2
+    assert kwargs["query_filter"] == Filter(
+        must=[
+            FieldCondition(
+                key="project", match=MatchValue(value="user-service__aaaa1111")
+            )
+        ]
+    )
 
 
 @pytest.mark.skipif(not has_qdrant_client(), reason="qdrant-client not installed")
@@ -104,14 +97,13 @@ def _milvus_hit(node_id: int, qualified_name: str, distance: float) -> dict:
 
 
 @pytest.mark.skipif(not has_pymilvus(), reason="pymilvus not installed")
-def test_milvus_search_filters_by_project_prefix() -> None:
+def test_milvus_scoped_search_uses_project_expression() -> None:
     import codebase_rag.vector_store as vs
 
     mock_client = MagicMock()
     mock_client.search.return_value = [
         [
             _milvus_hit(1, "user-service__aaaa1111.src.handlers.get_user", 0.1),
-            _milvus_hit(2, "order-service__bbbb2222.src.orders.create", 0.2),
             _milvus_hit(3, "user-service__aaaa1111.src.models.User", 0.3),
         ]
     ]
@@ -127,8 +119,39 @@ def test_milvus_search_filters_by_project_prefix() -> None:
         vs.close_vector_store_client()
 
     assert [node_id for node_id, _ in results] == [1, 3]
-    output_fields = mock_client.search.call_args.kwargs["output_fields"]
-    assert "qualified_name" in output_fields
+    kwargs = mock_client.search.call_args.kwargs
+    assert kwargs["filter"] == 'project == "user-service__aaaa1111"'
+    assert kwargs["limit"] == 2
+
+
+@pytest.mark.skipif(not has_pymilvus(), reason="pymilvus not installed")
+def test_milvus_collection_without_project_field_filters_client_side() -> None:
+    # Collections created before the project field cannot be filtered in
+    # Milvus; scoped searches keep the prefix filter until a rebuild.
+    import codebase_rag.vector_store as vs
+
+    mock_client = MagicMock()
+    mock_client.search.return_value = [
+        [
+            _milvus_hit(1, "user-service__aaaa1111.src.handlers.get_user", 0.1),
+            _milvus_hit(2, "order-service__bbbb2222.src.orders.create", 0.2),
+            _milvus_hit(3, "user-service__aaaa1111.src.models.User", 0.3),
+        ]
+    ]
+
+    with (
+        patch.object(vs.settings, "VECTOR_STORE_BACKEND", VectorStoreBackend.MILVUS),
+        patch("codebase_rag.vector_store.get_milvus_client", return_value=mock_client),
+        patch.object(vs, "_MILVUS_HAS_PROJECT_FIELD", False),
+    ):
+        results = vs.search_embeddings(
+            _EMBEDDING, top_k=2, project="user-service__aaaa1111"
+        )
+
+    assert [node_id for node_id, _ in results] == [1, 3]
+    kwargs = mock_client.search.call_args.kwargs
+    assert kwargs["filter"] == ""
+    assert "qualified_name" in kwargs["output_fields"]
 
 
 @pytest.mark.skipif(not has_semantic_dependencies(), reason="semantic deps missing")
@@ -149,13 +172,14 @@ def test_semantic_code_search_passes_project_to_vector_search() -> None:
 
 
 @pytest.mark.skipif(not has_qdrant_client(), reason="qdrant-client not installed")
-def test_qdrant_widens_window_until_project_matches_found() -> None:
-    # The first over-fetch window may hold only other projects' neighbors;
-    # the search must widen the window instead of returning nothing.
+def test_qdrant_dotted_scope_widens_window_within_project() -> None:
+    # A scope narrower than the stored project (a package inside it) is
+    # filtered to the project in Qdrant, then by prefix with a widening
+    # window, since the first window may hold only sibling packages.
     import codebase_rag.vector_store as vs
 
     other = [
-        _qdrant_point(i, f"noise__00000000.mod.f{i}", 0.9 - i * 0.001)
+        _qdrant_point(i, f"user-service__aaaa1111.tests.f{i}", 0.9 - i * 0.001)
         for i in range(100)
     ]
     wanted = [
@@ -163,7 +187,9 @@ def test_qdrant_widens_window_until_project_matches_found() -> None:
         _qdrant_point(1001, "user-service__aaaa1111.src.models.User", 0.4),
     ]
 
-    def query_points(collection_name: str, query: list[float], limit: int):  # type: ignore[no-untyped-def]
+    def query_points(  # type: ignore[no-untyped-def]
+        collection_name: str, query: list[float], limit: int, **_filters
+    ):
         result = MagicMock()
         result.points = (other + wanted)[:limit]
         return result
@@ -177,8 +203,64 @@ def test_qdrant_widens_window_until_project_matches_found() -> None:
     ):
         vs.close_vector_store_client()
         results = vs.search_embeddings(
-            _EMBEDDING, top_k=2, project="user-service__aaaa1111"
+            _EMBEDDING, top_k=2, project="user-service__aaaa1111.src"
         )
         vs.close_vector_store_client()
 
     assert [node_id for node_id, _ in results] == [1000, 1001]
+    query_filter = mock_client.query_points.call_args.kwargs["query_filter"]
+    assert query_filter.must[0].match.value == "user-service__aaaa1111"
+
+
+@pytest.mark.skipif(not has_qdrant_client(), reason="qdrant-client not installed")
+def test_qdrant_backfills_project_payload_on_existing_collection(
+    tmp_path: Path,
+) -> None:
+    # A collection written before the project payload is migrated on open,
+    # after which a small project's hits are found even when more than the
+    # old over-fetch cap of other projects' vectors sit closer to the query.
+    from qdrant_client import QdrantClient
+    from qdrant_client.models import Distance, PointStruct, VectorParams
+
+    import codebase_rag.vector_store as vs
+
+    legacy = QdrantClient(path=str(tmp_path))
+    legacy.create_collection(
+        collection_name="code_embeddings",
+        vectors_config=VectorParams(size=2, distance=Distance.COSINE),
+    )
+    noise = [
+        PointStruct(
+            id=i,
+            vector=[1.0, i * 1e-4],
+            payload={"node_id": i, "qualified_name": f"big__00000000.m.f{i}"},
+        )
+        for i in range(1100)
+    ]
+    small = PointStruct(
+        id=5000,
+        vector=[0.0, 1.0],
+        payload={"node_id": 5000, "qualified_name": "small__11111111.m.g"},
+    )
+    legacy.upsert(collection_name="code_embeddings", points=[*noise, small])
+    legacy.close()
+
+    with (
+        patch.object(vs.settings, "VECTOR_STORE_BACKEND", VectorStoreBackend.QDRANT),
+        patch.object(vs.settings, "QDRANT_URL", None),
+        patch.object(vs.settings, "QDRANT_DB_PATH", str(tmp_path)),
+        patch.object(vs.settings, "QDRANT_VECTOR_DIM", 2),
+    ):
+        vs.close_vector_store_client()
+        try:
+            results = vs.search_embeddings(
+                [1.0, 0.0], top_k=1, project="small__11111111"
+            )
+            (point,) = vs.get_qdrant_client().retrieve(
+                collection_name="code_embeddings", ids=[7], with_payload=True
+            )
+        finally:
+            vs.close_vector_store_client()
+
+    assert [node_id for node_id, _ in results] == [5000]
+    assert point.payload["project"] == "big__00000000"
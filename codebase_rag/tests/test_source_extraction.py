@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
 
 from codebase_rag.utils.source_extraction import (
+    LastSourceFile,
+    SourceLines,
     extract_source_lines,
     extract_source_with_fallback,
     validate_source_location,
@@ -240,6 +243,43 @@ class TestExtractSourceWithFallback:
         assert result == "line1\nline2"
 
 
+class TestSourceLines:
+    def test_extract_matches_per_call_extraction(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "test.py"
+        file_path.write_bytes(b"a\r\n  b  \n\x0cc\nd")
+        source = SourceLines.read(file_path)
+        assert source is not None
+        for start, end in [(1, 1), (2, 3), (1, 4), (3, 9), (9, 9), (0, 1)]:
+            assert source.extract(start, end) == extract_source_lines(
+                file_path, start, end
+            )
+
+    def test_read_text_counts_newlines_only(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "test.py"
+        file_path.write_bytes(b"a\r\nb\x0cc\nd")
+        source = SourceLines.read_text(file_path)
+        assert len(source) == 3
+        assert source.span(2, 3) == "b\x0cc\nd"
+
+    def test_last_source_file_reads_each_path_once(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        first = tmp_path / "a.py"
+        second = tmp_path / "b.py"
+        first.write_text("x = 1\ny = 2\n")
+        second.write_text("z = 3\n")
+        spy = MagicMock(wraps=SourceLines.read)
+        monkeypatch.setattr(SourceLines, "read", spy)
+        cache = LastSourceFile()
+        spans = [(first, 1, 1), (first, 2, 2), (second, 1, 1)]
+        results = [
+            extract_source_with_fallback(path, start, end, source_cache=cache)
+            for path, start, end in spans
+        ]
+        assert results == ["x = 1", "y = 2", "z = 3"]
+        assert [c.args[0] for c in spy.call_args_list] == [first, second]
+
+
 class TestValidateSourceLocation:
     @pytest.mark.parametrize(
         ("start_line", "end_line"),
@@ -1,4 +1,5 @@
-import time
+import sys
+from collections.abc import Generator
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -12,8 +13,10 @@ from codebase_rag.parsers.stdlib_extractor import StdlibExtractor
 @pytest.fixture(autouse=True)
 def reset_caches() -> None:
     se._STDLIB_CACHE.clear()
-    se._CACHE_TIMESTAMPS.clear()
+    se._CACHE_TOOLCHAINS.clear()
     se._EXTERNAL_TOOLS.clear()
+    se._INTROSPECTED.clear()
+    se.stop_stdlib_helpers()
 
 
 class TestCacheHelpers:
@@ -25,7 +28,7 @@ class TestCacheHelpers:
             se._STDLIB_CACHE["python:collections.Counter"]["collections.Counter"]
             == "collections"
         )
-        assert "python:collections.Counter" in se._CACHE_TIMESTAMPS
+        assert se._CACHE_TOOLCHAINS["python"] == se._toolchain_version("python")
 
     def test_get_cached_stdlib_result_returns_cached_value(self) -> None:
         se._cache_stdlib_result("python", "json.loads", "json")
@@ -39,16 +42,20 @@ class TestCacheHelpers:
 
         assert result is None
 
-    def test_cache_ttl_expiration(self) -> None:
-        se._cache_stdlib_result("python", "os.path", "os")
-        cache_key = "python:os.path"
-        se._CACHE_TIMESTAMPS[cache_key] = time.time() - (cs.IMPORT_CACHE_TTL + 100)
+    def test_cached_results_outlive_the_process_until_the_toolchain_changes(
+        self, tmp_path: Path
+    ) -> None:
+        with patch.object(Path, "home", return_value=tmp_path):
+            se._cache_stdlib_result("python", "os.path", "os")
+            se._cache_stdlib_result("rust", "std::fmt::Display", "std::fmt")
+            se.save_persistent_cache()
+            se._STDLIB_CACHE.clear()
 
-        result = se._get_cached_stdlib_result("python", "os.path")
+            with patch.dict(se._TOOLCHAIN_VERSIONS, {"python": "another python"}):
+                se.load_persistent_cache()
 
-        assert result is None
-        assert cache_key not in se._STDLIB_CACHE
-        assert cache_key not in se._CACHE_TIMESTAMPS
+        assert se._get_cached_stdlib_result("python", "os.path") is None
+        assert se._get_cached_stdlib_result("rust", "std::fmt::Display") == "std::fmt"
 
 
 class TestToolAvailability:
@@ -92,7 +99,7 @@ class TestCachePersistence:
             assert (cache_dir / "stdlib_cache.json").exists()
 
             se._STDLIB_CACHE.clear()
-            se._CACHE_TIMESTAMPS.clear()
+            se._CACHE_TOOLCHAINS.clear()
 
             se.load_persistent_cache()
 
@@ -111,7 +118,7 @@ class TestCachePersistence:
             se.clear_stdlib_cache()
 
             assert len(se._STDLIB_CACHE) == 0
-            assert len(se._CACHE_TIMESTAMPS) == 0
+            assert len(se._CACHE_TOOLCHAINS) == 0
             assert not cache_file.exists()
 
     def test_flush_stdlib_cache_calls_save(self, tmp_path: Path) -> None:
@@ -414,7 +421,7 @@ class TestCachePersistenceErrorHandling:
             assert len(se._STDLIB_CACHE) == 0
 
 
-class TestGoExtractorWithMockedSubprocess:
+class TestGoExtractorWithMockedHelper:
     @pytest.fixture
     def extractor(self) -> StdlibExtractor:
         return StdlibExtractor(function_registry=None)
@@ -422,60 +429,41 @@ class TestGoExtractorWithMockedSubprocess:
     def test_go_extractor_returns_package_on_successful_introspection(
         self, extractor: StdlibExtractor
     ) -> None:
-        mock_list_result = MagicMock()
-        mock_list_result.returncode = 0
-        mock_list_result.stdout = "/usr/local/go/src/fmt"
-
-        mock_popen = MagicMock()
-        mock_popen.__enter__ = MagicMock(return_value=mock_popen)
-        mock_popen.__exit__ = MagicMock(return_value=False)
-        mock_popen.returncode = 0
-        mock_popen.communicate.return_value = (
-            '{"hasEntity": true, "entityType": "function"}',
-            "",
-        )
-
-        with (
-            patch("subprocess.run", return_value=mock_list_result),
-            patch("subprocess.Popen", return_value=mock_popen),
-        ):
+        with patch.object(se, "_query_helper", return_value=[True]) as helper:
             result = extractor.extract_module_path(
-                "fmt/Println", cs.SupportedLanguage.GO
+                "fmt/sprintfHelper", cs.SupportedLanguage.GO
             )
 
             assert result == "fmt"
+            helper.assert_called_once_with(
+                cs.SupportedLanguage.GO, [("fmt", "sprintfHelper")]
+            )
 
-    def test_go_extractor_fallback_on_go_list_failure(
+    def test_go_extractor_exported_name_folds_without_introspection(
         self, extractor: StdlibExtractor
     ) -> None:
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_result.stdout = ""
-
-        with patch("subprocess.run", return_value=mock_result):
+        with patch.object(se, "_query_helper") as helper:
             result = extractor.extract_module_path(
                 "fmt/Println", cs.SupportedLanguage.GO
             )
 
             assert result == "fmt"
+            helper.assert_not_called()
 
-    def test_go_extractor_fallback_on_timeout(self, extractor: StdlibExtractor) -> None:
-        import subprocess
-
-        with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("go", 5)):
+    def test_go_extractor_fallback_on_helper_failure(
+        self, extractor: StdlibExtractor
+    ) -> None:
+        with patch.object(se, "_query_helper", return_value=[None]):
             result = extractor.extract_module_path(
-                "fmt/Println", cs.SupportedLanguage.GO
+                "fmt/lowercase", cs.SupportedLanguage.GO
             )
 
-            assert result == "fmt"
+            assert result == "fmt/lowercase"
 
     def test_go_extractor_lowercase_entity_returns_unchanged(
         self, extractor: StdlibExtractor
     ) -> None:
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-
-        with patch("subprocess.run", return_value=mock_result):
+        with patch.object(se, "_query_helper", return_value=[False]):
             result = extractor.extract_module_path(
                 "fmt/lowercase", cs.SupportedLanguage.GO
             )
@@ -542,7 +530,7 @@ class TestJavaExtractorWithMockedSubprocess:
             assert result == "java.lang"
 
 
-class TestLuaExtractorWithMockedSubprocess:
+class TestLuaExtractorWithMockedHelper:
     @pytest.fixture
     def extractor(self) -> StdlibExtractor:
         return StdlibExtractor(function_registry=None)
@@ -550,11 +538,7 @@ class TestLuaExtractorWithMockedSubprocess:
     def test_lua_extractor_returns_module_on_successful_introspection(
         self, extractor: StdlibExtractor
     ) -> None:
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "hasEntity=true"
-
-        with patch("subprocess.run", return_value=mock_result):
+        with patch.object(se, "_query_helper", return_value=[True]):
             result = extractor.extract_module_path(
                 "string.upper", cs.SupportedLanguage.LUA
             )
@@ -564,23 +548,17 @@ class TestLuaExtractorWithMockedSubprocess:
     def test_lua_extractor_fallback_on_entity_not_found(
         self, extractor: StdlibExtractor
     ) -> None:
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "hasEntity=false"
-
-        with patch("subprocess.run", return_value=mock_result):
+        with patch.object(se, "_query_helper", return_value=[False]):
             result = extractor.extract_module_path(
                 "string.nonexistent", cs.SupportedLanguage.LUA
             )
 
             assert result == "string.nonexistent"
 
-    def test_lua_extractor_fallback_on_timeout(
+    def test_lua_extractor_fallback_on_helper_failure(
         self, extractor: StdlibExtractor
     ) -> None:
-        import subprocess
-
-        with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("lua", 5)):
+        with patch.object(se, "_query_helper", return_value=[None]):
             result = extractor.extract_module_path(
                 "math.floor", cs.SupportedLanguage.LUA
             )
@@ -590,7 +568,7 @@ class TestLuaExtractorWithMockedSubprocess:
     def test_lua_extractor_fallback_on_lua_not_found(
         self, extractor: StdlibExtractor
     ) -> None:
-        with patch("subprocess.run", side_effect=FileNotFoundError):
+        with patch.object(se, "_is_tool_available", return_value=False):
             result = extractor.extract_module_path(
                 "table.insert", cs.SupportedLanguage.LUA
             )
@@ -600,12 +578,68 @@ class TestLuaExtractorWithMockedSubprocess:
     def test_lua_extractor_stdlib_module_in_set(
         self, extractor: StdlibExtractor
     ) -> None:
-        with patch("subprocess.run", side_effect=FileNotFoundError):
+        with patch.object(se, "_query_helper") as helper:
             result = extractor.extract_module_path(
                 "custom.string", cs.SupportedLanguage.LUA
             )
 
             assert result == "custom"
+            helper.assert_not_called()
+
+
+# One long-lived helper answers a whole batch over a pipe; this stand-in
+# speaks the same protocol (and chatters, like a module loaded by require).
+_FAKE_HELPER = """
+import sys
+for line in sys.stdin:
+    module, entity = line.rstrip("\\n").split("\\t")
+    print("loading", module, flush=True)
+    print("cgr:1" if entity.startswith("has") else "cgr:0", flush=True)
+"""
+
+
+class TestIntrospectionHelper:
+    @pytest.fixture
+    def launches(self) -> Generator[list[list[str]], None, None]:
+        started: list[list[str]] = []
+
+        def command(helper: se._IntrospectionHelper) -> list[str]:
+            started.append([helper.language])
+            return [sys.executable, "-c", _FAKE_HELPER]
+
+        with patch.object(se._IntrospectionHelper, "_command", command):
+            yield started
+
+    def test_prefetch_answers_every_queued_name_with_one_helper(
+        self, launches: list[list[str]]
+    ) -> None:
+        extractor = StdlibExtractor(function_registry=None)
+        names = [
+            (f"pkg{i}/{'hasIt' if i % 2 else 'missing'}", cs.SupportedLanguage.GO)
+            for i in range(cs.STDLIB_HELPER_BATCH_SIZE + 10)
+        ]
+
+        extractor.prefetch(names)
+        with patch.object(se, "_query_helper") as helper:
+            results = [extractor.extract_module_path(n, lang) for n, lang in names]
+
+        helper.assert_not_called()
+        assert launches == [[cs.SupportedLanguage.GO]]
+        assert results[:2] == ["pkg0/missing", "pkg1"]
+
+    def test_hung_helper_is_abandoned_for_the_heuristics(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(cs, "STDLIB_HELPER_TIMEOUT", 0.5)
+        hang = [sys.executable, "-c", "import time; time.sleep(60)"]
+        with patch.object(se._IntrospectionHelper, "_command", return_value=hang):
+            result = StdlibExtractor().extract_module_path(
+                "string.hasIt", cs.SupportedLanguage.LUA
+            )
+            again = se._query_helper(cs.SupportedLanguage.LUA, [("table", "hasIt")])
+
+        assert result == "string.hasIt"
+        assert again == [None]
 
 
 class TestPythonExtractorEdgeCases:
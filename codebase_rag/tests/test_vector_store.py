@@ -193,7 +193,11 @@ def test_search_embeddings_calls_query_points(
         results = search_embeddings(query_embedding, top_k=5)
 
     mock_qdrant_client.query_points.assert_called_once_with(
-        collection_name="code_embeddings", query=query_embedding, limit=5
+        collection_name="code_embeddings",
+        query=query_embedding,
+        limit=5,
+        query_filter=None,
+        search_params=None,
     )
     assert results == [(1, 0.95), (2, 0.85)]
 
@@ -259,7 +263,11 @@ def test_search_embeddings_default_top_k(
         search_embeddings([0.2] * 768)
 
     mock_qdrant_client.query_points.assert_called_once_with(
-        collection_name="code_embeddings", query=[0.2] * 768, limit=5
+        collection_name="code_embeddings",
+        query=[0.2] * 768,
+        limit=5,
+        query_filter=None,
+        search_params=None,
     )
 
 
@@ -525,3 +533,45 @@ def test_process_exit_closes_local_client_cleanly(temp_qdrant_path: Path) -> Non
     )
     assert result.returncode == 0
     assert "Exception ignored" not in result.stderr
+
+
+@pytest.mark.skipif(not has_qdrant_client(), reason="qdrant-client not installed")
+def test_qdrant_quantization_builds_codes_and_rescores(
+    mock_qdrant_client: MagicMock, reset_global_client: None
+) -> None:
+    from qdrant_client import models
+
+    import codebase_rag.vector_store as vs
+
+    mock_qdrant_client.collection_exists.return_value = False
+    mock_qdrant_client.query_points.return_value = MagicMock(points=[])
+    with (
+        patch.object(vs.settings, "VECTOR_QUANTIZATION", "int8"),
+        patch.object(vs.settings, "VECTOR_RESCORE_OVERSAMPLING", 2.5),
+        patch(
+            "codebase_rag.vector_store.QdrantClient", return_value=mock_qdrant_client
+        ),
+    ):
+        vs.search_embeddings([0.1] * 768, top_k=5)
+
+    create = mock_qdrant_client.create_collection.call_args.kwargs
+    assert create["vectors_config"].on_disk is True
+    assert create["quantization_config"].scalar.type == models.ScalarType.INT8
+    params = mock_qdrant_client.query_points.call_args.kwargs["search_params"]
+    assert params.quantization.rescore is True
+    assert params.quantization.oversampling == 2.5
+
+
+def test_milvus_rescoring_orders_the_shortlist_by_exact_cosine() -> None:
+    import codebase_rag.vector_store as vs
+
+    hits = [
+        {"id": 1, "distance": 0.99, "entity": {"node_id": 1, "embedding": [0.0, 1.0]}},
+        {"id": 2, "distance": 0.98, "entity": {"node_id": 2, "embedding": [1.0, 0.1]}},
+        {"id": 3, "distance": 0.97, "entity": {"node_id": 3, "embedding": [2.0, 0.0]}},
+    ]
+    rescored = vs._rescore_milvus_hits(hits, [1.0, 0.0], 2)
+    assert [node_id for node_id, _score, _qn in rescored] == [3, 2]
+    assert rescored[0][1] == pytest.approx(1.0)
+    assert vs._pq_subvectors(768) == 96
+    assert vs._pq_subvectors(100) == 10
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import DEFAULT, MagicMock, patch
+
+import pytest
+
+from codebase_rag import constants as cs
+from codebase_rag.graph_updater import GraphUpdater
+from codebase_rag.parser_loader import load_parsers
+from codebase_rag.warm_state import load_warm_state
+
+# A finished run persists its registries; a watcher whose initial run found
+# the repo in sync loads them instead of reading locations from the graph.
+
+_REHYDRATORS = (
+    "_rehydrate_csharp_type_locations",
+    "_rehydrate_go_type_locations",
+    "_rehydrate_function_locations",
+)
+
+
+@pytest.fixture
+def py_project(temp_repo: Path) -> Path:
+    (temp_repo / "__init__.py").touch()
+    (temp_repo / "module_a.py").write_text("def func_a():\n    pass\n")
+    (temp_repo / "module_b.py").write_text(
+        "from module_a import func_a\n\n\ndef func_b():\n    func_a()\n"
+    )
+    return temp_repo
+
+
+def _updater(repo: Path, ingestor: MagicMock) -> GraphUpdater:
+    parsers, queries = load_parsers()
+    return GraphUpdater(
+        ingestor=ingestor, repo_path=repo, parsers=parsers, queries=queries
+    )
+
+
+def _snapshot(repo: Path) -> dict:
+    return json.loads((repo / cs.WARM_STATE_FILENAME).read_text())
+
+
+def test_in_sync_watcher_starts_from_the_snapshot(
+    py_project: Path, mock_ingestor: MagicMock
+) -> None:
+    _updater(py_project, mock_ingestor).run()
+
+    updater = _updater(py_project, mock_ingestor)
+    updater.run()
+    assert updater.skipped_because_in_sync
+
+    assert updater.load_warm_state() is True
+    func_a = f"{updater.project_name}.module_a.func_a"
+    assert func_a in updater.function_registry
+    assert updater.factory.definition_processor.function_locations
+    assert updater.factory.import_processor.import_mapping[
+        f"{updater.project_name}.module_b"
+    ]
+    with patch.multiple(updater, **dict.fromkeys(_REHYDRATORS, DEFAULT)):
+        updater.ensure_warm_state()
+        for name in _REHYDRATORS:
+            getattr(updater, name).assert_not_called()
+
+
+def test_snapshot_from_another_hash_cache_is_ignored(
+    py_project: Path, mock_ingestor: MagicMock
+) -> None:
+    _updater(py_project, mock_ingestor).run()
+    (py_project / cs.HASH_CACHE_FILENAME).write_text("{}")
+
+    updater = _updater(py_project, mock_ingestor)
+    assert updater.load_warm_state() is False
+    assert len(updater.function_registry) == 0
+    with patch.multiple(updater, **dict.fromkeys(_REHYDRATORS, DEFAULT)):
+        updater.ensure_warm_state()
+        updater.ensure_warm_state()
+        for name in _REHYDRATORS:
+            getattr(updater, name).assert_called_once()
+
+
+def test_incremental_run_keeps_unchanged_import_maps(
+    py_project: Path, mock_ingestor: MagicMock
+) -> None:
+    _updater(py_project, mock_ingestor).run()
+    (py_project / "module_a.py").write_text("def func_a():\n    return 1\n")
+
+    updater = _updater(py_project, mock_ingestor)
+    updater.run()
+    assert not updater.skipped_because_in_sync
+
+    module_b = f"{updater.project_name}.module_b"
+    assert module_b not in updater.factory.import_processor.import_mapping
+    assert module_b in _snapshot(py_project)[cs.WARM_STATE_KEY_IMPORT_MAPPING]
+
+
+def test_malformed_rows_are_dropped_at_load(
+    py_project: Path, mock_ingestor: MagicMock
+) -> None:
+    _updater(py_project, mock_ingestor).run()
+    state_path = py_project / cs.WARM_STATE_FILENAME
+    data = _snapshot(py_project)
+    rows = data[cs.WARM_STATE_KEY_FUNCTION_LOCATIONS]
+    data[cs.WARM_STATE_KEY_FUNCTION_LOCATIONS] = [["m", "1", 0], *rows]
+    data[cs.WARM_STATE_KEY_REGISTRY]["bad"] = 3
+    state_path.write_text(json.dumps(data))
+    digest = data[cs.WARM_STATE_KEY_HASH_CACHE]
+    project = data[cs.WARM_STATE_KEY_PROJECT]
+
+    state = load_warm_state(state_path, project, digest)
+    assert state is not None
+    assert state.function_locations == [tuple(row) for row in rows]
+    assert "bad" not in state.registry
+
+    data[cs.WARM_STATE_KEY_MACROS] = {}
+    state_path.write_text(json.dumps(data))
+    assert load_warm_state(state_path, project, digest) is None
+
+
+def test_snapshot_is_optional(
+    py_project: Path, mock_ingestor: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        "codebase_rag.graph_updater.settings.WARM_STATE_SNAPSHOT", False
+    )
+    _updater(py_project, mock_ingestor).run()
+
+    assert not (py_project / cs.WARM_STATE_FILENAME).exists()
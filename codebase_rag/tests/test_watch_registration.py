@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Protocol, runtime_checkable
+from unittest.mock import MagicMock
+
+import pytest
+from loguru import logger
+from watchdog.events import (
+    DirCreatedEvent,
+    DirDeletedEvent,
+    FileModifiedEvent,
+    FileOpenedEvent,
+)
+from watchdog.observers.api import ObservedWatch
+
+from codebase_rag import constants as cs
+from codebase_rag import logs
+from codebase_rag.utils.path_utils import should_keep_dir
+from realtime_updater import CodeChangeEventHandler, DirectoryWatches
+
+# The watcher registers watches around the indexer's ignored subtrees instead
+# of one recursive watch over the whole repository.
+
+
+class _FakeObserver:
+    def __init__(self) -> None:
+        self.scheduled: dict[ObservedWatch, str] = {}
+
+    def schedule(self, _handler, path: str, *, recursive: bool) -> ObservedWatch:
+        watch = ObservedWatch(path, recursive=recursive)
+        self.scheduled[watch] = path
+        return watch
+
+    def unschedule(self, watch: ObservedWatch) -> None:
+        del self.scheduled[watch]
+
+
+@runtime_checkable
+class _AnyProtocol(Protocol):
+    pass
+
+
+def _heavy(path: Path) -> None:
+    for i in range(cs.WATCH_PRUNED_SUBTREE_MIN_DIRS):
+        (path / f"pkg{i}").mkdir(parents=True)
+
+
+@pytest.fixture
+def repo(temp_repo: Path) -> Path:
+    (temp_repo / "src" / "app").mkdir(parents=True)
+    (temp_repo / "src" / "app" / "main.py").write_text("x = 1\n")
+    (temp_repo / "src" / "__pycache__").mkdir()
+    (temp_repo / "docs").mkdir()
+    _heavy(temp_repo / "node_modules")
+    return temp_repo
+
+
+def _watches(repo: Path, max_watches: int = 64) -> DirectoryWatches:
+    watches = DirectoryWatches(
+        _FakeObserver(), MagicMock(), repo, should_keep_dir, max_watches
+    )
+    watches.start()
+    return watches
+
+
+def test_large_ignored_subtree_is_left_out(repo: Path) -> None:
+    watches = _watches(repo)
+
+    assert watches.watched == {cs.ROOT_DIR_KEY: False, "docs": True, "src": True}
+
+
+def test_ignored_subtree_growing_inside_a_recursive_watch_splits_it(
+    repo: Path,
+) -> None:
+    watches = _watches(repo)
+    _heavy(repo / "src" / "node_modules")
+
+    watches.directory_created(repo / "src" / "node_modules" / "pkg3")
+
+    assert watches.watched == {
+        cs.ROOT_DIR_KEY: False,
+        "docs": True,
+        "src": False,
+        "src/app": True,
+    }
+
+
+def test_new_directory_is_registered_with_its_files(repo: Path) -> None:
+    watches = _watches(repo)
+    (repo / "lib" / "node_modules").mkdir(parents=True)
+    (repo / "lib" / "util.py").write_text("")
+    (repo / "lib" / "node_modules" / "dep.js").write_text("")
+
+    files = watches.directory_created(repo / "lib")
+
+    assert watches.watched["lib"] is True
+    assert files == [repo / "lib" / "util.py"]
+    assert watches.directory_created(repo / "node_modules" / "late") == []
+
+
+def test_deleted_directory_is_unregistered(repo: Path) -> None:
+    watches = _watches(repo)
+
+    watches.directory_deleted(repo / "src")
+
+    assert "src" not in watches.watched
+
+
+def test_watch_limit_keeps_one_recursive_watch(repo: Path) -> None:
+    watches = _watches(repo, max_watches=2)
+
+    assert watches.watched == {cs.ROOT_DIR_KEY: True}
+
+
+def test_handler_counts_dropped_and_processed_events(
+    mock_updater: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("realtime_updater.QueryProtocol", _AnyProtocol)
+    handler = CodeChangeEventHandler(mock_updater, debounce_seconds=0)
+    handler.ignore_patterns = handler.ignore_patterns - {"tmp", "temp"}
+    repo = mock_updater.repo_path
+    (repo / "app.py").write_text("x = 1\n")
+    (repo / "node_modules").mkdir()
+
+    handler.dispatch(FileModifiedEvent(str(repo / "app.py")))
+    handler.dispatch(FileOpenedEvent(str(repo / "app.py")))
+    handler.dispatch(FileModifiedEvent(str(repo / "node_modules" / "x.js")))
+    handler.dispatch(DirCreatedEvent(str(repo / "node_modules")))
+
+    assert handler.event_counts == (1, 3)
+
+
+def test_handler_reports_event_counts_only_when_they_move(
+    mock_updater: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("realtime_updater.QueryProtocol", _AnyProtocol)
+    handler = CodeChangeEventHandler(mock_updater, debounce_seconds=0)
+    repo = mock_updater.repo_path
+    reported: list[str] = []
+    sink_id = logger.add(
+        lambda message: reported.append(message.record["message"]),
+        filter=lambda record: record["message"].startswith("Watcher events"),
+    )
+    try:
+        handler.report_event_counts()
+        handler.dispatch(FileOpenedEvent(str(repo / "app.py")))
+        handler.report_event_counts()
+        handler.report_event_counts()
+        handler.report_event_counts(force=True)
+    finally:
+        logger.remove(sink_id)
+
+    assert reported == [
+        logs.WATCHER_EVENT_COUNTS.format(processed=0, dropped=1),
+        logs.WATCHER_EVENT_COUNTS.format(processed=0, dropped=1),
+    ]
+
+
+def test_handler_forwards_directory_events(
+    mock_updater: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("realtime_updater.QueryProtocol", _AnyProtocol)
+    handler = CodeChangeEventHandler(mock_updater, debounce_seconds=0)
+    handler.ignore_patterns = handler.ignore_patterns - {"tmp", "temp"}
+    repo = mock_updater.repo_path
+    _heavy(repo / "node_modules")
+    handler.watches = _watches(repo)
+    (repo / "pkg").mkdir()
+    (repo / "pkg" / "mod.py").write_text("def f():\n    pass\n")
+
+    handler.dispatch(DirCreatedEvent(str(repo / "pkg")))
+
+    assert "pkg" in handler.watches.watched
+    assert handler.event_counts.processed == 1
+
+    handler.dispatch(DirDeletedEvent(str(repo / "pkg")))
+
+    assert "pkg" not in handler.watches.watched
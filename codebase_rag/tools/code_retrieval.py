@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 from pathlib import Path
+from typing import NamedTuple
 
 from loguru import logger
 from pydantic_ai import Tool
@@ -16,9 +17,19 @@ from ..utils.path_utils import (
     absolute_path_within_project_root,
     project_roots_from_rows,
 )
+from ..utils.source_extraction import SourceLines
 from . import tool_descriptions as td
 
 
+class _SnippetLocation(NamedTuple):
+    qualified_name: str
+    full_path: Path
+    file_path: str
+    start_line: int
+    end_line: int
+    docstring: str | None
+
+
 class CodeRetriever:
     __slots__ = ("project_root", "ingestor", "_project_roots")
 
@@ -38,6 +49,33 @@ class CodeRetriever:
         return self._project_roots
 
     async def find_code_snippet(self, qualified_name: str) -> CodeSnippet:
+        return (await self.find_code_snippets([qualified_name]))[0]
+
+    async def find_code_snippets(self, qualified_names: list[str]) -> list[CodeSnippet]:
+        """Snippets for `qualified_names`, in order, reading each file once.
+
+        Every name is located in the graph first; the located spans are then
+        grouped by file so a module holding many of them is decoded and
+        line-indexed a single time.
+        """
+        located = [await self._locate(qn) for qn in qualified_names]
+        sources: dict[Path, SourceLines | Exception] = {}
+        for item in located:
+            if isinstance(item, _SnippetLocation) and item.full_path not in sources:
+                try:
+                    sources[item.full_path] = await asyncio.to_thread(
+                        SourceLines.read_text, item.full_path, ENCODING_UTF8
+                    )
+                except Exception as e:
+                    sources[item.full_path] = e
+        return [
+            item
+            if isinstance(item, CodeSnippet)
+            else self._slice_snippet(item, sources[item.full_path])
+            for item in located
+        ]
+
+    async def _locate(self, qualified_name: str) -> CodeSnippet | _SnippetLocation:
         logger.info(ls.CODE_RETRIEVER_SEARCH.format(name=qualified_name))
 
         params = {"qn": qualified_name}
@@ -116,42 +154,54 @@ class CodeRetriever:
                         path=file_path_str
                     ),
                 )
-            with full_path.open("r", encoding=ENCODING_UTF8) as f:
-                all_lines = f.readlines()
-
-            if end_line > len(all_lines):
-                return CodeSnippet(
-                    qualified_name=qualified_name,
-                    source_code="",
-                    file_path=file_path_str,
-                    line_start=0,
-                    line_end=0,
-                    found=False,
-                    error_message=te.CODE_MISSING_LOCATION,
-                )
-
-            snippet_lines = all_lines[start_line - 1 : end_line]
-            source_code = "".join(snippet_lines)
-
-            return CodeSnippet(
-                qualified_name=qualified_name,
-                source_code=source_code,
-                file_path=file_path_str,
-                line_start=start_line,
-                line_end=end_line,
-                docstring=res.get("docstring"),
+            docstring = res.get("docstring")
+            return _SnippetLocation(
+                qualified_name,
+                full_path,
+                file_path_str,
+                start_line,
+                end_line,
+                docstring if isinstance(docstring, str) else None,
             )
         except Exception as e:
-            logger.exception(ls.CODE_RETRIEVER_ERROR.format(error=e))
+            return self._error_snippet(qualified_name, e)
+
+    def _slice_snippet(
+        self, location: _SnippetLocation, source: SourceLines | Exception
+    ) -> CodeSnippet:
+        if isinstance(source, Exception):
+            return self._error_snippet(location.qualified_name, source)
+        if location.end_line > len(source):
             return CodeSnippet(
-                qualified_name=qualified_name,
+                qualified_name=location.qualified_name,
                 source_code="",
-                file_path="",
+                file_path=location.file_path,
                 line_start=0,
                 line_end=0,
                 found=False,
-                error_message=str(e),
+                error_message=te.CODE_MISSING_LOCATION,
             )
+        return CodeSnippet(
+            qualified_name=location.qualified_name,
+            source_code=source.span(location.start_line, location.end_line),
+            file_path=location.file_path,
+            line_start=location.start_line,
+            line_end=location.end_line,
+            docstring=location.docstring,
+        )
+
+    @staticmethod
+    def _error_snippet(qualified_name: str, error: Exception) -> CodeSnippet:
+        logger.opt(exception=error).error(ls.CODE_RETRIEVER_ERROR.format(error=error))
+        return CodeSnippet(
+            qualified_name=qualified_name,
+            source_code="",
+            file_path="",
+            line_start=0,
+            line_end=0,
+            found=False,
+            error_message=str(error),
+        )
 
 
 def create_code_retrieval_tool(code_retriever: CodeRetriever) -> Tool:
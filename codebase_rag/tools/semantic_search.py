@@ -10,6 +10,7 @@ from pydantic_ai import Tool
 from .. import constants as cs
 from .. import exceptions as ex
 from .. import logs as ls
+from ..config import settings
 from ..cypher_queries import (
     CYPHER_GET_FUNCTION_SOURCE_LOCATION,
     CYPHER_LIST_PROJECTS,
@@ -38,14 +39,35 @@ def semantic_code_search(
         return []
 
     try:
-        from ..embedder import embed_code
+        from ..lexical_index import fuse_scores, is_identifier_query, search_lexical
+        from ..query_embedding import embed_query
         from ..vector_store import search_embeddings
 
-        query_embedding = embed_code(query)
-
-        search_results = search_embeddings(
-            query_embedding, top_k=top_k, project=project
+        lexical_results = (
+            search_lexical(query, top_k, project)
+            if settings.LEXICAL_INDEX_ENABLED
+            else []
         )
+        if lexical_results and lexical_results[0].exact and is_identifier_query(query):
+            # An identifier the index holds is a lexical question; skip the
+            # model. One it only matches in parts falls through to fusion.
+            best = lexical_results[0].score
+            search_results = [
+                (hit.node_id, hit.score / best) for hit in lexical_results
+            ]
+            logger.info(
+                ls.SEMANTIC_LEXICAL_ANSWER.format(
+                    query=query, count=len(search_results)
+                )
+            )
+        else:
+            query_embedding = embed_query(query)
+            search_results = fuse_scores(
+                search_embeddings(query_embedding, top_k=top_k, project=project),
+                lexical_results,
+                top_k,
+                settings.LEXICAL_FUSION_WEIGHT,
+            )
 
         if not search_results:
             logger.info(ls.SEMANTIC_NO_MATCH.format(query=query))
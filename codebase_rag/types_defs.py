@@ -21,7 +21,7 @@ from .constants import AuditCheck, NodeLabel, RelationshipType, SupportedLanguag
 if TYPE_CHECKING:
     from tree_sitter import Language, Node, Parser, Query
 
-    from .models import LanguageSpec
+    from .models import GraphNode, GraphRelationship, LanguageSpec
 
 type LanguageLoader = Callable[[], Language] | None
 
@@ -168,6 +168,25 @@ class LoadableProtocol(Protocol):
     def _ensure_loaded(self) -> None: ...
 
 
+class GraphReaderProtocol(Protocol):
+    def load(self) -> None: ...
+    @property
+    def nodes(self) -> list[GraphNode]: ...
+    @property
+    def relationships(self) -> list[GraphRelationship]: ...
+    @property
+    def metadata(self) -> GraphMetadata: ...
+    def find_nodes_by_label(self, label: str) -> list[GraphNode]: ...
+    def find_node_by_property(
+        self, property_name: str, value: PropertyValue
+    ) -> list[GraphNode]: ...
+    def get_node_by_id(self, node_id: int) -> GraphNode | None: ...
+    def get_relationships_for_node(self, node_id: int) -> list[GraphRelationship]: ...
+    def get_outgoing_relationships(self, node_id: int) -> list[GraphRelationship]: ...
+    def get_incoming_relationships(self, node_id: int) -> list[GraphRelationship]: ...
+    def summary(self) -> GraphSummary: ...
+
+
 class CursorProtocol(Protocol):
     def execute(
         self,
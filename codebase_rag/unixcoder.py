@@ -2,6 +2,8 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT license.
 
+from typing import Any
+
 import torch
 from torch import nn
 from transformers import RobertaConfig, RobertaModel, RobertaTokenizer
@@ -10,13 +12,30 @@ from . import constants as cs
 
 
 class UniXcoder(nn.Module):
-    def __init__(self, model_name: str) -> None:
+    def __init__(
+        self,
+        model_name: str,
+        *,
+        pretrained: bool = True,
+        attn_implementation: str | None = None,
+    ) -> None:
         super().__init__()
+        # `pretrained=False` builds the architecture with untrained weights,
+        # for callers that load a state dict of their own afterwards.
+        # The attention backend is only passed when requested: transformers
+        # releases that predate `attn_implementation` reject the keyword.
+        extra: dict[str, Any] = (
+            {}
+            if attn_implementation is None
+            else {"attn_implementation": attn_implementation}
+        )
         self.tokenizer: RobertaTokenizer = RobertaTokenizer.from_pretrained(model_name)
-        self.config: RobertaConfig = RobertaConfig.from_pretrained(model_name)
+        self.config: RobertaConfig = RobertaConfig.from_pretrained(model_name, **extra)
         self.config.is_decoder = True
-        self.model: RobertaModel = RobertaModel.from_pretrained(
-            model_name, config=self.config
+        self.model: RobertaModel = (
+            RobertaModel.from_pretrained(model_name, config=self.config, **extra)
+            if pretrained
+            else RobertaModel(self.config)
         )
 
         self.register_buffer(
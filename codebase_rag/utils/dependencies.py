@@ -5,6 +5,7 @@ from collections.abc import Sequence
 
 from codebase_rag.constants import (
     MODULE_AST_GREP,
+    MODULE_NUMPY,
     MODULE_PYMILVUS,
     MODULE_QDRANT_CLIENT,
     MODULE_TORCH,
@@ -41,6 +42,10 @@ def has_pymilvus() -> bool:
     return _check_dependency(MODULE_PYMILVUS)
 
 
+def has_numpy() -> bool:
+    return _check_dependency(MODULE_NUMPY)
+
+
 def has_ast_grep() -> bool:
     return _check_dependency(MODULE_AST_GREP)
 
@@ -51,6 +56,8 @@ def has_vector_store_dependencies() -> bool:
     backend = settings.VECTOR_STORE_BACKEND
     if backend == VectorStoreBackend.MILVUS:
         return has_pymilvus()
+    if backend == VectorStoreBackend.LOCAL:
+        return has_numpy()
     return has_qdrant_client()
 
 
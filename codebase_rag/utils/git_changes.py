@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import subprocess
+from pathlib import Path
+from typing import NamedTuple
+
+from .. import constants as cs
+
+# Change detection from git instead of a tree walk: the paths that can differ
+# from the last indexed run are the commits since its HEAD, whatever is dirty
+# now, and whatever was dirty then (its indexed bytes were never committed).
+# Every query runs in the repo directory, so a repo nested inside a larger
+# work tree sees only its own paths, relative to itself.
+
+
+class GitSnapshot(NamedTuple):
+    head: str
+    # Work-tree paths whose content differs from HEAD: staged or unstaged
+    # edits, deletions, and untracked files git does not ignore.
+    dirty: frozenset[str]
+
+
+class GitIndexState(NamedTuple):
+    commit: str
+    dirty: frozenset[str]
+    # Whether git saw every eligible file of that run; an ignored one could
+    # change without git reporting it, so such a repo always walks.
+    complete: bool
+    config: str
+
+
+def _git(repo_path: Path, *args: str) -> str | None:
+    try:
+        proc = subprocess.run(
+            ["git", "-C", str(repo_path), *args],
+            capture_output=True,
+            text=True,
+            encoding=cs.ENCODING_UTF8,
+            timeout=cs.GIT_CHANGE_TIMEOUT,
+            check=False,
+        )
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return None
+    if proc.returncode != 0:
+        return None
+    return proc.stdout
+
+
+def _z_paths(output: str) -> frozenset[str]:
+    return frozenset(path for path in output.split("\0") if path)
+
+
+def read_git_snapshot(repo_path: Path) -> GitSnapshot | None:
+    head = _git(repo_path, "rev-parse", "--verify", "-q", "HEAD")
+    if not head:
+        return None
+    changed = _git(
+        repo_path, "diff", "--name-only", "-z", "--no-renames", "--relative", "HEAD"
+    )
+    untracked = _git(repo_path, "ls-files", "-z", "--others", "--exclude-standard")
+    if changed is None or untracked is None:
+        return None
+    return GitSnapshot(head.strip(), _z_paths(changed) | _z_paths(untracked))
+
+
+def committed_changes(repo_path: Path, since: str, head: str) -> frozenset[str] | None:
+    # None when `since` is no longer reachable (history rewritten, shallow).
+    if since == head:
+        return frozenset()
+    output = _git(
+        repo_path,
+        "diff",
+        "--name-only",
+        "-z",
+        "--no-renames",
+        "--relative",
+        since,
+        head,
+    )
+    return None if output is None else _z_paths(output)
+
+
+def tracked_files(repo_path: Path) -> frozenset[str] | None:
+    output = _git(repo_path, "ls-files", "-z")
+    return None if output is None else _z_paths(output)
+
+
+def load_git_index_state(state_path: Path) -> GitIndexState | None:
+    try:
+        data = json.loads(state_path.read_text(encoding=cs.ENCODING_UTF8))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    commit = data.get(cs.GIT_STATE_KEY_COMMIT)
+    dirty = data.get(cs.GIT_STATE_KEY_DIRTY)
+    complete = data.get(cs.GIT_STATE_KEY_COMPLETE)
+    config = data.get(cs.GIT_STATE_KEY_CONFIG)
+    if not (
+        isinstance(commit, str)
+        and isinstance(dirty, list)
+        and isinstance(complete, bool)
+        and isinstance(config, str)
+    ):
+        return None
+    return GitIndexState(
+        commit, frozenset(p for p in dirty if isinstance(p, str)), complete, config
+    )
+
+
+def save_git_index_state(state_path: Path, state: GitIndexState) -> None:
+    try:
+        with state_path.open("w", encoding=cs.ENCODING_UTF8) as f:
+            json.dump(
+                {
+                    cs.GIT_STATE_KEY_COMMIT: state.commit,
+                    cs.GIT_STATE_KEY_DIRTY: sorted(state.dirty),
+                    cs.GIT_STATE_KEY_COMPLETE: state.complete,
+                    cs.GIT_STATE_KEY_CONFIG: state.config,
+                },
+                f,
+            )
+    except OSError:
+        pass
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from itertools import accumulate
 from pathlib import Path
 
 from loguru import logger
@@ -9,45 +10,116 @@ from .. import logs as ls
 from ..constants import ENCODING_UTF8
 
 
-def extract_source_lines(
-    file_path: Path, start_line: int, end_line: int, encoding: str = ENCODING_UTF8
-) -> str | None:
-    if not file_path.exists():
-        logger.warning(ls.SOURCE_FILE_NOT_FOUND.format(path=file_path))
-        return None
+def _newline_offsets(text: str) -> list[int]:
+    offsets = [0]
+    pos = text.find("\n")
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = text.find("\n", pos + 1)
+    if offsets[-1] != len(text):
+        offsets.append(len(text))
+    return offsets
 
-    if start_line < 1 or end_line < 1 or start_line > end_line:
-        logger.warning(ls.SOURCE_INVALID_RANGE.format(start=start_line, end=end_line))
-        return None
 
-    try:
-        raw_bytes = file_path.read_bytes()
-        text = raw_bytes.decode(encoding)
-        lines = text.splitlines(keepends=True)
+class SourceLines:
+    """A file decoded once, with the offset of every line start.
 
-        if not lines:
+    Slicing a span is then two list lookups and one string slice, so a
+    module with hundreds of definitions is read and split once rather than
+    once per definition. `read` splits like `str.splitlines` (the embedding
+    pass's historical line numbering); `read_text` translates newlines and
+    splits on "\n" only, matching `readlines` on a text-mode handle.
+    """
+
+    __slots__ = ("path", "_text", "_offsets")
+
+    def __init__(self, path: Path, text: str, offsets: list[int]) -> None:
+        self.path = path
+        self._text = text
+        self._offsets = offsets
+
+    @classmethod
+    def read(cls, path: Path, encoding: str = ENCODING_UTF8) -> SourceLines | None:
+        if not path.exists():
+            logger.warning(ls.SOURCE_FILE_NOT_FOUND.format(path=path))
+            return None
+        try:
+            text = path.read_bytes().decode(encoding)
+        except Exception as e:
+            logger.warning(ls.SOURCE_EXTRACT_FAILED.format(path=path, error=e))
             return None
+        offsets = [0, *accumulate(map(len, text.splitlines(keepends=True)))]
+        return cls(path, text, offsets)
+
+    @classmethod
+    def read_text(cls, path: Path, encoding: str = ENCODING_UTF8) -> SourceLines:
+        text = path.read_text(encoding=encoding)
+        return cls(path, text, _newline_offsets(text))
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
 
-        if start_line > len(lines) or end_line > len(lines):
+    def span(self, start_line: int, end_line: int) -> str:
+        """Lines `start_line`..`end_line` (1-based, inclusive), terminators kept."""
+        return self._text[self._offsets[start_line - 1] : self._offsets[end_line]]
+
+    def extract(self, start_line: int, end_line: int) -> str | None:
+        """`extract_source_lines` semantics: validated, clamped and stripped."""
+        if start_line < 1 or end_line < 1 or start_line > end_line:
+            logger.warning(
+                ls.SOURCE_INVALID_RANGE.format(start=start_line, end=end_line)
+            )
+            return None
+        length = len(self)
+        if not length:
+            return None
+        if end_line > length:
             logger.warning(
                 ls.SOURCE_RANGE_EXCEEDS.format(
-                    start=start_line,
-                    end=end_line,
-                    length=len(lines),
-                    path=file_path,
+                    start=start_line, end=end_line, length=length, path=self.path
                 )
             )
-            end_line = min(end_line, len(lines))
-            if start_line > len(lines):
+            if start_line > length:
                 return None
+            end_line = length
+        return self.span(start_line, end_line).strip()
+
+
+class LastSourceFile:
+    """Keeps only the most recently read file.
 
-        extracted_lines = lines[start_line - 1 : end_line]
-        return "".join(extracted_lines).strip()
+    Callers that visit spans grouped by path read each file once while
+    holding a single file in memory; the read is deferred until a span
+    actually needs it.
+    """
 
-    except Exception as e:
-        logger.warning(ls.SOURCE_EXTRACT_FAILED.format(path=file_path, error=e))
+    __slots__ = ("_path", "_source")
+
+    def __init__(self) -> None:
+        self._path: Path | None = None
+        self._source: SourceLines | None = None
+
+    def get(self, path: Path, encoding: str = ENCODING_UTF8) -> SourceLines | None:
+        if path != self._path:
+            self._path = path
+            self._source = SourceLines.read(path, encoding)
+        return self._source
+
+
+def extract_source_lines(
+    file_path: Path, start_line: int, end_line: int, encoding: str = ENCODING_UTF8
+) -> str | None:
+    if not file_path.exists():
+        logger.warning(ls.SOURCE_FILE_NOT_FOUND.format(path=file_path))
         return None
 
+    if start_line < 1 or end_line < 1 or start_line > end_line:
+        logger.warning(ls.SOURCE_INVALID_RANGE.format(start=start_line, end=end_line))
+        return None
+
+    source = SourceLines.read(file_path, encoding)
+    return None if source is None else source.extract(start_line, end_line)
+
 
 def extract_source_with_fallback(
     file_path: Path,
@@ -56,6 +128,7 @@ def extract_source_with_fallback(
     qualified_name: str | None = None,
     ast_extractor: Callable[[str, Path], str | None] | None = None,
     encoding: str = ENCODING_UTF8,
+    source_cache: LastSourceFile | None = None,
 ) -> str | None:
     if ast_extractor and qualified_name:
         try:
@@ -64,6 +137,9 @@ def extract_source_with_fallback(
         except Exception as e:
             logger.debug(ls.SOURCE_AST_FAILED, name=qualified_name, error=e)
 
+    if source_cache is not None:
+        source = source_cache.get(file_path, encoding)
+        return None if source is None else source.extract(start_line, end_line)
     return extract_source_lines(file_path, start_line, end_line, encoding)
 
 
@@ -0,0 +1,98 @@
+"""Quantized codes for a coarse first pass, rescored at full precision.
+
+Rows are unit vectors, so every component lies in [-1, 1]:
+
+- `int8` stores round(127 * x), a quarter of float32; the coarse score is
+  the dot product of the codes with the float query.
+- `binary` stores the sign of each component, one bit per dimension, a
+  thirty-second of float32; the coarse score is minus the number of signs
+  that differ from the query's.
+
+Coarse scores only shortlist candidates: the `oversampling * k` best are
+rescored against the float32 rows, so the returned order is exact within
+the shortlist and recall is lost only when a true neighbour falls outside it.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from numpy.typing import NDArray
+
+from . import constants as cs
+from . import exceptions as ex
+
+_INT8_SCALE = 127.0
+# Rows decoded per step, bounding the float32 copy a coarse pass makes.
+_CHUNK_ROWS = 65536
+
+LOCAL_MODES = frozenset({cs.VectorQuantization.INT8, cs.VectorQuantization.BINARY})
+
+
+def code_width(dim: int, mode: cs.VectorQuantization) -> int:
+    """Bytes per row of `mode` codes for `dim`-dimensional vectors."""
+    match mode:
+        case cs.VectorQuantization.NONE:
+            return dim * np.dtype(np.float32).itemsize
+        case cs.VectorQuantization.INT8:
+            return dim
+        case cs.VectorQuantization.BINARY:
+            return -(-dim // 8)
+    raise ValueError(ex.VECTOR_QUANTIZATION_UNSUPPORTED.format(mode=mode))
+
+
+def code_dtype(mode: cs.VectorQuantization) -> type[np.integer]:
+    return np.uint8 if mode == cs.VectorQuantization.BINARY else np.int8
+
+
+def encode(vectors: NDArray[np.float32], mode: cs.VectorQuantization) -> NDArray:
+    """Codes for unit-normalised `vectors`, one row of `code_width` each."""
+    match mode:
+        case cs.VectorQuantization.INT8:
+            return np.clip(
+                np.rint(vectors * _INT8_SCALE), -_INT8_SCALE, _INT8_SCALE
+            ).astype(np.int8)
+        case cs.VectorQuantization.BINARY:
+            return np.packbits(vectors > 0, axis=1)
+    raise ValueError(ex.VECTOR_QUANTIZATION_UNSUPPORTED.format(mode=mode))
+
+
+def _popcount(bits: NDArray[np.uint8]) -> NDArray[np.int64]:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(bits).sum(axis=1, dtype=np.int64)
+    return np.unpackbits(bits, axis=1).sum(axis=1, dtype=np.int64)
+
+
+def coarse_scores(
+    codes: NDArray, query: NDArray[np.float32], mode: cs.VectorQuantization
+) -> NDArray[np.float32]:
+    """Approximate similarity of each code row to the unit `query`."""
+    if mode == cs.VectorQuantization.BINARY:
+        query_bits = np.packbits(query > 0)
+        parts = [
+            -_popcount(codes[start : start + _CHUNK_ROWS] ^ query_bits)
+            for start in range(0, len(codes), _CHUNK_ROWS)
+        ]
+    else:
+        parts = [
+            codes[start : start + _CHUNK_ROWS].astype(np.float32) @ query
+            for start in range(0, len(codes), _CHUNK_ROWS)
+        ]
+    if not parts:
+        return np.empty(0, dtype=np.float32)
+    return np.concatenate(parts).astype(np.float32)
+
+
+def shortlist_size(k: int, oversampling: float) -> int:
+    return max(k, math.ceil(k * oversampling))
+
+
+def shortlist(
+    scores: NDArray[np.float32], rows: NDArray[np.int64], size: int
+) -> NDArray[np.int64]:
+    """The `size` rows with the best coarse scores, in row order."""
+    if size >= len(rows):
+        return rows
+    picked = np.argpartition(-scores, size - 1)[:size]
+    return np.sort(rows[picked])
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import atexit
+import json
+import math
 import time
 from collections.abc import Callable, Sequence
 from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
 from typing import Any, Protocol, cast
 from urllib.parse import urlsplit
 
@@ -11,14 +14,31 @@ from loguru import logger
 
 from . import logs as ls
 from .config import settings
-from .constants import PAYLOAD_NODE_ID, PAYLOAD_QUALIFIED_NAME, VectorStoreBackend
-from .utils.dependencies import has_pymilvus, has_qdrant_client
+from .constants import (
+    PAYLOAD_NODE_ID,
+    PAYLOAD_PROJECT,
+    PAYLOAD_QUALIFIED_NAME,
+    VectorQuantization,
+    VectorStoreBackend,
+)
+from .lexical_index import clear_lexical_index, delete_lexical_ids
+from .utils.dependencies import has_numpy, has_pymilvus, has_qdrant_client
 
 _RETRIEVE_BATCH_SIZE = 1000
 _MILVUS_VECTOR_FIELD = "embedding"
+_MILVUS_PROJECT_MAX_LENGTH = 1024
+_MILVUS_IVF_LISTS = 1024
+# Target dimensions per product-quantizer sub-vector (8 bits each).
+_MILVUS_PQ_SUBVECTOR_DIM = 8
 _PROJECT_OVERFETCH = 4
 _PROJECT_MAX_FETCH = 1024
 
+type ScopedQuery = Callable[[int, str | None], Sequence[tuple[int, float, Any]]]
+
+
+def _payload_project(qualified_name: str) -> str:
+    return qualified_name.split(".", 1)[0]
+
 
 def _filter_by_project(
     scored: Sequence[tuple[int, float, Any]], project: str, top_k: int
@@ -37,9 +57,10 @@ def _search_project_scoped(
     top_k: int,
     project: str,
 ) -> list[tuple[int, float]]:
-    # ponytail: client-side prefix filter with a widening window, capped at
-    # _PROJECT_MAX_FETCH; switch to an indexed payload/expr filter if a
-    # project's matches routinely sit past the cap.
+    # Client-side prefix filter with a widening window, capped at
+    # _PROJECT_MAX_FETCH. Only the cases the store cannot filter exactly
+    # land here: a dotted scope narrower than the stored project, and
+    # Milvus collections created before the project field existed.
     fetch_k = top_k * _PROJECT_OVERFETCH
     while True:
         hits = run_query(fetch_k)
@@ -50,18 +71,55 @@ def _search_project_scoped(
         fetch_k = min(fetch_k * _PROJECT_OVERFETCH, _PROJECT_MAX_FETCH)
 
 
+def _search_project(
+    run_query: ScopedQuery, top_k: int, project: str, *, server_filter: bool = True
+) -> list[tuple[int, float]]:
+    if not server_filter:
+        return _search_project_scoped(
+            lambda limit: run_query(limit, None), top_k, project
+        )
+    stored_project = _payload_project(project)
+    if stored_project == project:
+        return [
+            (node_id, score) for node_id, score, _ in run_query(top_k, stored_project)
+        ]
+    return _search_project_scoped(
+        lambda limit: run_query(limit, stored_project), top_k, project
+    )
+
+
 _CLIENT: Any | None = None
 _CLIENT_BACKEND: VectorStoreBackend | None = None
+# False once the open Milvus collection is found to lack PAYLOAD_PROJECT.
+_MILVUS_HAS_PROJECT_FIELD = True
 
 # Each name is the real class or None (dependency absent), typed Any via
 # cast so ty does not flag the guarded call sites: the availability gates
 # never call the None case, and tests patch the module-level binding.
 if has_qdrant_client():
     from qdrant_client import QdrantClient
-    from qdrant_client.models import Distance, PointStruct, VectorParams
+    from qdrant_client import models as qdrant_models
+    from qdrant_client.models import (
+        Distance,
+        FieldCondition,
+        Filter,
+        IsEmptyCondition,
+        MatchValue,
+        PayloadField,
+        PayloadSchemaType,
+        PointStruct,
+        VectorParams,
+    )
 else:
     QdrantClient = cast(Any, None)
+    qdrant_models = cast(Any, None)
     Distance = cast(Any, None)
+    FieldCondition = cast(Any, None)
+    Filter = cast(Any, None)
+    IsEmptyCondition = cast(Any, None)
+    MatchValue = cast(Any, None)
+    PayloadField = cast(Any, None)
+    PayloadSchemaType = cast(Any, None)
     PointStruct = cast(Any, None)
     VectorParams = cast(Any, None)
 
@@ -96,13 +154,14 @@ class VectorStore(Protocol):
 
 
 def close_vector_store_client() -> None:
-    global _CLIENT, _CLIENT_BACKEND
+    global _CLIENT, _CLIENT_BACKEND, _MILVUS_HAS_PROJECT_FIELD
     if _CLIENT is not None:
         close = getattr(_CLIENT, "close", None)
         if callable(close):
             close()
         _CLIENT = None
         _CLIENT_BACKEND = None
+    _MILVUS_HAS_PROJECT_FIELD = True
 
 
 def close_qdrant_client() -> None:
@@ -139,6 +198,11 @@ def _get_vector_store() -> VectorStore | None:
             logger.warning(ls.VECTOR_STORE_BACKEND_UNAVAILABLE.format(backend=backend))
             return None
         return QdrantVectorStore()
+    if backend == VectorStoreBackend.LOCAL:
+        if not has_numpy():
+            logger.warning(ls.VECTOR_STORE_BACKEND_UNAVAILABLE.format(backend=backend))
+            return None
+        return LocalVectorStore()
     return None
 
 
@@ -166,13 +230,145 @@ def get_qdrant_client() -> Any:
                 raise
         _CLIENT_BACKEND = VectorStoreBackend.QDRANT
         if not _CLIENT.collection_exists(settings.QDRANT_COLLECTION_NAME):
-            _CLIENT.create_collection(
+            _create_qdrant_collection(_CLIENT)
+        else:
+            try:
+                _migrate_qdrant_collection(_CLIENT)
+            except Exception as e:
+                # An unmigrated collection only misses scoped hits or the
+                # quantized index; it stays usable and the next open retries.
+                logger.warning(
+                    ls.VECTOR_STORE_MIGRATION_FAILED.format(
+                        backend=VectorStoreBackend.QDRANT, error=e
+                    )
+                )
+    return _CLIENT
+
+
+def _create_qdrant_collection(client: Any) -> None:
+    quantization = _qdrant_quantization_config()
+    client.create_collection(
+        collection_name=settings.QDRANT_COLLECTION_NAME,
+        vectors_config=VectorParams(
+            size=settings.QDRANT_VECTOR_DIM,
+            distance=Distance.COSINE,
+            # Quantized codes stay in RAM; the originals, read only to
+            # rescore a shortlist, can live on disk.
+            on_disk=quantization is not None,
+        ),
+        quantization_config=quantization,
+    )
+    _ensure_qdrant_project_index(client)
+
+
+def _qdrant_quantization_config() -> Any:
+    match settings.VECTOR_QUANTIZATION:
+        case VectorQuantization.INT8:
+            return qdrant_models.ScalarQuantization(
+                scalar=qdrant_models.ScalarQuantizationConfig(
+                    type=qdrant_models.ScalarType.INT8, always_ram=True
+                )
+            )
+        case VectorQuantization.BINARY:
+            return qdrant_models.BinaryQuantization(
+                binary=qdrant_models.BinaryQuantizationConfig(always_ram=True)
+            )
+        case VectorQuantization.PRODUCT:
+            return qdrant_models.ProductQuantization(
+                product=qdrant_models.ProductQuantizationConfig(
+                    compression=qdrant_models.CompressionRatio.X16, always_ram=True
+                )
+            )
+    return None
+
+
+def _qdrant_search_params() -> Any:
+    if settings.VECTOR_QUANTIZATION == VectorQuantization.NONE:
+        return None
+    return qdrant_models.SearchParams(
+        quantization=qdrant_models.QuantizationSearchParams(
+            rescore=True, oversampling=settings.VECTOR_RESCORE_OVERSAMPLING
+        )
+    )
+
+
+def _ensure_qdrant_quantization(client: Any) -> None:
+    # Embedded Qdrant ignores quantization; a server collection created
+    # before it was enabled gets the codes built in place.
+    quantization = _qdrant_quantization_config()
+    if quantization is None or not settings.QDRANT_URL:
+        return
+    info = client.get_collection(settings.QDRANT_COLLECTION_NAME)
+    if info.config.quantization_config is not None:
+        return
+    client.update_collection(
+        collection_name=settings.QDRANT_COLLECTION_NAME,
+        quantization_config=quantization,
+    )
+    logger.info(
+        ls.VECTOR_STORE_QUANTIZATION_ENABLED.format(
+            mode=settings.VECTOR_QUANTIZATION, backend=VectorStoreBackend.QDRANT
+        )
+    )
+
+
+def _ensure_qdrant_project_index(client: Any) -> None:
+    # Embedded Qdrant filters by scanning and warns that payload indexes
+    # have no effect there, so only a server gets the keyword index.
+    if not settings.QDRANT_URL:
+        return
+    info = client.get_collection(settings.QDRANT_COLLECTION_NAME)
+    if PAYLOAD_PROJECT in (info.payload_schema or {}):
+        return
+    client.create_payload_index(
+        collection_name=settings.QDRANT_COLLECTION_NAME,
+        field_name=PAYLOAD_PROJECT,
+        field_schema=PayloadSchemaType.KEYWORD,
+    )
+
+
+def _migrate_qdrant_collection(client: Any) -> None:
+    # Points stored before the project payload existed get it from their
+    # qualified name; set_payload leaves the vectors alone, and a migrated
+    # collection costs one empty scroll per open.
+    _ensure_qdrant_project_index(client)
+    _ensure_qdrant_quantization(client)
+    missing = Filter(
+        must=[IsEmptyCondition(is_empty=PayloadField(key=PAYLOAD_PROJECT))]
+    )
+    backfilled = 0
+    while True:
+        records, _ = client.scroll(
+            collection_name=settings.QDRANT_COLLECTION_NAME,
+            scroll_filter=missing,
+            limit=_RETRIEVE_BATCH_SIZE,
+            with_payload=[PAYLOAD_QUALIFIED_NAME],
+            with_vectors=False,
+        )
+        if not records:
+            break
+        by_project: dict[str, list[Any]] = {}
+        for record in records:
+            qualified_name = (record.payload or {}).get(PAYLOAD_QUALIFIED_NAME)
+            project = (
+                _payload_project(qualified_name)
+                if isinstance(qualified_name, str)
+                else ""
+            )
+            by_project.setdefault(project, []).append(record.id)
+        for project, ids in by_project.items():
+            client.set_payload(
                 collection_name=settings.QDRANT_COLLECTION_NAME,
-                vectors_config=VectorParams(
-                    size=settings.QDRANT_VECTOR_DIM, distance=Distance.COSINE
-                ),
+                payload={PAYLOAD_PROJECT: project},
+                points=ids,
             )
-    return _CLIENT
+        backfilled += len(records)
+    if backfilled:
+        logger.info(
+            ls.VECTOR_STORE_PROJECT_BACKFILLED.format(
+                count=backfilled, backend=VectorStoreBackend.QDRANT
+            )
+        )
 
 
 def _milvus_client_kwargs() -> dict[str, str]:
@@ -205,13 +401,22 @@ def _ensure_milvus_collection(client: Any) -> None:
         datatype=DataType.VARCHAR,
         max_length=65535,
     )
+    schema.add_field(
+        field_name=PAYLOAD_PROJECT,
+        datatype=DataType.VARCHAR,
+        max_length=_MILVUS_PROJECT_MAX_LENGTH,
+    )
 
     index_params = client.prepare_index_params()
     index_params.add_index(
         field_name=_MILVUS_VECTOR_FIELD,
-        index_type="AUTOINDEX",
         metric_type="COSINE",
+        **_milvus_vector_index(),
     )
+    # Milvus Lite evaluates the filter expression by scan; a server gets an
+    # inverted index so a scoped search does not touch other projects.
+    if _is_milvus_server():
+        index_params.add_index(field_name=PAYLOAD_PROJECT, index_type="INVERTED")
     client.create_collection(
         collection_name=settings.MILVUS_COLLECTION_NAME,
         schema=schema,
@@ -220,7 +425,47 @@ def _ensure_milvus_collection(client: Any) -> None:
     )
 
 
+def _milvus_quantized() -> bool:
+    return _is_milvus_server() and settings.VECTOR_QUANTIZATION in (
+        VectorQuantization.INT8,
+        VectorQuantization.PRODUCT,
+    )
+
+
+def _milvus_vector_index() -> dict[str, Any]:
+    # Milvus Lite builds flat indexes only, and binary codes need a binary
+    # vector field (a different schema), so both stay unquantized. The index
+    # is fixed at creation: an existing collection changes after --clean.
+    mode = settings.VECTOR_QUANTIZATION
+    if mode == VectorQuantization.NONE:
+        return {"index_type": "AUTOINDEX"}
+    if not _milvus_quantized():
+        logger.warning(
+            ls.VECTOR_STORE_QUANTIZATION_UNSUPPORTED.format(
+                mode=mode, backend=VectorStoreBackend.MILVUS
+            )
+        )
+        return {"index_type": "AUTOINDEX"}
+    if mode == VectorQuantization.INT8:
+        return {"index_type": "IVF_SQ8", "params": {"nlist": _MILVUS_IVF_LISTS}}
+    return {
+        "index_type": "IVF_PQ",
+        "params": {
+            "nlist": _MILVUS_IVF_LISTS,
+            "m": _pq_subvectors(settings.MILVUS_VECTOR_DIM),
+            "nbits": 8,
+        },
+    }
+
+
+def _pq_subvectors(dim: int) -> int:
+    # IVF_PQ needs the sub-vector count to divide the dimension.
+    target = max(1, dim // _MILVUS_PQ_SUBVECTOR_DIM)
+    return max(m for m in range(1, target + 1) if dim % m == 0)
+
+
 def _validate_milvus_collection(client: Any) -> None:
+    global _MILVUS_HAS_PROJECT_FIELD
     description = client.describe_collection(
         collection_name=settings.MILVUS_COLLECTION_NAME
     )
@@ -249,6 +494,16 @@ def _validate_milvus_collection(client: Any) -> None:
             f"dimension {dim}, expected {settings.MILVUS_VECTOR_DIM}"
         )
 
+    # The schema is fixed at creation, so an older collection keeps working
+    # without the field; clear_all_embeddings recreates it with the field.
+    _MILVUS_HAS_PROJECT_FIELD = PAYLOAD_PROJECT in fields
+    if not _MILVUS_HAS_PROJECT_FIELD:
+        logger.warning(
+            ls.MILVUS_PROJECT_FIELD_MISSING.format(
+                collection=settings.MILVUS_COLLECTION_NAME, field=PAYLOAD_PROJECT
+            )
+        )
+
 
 def get_milvus_client() -> Any:
     global _CLIENT, _CLIENT_BACKEND
@@ -263,6 +518,19 @@ def get_milvus_client() -> Any:
     return _CLIENT
 
 
+def get_local_vector_client() -> Any:
+    global _CLIENT, _CLIENT_BACKEND
+    from .local_vector_store import LocalVectorClient
+
+    _ensure_client_backend(VectorStoreBackend.LOCAL)
+    if _CLIENT is None:
+        _CLIENT = LocalVectorClient(
+            Path(settings.LOCAL_VECTOR_PATH), settings.LOCAL_VECTOR_DIM
+        )
+        _CLIENT_BACKEND = VectorStoreBackend.LOCAL
+    return _CLIENT
+
+
 def _upsert_with_retry(points: list[Any]) -> None:
     client = get_qdrant_client()
     max_attempts = settings.QDRANT_UPSERT_RETRIES
@@ -301,6 +569,7 @@ class QdrantVectorStore:
                 payload={
                     PAYLOAD_NODE_ID: node_id,
                     PAYLOAD_QUALIFIED_NAME: qualified_name,
+                    PAYLOAD_PROJECT: _payload_project(qualified_name),
                 },
             )
             for node_id, embedding, qualified_name in points
@@ -349,12 +618,7 @@ class QdrantVectorStore:
         # the stale points survive.
         client = get_qdrant_client()
         client.delete_collection(collection_name=settings.QDRANT_COLLECTION_NAME)
-        client.create_collection(
-            collection_name=settings.QDRANT_COLLECTION_NAME,
-            vectors_config=VectorParams(
-                size=settings.QDRANT_VECTOR_DIM, distance=Distance.COSINE
-            ),
-        )
+        _create_qdrant_collection(client)
         logger.info(ls.VECTOR_STORE_CLEARED.format(backend=self.backend))
 
     def verify_stored_ids(self, expected_ids: set[int]) -> set[int]:
@@ -383,11 +647,15 @@ class QdrantVectorStore:
         try:
             client = get_qdrant_client()
 
-            def run_query(limit: int) -> list[tuple[int, float, Any]]:
+            def run_query(
+                limit: int, stored_project: str | None = None
+            ) -> list[tuple[int, float, Any]]:
                 result = client.query_points(
                     collection_name=settings.QDRANT_COLLECTION_NAME,
                     query=query_embedding,
                     limit=limit,
+                    query_filter=_qdrant_project_filter(stored_project),
+                    search_params=_qdrant_search_params(),
                 )
                 return [
                     (
@@ -403,12 +671,22 @@ class QdrantVectorStore:
                 return [
                     (node_id, score) for node_id, score, _ in run_query(effective_top_k)
                 ]
-            return _search_project_scoped(run_query, effective_top_k, project)
+            return _search_project(run_query, effective_top_k, project)
         except Exception as e:
             logger.warning(ls.EMBEDDING_SEARCH_FAILED.format(error=e))
             return []
 
 
+def _qdrant_project_filter(stored_project: str | None) -> Any:
+    if stored_project is None:
+        return None
+    return Filter(
+        must=[
+            FieldCondition(key=PAYLOAD_PROJECT, match=MatchValue(value=stored_project))
+        ]
+    )
+
+
 class MilvusVectorStore:
     backend = VectorStoreBackend.MILVUS
 
@@ -417,16 +695,19 @@ class MilvusVectorStore:
     ) -> int:
         if not points:
             return 0
-        rows = [
-            {
-                PAYLOAD_NODE_ID: node_id,
-                _MILVUS_VECTOR_FIELD: embedding,
-                PAYLOAD_QUALIFIED_NAME: qualified_name,
-            }
-            for node_id, embedding, qualified_name in points
-        ]
         try:
             client = get_milvus_client()
+            rows: list[dict[str, Any]] = [
+                {
+                    PAYLOAD_NODE_ID: node_id,
+                    _MILVUS_VECTOR_FIELD: embedding,
+                    PAYLOAD_QUALIFIED_NAME: qualified_name,
+                }
+                for node_id, embedding, qualified_name in points
+            ]
+            if _MILVUS_HAS_PROJECT_FIELD:
+                for row in rows:
+                    row[PAYLOAD_PROJECT] = _payload_project(row[PAYLOAD_QUALIFIED_NAME])
             client.upsert(
                 collection_name=settings.MILVUS_COLLECTION_NAME,
                 data=rows,
@@ -500,19 +781,27 @@ class MilvusVectorStore:
         output_fields = (
             [PAYLOAD_NODE_ID, PAYLOAD_QUALIFIED_NAME] if project else [PAYLOAD_NODE_ID]
         )
+        rescore = _milvus_quantized()
+        if rescore:
+            output_fields.append(_MILVUS_VECTOR_FIELD)
         try:
             client = get_milvus_client()
 
-            def run_query(limit: int) -> list[tuple[int, float, Any]]:
+            def run_query(
+                limit: int, stored_project: str | None = None
+            ) -> list[tuple[int, float, Any]]:
                 result = client.search(
                     collection_name=settings.MILVUS_COLLECTION_NAME,
                     data=[query_embedding],
                     anns_field=_MILVUS_VECTOR_FIELD,
-                    limit=limit,
+                    limit=_rescore_limit(limit) if rescore else limit,
                     output_fields=output_fields,
+                    filter=_milvus_project_filter(stored_project),
                 )
                 if not result:
                     return []
+                if rescore:
+                    return _rescore_milvus_hits(result[0], query_embedding, limit)
                 return [
                     (
                         node_id,
@@ -529,7 +818,115 @@ class MilvusVectorStore:
                 return [
                     (node_id, score) for node_id, score, _ in run_query(effective_top_k)
                 ]
-            return _search_project_scoped(run_query, effective_top_k, project)
+            return _search_project(
+                run_query,
+                effective_top_k,
+                project,
+                server_filter=_MILVUS_HAS_PROJECT_FIELD,
+            )
+        except Exception as e:
+            logger.warning(ls.EMBEDDING_SEARCH_FAILED.format(error=e))
+            return []
+
+
+def _rescore_limit(limit: int) -> int:
+    return max(limit, math.ceil(limit * settings.VECTOR_RESCORE_OVERSAMPLING))
+
+
+def _rescore_milvus_hits(
+    hits: Sequence[Any], query_embedding: list[float], limit: int
+) -> list[tuple[int, float, Any]]:
+    # The IVF_SQ8/IVF_PQ distances are approximate; the stored float
+    # vectors come back with the shortlist and give the exact cosine.
+    query_norm = math.sqrt(sum(x * x for x in query_embedding)) or 1.0
+    rescored: list[tuple[int, float, Any]] = []
+    for hit in hits:
+        entity = cast(dict[str, Any], hit).get("entity") or {}
+        vector = entity.get(_MILVUS_VECTOR_FIELD)
+        node_id = _milvus_hit_node_id(cast(dict[str, Any], hit))
+        if not isinstance(node_id, int) or not vector:
+            continue
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        score = sum(q * v for q, v in zip(query_embedding, vector)) / (
+            query_norm * norm
+        )
+        rescored.append(
+            (node_id, score, _milvus_hit_qualified_name(cast(dict[str, Any], hit)))
+        )
+    rescored.sort(key=lambda row: row[1], reverse=True)
+    return rescored[:limit]
+
+
+def _milvus_project_filter(stored_project: str | None) -> str:
+    if stored_project is None:
+        return ""
+    # A JSON string literal is a valid, escaped Milvus string literal.
+    return f"{PAYLOAD_PROJECT} == {json.dumps(stored_project)}"
+
+
+class LocalVectorStore:
+    backend = VectorStoreBackend.LOCAL
+
+    def store_embedding_batch(
+        self, points: Sequence[tuple[int, list[float], str]]
+    ) -> int:
+        if not points:
+            return 0
+        try:
+            stored = get_local_vector_client().upsert(points)
+            logger.debug(ls.EMBEDDING_BATCH_STORED.format(count=stored))
+            return stored
+        except Exception as e:
+            logger.warning(ls.EMBEDDING_BATCH_FAILED.format(error=e))
+            return 0
+
+    def delete_project_embeddings(
+        self, project_name: str, node_ids: Sequence[int]
+    ) -> None:
+        if not node_ids:
+            return
+        try:
+            logger.info(
+                ls.VECTOR_STORE_DELETE_PROJECT.format(
+                    count=len(node_ids), backend=self.backend, project=project_name
+                )
+            )
+            get_local_vector_client().delete(node_ids)
+            logger.info(
+                ls.VECTOR_STORE_DELETE_PROJECT_DONE.format(
+                    backend=self.backend, project=project_name
+                )
+            )
+        except Exception as e:
+            logger.warning(
+                ls.VECTOR_STORE_DELETE_PROJECT_FAILED.format(
+                    backend=self.backend, project=project_name, error=e
+                )
+            )
+
+    def clear_all_embeddings(self) -> None:
+        # Failures propagate; see QdrantVectorStore.clear_all_embeddings.
+        get_local_vector_client().clear()
+        logger.info(ls.VECTOR_STORE_CLEARED.format(backend=self.backend))
+
+    def verify_stored_ids(self, expected_ids: set[int]) -> set[int]:
+        if not expected_ids:
+            return set()
+        found: set[int] = get_local_vector_client().existing(expected_ids)
+        return found
+
+    def search_embeddings(
+        self,
+        query_embedding: list[float],
+        top_k: int | None = None,
+        project: str | None = None,
+    ) -> list[tuple[int, float]]:
+        effective_top_k = top_k if top_k is not None else settings.LOCAL_VECTOR_TOP_K
+        try:
+            hits: list[tuple[int, float]] = get_local_vector_client().search(
+                query_embedding, effective_top_k, project
+            )
+            return hits
         except Exception as e:
             logger.warning(ls.EMBEDDING_SEARCH_FAILED.format(error=e))
             return []
@@ -557,9 +954,12 @@ def _normalize_milvus_score(raw_score: float) -> float:
     return raw_score
 
 
+def _is_milvus_server() -> bool:
+    return urlsplit(settings.MILVUS_URI).scheme in ("http", "https", "tcp")
+
+
 def _uses_milvus_lite_30_cosine_distance() -> bool:
-    uri = settings.MILVUS_URI
-    if urlsplit(uri).scheme in ("http", "https", "tcp"):
+    if _is_milvus_server():
         return False
     try:
         lite_version = version("milvus-lite")
@@ -582,6 +982,12 @@ def store_embedding_batch(points: Sequence[tuple[int, list[float], str]]) -> int
 
 
 def delete_project_embeddings(project_name: str, node_ids: Sequence[int]) -> None:
+    # The lexical index is keyed by the same node ids, so it drops them too.
+    if node_ids and settings.LEXICAL_INDEX_ENABLED:
+        try:
+            delete_lexical_ids(project_name, set(node_ids))
+        except Exception as e:
+            logger.warning(ls.LEXICAL_INDEX_UPDATE_FAILED.format(error=e))
     vector_store = _get_vector_store()
     if vector_store is None:
         return
@@ -589,6 +995,7 @@ def delete_project_embeddings(project_name: str, node_ids: Sequence[int]) -> Non
 
 
 def clear_all_embeddings() -> None:
+    clear_lexical_index()
     vector_store = _get_vector_store()
     if vector_store is None:
         return
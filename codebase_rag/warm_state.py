@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import NamedTuple
+
+from loguru import logger
+
+from . import constants as cs
+from . import logs as ls
+from .types_defs import JsonValue
+
+# The registries a finished run leaves in memory, persisted per project (the
+# repo's WARM_STATE_FILENAME state file) so a watcher started on an in-sync
+# repo resolves its first events without project-wide graph reads. The
+# snapshot records the digest of the hash cache written by the same run: any
+# later run that re-indexes rewrites the hash cache, so a snapshot whose
+# digest no longer matches describes a different graph and is ignored.
+
+
+type FunctionLocationRow = tuple[str, int, int, str, str, str | None, bool]
+type GoTypeLocationRow = tuple[str, int, int, str, str]
+type CSharpTypeLocationRow = tuple[str, int, str]
+
+
+class WarmState(NamedTuple):
+    # qn -> NodeType value.
+    registry: dict[str, str]
+    properties: list[str]
+    macros: list[str]
+    # Module qn -> repo-relative posix path.
+    module_paths: dict[str, str]
+    # (module_qn, line, col, label, qn, container_qn, is_named)
+    function_locations: list[FunctionLocationRow]
+    # (path, line, col, qn, label)
+    go_type_locations: list[GoTypeLocationRow]
+    # (path, line, qn)
+    csharp_type_locations: list[CSharpTypeLocationRow]
+    import_mapping: dict[str, dict[str, str]]
+
+
+_KEYS: tuple[str, ...] = (
+    cs.WARM_STATE_KEY_REGISTRY,
+    cs.WARM_STATE_KEY_PROPERTIES,
+    cs.WARM_STATE_KEY_MACROS,
+    cs.WARM_STATE_KEY_MODULE_PATHS,
+    cs.WARM_STATE_KEY_FUNCTION_LOCATIONS,
+    cs.WARM_STATE_KEY_GO_TYPE_LOCATIONS,
+    cs.WARM_STATE_KEY_CSHARP_TYPE_LOCATIONS,
+    cs.WARM_STATE_KEY_IMPORT_MAPPING,
+)
+
+
+# A field of the wrong shape rejects the snapshot; a malformed entry inside
+# a well-formed field is dropped on its own.
+def _strings(value: JsonValue) -> list[str] | None:
+    if not isinstance(value, list):
+        return None
+    return [item for item in value if isinstance(item, str)]
+
+
+def _string_map(value: JsonValue) -> dict[str, str] | None:
+    if not isinstance(value, dict):
+        return None
+    return {key: item for key, item in value.items() if isinstance(item, str)}
+
+
+def _string_maps(value: JsonValue) -> dict[str, dict[str, str]] | None:
+    if not isinstance(value, dict):
+        return None
+    return {
+        key: mapping
+        for key, item in value.items()
+        if (mapping := _string_map(item)) is not None
+    }
+
+
+def _rows[R](
+    value: JsonValue, narrow: Callable[[JsonValue], R | None]
+) -> list[R] | None:
+    if not isinstance(value, list):
+        return None
+    return [row for item in value if (row := narrow(item)) is not None]
+
+
+def _function_location_row(item: JsonValue) -> FunctionLocationRow | None:
+    match item:
+        case [
+            str(module_qn),
+            int(line),
+            int(col),
+            str(label),
+            str(qn),
+            str() | None as container,
+            bool(is_named),
+        ]:
+            return (module_qn, line, col, label, qn, container, is_named)
+    return None
+
+
+def _go_type_location_row(item: JsonValue) -> GoTypeLocationRow | None:
+    match item:
+        case [str(path), int(line), int(col), str(qn), str(label)]:
+            return (path, line, col, qn, label)
+    return None
+
+
+def _csharp_type_location_row(item: JsonValue) -> CSharpTypeLocationRow | None:
+    match item:
+        case [str(path), int(line), str(qn)]:
+            return (path, line, qn)
+    return None
+
+
+def hash_cache_digest(cache_path: Path) -> str | None:
+    try:
+        return hashlib.md5(cache_path.read_bytes(), usedforsecurity=False).hexdigest()
+    except OSError:
+        return None
+
+
+def load_warm_state(
+    state_path: Path, project_name: str, digest: str | None
+) -> WarmState | None:
+    if digest is None:
+        return None
+    try:
+        data = json.loads(state_path.read_text(encoding=cs.ENCODING_UTF8))
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(data, dict)
+        or data.get(cs.WARM_STATE_KEY_VERSION) != cs.WARM_STATE_VERSION
+        or data.get(cs.WARM_STATE_KEY_PROJECT) != project_name
+        or data.get(cs.WARM_STATE_KEY_HASH_CACHE) != digest
+    ):
+        return None
+    registry = _string_map(data.get(cs.WARM_STATE_KEY_REGISTRY))
+    properties = _strings(data.get(cs.WARM_STATE_KEY_PROPERTIES))
+    macros = _strings(data.get(cs.WARM_STATE_KEY_MACROS))
+    module_paths = _string_map(data.get(cs.WARM_STATE_KEY_MODULE_PATHS))
+    function_locations = _rows(
+        data.get(cs.WARM_STATE_KEY_FUNCTION_LOCATIONS), _function_location_row
+    )
+    go_type_locations = _rows(
+        data.get(cs.WARM_STATE_KEY_GO_TYPE_LOCATIONS), _go_type_location_row
+    )
+    csharp_type_locations = _rows(
+        data.get(cs.WARM_STATE_KEY_CSHARP_TYPE_LOCATIONS), _csharp_type_location_row
+    )
+    import_mapping = _string_maps(data.get(cs.WARM_STATE_KEY_IMPORT_MAPPING))
+    if (
+        registry is None
+        or properties is None
+        or macros is None
+        or module_paths is None
+        or function_locations is None
+        or go_type_locations is None
+        or csharp_type_locations is None
+        or import_mapping is None
+    ):
+        return None
+    return WarmState(
+        registry=registry,
+        properties=properties,
+        macros=macros,
+        module_paths=module_paths,
+        function_locations=function_locations,
+        go_type_locations=go_type_locations,
+        csharp_type_locations=csharp_type_locations,
+        import_mapping=import_mapping,
+    )
+
+
+def save_warm_state(
+    state_path: Path, project_name: str, digest: str, state: WarmState
+) -> None:
+    payload = {
+        cs.WARM_STATE_KEY_VERSION: cs.WARM_STATE_VERSION,
+        cs.WARM_STATE_KEY_PROJECT: project_name,
+        cs.WARM_STATE_KEY_HASH_CACHE: digest,
+        **dict(zip(_KEYS, state, strict=True)),
+    }
+    try:
+        with state_path.open("w", encoding=cs.ENCODING_UTF8) as f:
+            json.dump(payload, f)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(ls.WARM_STATE_SAVE_ERROR, error=e)
+        state_path.unlink(missing_ok=True)
+        return
+    logger.debug(ls.WARM_STATE_SAVED, count=len(state.registry), path=state_path)
@@ -4,11 +4,15 @@
 # unambiguously to one function, does cgr's embedder rank that function in the
 # top k? It uses cgr's own embedder over function source from the captured
 # graph, so it tests cgr's embedding + ranking pipeline; the Qdrant ANN layer
-# only approximates this same ranking.
+# only approximates this same ranking. With a quantization mode the ranking
+# goes through cgr's quantized shortlist and full-precision rescoring, and
+# `index_bytes` gives the searched matrix's size, so recall@k and memory can
+# be compared across modes on the same fixtures.
 from pathlib import Path
 from typing import NamedTuple
 
 from codebase_rag import constants as cs
+from codebase_rag.config import settings
 
 from . import constants as ec
 from .cgr_graph import _capture
@@ -57,7 +61,11 @@ def function_snippets(target: Path, project: str) -> dict[str, str]:
 
 
 def cgr_semantic_ranking(
-    target: Path, project: str, queries: list[str], top_k: int
+    target: Path,
+    project: str,
+    queries: list[str],
+    top_k: int,
+    quantization: cs.VectorQuantization = cs.VectorQuantization.NONE,
 ) -> dict[str, list[str]]:
     from codebase_rag.embedder import embed_code_batch
 
@@ -65,7 +73,21 @@ def cgr_semantic_ranking(
     qns = list(snippets)
     snippet_vecs = embed_code_batch([snippets[qn] for qn in qns])
     query_vecs = embed_code_batch(queries)
+    return rank_snippets(queries, query_vecs, qns, snippet_vecs, top_k, quantization)
 
+
+def rank_snippets(
+    queries: list[str],
+    query_vecs: list[list[float]],
+    qns: list[str],
+    snippet_vecs: list[list[float]],
+    top_k: int,
+    quantization: cs.VectorQuantization = cs.VectorQuantization.NONE,
+) -> dict[str, list[str]]:
+    if quantization != cs.VectorQuantization.NONE:
+        return _rank_quantized(
+            queries, query_vecs, qns, snippet_vecs, top_k, quantization
+        )
     ranking: dict[str, list[str]] = {}
     for query, query_vec in zip(queries, query_vecs, strict=False):
         scored = sorted(
@@ -80,6 +102,49 @@ def cgr_semantic_ranking(
     return ranking
 
 
+def _rank_quantized(
+    queries: list[str],
+    query_vecs: list[list[float]],
+    qns: list[str],
+    snippet_vecs: list[list[float]],
+    top_k: int,
+    quantization: cs.VectorQuantization,
+) -> dict[str, list[str]]:
+    # The local backend's search: rank on codes, rescore the shortlist.
+    import numpy as np
+
+    from codebase_rag import vector_quantization as vq
+
+    def unit(rows: list[list[float]]) -> np.ndarray:
+        matrix = np.asarray(rows, dtype=np.float32).reshape(len(rows), -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+    matrix = unit(snippet_vecs)
+    codes = vq.encode(matrix, quantization)
+    all_rows = np.arange(len(qns), dtype=np.int64)
+    size = vq.shortlist_size(top_k, settings.VECTOR_RESCORE_OVERSAMPLING)
+    ranking: dict[str, list[str]] = {}
+    for query, query_vec in zip(queries, unit(query_vecs), strict=False):
+        coarse = vq.coarse_scores(codes, query_vec, quantization)
+        rows = vq.shortlist(coarse, all_rows, size)
+        exact = matrix[rows] @ query_vec
+        order = np.argsort(-exact, kind="stable")[:top_k]
+        ranking[query] = [qns[int(rows[i])] for i in order]
+    return ranking
+
+
+def index_bytes(
+    count: int,
+    dim: int,
+    quantization: cs.VectorQuantization = cs.VectorQuantization.NONE,
+) -> int:
+    # What a search scans: the float32 matrix, or the codes in its place.
+    from codebase_rag import vector_quantization as vq
+
+    return count * vq.code_width(dim, quantization)
+
+
 def score_semantic(
     cases: list[SemanticCase], ranking: dict[str, list[str]]
 ) -> ScoreResult:
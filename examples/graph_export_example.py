@@ -22,8 +22,8 @@ from codebase_rag.constants import (
     KEY_TOTAL_RELATIONSHIPS,
     NodeLabel,
 )
-from codebase_rag.graph_loader import GraphLoader, load_graph
-from codebase_rag.types_defs import GraphSummary
+from codebase_rag.graph_loader import load_graph
+from codebase_rag.types_defs import GraphReaderProtocol, GraphSummary
 
 
 def log_summary(summary: GraphSummary) -> None:
@@ -50,7 +50,9 @@ def log_node_and_relationship_types(summary: GraphSummary) -> None:
         logger.info(logs.GRAPH_REL_COUNT.format(rel_type=rel_type, count=count))
 
 
-def log_example_nodes(graph: GraphLoader, node_label: str, limit: int = 5) -> None:
+def log_example_nodes(
+    graph: GraphReaderProtocol, node_label: str, limit: int = 5
+) -> None:
     nodes = graph.find_nodes_by_label(node_label)
     logger.info(logs.GRAPH_FOUND_NODES.format(count=len(nodes), label=node_label))
 
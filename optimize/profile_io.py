@@ -341,7 +341,7 @@ def profile_embedding_cache_io():
 
     tmp = Path(tempfile.mkdtemp())
     try:
-        cache = EmbeddingCache(path=tmp / "embedding_cache.json")
+        cache = EmbeddingCache(path=tmp / "embedding_cache.bin")
         for i in range(500):
             cache.put(f"def func_{i}(): pass", [float(j) / 768 for j in range(768)])
 
@@ -350,11 +350,11 @@ def profile_embedding_cache_io():
 
         r = benchmark(save_cache, runs=5, label=f"save embedding cache ({len(cache)} entries, 768-dim)")
         results.append(r)
-        size = (tmp / "embedding_cache.json").stat().st_size
+        size = (tmp / "embedding_cache.bin").stat().st_size
         print(f"  {r['label']}: avg={r['avg_ms']:.2f}ms, size={size/1024/1024:.2f}MB")
 
         def load_cache():
-            new_cache = EmbeddingCache(path=tmp / "embedding_cache.json")
+            new_cache = EmbeddingCache(path=tmp / "embedding_cache.bin")
             new_cache.load()
             return new_cache
 
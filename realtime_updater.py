@@ -1,19 +1,21 @@
+import os
 import sys
 import threading
 import time
 from collections.abc import Callable
 from pathlib import Path
-from typing import Annotated, Protocol
+from typing import Annotated, NamedTuple, Protocol
 
 import typer
 from loguru import logger
-from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.events import FileCreatedEvent, FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
+from watchdog.observers.api import BaseObserver, ObservedWatch
 
 from codebase_rag import cli_help as ch
 from codebase_rag import logs
 from codebase_rag import tool_errors as te
-from codebase_rag.config import settings
+from codebase_rag.config import load_ignore_patterns, settings
 from codebase_rag.constants import (
     CYPHER_DELETE_CALLS,
     CYPHER_DELETE_FILE,
@@ -27,6 +29,9 @@ from codebase_rag.constants import (
     KEY_PROJECT_PREFIX,
     LOG_LEVEL_INFO,
     REALTIME_LOGGER_FORMAT,
+    ROOT_DIR_KEY,
+    SEPARATOR_SLASH,
+    WATCH_PRUNED_SUBTREE_MIN_DIRS,
     WATCHER_SLEEP_INTERVAL,
     EventType,
     SupportedLanguage,
@@ -58,6 +63,227 @@ class PendingTimer(Protocol):
 # invoking it during `start()` — doing so deadlocks the handler.
 TimerFactory = Callable[..., PendingTimer]
 
+# `(dirname, dir_prefix) -> bool`: the indexer's own walk predicate
+# (GraphUpdater._should_keep_dir), so the watcher sees exactly the
+# directories a sync would read.
+KeepDir = Callable[[str, str], bool]
+
+
+class EventCounts(NamedTuple):
+    # Events that led to a graph update, and events discarded without one
+    # (directories, ignored paths, read-only events). Debounced repeats of
+    # a pending path are neither.
+    processed: int
+    dropped: int
+
+
+def _subdirectories(path: Path) -> list[str]:
+    # Symlinked directories are not followed, as in the indexer's os.walk.
+    try:
+        with os.scandir(path) as entries:
+            return sorted(
+                entry.name for entry in entries if entry.is_dir(follow_symlinks=False)
+            )
+    except OSError:
+        return []
+
+
+def _is_heavy(path: Path) -> bool:
+    # Whether the subtree holds at least WATCH_PRUNED_SUBTREE_MIN_DIRS
+    # directories; stops counting there.
+    seen = 0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        for name in _subdirectories(current):
+            seen += 1
+            if seen >= WATCH_PRUNED_SUBTREE_MIN_DIRS:
+                return True
+            stack.append(current / name)
+    return False
+
+
+class DirectoryWatches:
+    """Watch registrations that leave the indexer's ignored subtrees out.
+
+    watchdog runs one emitter (on Linux, an inotify instance and a thread)
+    per scheduled watch, so a watch per directory would exhaust the
+    instance limit long before the watch limit. A directory whose subtree
+    holds no large ignored directory gets ONE recursive watch; only the
+    directories above such a subtree are watched one level deep, each kept
+    child getting its own registration. Small ignored directories
+    (__pycache__) stay inside a recursive watch and the handler drops their
+    events.
+    """
+
+    def __init__(
+        self,
+        observer: BaseObserver,
+        handler: FileSystemEventHandler,
+        repo_path: Path,
+        keep_dir: KeepDir,
+        max_watches: int,
+    ) -> None:
+        self._observer = observer
+        self._handler = handler
+        self.repo_path = repo_path
+        self._keep_dir = keep_dir
+        self._max_watches = max_watches
+        # Rel dir key (ROOT_DIR_KEY for the repo) -> its scheduled watch.
+        self._watches: dict[str, ObservedWatch] = {}
+        # Directory events arrive on the observer thread; start() runs on
+        # the main one.
+        self._lock = threading.RLock()
+
+    def start(self) -> None:
+        with self._lock:
+            self._schedule(ROOT_DIR_KEY)
+        recursive = sum(watch.is_recursive for watch in self._watches.values())
+        logger.info(
+            logs.WATCHER_REGISTERED.format(
+                count=len(self._watches), recursive=recursive
+            )
+        )
+
+    @property
+    def watched(self) -> dict[str, bool]:
+        """Rel dir key -> whether its watch is recursive."""
+        with self._lock:
+            return {key: w.is_recursive for key, w in self._watches.items()}
+
+    def directory_created(self, path: Path) -> list[Path]:
+        """Register a new directory; returns the files already inside it.
+
+        A recursive watch picks new directories up by itself; the one thing
+        to check there is an ignored subtree that just grew large (an
+        `npm install`), which re-registers the watch around it. A directory
+        created under a one-level watch gets its own registration, and the
+        files written into it before that are returned so the caller can
+        replay their creation.
+        """
+        key = self._key(path)
+        if key is None or key == ROOT_DIR_KEY:
+            return []
+        parent = key.rpartition(SEPARATOR_SLASH)[0] or ROOT_DIR_KEY
+        with self._lock:
+            owner = self._owner(parent)
+            if owner is None or key in self._watches:
+                return []
+            if self._watches[owner].is_recursive:
+                pruned = self._first_pruned(key, owner)
+                if pruned is not None and _is_heavy(self._path(pruned)):
+                    self._split(owner)
+                return []
+            if owner != parent or not self._is_kept(key):
+                return []
+            self._schedule(key)
+            return self._kept_files(key)
+
+    def directory_deleted(self, path: Path) -> None:
+        key = self._key(path)
+        if key is None or key == ROOT_DIR_KEY:
+            return
+        with self._lock:
+            self._unschedule_under(key)
+
+    def _key(self, path: Path) -> str | None:
+        try:
+            return path.relative_to(self.repo_path).as_posix()
+        except ValueError:
+            return None
+
+    def _path(self, key: str) -> Path:
+        return self.repo_path if key == ROOT_DIR_KEY else self.repo_path / key
+
+    @staticmethod
+    def _prefix(key: str) -> str:
+        return "" if key == ROOT_DIR_KEY else f"{key}{SEPARATOR_SLASH}"
+
+    def _owner(self, key: str) -> str | None:
+        # The nearest watched directory at or above `key`.
+        while True:
+            if key in self._watches:
+                return key
+            if key == ROOT_DIR_KEY:
+                return None
+            key = key.rpartition(SEPARATOR_SLASH)[0] or ROOT_DIR_KEY
+
+    def _is_kept(self, key: str) -> bool:
+        return self._first_pruned(key, ROOT_DIR_KEY) is None
+
+    def _first_pruned(self, key: str, below: str) -> str | None:
+        # The topmost directory under `below`, on the way to `key`, that the
+        # indexer's walk prunes.
+        prefix = self._prefix(below)
+        for name in key.removeprefix(prefix).split(SEPARATOR_SLASH):
+            if not self._keep_dir(name, prefix):
+                return f"{prefix}{name}"
+            prefix = f"{prefix}{name}{SEPARATOR_SLASH}"
+        return None
+
+    def _plan(self, key: str) -> list[tuple[str, bool]]:
+        path = self._path(key)
+        prefix = self._prefix(key)
+        split = False
+        child_plans: list[list[tuple[str, bool]]] = []
+        for name in _subdirectories(path):
+            if self._keep_dir(name, prefix):
+                child_plans.append(self._plan(f"{prefix}{name}"))
+            elif _is_heavy(path / name):
+                split = True
+        if not split and all(len(plan) == 1 and plan[0][1] for plan in child_plans):
+            return [(key, True)]
+        return [(key, False), *(entry for plan in child_plans for entry in plan)]
+
+    def _fitted_plan(self, key: str) -> list[tuple[str, bool]]:
+        plan = self._plan(key)
+        if len(plan) > 1 and len(self._watches) + len(plan) > self._max_watches:
+            logger.warning(
+                logs.WATCHER_WATCH_LIMIT.format(
+                    limit=self._max_watches, path=self._path(key)
+                )
+            )
+            return [(key, True)]
+        return plan
+
+    def _schedule(self, key: str) -> None:
+        self._apply(self._fitted_plan(key))
+
+    def _apply(self, plan: list[tuple[str, bool]]) -> None:
+        for key, recursive in plan:
+            self._watches[key] = self._observer.schedule(
+                self._handler, str(self._path(key)), recursive=recursive
+            )
+
+    def _split(self, owner: str) -> None:
+        watch = self._watches.pop(owner)
+        plan = self._fitted_plan(owner)
+        if plan == [(owner, True)]:
+            # Nothing to carve out, or no room to: keep the watch as it is.
+            self._watches[owner] = watch
+            return
+        logger.info(logs.WATCHER_SUBTREE_SPLIT.format(path=self._path(owner)))
+        self._observer.unschedule(watch)
+        self._apply(plan)
+
+    def _unschedule_under(self, key: str) -> None:
+        prefix = self._prefix(key)
+        for watched in [k for k in self._watches if k == key or k.startswith(prefix)]:
+            watch = self._watches.pop(watched)
+            try:
+                self._observer.unschedule(watch)
+            except KeyError:
+                # watchdog already dropped the emitter of a deleted root.
+                pass
+
+    def _kept_files(self, key: str) -> list[Path]:
+        files: list[Path] = []
+        for dirpath, dirnames, filenames in os.walk(self._path(key)):
+            prefix = self._prefix(self._key(Path(dirpath)) or ROOT_DIR_KEY)
+            dirnames[:] = [d for d in dirnames if self._keep_dir(d, prefix)]
+            files.extend(Path(dirpath) / name for name in filenames)
+        return files
+
 
 class CodeChangeEventHandler(FileSystemEventHandler):
     """
@@ -90,6 +316,13 @@ class CodeChangeEventHandler(FileSystemEventHandler):
         self.debounce_seconds = debounce_seconds
         self.max_wait_seconds = max_wait_seconds
         self.debounce_enabled = debounce_seconds > 0
+        # Set by the watch loop once registrations exist: directory events
+        # then add and remove watches as the tree changes.
+        self.watches: DirectoryWatches | None = None
+        self._counts_lock = threading.Lock()
+        self._processed = 0
+        self._dropped = 0
+        self._reported = EventCounts(0, 0)
 
         # Thread-safe state for tracking pending changes
         self.timers: dict[str, PendingTimer] = {}
@@ -112,6 +345,45 @@ class CodeChangeEventHandler(FileSystemEventHandler):
         else:
             logger.info(logs.WATCHER_ACTIVE)
 
+    @property
+    def event_counts(self) -> EventCounts:
+        with self._counts_lock:
+            return EventCounts(self._processed, self._dropped)
+
+    def report_event_counts(self, force: bool = False) -> None:
+        """Log the event totals if they moved since the last report."""
+        counts = self.event_counts
+        if counts == self._reported and not force:
+            return
+        self._reported = counts
+        logger.info(
+            logs.WATCHER_EVENT_COUNTS.format(
+                processed=counts.processed, dropped=counts.dropped
+            )
+        )
+
+    def _count(self, processed: bool) -> None:
+        with self._counts_lock:
+            if processed:
+                self._processed += 1
+            else:
+                self._dropped += 1
+
+    def _on_directory_event(self, event: FileSystemEvent, src_path: str) -> None:
+        if self.watches is None:
+            return
+        if event.event_type in (EventType.DELETED, EventType.MOVED):
+            self.watches.directory_deleted(Path(src_path))
+        created = src_path
+        if event.event_type == EventType.MOVED:
+            created = event.dest_path
+            if isinstance(created, bytes):
+                created = created.decode()
+        elif event.event_type != EventType.CREATED:
+            return
+        for file_path in self.watches.directory_created(Path(created)):
+            self.dispatch(FileCreatedEvent(str(file_path)))
+
     def _is_relevant(self, path_str: str) -> bool:
         path = Path(path_str)
         if any(path.name.endswith(suffix) for suffix in self.ignore_suffixes):
@@ -136,7 +408,12 @@ class CodeChangeEventHandler(FileSystemEventHandler):
         if isinstance(src_path, bytes):
             src_path = src_path.decode()
 
-        if event.is_directory or not self._is_relevant(src_path):
+        if event.is_directory:
+            self._count(processed=False)
+            self._on_directory_event(event, src_path)
+            return
+        if not self._is_relevant(src_path):
+            self._count(processed=False)
             return
 
         if not self.debounce_enabled:
@@ -247,7 +524,9 @@ class CodeChangeEventHandler(FileSystemEventHandler):
             EventType.DELETED,  # watchdog deletion event
         }
         if event.event_type not in relevant_events:
+            self._count(processed=False)
             return
+        self._count(processed=True)
 
         logger.warning(
             logs.CHANGE_DETECTED.format(event_type=event.event_type, path=path)
@@ -319,17 +598,15 @@ class CodeChangeEventHandler(FileSystemEventHandler):
         changed_language = changed_spec.language if changed_spec else None
         if changed_language == SupportedLanguage.GO:
             self.updater._run_go_frontend()
-            # A watch process that did not perform the full build itself has
-            # no in-memory locations for unchanged files; restoring them from
-            # the persisted graph matches the incremental flow and costs
-            # nothing when live state already holds them (fresh entries win).
-            self.updater._rehydrate_go_type_locations()
-            self.updater._rehydrate_function_locations()
+            # A watch process whose initial run found the repo in sync holds
+            # no in-memory locations for unchanged files; they come from the
+            # warm-state snapshot loaded at startup or, without one, from a
+            # single graph read on the first event. Events keep them current.
+            self.updater.ensure_warm_state()
             self.updater._join_go_implements()
         elif changed_language == SupportedLanguage.CSHARP:
             self.updater._run_csharp_frontend()
-            self.updater._rehydrate_csharp_type_locations()
-            self.updater._rehydrate_function_locations()
+            self.updater.ensure_warm_state()
             self.updater._join_csharp_partials()
         elif changed_language == SupportedLanguage.JAVA:
             # The javac facts (issue #1181) are keyed by (file, line, byte
@@ -337,13 +614,15 @@ class CodeChangeEventHandler(FileSystemEventHandler):
             # otherwise keep binding it through the previous run's positions,
             # and a stale external proof would keep suppressing a live edge.
             self.updater._run_java_frontend()
-            self.updater._rehydrate_function_locations()
+            self.updater.ensure_warm_state()
         elif changed_language == SupportedLanguage.PYTHON:
             # The Jedi facts (issue #1183) are position-keyed against the
             # repo-wide import graph, so an edit can rebind call sites in
-            # unchanged files; same rerun-then-rehydrate posture as Go/C#.
-            self.updater._run_python_frontend()
-            self.updater._rehydrate_function_locations()
+            # unchanged files. The frontend is incremental: it re-infers the
+            # edited file and the files importing it, and the rest of the
+            # facts stay in place; then the same warm state as Go/C#.
+            self.updater._run_python_frontend(changed=[path])
+            self.updater.ensure_warm_state()
 
         # Rust inline-mod import maps retract at the end of every parse
         # and only re-commit through arbitration; run() is not on this
@@ -403,11 +682,25 @@ def _run_watcher_loop(
     debounce_seconds: float,
     max_wait_seconds: float,
 ):
-    updater = GraphUpdater(ingestor, repo_path_obj, parsers, queries)
+    # The same exclude/unignore set a non-interactive `cgr start` indexes
+    # with, so the watcher's syncs and watch registrations agree with it.
+    cgrignore = load_ignore_patterns(repo_path_obj)
+    updater = GraphUpdater(
+        ingestor,
+        repo_path_obj,
+        parsers,
+        queries,
+        unignore_paths=cgrignore.unignore or None,
+        exclude_paths=cgrignore.exclude or None,
+    )
 
     # Initial full scan builds the context for real-time updates
     logger.info(logs.INITIAL_SCAN)
     updater.run()
+    # An in-sync run re-parsed nothing, so the registries come from the
+    # snapshot the last indexing run left behind.
+    if updater.skipped_because_in_sync and settings.WARM_STATE_SNAPSHOT:
+        updater.load_warm_state()
     logger.success(logs.INITIAL_SCAN_DONE)
 
     event_handler = CodeChangeEventHandler(
@@ -416,16 +709,31 @@ def _run_watcher_loop(
         max_wait_seconds=max_wait_seconds,
     )
     observer = Observer()
-    observer.schedule(event_handler, str(repo_path_obj), recursive=True)
+    # After run(): the keep predicate includes the generated-source roots
+    # the initial sync registered.
+    event_handler.watches = DirectoryWatches(
+        observer,
+        event_handler,
+        repo_path_obj,
+        updater._should_keep_dir,
+        settings.WATCHER_MAX_WATCHES,
+    )
+    event_handler.watches.start()
     observer.start()
     logger.info(logs.WATCHING.format(path=repo_path_obj))
 
+    report_interval = settings.WATCHER_EVENT_COUNTS_INTERVAL
+    next_report = time.monotonic() + report_interval
     try:
         while True:
             time.sleep(WATCHER_SLEEP_INTERVAL)
+            if report_interval and time.monotonic() >= next_report:
+                event_handler.report_event_counts()
+                next_report = time.monotonic() + report_interval
     except KeyboardInterrupt:
         observer.stop()
     observer.join()
+    event_handler.report_event_counts(force=True)
 
 
 def _validate_positive_int(value: int | None) -> int | None: